@@ -1,6 +1,6 @@
-import os
 import logging
-import ollama
+
+from llm_client import get_main_llm, get_router_llm
 
 logger = logging.getLogger(__name__)
 
@@ -10,14 +10,12 @@ class Agent:
 
     def __init__(self):
         # 에이전트용 LLM (RAG 필요 여부 판단용)
-        self.agent_url = os.getenv("OLLAMA_AGENT_URL", "http://112.148.37.41:1889")
-        self.agent_client = ollama.Client(host=self.agent_url)
-        self.agent_model = "huihui_ai/kanana-nano-abliterated:2.1b"
+        self.agent_llm = get_router_llm()
+        self.agent_model = self.agent_llm.model
 
         # 메인 LLM (실제 대화용)
-        self.main_url = os.getenv("OLLAMA_MAIN_URL", "http://112.148.37.41:1884")
-        self.main_client = ollama.Client(host=self.main_url)
-        self.main_model = "gemma3:27b-it-q4_K_M"
+        self.main_llm = get_main_llm()
+        self.main_model = self.main_llm.model
 
     async def needs_rag(self, user_message: str) -> tuple[bool, dict]:
         """
@@ -66,12 +64,7 @@ class Agent:
             logger.info("="*80)
             logger.info(f"📝 프롬프트:\n{prompt}")
 
-            response = self.agent_client.generate(
-                model=self.agent_model,
-                prompt=prompt
-            )
-
-            answer = response['response'].strip().upper()
+            answer = (await self.agent_llm.generate(prompt)).upper()
             needs_rag = "YES" in answer
 
             logger.info(f"💬 에이전트 응답: {answer}")
@@ -117,12 +110,7 @@ class Agent:
             logger.info(f"📝 프롬프트:\n{prompt}")
 
             # 메인 LLM 사용 (Gemma3)
-            response = self.main_client.generate(
-                model=self.main_model,
-                prompt=prompt
-            )
-
-            answer = response['response'].strip()
+            answer = await self.main_llm.generate(prompt)
 
             # 50자 제한 체크 및 추가 설명 제안
             if len(answer) > 50:
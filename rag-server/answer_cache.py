@@ -0,0 +1,279 @@
+"""
+시맨틱 답변 캐시 (Semantic Answer Cache)
+
+매장별로 반복되는 질문("영업시간 알려줘", "주차 돼요?" 등)의 RAG 답변을 캐시합니다.
+캐시 키는 (store_id, category, language)이며 두 단계로 조회합니다.
+
+1. 정규화된 질문 텍스트 완전 일치 (임베딩 없이 즉시 반환)
+2. 쿼리 임베딩 최근접 이웃 (코사인 유사도가 임계값 이상이면 반환)
+
+매장 문서가 재인덱싱되면 해당 매장의 캐시는 무효화되며,
+TTL 만료 및 LRU 방식으로 오래된 항목을 제거합니다.
+
+설정 (환경변수):
+- ANSWER_CACHE_ENABLED: 캐시 사용 여부 (기본 true)
+- ANSWER_CACHE_SIMILARITY: 시맨틱 히트 유사도 임계값 (기본 0.95)
+- ANSWER_CACHE_TTL_SECONDS: 항목 유효 시간 (기본 3600초)
+- ANSWER_CACHE_MAX_ENTRIES: 전체 최대 항목 수 (기본 10000)
+"""
+
+import os
+import re
+import copy
+import time
+import logging
+import unicodedata
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# 정규화 시 제거할 문장 끝 기호
+_TRAILING_PUNCTUATION = re.compile(r"[\s?!.~,。？！…]+$")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_query(text: str) -> str:
+    """
+    캐시 키용 질문 정규화
+
+    유니코드 정규화(NFKC), 소문자 변환, 공백 통일, 문장 끝 기호 제거
+    예: "영업시간 알려줘?? " -> "영업시간 알려줘"
+    """
+    text = unicodedata.normalize("NFKC", text).lower().strip()
+    text = _WHITESPACE.sub(" ", text)
+    return _TRAILING_PUNCTUATION.sub("", text)
+
+
+class CacheEntry:
+    """캐시 항목"""
+
+    __slots__ = ("normalized_query", "embedding", "answer", "debug_info", "created_at", "hits")
+
+    def __init__(self, normalized_query: str, embedding: Optional[np.ndarray], answer: str, debug_info: dict):
+        self.normalized_query = normalized_query
+        self.embedding = embedding
+        self.answer = answer
+        self.debug_info = debug_info
+        self.created_at = time.time()
+        self.hits = 0
+
+
+class SemanticAnswerCache:
+    """(store_id, category, language)별 시맨틱 답변 캐시"""
+
+    def __init__(
+        self,
+        similarity_threshold: Optional[float] = None,
+        ttl_seconds: Optional[float] = None,
+        max_entries: Optional[int] = None,
+        enabled: Optional[bool] = None
+    ):
+        self.enabled = enabled if enabled is not None else os.getenv("ANSWER_CACHE_ENABLED", "true").lower() == "true"
+        self.similarity_threshold = similarity_threshold if similarity_threshold is not None else float(os.getenv("ANSWER_CACHE_SIMILARITY", "0.95"))
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else float(os.getenv("ANSWER_CACHE_TTL_SECONDS", "3600"))
+        self.max_entries = max_entries if max_entries is not None else int(os.getenv("ANSWER_CACHE_MAX_ENTRIES", "10000"))
+
+        # LRU 순서 관리: (store_id, category, language, normalized_query) -> CacheEntry
+        self._entries: "OrderedDict[tuple, CacheEntry]" = OrderedDict()
+        # 키별 인덱스: (store_id, category, language) -> {normalized_query: CacheEntry}
+        self._by_key: Dict[tuple, Dict[str, CacheEntry]] = {}
+
+        # 통계 (misses는 완전 일치와 유사도 조회가 모두 실패한 요청 수, exact_misses는 임베딩 조회로 넘어간 수)
+        self.exact_hits = 0
+        self.exact_misses = 0
+        self.semantic_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+        logger.info(
+            f"✅ 시맨틱 답변 캐시 초기화 (enabled={self.enabled}, threshold={self.similarity_threshold}, "
+            f"ttl={self.ttl_seconds}s, max_entries={self.max_entries})"
+        )
+
+    def lookup_exact(
+        self,
+        store_id: int,
+        category: str,
+        language: str,
+        query: str,
+        normalized: Optional[str] = None
+    ) -> Optional[Tuple[str, dict]]:
+        """
+        정규화된 질문 텍스트 완전 일치 조회
+
+        Args:
+            normalized: 이미 정규화한 질문 (요청 컨텍스트, 없으면 query를 정규화)
+
+        Returns:
+            (답변, 디버그 정보) 또는 None
+        """
+        if not self.enabled:
+            return None
+
+        normalized = normalized or normalize_query(query)
+        entry = self._by_key.get((store_id, category, language), {}).get(normalized)
+        if entry is None or self._expire_if_stale(store_id, category, language, entry):
+            # 최종 미스는 이어지는 lookup_similar에서 집계 (중복 집계 방지)
+            self.exact_misses += 1
+            return None
+
+        self.exact_hits += 1
+        return self._hit(store_id, category, language, entry, "exact", 1.0)
+
+    def lookup_similar(
+        self,
+        store_id: int,
+        category: str,
+        language: str,
+        query_embedding: list[float]
+    ) -> Optional[Tuple[str, dict]]:
+        """
+        쿼리 임베딩 최근접 이웃 조회 (유사도 임계값 이상만)
+
+        Returns:
+            (답변, 디버그 정보) 또는 None
+        """
+        if not self.enabled:
+            return None
+
+        bucket = self._by_key.get((store_id, category, language))
+        candidates = []
+        if bucket:
+            for entry in list(bucket.values()):
+                if entry.embedding is not None and not self._expire_if_stale(store_id, category, language, entry):
+                    candidates.append(entry)
+
+        if not candidates:
+            self.misses += 1
+            return None
+
+        query_vector = self._normalize_vector(query_embedding)
+        matrix = np.stack([entry.embedding for entry in candidates])
+        similarities = matrix @ query_vector
+        best = int(np.argmax(similarities))
+        best_similarity = float(similarities[best])
+
+        if best_similarity < self.similarity_threshold:
+            self.misses += 1
+            return None
+
+        self.semantic_hits += 1
+        return self._hit(store_id, category, language, candidates[best], "semantic", best_similarity)
+
+    def put(
+        self,
+        store_id: int,
+        category: str,
+        language: str,
+        query: str,
+        query_embedding: Optional[list[float]],
+        answer: str,
+        debug_info: dict,
+        normalized: Optional[str] = None
+    ):
+        """답변 저장 (최대 항목 수 초과 시 가장 오래 사용되지 않은 항목 제거, normalized: 이미 정규화한 질문)"""
+        if not self.enabled:
+            return
+
+        normalized = normalized or normalize_query(query)
+        embedding = self._normalize_vector(query_embedding) if query_embedding is not None else None
+        entry = CacheEntry(normalized, embedding, answer, copy.deepcopy(debug_info))
+
+        lru_key = (store_id, category, language, normalized)
+        self._entries[lru_key] = entry
+        self._entries.move_to_end(lru_key)
+        self._by_key.setdefault((store_id, category, language), {})[normalized] = entry
+
+        while len(self._entries) > self.max_entries:
+            (old_store, old_category, old_language, old_query), _ = self._entries.popitem(last=False)
+            self._remove_from_index(old_store, old_category, old_language, old_query)
+            self.evictions += 1
+
+    def invalidate_store(self, store_id: int, category: Optional[str] = None) -> int:
+        """
+        매장 캐시 무효화 (문서 재인덱싱 시 호출)
+
+        Args:
+            store_id: 매장 ID
+            category: 카테고리 (None이면 모든 카테고리)
+
+        Returns:
+            제거된 항목 수
+        """
+        keys = [
+            key for key in self._entries
+            if key[0] == store_id and (category is None or key[1] == category)
+        ]
+        for key in keys:
+            del self._entries[key]
+            self._remove_from_index(*key)
+
+        if keys:
+            self.invalidations += 1
+            logger.info(f"🗑️ 답변 캐시 무효화: store_id={store_id}, category={category} ({len(keys)}개)")
+        return len(keys)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """캐시 설정 및 히트/미스 통계"""
+        hits = self.exact_hits + self.semantic_hits
+        lookups = hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "similarity_threshold": self.similarity_threshold,
+            "ttl_seconds": self.ttl_seconds,
+            "max_entries": self.max_entries,
+            "entries": len(self._entries),
+            "exact_hits": self.exact_hits,
+            "exact_misses": self.exact_misses,
+            "semantic_hits": self.semantic_hits,
+            "misses": self.misses,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations
+        }
+
+    def _hit(self, store_id: int, category: str, language: str, entry: CacheEntry,
+             hit_type: str, similarity: float) -> Tuple[str, dict]:
+        """히트 처리 (LRU 갱신 및 디버그 정보 구성)"""
+        self._entries.move_to_end((store_id, category, language, entry.normalized_query))
+        entry.hits += 1
+
+        debug_info = copy.deepcopy(entry.debug_info)
+        debug_info["cache"] = {
+            "hit": hit_type,
+            "similarity": round(similarity, 4),
+            "cached_query": entry.normalized_query,
+            "age_seconds": round(time.time() - entry.created_at, 1)
+        }
+        logger.info(f"⚡ 답변 캐시 히트 ({hit_type}, 유사도={similarity:.4f}): {entry.normalized_query}")
+        return entry.answer, debug_info
+
+    def _expire_if_stale(self, store_id: int, category: str, language: str, entry: CacheEntry) -> bool:
+        """TTL이 지난 항목 제거 (제거했으면 True)"""
+        if time.time() - entry.created_at <= self.ttl_seconds:
+            return False
+        lru_key = (store_id, category, language, entry.normalized_query)
+        self._entries.pop(lru_key, None)
+        self._remove_from_index(*lru_key)
+        self.evictions += 1
+        return True
+
+    def _remove_from_index(self, store_id: int, category: str, language: str, normalized_query: str):
+        """키별 인덱스에서 항목 제거"""
+        bucket = self._by_key.get((store_id, category, language))
+        if bucket is None:
+            return
+        bucket.pop(normalized_query, None)
+        if not bucket:
+            del self._by_key[(store_id, category, language)]
+
+    @staticmethod
+    def _normalize_vector(vector) -> np.ndarray:
+        """코사인 유사도 계산을 위한 L2 정규화"""
+        array = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(array)
+        return array / norm if norm > 0 else array
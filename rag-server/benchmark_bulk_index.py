@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+벡터 적재 처리량 벤치마크
+
+여러 매장을 연속으로 재인덱싱할 때의 Milvus 적재 속도(chunks/second)를 비교합니다.
+임베딩 계산 비용을 제외하기 위해 합성 벡터를 사용합니다.
+
+비교 대상:
+- per_store_flush: 매장마다 insert + flush (이전 MilvusVectorStore.insert 동작)
+- bulk_writer: BulkVectorWriter로 여러 매장을 모아 insert, flush는 마지막에 한 번
+
+실행 방법:
+    python benchmark_bulk_index.py --stores 1000 --chunks-per-store 30
+"""
+
+import argparse
+import time
+
+import numpy as np
+from pymilvus import utility
+
+from bulk_writer import BulkVectorWriter
+from vector_store import MilvusVectorStore, chunk_hash
+
+
+def synthetic_store(store_id: int, chunks_per_store: int, dimension: int, rng: np.random.Generator):
+    """매장 하나 분량의 합성 청크/임베딩/sparse 가중치 (청크당 토큰 64개)"""
+    texts = [f"store {store_id} chunk {i}" for i in range(chunks_per_store)]
+    vectors = rng.standard_normal((chunks_per_store, dimension)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    sparse = [
+        {int(token_id): float(weight) for token_id, weight in zip(rng.integers(0, 250000, 64), rng.random(64))}
+        for _ in range(chunks_per_store)
+    ]
+    return texts, vectors.tolist(), sparse
+
+
+def run_per_store_flush(store: MilvusVectorStore, stores: int, chunks_per_store: int,
+                        dimension: int, rng: np.random.Generator):
+    """매장마다 insert 후 flush"""
+    for store_id in range(1, stores + 1):
+        texts, embeddings, sparse = synthetic_store(store_id, chunks_per_store, dimension, rng)
+        store.insert(texts, embeddings, store_id, "customer", sparse_embeddings=sparse)
+        store.flush()
+
+
+def run_bulk_writer(store: MilvusVectorStore, stores: int, chunks_per_store: int,
+                    dimension: int, rng: np.random.Generator):
+    """BulkVectorWriter로 모아서 적재"""
+    with BulkVectorWriter(store) as writer:
+        for store_id in range(1, stores + 1):
+            texts, embeddings, sparse = synthetic_store(store_id, chunks_per_store, dimension, rng)
+            writer.add(texts, embeddings, store_id, "customer", [chunk_hash(text) for text in texts],
+                       sparse_embeddings=sparse)
+
+
+VARIANTS = {
+    "per_store_flush": run_per_store_flush,
+    "bulk_writer": run_bulk_writer,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Milvus 벌크 적재 처리량 벤치마크")
+    parser.add_argument("--stores", type=int, default=1000, help="매장 수")
+    parser.add_argument("--chunks-per-store", type=int, default=30, help="매장당 청크 수")
+    parser.add_argument("--dimension", type=int, default=1024, help="임베딩 차원")
+    parser.add_argument("--variants", default=",".join(VARIANTS), help="비교할 방식 (쉼표 구분)")
+    parser.add_argument("--seed", type=int, default=42, help="난수 시드")
+    args = parser.parse_args()
+
+    total_chunks = args.stores * args.chunks_per_store
+    results = []
+
+    for name in args.variants.split(","):
+        collection_name = f"bench_ingest_{name}"
+        if utility.has_collection(collection_name):
+            utility.drop_collection(collection_name)
+
+        store = MilvusVectorStore(collection_name=collection_name, dimension=args.dimension)
+        rng = np.random.default_rng(args.seed)
+        try:
+            print(f"⏱️ {name}: 매장 {args.stores}개 x 청크 {args.chunks_per_store}개 적재 중...")
+            started = time.perf_counter()
+            VARIANTS[name](store, args.stores, args.chunks_per_store, args.dimension, rng)
+            elapsed = time.perf_counter() - started
+            results.append((name, elapsed, total_chunks / elapsed))
+        finally:
+            utility.drop_collection(collection_name)
+
+    print("=" * 80)
+    print(f"{'방식':<20}{'청크 수':>12}{'소요 시간(s)':>16}{'chunks/s':>14}")
+    for name, elapsed, throughput in results:
+        print(f"{name:<20}{total_chunks:>12}{elapsed:>16.2f}{throughput:>14.1f}")
+    print("=" * 80)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+벡터 검색 지연 시간 벤치마크
+
+매장 수를 늘려가며 합성 임베딩으로 임시 컬렉션을 만들고,
+인덱스 설정별 단일 매장 검색의 p50/p99 지연 시간을 측정합니다.
+
+비교 대상:
+- ivf_flat: IVF_FLAT (nlist=128, nprobe=10), 파티션 없음 (기존 방식, store_id 스칼라 필터)
+- hnsw_partitioned: HNSW + store_id partition key (현재 기본 설정)
+
+실행 방법:
+    python benchmark_vector_search.py --stores 10,100,1000 --chunks-per-store 30 --queries 500
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+import numpy as np
+from pymilvus import utility
+
+from vector_store import MilvusVectorStore, get_index_config, chunk_hash
+
+VARIANTS = {
+    "ivf_flat": {"index_type": "IVF_FLAT", "partition_key": False},
+    "hnsw_partitioned": {"index_type": "HNSW", "partition_key": True},
+}
+
+
+def random_vectors(count: int, dimension: int, rng: np.random.Generator) -> np.ndarray:
+    """L2 정규화된 랜덤 벡터"""
+    vectors = rng.standard_normal((count, dimension)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def percentile(values: list[float], q: float) -> float:
+    """백분위수 (q: 0~100)"""
+    return float(np.percentile(values, q))
+
+
+def run_variant(name: str, num_stores: int, chunks_per_store: int, queries: int,
+                dimension: int, top_k: int, rng: np.random.Generator) -> dict:
+    """
+    한 가지 인덱스 설정으로 적재 후 검색 지연 시간 측정
+
+    Returns:
+        {"variant", "stores", "vectors", "p50_ms", "p99_ms", "mean_ms"}
+    """
+    config = get_index_config()
+    config.update(VARIANTS[name])
+    config["sparse"] = False  # dense 인덱스만 비교
+
+    collection_name = f"bench_{name}_{num_stores}"
+    if utility.has_collection(collection_name):
+        utility.drop_collection(collection_name)
+
+    store = MilvusVectorStore(collection_name=collection_name, dimension=dimension, index_config=config)
+    try:
+        # 매장별 합성 청크 적재 (flush는 마지막에 한 번)
+        batch_stores = max(1, 5000 // chunks_per_store)
+        for first in range(0, num_stores, batch_stores):
+            store_ids = list(range(first + 1, min(first + batch_stores, num_stores) + 1))
+            count = len(store_ids) * chunks_per_store
+            store.collection.insert([
+                [store_id for store_id in store_ids for _ in range(chunks_per_store)],
+                ["customer"] * count,
+                [f"chunk {i}" for i in range(count)],
+                [chunk_hash(f"{first}-{i}") for i in range(count)],
+                random_vectors(count, dimension, rng).tolist()
+            ])
+        store.collection.flush()
+        store.collection.load()
+
+        # 워밍업 후 측정
+        query_vectors = random_vectors(queries, dimension, rng).tolist()
+        for vector in query_vectors[:10]:
+            store.search(vector, store_id=1, category="customer", top_k=top_k)
+
+        latencies = []
+        for vector in query_vectors:
+            store_id = random.randint(1, num_stores)
+            started = time.perf_counter()
+            store.search(vector, store_id=store_id, category="customer", top_k=top_k)
+            latencies.append((time.perf_counter() - started) * 1000)
+
+        return {
+            "variant": name,
+            "stores": num_stores,
+            "vectors": num_stores * chunks_per_store,
+            "p50_ms": percentile(latencies, 50),
+            "p99_ms": percentile(latencies, 99),
+            "mean_ms": statistics.mean(latencies)
+        }
+    finally:
+        utility.drop_collection(collection_name)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Milvus 검색 지연 시간 벤치마크 (매장 수별 p50/p99)")
+    parser.add_argument("--stores", default="10,100,1000", help="매장 수 목록 (쉼표 구분)")
+    parser.add_argument("--chunks-per-store", type=int, default=30, help="매장당 청크 수")
+    parser.add_argument("--queries", type=int, default=500, help="측정할 검색 횟수")
+    parser.add_argument("--dimension", type=int, default=1024, help="임베딩 차원")
+    parser.add_argument("--top-k", type=int, default=5, help="검색 결과 수")
+    parser.add_argument("--variants", default=",".join(VARIANTS), help="비교할 설정 (쉼표 구분)")
+    parser.add_argument("--seed", type=int, default=42, help="난수 시드")
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    rng = np.random.default_rng(args.seed)
+
+    results = []
+    for num_stores in [int(value) for value in args.stores.split(",")]:
+        for name in args.variants.split(","):
+            print(f"⏱️ {name}: 매장 {num_stores}개 측정 중...")
+            results.append(run_variant(
+                name, num_stores, args.chunks_per_store, args.queries, args.dimension, args.top_k, rng
+            ))
+
+    print("=" * 80)
+    print(f"{'설정':<20}{'매장 수':>10}{'벡터 수':>12}{'p50(ms)':>12}{'p99(ms)':>12}{'평균(ms)':>12}")
+    for result in results:
+        print(
+            f"{result['variant']:<20}{result['stores']:>10}{result['vectors']:>12}"
+            f"{result['p50_ms']:>12.2f}{result['p99_ms']:>12.2f}{result['mean_ms']:>12.2f}"
+        )
+    print("=" * 80)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+"""
+Milvus 버퍼드 벌크 writer
+
+여러 매장을 연속으로 재인덱싱할 때 매장마다 insert + flush를 하면
+flush마다 세그먼트가 봉인되어 작은 세그먼트가 쌓이고 적재 속도가 크게 떨어집니다.
+BulkVectorWriter는 여러 매장의 행을 버퍼에 모아 큰 단위로 insert하고,
+flush는 일정 행 수/시간마다 또는 명시적으로 한 번만 수행합니다.
+
+사용 예:
+    with BulkVectorWriter(vector_store) as writer:
+        for store_id, chunks, embeddings in ...:
+            writer.add(chunks, embeddings, store_id, "customer")
+    # with 블록 종료 시 남은 행 insert + flush
+
+설정 (환경변수):
+- MILVUS_INSERT_BATCH_ROWS: 한 번에 insert할 행 수 (기본 5000)
+- MILVUS_FLUSH_EVERY_ROWS: 이 행 수만큼 insert할 때마다 flush (기본 100000, 0이면 종료 시에만)
+- MILVUS_FLUSH_INTERVAL_SECONDS: 마지막 flush 후 이 시간이 지나면 flush (기본 60, 0이면 비활성)
+"""
+
+import os
+import time
+import logging
+import threading
+from typing import Callable, Optional
+
+from vector_store import MilvusVectorStore, chunk_hash
+
+logger = logging.getLogger(__name__)
+
+
+class BulkVectorWriter:
+    """여러 매장의 벡터를 모아서 적재하는 버퍼드 writer"""
+
+    def __init__(
+        self,
+        vector_store: MilvusVectorStore,
+        batch_rows: Optional[int] = None,
+        flush_every_rows: Optional[int] = None,
+        flush_interval_seconds: Optional[float] = None
+    ):
+        """
+        Args:
+            vector_store: 대상 벡터 스토어
+            batch_rows: 한 번에 insert할 행 수
+            flush_every_rows: 이 행 수만큼 insert할 때마다 flush
+            flush_interval_seconds: 마지막 flush 후 경과 시간 기준 flush
+        """
+        self.vector_store = vector_store
+        # 컬렉션에 sparse 필드가 있으면 add마다 sparse 가중치 필수 (빈 가중치로 채우면 sparse/hybrid 검색에서 누락)
+        self.requires_sparse = vector_store.has_sparse
+        self.batch_rows = batch_rows or int(os.getenv("MILVUS_INSERT_BATCH_ROWS", "5000"))
+        self.flush_every_rows = flush_every_rows if flush_every_rows is not None else int(os.getenv("MILVUS_FLUSH_EVERY_ROWS", "100000"))
+        self.flush_interval_seconds = flush_interval_seconds if flush_interval_seconds is not None else float(os.getenv("MILVUS_FLUSH_INTERVAL_SECONDS", "60"))
+
+        self._lock = threading.Lock()
+        self._reset_buffer()
+        # 버퍼의 행이 실제로 insert된 뒤 실행할 콜백 (예: 오래된 청크 삭제)
+        # (해당 행들의 버퍼 내 끝 위치, 콜백)
+        self._after_insert: list[tuple[int, Callable[[], None]]] = []
+
+        self._rows_since_flush = 0
+        self._last_flush = time.monotonic()
+
+        # 통계
+        self.inserted_rows = 0
+        self.insert_calls = 0
+        self.flush_calls = 0
+
+    def add(
+        self,
+        texts: list[str],
+        embeddings: list[list[float]],
+        store_id: int,
+        category: str,
+        chunk_hashes: Optional[list[str]] = None,
+        after_insert: Optional[Callable[[], None]] = None,
+        sparse_embeddings: Optional[list[dict[int, float]]] = None
+    ):
+        """
+        행 추가 (버퍼가 batch_rows 이상이면 insert)
+
+        Args:
+            texts: 청크 텍스트
+            embeddings: 청크 임베딩
+            store_id: 매장 ID
+            category: 문서 카테고리
+            chunk_hashes: 청크 내용 해시 (None이면 텍스트로 계산)
+            after_insert: 이 행들이 Milvus에 insert된 뒤 호출할 콜백
+            sparse_embeddings: 청크 sparse 가중치 (컬렉션에 sparse 필드가 있으면 필수)
+
+        Raises:
+            ValueError: 컬럼 길이가 texts와 다르거나, sparse 필드가 있는 컬렉션에 sparse 가중치가 없는 경우
+        """
+        if len(embeddings) != len(texts) or (chunk_hashes is not None and len(chunk_hashes) != len(texts)):
+            raise ValueError(f"임베딩/청크 해시 수가 텍스트 수({len(texts)})와 다릅니다")
+        if sparse_embeddings is None:
+            if texts and self.requires_sparse:
+                raise ValueError("컬렉션에 sparse_embedding 필드가 있어 sparse 가중치가 필요합니다")
+            sparse_embeddings = [None] * len(texts)
+        elif len(sparse_embeddings) != len(texts):
+            raise ValueError(f"sparse 가중치 수({len(sparse_embeddings)})가 텍스트 수({len(texts)})와 다릅니다")
+
+        with self._lock:
+            self._store_ids.extend([store_id] * len(texts))
+            self._categories.extend([category] * len(texts))
+            self._texts.extend(texts)
+            self._hashes.extend(chunk_hashes or [chunk_hash(text) for text in texts])
+            self._embeddings.extend(embeddings)
+            self._sparse.extend(sparse_embeddings)
+            if after_insert:
+                self._after_insert.append((len(self._texts), after_insert))
+
+            if self._interval_elapsed():
+                self._insert_buffer()
+            elif len(self._texts) >= self.batch_rows:
+                self._insert_buffer(full_batches_only=True)
+            self._maybe_flush()
+
+    def flush(self):
+        """버퍼에 남은 행을 insert하고 Milvus flush"""
+        with self._lock:
+            self._insert_buffer()
+            self._flush()
+
+    def get_stats(self) -> dict:
+        """적재 통계"""
+        return {
+            "buffered_rows": len(self._texts),
+            "inserted_rows": self.inserted_rows,
+            "insert_calls": self.insert_calls,
+            "flush_calls": self.flush_calls
+        }
+
+    def __enter__(self) -> "BulkVectorWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # 예외가 나도 이미 버퍼에 들어간 행은 적재
+        self.flush()
+        return False
+
+    def _reset_buffer(self):
+        """컬럼 버퍼 초기화"""
+        self._store_ids: list[int] = []
+        self._categories: list[str] = []
+        self._texts: list[str] = []
+        self._hashes: list[str] = []
+        self._embeddings: list[list[float]] = []
+        self._sparse: list[Optional[dict[int, float]]] = []
+
+    def _insert_buffer(self, full_batches_only: bool = False):
+        """
+        버퍼를 batch_rows 단위로 insert 후 콜백 실행 (lock 보유 상태에서 호출)
+
+        Args:
+            full_batches_only: True면 batch_rows를 채운 묶음만 insert하고 나머지는 버퍼에 유지
+        """
+        total = len(self._texts)
+        count = total - total % self.batch_rows if full_batches_only else total
+
+        for start in range(0, count, self.batch_rows):
+            end = min(start + self.batch_rows, count)
+            self.vector_store.insert_rows(
+                store_ids=self._store_ids[start:end],
+                categories=self._categories[start:end],
+                texts=self._texts[start:end],
+                chunk_hashes=self._hashes[start:end],
+                embeddings=self._embeddings[start:end],
+                sparse_embeddings=self._sparse[start:end]
+            )
+            self.insert_calls += 1
+
+        if count:
+            self.inserted_rows += count
+            self._rows_since_flush += count
+            logger.info(f"📥 벌크 insert: {count}개 (누적 {self.inserted_rows}개)")
+
+            del self._store_ids[:count]
+            del self._categories[:count]
+            del self._texts[:count]
+            del self._hashes[:count]
+            del self._embeddings[:count]
+            del self._sparse[:count]
+
+        # 모든 행이 insert된 add 호출의 콜백만 실행 (새 행이 없는 add의 콜백도 포함)
+        ready = [callback for end, callback in self._after_insert if end <= count]
+        self._after_insert = [(end - count, callback) for end, callback in self._after_insert if end > count]
+        for callback in ready:
+            callback()
+
+    def _interval_elapsed(self) -> bool:
+        """마지막 flush 후 flush_interval_seconds가 지났는지"""
+        return bool(self.flush_interval_seconds) and time.monotonic() - self._last_flush >= self.flush_interval_seconds
+
+    def _maybe_flush(self):
+        """행 수/시간 기준 flush (lock 보유 상태에서 호출)"""
+        by_rows = self.flush_every_rows and self._rows_since_flush >= self.flush_every_rows
+        if by_rows or (self._rows_since_flush and self._interval_elapsed()):
+            self._flush()
+
+    def _flush(self):
+        """Milvus flush (lock 보유 상태에서 호출)"""
+        if self._rows_since_flush:
+            self.vector_store.flush()
+            self.flush_calls += 1
+            logger.info(f"💾 Milvus flush: {self._rows_since_flush}개")
+        self._rows_since_flush = 0
+        self._last_flush = time.monotonic()
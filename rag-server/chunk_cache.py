@@ -0,0 +1,194 @@
+"""
+문서 청크 캐시 (Chunk Cache)
+
+바뀌지 않은 문서를 인덱싱할 때마다 다시 토크나이즈/청킹/임베딩하지 않도록
+문서별 청킹 결과와 임베딩을 로컬 디스크에 저장합니다. 프로세스를 재시작해도 유지됩니다.
+
+캐시 키: 파일 경로 + mtime + 내용 해시 + 청커 설정(청크 크기, 겹침, 바이트 한도, 모델, 청커 버전)
+저장 형식 (CHUNK_CACHE_DIR 아래):
+- {경로 해시}_{키}.json: 청크 목록, 청크별 토큰 수
+- {경로 해시}_{키}.npy: 청크 임베딩 (float32, mmap으로 로드)
+- {경로 해시}_{키}.sparse.json: 청크 sparse 가중치 (sparse 필드 사용 시)
+
+같은 경로의 이전 항목은 새 항목을 저장할 때 삭제합니다.
+
+설정 (환경변수):
+- CHUNK_CACHE_ENABLED: 캐시 사용 여부 (기본 true)
+- CHUNK_CACHE_DIR: 캐시 디렉토리 (기본 /app/media/chunk_cache)
+"""
+
+import os
+import json
+import glob
+import hashlib
+import logging
+import threading
+from typing import Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class ChunkCache:
+    """문서별 청킹 결과/임베딩 디스크 캐시"""
+
+    def __init__(self, cache_dir: Optional[str] = None, enabled: Optional[bool] = None):
+        """
+        Args:
+            cache_dir: 캐시 디렉토리
+            enabled: 캐시 사용 여부
+        """
+        self.enabled = enabled if enabled is not None else os.getenv("CHUNK_CACHE_ENABLED", "true").lower() == "true"
+        self.cache_dir = cache_dir or os.getenv("CHUNK_CACHE_DIR", "/app/media/chunk_cache")
+
+        if self.enabled:
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+            except OSError as e:
+                logger.warning(f"⚠️ 청크 캐시 디렉토리 생성 실패 - 캐시 비활성화: {str(e)}")
+                self.enabled = False
+
+        self._lock = threading.Lock()
+
+        # 통계
+        self.hits = 0
+        self.misses = 0
+        self.embedding_hits = 0
+
+    @staticmethod
+    def make_key(file_path: str, content: str, config: dict) -> str:
+        """캐시 키 (경로 + mtime + 내용 해시 + 청커 설정)"""
+        payload = json.dumps({
+            "path": os.path.abspath(file_path),
+            "mtime_ns": os.stat(file_path).st_mtime_ns,
+            "content": hashlib.sha256(content.encode("utf-8")).hexdigest(),
+            "config": config
+        }, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+    def get(self, file_path: str, key: str) -> Optional[dict]:
+        """
+        캐시 조회
+
+        Returns:
+            {"key", "chunks", "token_counts", "embeddings"(mmap 배열 또는 None), "sparse"(리스트 또는 None)} 또는 None
+        """
+        if not self.enabled:
+            return None
+
+        base = self._base_path(file_path, key)
+        try:
+            with open(f"{base}.json", "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+
+        embeddings = None
+        if os.path.exists(f"{base}.npy"):
+            try:
+                embeddings = np.load(f"{base}.npy", mmap_mode="r")
+                if len(embeddings) != len(data["chunks"]):
+                    embeddings = None
+                else:
+                    self.embedding_hits += 1
+            except (OSError, ValueError):
+                embeddings = None
+
+        sparse = None
+        if embeddings is not None and os.path.exists(f"{base}.sparse.json"):
+            try:
+                with open(f"{base}.sparse.json", "r", encoding="utf-8") as f:
+                    sparse = [{int(index): weight for index, weight in row} for row in json.load(f)]
+            except (OSError, ValueError):
+                sparse = None
+
+        self.hits += 1
+        return {
+            "key": key,
+            "chunks": data["chunks"],
+            "token_counts": data["token_counts"],
+            "embeddings": embeddings,
+            "sparse": sparse
+        }
+
+    def put(self, file_path: str, key: str, chunks: list[str], token_counts: list[int]) -> dict:
+        """
+        청킹 결과 저장 (같은 경로의 이전 항목은 삭제)
+
+        Returns:
+            get()과 같은 형식의 항목 (embeddings=None)
+        """
+        entry = {"key": key, "chunks": chunks, "token_counts": token_counts, "embeddings": None, "sparse": None}
+        if not self.enabled:
+            return entry
+
+        base = self._base_path(file_path, key)
+        try:
+            with self._lock:
+                self._write_atomic(f"{base}.json", lambda f: f.write(
+                    json.dumps({"path": file_path, "chunks": chunks, "token_counts": token_counts}, ensure_ascii=False).encode("utf-8")
+                ))
+                self._remove_stale(file_path, key)
+        except OSError as e:
+            logger.warning(f"⚠️ 청크 캐시 저장 실패: {file_path} - {str(e)}")
+
+        return entry
+
+    def put_embeddings(self, file_path: str, entry: dict, embeddings: list[list[float]],
+                       sparse: Optional[list[dict[int, float]]] = None):
+        """문서 청크 임베딩(및 sparse 가중치) 저장 (청크 순서와 동일)"""
+        if not self.enabled or len(embeddings) != len(entry["chunks"]):
+            return
+
+        base = self._base_path(file_path, entry["key"])
+        try:
+            if sparse is not None:
+                rows = [[[index, weight] for index, weight in weights.items()] for weights in sparse]
+                self._write_atomic(f"{base}.sparse.json", lambda f: f.write(json.dumps(rows).encode("utf-8")))
+                entry["sparse"] = sparse
+
+            array = np.asarray(embeddings, dtype=np.float32)
+            self._write_atomic(f"{base}.npy", lambda f: np.save(f, array))
+            entry["embeddings"] = np.load(f"{base}.npy", mmap_mode="r")
+        except OSError as e:
+            logger.warning(f"⚠️ 임베딩 캐시 저장 실패: {file_path} - {str(e)}")
+
+    def get_stats(self) -> dict:
+        """캐시 통계"""
+        total = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "cache_dir": self.cache_dir,
+            "hits": self.hits,
+            "misses": self.misses,
+            "embedding_hits": self.embedding_hits,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0
+        }
+
+    def _base_path(self, file_path: str, key: str) -> str:
+        """항목 파일 경로 (확장자 제외)"""
+        return os.path.join(self.cache_dir, f"{self._path_id(file_path)}_{key}")
+
+    @staticmethod
+    def _path_id(file_path: str) -> str:
+        return hashlib.sha256(os.path.abspath(file_path).encode("utf-8")).hexdigest()[:16]
+
+    def _remove_stale(self, file_path: str, key: str):
+        """같은 경로의 다른 키 항목 삭제"""
+        prefix = os.path.join(self.cache_dir, f"{self._path_id(file_path)}_")
+        for path in glob.glob(f"{prefix}*"):
+            if not os.path.basename(path).startswith(f"{self._path_id(file_path)}_{key}."):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    @staticmethod
+    def _write_atomic(path: str, write):
+        """임시 파일에 쓴 뒤 교체 (다른 프로세스가 반쯤 쓴 파일을 읽지 않도록)"""
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            write(f)
+        os.replace(tmp_path, path)
@@ -0,0 +1,204 @@
+"""
+프롬프트 컨텍스트 예산 관리 (Context Budgeter)
+
+검색된 청크를 그대로 이어 붙이면 50자 답변에 필요 없는 내용까지 LLM이 prefill해야 합니다.
+청크를 마크다운 섹션 단위로 나눈 뒤
+1. 청크 사이에 겹치는 줄(같은 제목 아래의 청크 겹침, 반복되는 상위 제목)을 한 번만 남기고
+2. 질문과 관련된 섹션(긴 섹션은 관련된 줄)만 골라
+3. 경로별 토큰 예산 안에서 원래 문서 순서대로 컨텍스트를 만듭니다.
+
+관련도는 BGE-M3 sparse 가중치(질문 토큰별 가중치)로 계산합니다.
+sparse 가중치가 없으면 (dense 검색) 질문 토큰 일치 수를 사용합니다.
+토큰 수는 임베딩 모델 토크나이저 기준의 추정치입니다 (실제 LLM 토큰 수는 Ollama의 prompt_eval_count).
+
+설정 (환경변수):
+- CONTEXT_TOKEN_BUDGET: 기본 컨텍스트 토큰 예산 (기본 600)
+- CONTEXT_TOKEN_BUDGETS: 경로별 예산 "경로=토큰,경로:카테고리=토큰" (기본 "RAG_QUERY=600,RAG_QUERY:owner=1200")
+- CONTEXT_SECTION_MAX_TOKENS: 이보다 긴 섹션은 관련된 줄만 추출 (기본 160)
+"""
+
+import os
+import re
+import logging
+from typing import Optional
+
+from document_loader import get_tokenizer, split_sections
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+_HEADING = re.compile(r"^#{1,6}\s+\S")
+
+
+def parse_budgets(value: str) -> dict[str, int]:
+    """"경로=토큰,경로:카테고리=토큰" 형식의 경로별 예산 파싱"""
+    budgets = {}
+    for item in value.split(","):
+        if "=" not in item:
+            continue
+        key, tokens = item.split("=", 1)
+        try:
+            budgets[key.strip()] = int(tokens)
+        except ValueError:
+            logger.warning(f"⚠️ 잘못된 컨텍스트 예산 설정 무시: {item}")
+    return budgets
+
+
+class ContextBudgeter:
+    """검색 청크 중복 제거 + 관련 섹션 추출 + 토큰 예산 적용"""
+
+    def __init__(
+        self,
+        default_budget: Optional[int] = None,
+        budgets: Optional[dict[str, int]] = None,
+        section_max_tokens: Optional[int] = None,
+        tokenizer=None
+    ):
+        """
+        Args:
+            default_budget: 경로별 예산이 없을 때의 토큰 예산
+            budgets: {"경로" 또는 "경로:카테고리": 토큰 예산}
+            section_max_tokens: 줄 단위로 추출할 섹션 토큰 수 기준
+            tokenizer: 토큰 계산용 토크나이저 (None이면 임베딩 모델 토크나이저)
+        """
+        self.default_budget = default_budget or int(os.getenv("CONTEXT_TOKEN_BUDGET", "600"))
+        self.budgets = budgets if budgets is not None else parse_budgets(
+            os.getenv("CONTEXT_TOKEN_BUDGETS", "RAG_QUERY=600,RAG_QUERY:owner=1200")
+        )
+        self.section_max_tokens = section_max_tokens or int(os.getenv("CONTEXT_SECTION_MAX_TOKENS", "160"))
+        self.tokenizer = tokenizer or get_tokenizer()
+
+    def budget_for(self, route: str, category: str) -> int:
+        """경로(+카테고리)별 토큰 예산"""
+        return self.budgets.get(f"{route}:{category}", self.budgets.get(route, self.default_budget))
+
+    def token_ids(self, text: str) -> list[int]:
+        """토큰 ID 목록 (특수 토큰 제외)"""
+        return self.tokenizer(text, add_special_tokens=False, verbose=False)["input_ids"]
+
+    def count_tokens(self, text: str) -> int:
+        """토큰 수 (추정치)"""
+        return len(self.token_ids(text))
+
+    def build(
+        self,
+        query: str,
+        documents: list[dict],
+        budget: int,
+        query_weights: Optional[dict[int, float]] = None
+    ) -> tuple[str, dict]:
+        """
+        검색 문서로 예산 안의 컨텍스트 생성
+
+        Args:
+            query: 사용자 질문
+            documents: 검색/재순위화된 문서 (관련도 순)
+            budget: 컨텍스트 토큰 예산
+            query_weights: 질문 sparse 가중치 {토큰 ID: 가중치} (None이면 질문 토큰 일치 수)
+
+        Returns:
+            tuple: (컨텍스트 텍스트, 정보 {"budget", "input_tokens", "context_tokens", "sections", "selected_sections", "duplicate_lines"})
+        """
+        weights = query_weights or {token_id: 1.0 for token_id in self.token_ids(query)}
+
+        units, duplicate_lines, input_tokens = self._units(documents, weights)
+
+        # 관련도 순으로 예산까지 선택 (관련 섹션이 없으면 최상위 문서의 섹션을 순서대로)
+        candidates = [unit for unit in units if unit["score"] > 0] or [unit for unit in units if unit["rank"] == 0]
+        candidates.sort(key=lambda unit: (-unit["score"], unit["order"]))
+
+        selected = []
+        used = 0
+        for unit in candidates:
+            if selected and used + unit["tokens"] > budget:
+                continue
+            selected.append(unit)
+            used += unit["tokens"]
+
+        context = self._render(sorted(selected, key=lambda unit: unit["order"]))
+        info = {
+            "budget": budget,
+            "input_tokens": input_tokens,
+            "context_tokens": self.count_tokens(context),
+            "sections": len(units),
+            "selected_sections": len(selected),
+            "duplicate_lines": duplicate_lines
+        }
+        return context, info
+
+    def _units(self, documents: list[dict], weights: dict[int, float]) -> tuple[list[dict], int, int]:
+        """
+        문서를 중복 제거된 섹션(또는 긴 섹션의 줄) 단위로 분리하고 관련도 계산
+
+        Returns:
+            tuple: (단위 목록 [{"rank", "order", "headings", "lines", "tokens", "score"}], 중복 줄 수, 입력 토큰 수)
+        """
+        units = []
+        # 같은 제목 경로 아래에서만 중복 판단 (메뉴마다 같은 "**가격**: 9,000원" 줄이 있을 수 있음)
+        seen: set[tuple[tuple[str, ...], str]] = set()
+        duplicate_lines = 0
+        input_tokens = 0
+
+        for rank, document in enumerate(documents):
+            input_tokens += self.count_tokens(document["text"])
+            for headings, body in split_sections(document["text"]):
+                lines = body.split("\n")
+                title = lines[0] if _HEADING.match(lines[0]) else ""
+                headings = headings + [title] if title else list(headings)
+                heading_tokens = self.count_tokens("\n".join(headings))
+
+                # 같은 제목 아래 다른 청크에서 이미 나온 줄 제외 (제목 줄은 문맥용이므로 렌더링 시 처리)
+                path = tuple(_WHITESPACE.sub(" ", heading).strip() for heading in headings)
+                fresh = []
+                for line in lines[1:] if title else lines:
+                    text = _WHITESPACE.sub(" ", line).strip()
+                    if not text:
+                        continue
+                    key = (path, text)
+                    if key in seen:
+                        duplicate_lines += 1
+                        continue
+                    seen.add(key)
+                    fresh.append(line)
+                if not fresh:
+                    continue
+
+                section_ids = self.token_ids("\n".join(fresh))
+                if len(section_ids) <= self.section_max_tokens:
+                    groups = [(fresh, section_ids)]
+                else:
+                    # 긴 섹션은 줄 단위로 관련된 줄만 고름
+                    groups = [([line], self.token_ids(line)) for line in fresh]
+
+                for group_lines, ids in groups:
+                    score = sum(weights.get(token_id, 0.0) for token_id in set(ids))
+                    units.append({
+                        "rank": rank,
+                        "order": len(units),
+                        "headings": headings,
+                        "lines": group_lines,
+                        # 제목 줄은 앞 단위와 공유되면 다시 쓰지 않지만 예산은 보수적으로 계산
+                        "tokens": len(ids) + heading_tokens,
+                        # 관련도가 같으면 상위 검색 문서 우선
+                        "score": score + (1e-3 / (rank + 1) if score > 0 else 0.0)
+                    })
+
+        return units, duplicate_lines, input_tokens
+
+    @staticmethod
+    def _render(units: list[dict]) -> str:
+        """선택된 단위를 문서 순서대로 렌더링 (제목 줄은 바뀔 때만 출력)"""
+        output: list[str] = []
+        current: list[str] = []
+        for unit in units:
+            if unit["headings"] != current:
+                # 공통 상위 제목은 다시 쓰지 않음
+                common = 0
+                while common < min(len(current), len(unit["headings"])) and current[common] == unit["headings"][common]:
+                    common += 1
+                if output:
+                    output.append("")
+                output.extend(unit["headings"][common:])
+                current = unit["headings"]
+            output.extend(unit["lines"])
+        return "\n".join(output).strip()
@@ -1,9 +1,12 @@
 import os
 import logging
 from pathlib import Path
+from typing import Optional
 from sqlalchemy import create_engine, text
 from datetime import datetime
 
+from faq_answers import build_faq_answers, get_faq_store
+
 logger = logging.getLogger(__name__)
 
 
@@ -208,6 +211,61 @@ class DocumentGenerator:
             logger.error(f"메뉴 정보 MD 생성 오류: {str(e)}")
             raise
 
+    def generate_faq_answers(self, store_id: int) -> Optional[str]:
+        """
+        매장 정보/메뉴로 FAQ 의도별 4개 언어 답변을 미리 계산하여 저장
+
+        매장 정보/메뉴 문서와 같은 값(스크래핑 값 우선)을 사용합니다.
+
+        Returns:
+            저장된 파일 경로 (답변할 정보가 없으면 None)
+        """
+        try:
+            with self.engine.connect() as conn:
+                store = conn.execute(text("""
+                    SELECT
+                        scraped_store_address,
+                        store_address,
+                        scraped_directions,
+                        scraped_phone,
+                        owner_phone,
+                        scraped_sns
+                    FROM stores
+                    WHERE id = :store_id
+                """), {"store_id": store_id}).fetchone()
+
+                if not store:
+                    raise ValueError(f"매장 ID {store_id}를 찾을 수 없습니다.")
+
+                menus = conn.execute(text("""
+                    SELECT menu_name, price, recommendation
+                    FROM menus
+                    WHERE store_id = :store_id
+                    ORDER BY id
+                """), {"store_id": store_id}).fetchall()
+
+            answers = build_faq_answers(
+                {
+                    "address": store[0] or store[1],
+                    "directions": store[2],
+                    "phone": store[3] or store[4],
+                    "sns": store[5]
+                },
+                [{"menu_name": menu[0], "price": menu[1], "recommendation": menu[2]} for menu in menus]
+            )
+
+            if not answers:
+                logger.warning(f"매장 ID {store_id}의 FAQ 답변을 만들 정보가 없습니다.")
+                return None
+
+            file_path = get_faq_store().save(store_id, answers)
+            logger.info(f"FAQ 답변 생성 완료: {file_path} ({', '.join(answers)})")
+            return file_path
+
+        except Exception as e:
+            logger.error(f"FAQ 답변 생성 오류: {str(e)}")
+            raise
+
     def register_document(self, store_id: int, category: str, doc_path: str):
         """
         생성된 문서를 rag_documents 테이블에 등록
@@ -305,6 +363,18 @@ class DocumentGenerator:
             except Exception as e:
                 logger.error(f"리뷰 요약 생성 실패: {str(e)}")
 
+            # 4. FAQ 사전 계산 답변 (RAG 인덱싱 대상 아님, 채팅에서 바로 반환)
+            try:
+                faq_path = self.generate_faq_answers(store_id)
+                if faq_path:
+                    generated["documents"].append({
+                        "type": "faq_answers",
+                        "path": faq_path,
+                        "category": "customer"
+                    })
+            except Exception as e:
+                logger.error(f"FAQ 답변 생성 실패: {str(e)}")
+
             return generated
 
         except Exception as e:
@@ -0,0 +1,166 @@
+"""
+매장 문서 증분 인덱싱
+
+RAG 서버(인라인 fallback)와 인덱싱 워커(index_worker.py)가 같은 로직을 쓰도록
+문서 조회 → 청킹 → 해시 비교 → 새 청크 임베딩/삽입 → 오래된 청크 삭제를 한 곳에 모았습니다.
+모든 메서드는 동기(blocking)이며, API 서버에서는 run_blocking으로 감싸서 호출합니다.
+"""
+
+import os
+import logging
+from typing import Optional
+from sqlalchemy import create_engine, text
+
+from embeddings import BGE_M3_Embeddings
+from vector_store import MilvusVectorStore, plan_chunk_update
+from document_loader import DocumentLoader
+
+logger = logging.getLogger(__name__)
+
+
+class DocumentIndexer:
+    """매장 문서 증분 인덱서"""
+
+    def __init__(
+        self,
+        embeddings: Optional[BGE_M3_Embeddings] = None,
+        vector_store: Optional[MilvusVectorStore] = None,
+        document_loader: Optional[DocumentLoader] = None,
+        engine=None
+    ):
+        """
+        Args:
+            embeddings: BGE-M3 임베딩 (None이면 새로 로드)
+            vector_store: 벡터 스토어 (None이면 새로 연결)
+            document_loader: 문서 로더 (None이면 기본 청킹 설정)
+            engine: SQLAlchemy 엔진 (None이면 DATABASE_URL로 생성)
+        """
+        self.embeddings = embeddings or BGE_M3_Embeddings()
+        self.vector_store = vector_store or MilvusVectorStore(dimension=self.embeddings.dimension)
+        self.document_loader = document_loader or DocumentLoader()
+        self.engine = engine or create_engine(os.getenv("DATABASE_URL"))
+
+    def index(self, store_id: int, category: str = "customer") -> dict:
+        """
+        특정 매장의 문서들을 증분 인덱싱
+
+        청크 내용 해시를 기존 벡터와 비교하여 새로 생기거나 바뀐 청크만 임베딩/삽입하고,
+        더 이상 없는 청크는 새 청크 삽입이 끝난 뒤에 삭제합니다.
+        (기존 청크 유지 → 새 청크 추가 → 오래된 청크 삭제 순서라 검색 결과가 비는 구간이 없음)
+
+        Args:
+            store_id: 매장 ID
+            category: 문서 카테고리 (customer/owner)
+
+        Returns:
+            인덱싱 결과 (변경 여부는 embedded_chunks/deleted_chunks로 판단)
+        """
+        try:
+            # 데이터베이스에서 문서 경로 조회
+            doc_paths = self.get_doc_paths(store_id, category)
+
+            if not doc_paths:
+                return {
+                    "status": "error",
+                    "message": f"매장 {store_id}의 {category} 문서가 없습니다."
+                }
+
+            # 문서 로드 및 청킹 (바뀌지 않은 문서는 청크 캐시 사용)
+            documents = [self.document_loader.load_document(doc_path) for doc_path in doc_paths]
+            all_chunks = [chunk for document in documents for chunk in document["chunks"]]
+
+            if not all_chunks:
+                return {
+                    "status": "error",
+                    "message": "청킹된 문서가 없습니다."
+                }
+
+            # 기존 벡터의 청크 해시와 비교
+            existing = self.vector_store.get_chunk_hashes(store_id, category)
+            chunks_by_hash, new_hashes, stale_ids = plan_chunk_update(all_chunks, existing)
+            unchanged = len(chunks_by_hash) - len(new_hashes)
+
+            logger.info(
+                f"🔄 증분 인덱싱: store_id={store_id}, category={category} "
+                f"(유지 {unchanged}개, 추가 {len(new_hashes)}개, 삭제 {len(stale_ids)}개)"
+            )
+
+            # 1) 새 청크만 임베딩 후 삽입 (기존 청크는 계속 검색됨)
+            if new_hashes:
+                new_chunks = [chunks_by_hash[h] for h in new_hashes]
+                embeddings, sparse_embeddings = self._embed(documents, new_hashes, chunks_by_hash)
+                self.vector_store.insert(
+                    texts=new_chunks,
+                    embeddings=embeddings,
+                    store_id=store_id,
+                    category=category,
+                    chunk_hashes=new_hashes,
+                    sparse_embeddings=sparse_embeddings
+                )
+
+            # 2) 새 청크가 반영된 뒤 오래된 청크 삭제
+            self.vector_store.delete_by_ids(stale_ids)
+
+            return {
+                "status": "success",
+                "indexed_documents": len(doc_paths),
+                "indexed_chunks": len(chunks_by_hash),
+                "embedded_chunks": len(new_hashes),
+                "unchanged_chunks": unchanged,
+                "deleted_chunks": len(stale_ids),
+                "store_id": store_id,
+                "category": category
+            }
+
+        except Exception as e:
+            logger.error(f"인덱싱 오류: {str(e)}")
+            return {
+                "status": "error",
+                "message": str(e)
+            }
+
+    def _embed(self, documents: list[dict], hashes: list[str], chunks_by_hash: dict[str, str]) -> tuple[list, Optional[list]]:
+        """
+        청크 임베딩 (청크 캐시에 있는 임베딩은 재사용, 나머지만 인코딩 후 캐시에 저장)
+
+        컬렉션에 sparse 필드가 있으면 sparse 가중치도 함께 계산합니다 (같은 forward pass).
+
+        Returns:
+            hashes 순서의 (dense 임베딩, sparse 가중치 또는 None)
+        """
+        with_sparse = self.vector_store.has_sparse
+        vectors = self.document_loader.cached_embeddings(documents, with_sparse=with_sparse)
+        missing = [h for h in hashes if h not in vectors]
+
+        if missing:
+            texts = [chunks_by_hash[h] for h in missing]
+            if with_sparse:
+                dense, sparse = self.embeddings.embed_documents_hybrid(texts)
+                vectors.update(zip(missing, zip(dense, sparse)))
+            else:
+                vectors.update((h, (vector, None)) for h, vector in zip(missing, self.embeddings.embed_documents(texts)))
+            self.document_loader.store_embeddings(documents, vectors)
+
+        if len(missing) < len(hashes):
+            logger.info(f"♻️ 캐시된 임베딩 재사용: {len(hashes) - len(missing)}개")
+
+        embeddings = [vectors[h][0] for h in hashes]
+        sparse_embeddings = [vectors[h][1] for h in hashes] if with_sparse else None
+        return embeddings, sparse_embeddings
+
+    def get_doc_paths(self, store_id: int, category: str) -> list[str]:
+        """데이터베이스에서 매장 문서 경로 조회"""
+        with self.engine.connect() as conn:
+            query = text("""
+                SELECT doc_path FROM rag_documents
+                WHERE store_id = :store_id AND category = :category
+            """)
+            result = conn.execute(query, {"store_id": store_id, "category": category})
+            return [row[0] for row in result]
+
+
+def has_changes(result: dict) -> bool:
+    """인덱싱 결과에 벡터 변경(추가/삭제)이 있었는지"""
+    return result.get("status") == "success" and bool(
+        result.get("embedded_chunks") or result.get("deleted_chunks")
+    )
@@ -1,19 +1,103 @@
-import os
+import re
 import logging
-import tiktoken
-from pathlib import Path
+from functools import lru_cache
+from typing import Optional
+
+from embeddings import MODEL_NAME, MAX_LENGTH
+from vector_store import MAX_TEXT_LENGTH, chunk_hash
+from chunk_cache import ChunkCache
 
 logger = logging.getLogger(__name__)
 
+# 마크다운 제목 줄 (# ~ ######)
+_HEADING = re.compile(r"^(#{1,6})\s+\S")
+# 구분선 (DocumentGenerator가 메뉴 항목 사이에 넣는 ---)
+_RULE = re.compile(r"^\s*(-{3,}|\*{3,}|_{3,})\s*$")
+# 문장 경계 (한 줄이 한도를 넘을 때만 사용)
+_SENTENCE_END = re.compile(r"(?<=[.!?。！？])\s+")
+
+# 청킹 알고리즘 버전 (결과가 달라지도록 바꾸면 올려서 청크 캐시 무효화)
+CHUNKER_VERSION = 2
+
+
+@lru_cache(maxsize=None)
+def get_tokenizer(model_name: str = MODEL_NAME):
+    """임베딩 모델 토크나이저 (프로세스당 한 번만 로드)"""
+    from transformers import AutoTokenizer
+    return AutoTokenizer.from_pretrained(model_name)
+
+
+def split_sections(text: str) -> list[tuple[list[str], str]]:
+    """
+    마크다운을 제목 기준 섹션으로 분리
+
+    Returns:
+        [(상위 제목 줄 목록, 섹션 본문(자기 제목 포함)), ...]
+    """
+    sections = []
+    path: list[tuple[int, str]] = []  # 현재 위치의 (제목 레벨, 제목 줄)
+    context: list[str] = []
+    lines: list[str] = []
+
+    def flush():
+        body = "\n".join(lines).strip()
+        if body:
+            sections.append((context, body))
+
+    for line in text.splitlines():
+        if _RULE.match(line):
+            continue
+
+        match = _HEADING.match(line)
+        if match:
+            flush()
+            level = len(match.group(1))
+            path = [(lvl, heading) for lvl, heading in path if lvl < level]
+            context = [heading for _, heading in path]
+            path.append((level, line.strip()))
+            lines = [line.strip()]
+        else:
+            lines.append(line.rstrip())
+
+    flush()
+    return sections
+
 
 class DocumentLoader:
     """마크다운 문서 로더 및 청킹"""
 
-    def __init__(self, chunk_size: int = 1000, chunk_overlap: int = 200):
-        self.chunk_size = chunk_size
-        self.chunk_overlap = chunk_overlap
-        # tiktoken 인코더 (토큰 계산용)
-        self.encoder = tiktoken.get_encoding("cl100k_base")
+    def __init__(
+        self,
+        chunk_size: Optional[int] = None,
+        chunk_overlap: int = 200,
+        tokenizer=None,
+        cache: Optional[ChunkCache] = None
+    ):
+        """
+        Args:
+            chunk_size: 청크 최대 토큰 수 (특수 토큰 포함, BGE-M3 max_length를 넘을 수 없음)
+            chunk_overlap: 구조 단위로 나눌 수 없는 긴 문단을 토큰 단위로 자를 때의 겹침 토큰 수
+            tokenizer: 토큰 계산용 토크나이저 (None이면 임베딩 모델 토크나이저)
+            cache: 청크 캐시 (None이면 환경변수 설정으로 생성)
+        """
+        self.chunk_size = min(chunk_size or MAX_LENGTH, MAX_LENGTH)
+        self.chunk_overlap = min(chunk_overlap, self.chunk_size // 2)
+        self.max_bytes = MAX_TEXT_LENGTH
+        # 임베딩 모델과 같은 토크나이저로 계산해야 encode 시 잘리지 않음
+        self.tokenizer = tokenizer or get_tokenizer()
+        self.cache = cache or ChunkCache()
+
+    @property
+    def config(self) -> dict:
+        """청킹 결과를 결정하는 설정 (청크 캐시 키에 포함)"""
+        return {
+            "version": CHUNKER_VERSION,
+            "model": MODEL_NAME,
+            "max_length": MAX_LENGTH,
+            "chunk_size": self.chunk_size,
+            "chunk_overlap": self.chunk_overlap,
+            "max_bytes": self.max_bytes
+        }
 
     def load_markdown(self, file_path: str) -> str:
         """마크다운 파일 로드"""
@@ -26,41 +110,145 @@ class DocumentLoader:
             logger.error(f"문서 로드 실패: {file_path} - {str(e)}")
             raise
 
+    def count_tokens(self, text: str) -> int:
+        """임베딩 시 실제 토큰 수 (CLS/SEP 특수 토큰 포함)"""
+        return len(self.tokenizer(text, add_special_tokens=True, verbose=False)["input_ids"])
+
+    def fits(self, text: str) -> bool:
+        """청크 한도(토큰 수, Milvus text 필드 바이트 수) 이내인지"""
+        return len(text.encode("utf-8")) <= self.max_bytes and self.count_tokens(text) <= self.chunk_size
+
+    def split_sections(self, text: str) -> list[tuple[list[str], str]]:
+        """마크다운을 제목 기준 섹션으로 분리 (split_sections 참고)"""
+        return split_sections(text)
+
     def chunk_text(self, text: str) -> list[str]:
         """
-        텍스트를 토큰 기준으로 청킹
+        텍스트를 마크다운 구조 기준으로 청킹
+
+        제목(메뉴 항목 등) 섹션을 순서대로 한도까지 한 청크에 모으고,
+        섹션 하나가 한도를 넘을 때만 줄 → 문장 → 토큰 순으로 나눕니다.
+        청크가 문서 중간에서 시작하면 상위 제목을 앞에 붙여 문맥을 유지합니다.
 
         Args:
             text: 청킹할 텍스트
 
         Returns:
-            청크 리스트
+            청크 리스트 (모두 chunk_size 토큰, Milvus text 필드 길이 이내)
         """
-        # 토큰으로 인코딩
-        tokens = self.encoder.encode(text)
-
         chunks = []
-        start = 0
+        current: list[str] = []
+        headings: set[str] = set()  # 현재 청크에 이미 들어간 제목 줄
 
-        while start < len(tokens):
-            # 청크 종료 위치 계산
-            end = start + self.chunk_size
+        for context, body in self.split_sections(text):
+            for piece in self._split_section(context, body):
+                if current:
+                    # 현재 청크에 없는 상위 제목만 붙여서 이어 붙이기 시도
+                    block = "\n".join([heading for heading in context if heading not in headings] + [piece])
+                    if self.fits("\n\n".join(current + [block])):
+                        current.append(block)
+                        headings.update(context)
+                        headings.update(line for line in piece.split("\n") if _HEADING.match(line))
+                        continue
+                    chunks.append("\n\n".join(current))
 
-            # 청크 추출
-            chunk_tokens = tokens[start:end]
+                current = ["\n".join(context + [piece])]
+                headings = set(context)
+                headings.update(line for line in piece.split("\n") if _HEADING.match(line))
 
-            # 토큰을 텍스트로 디코딩
-            chunk_text = self.encoder.decode(chunk_tokens)
-            chunks.append(chunk_text)
-
-            # 다음 시작 위치 (오버랩 고려)
-            start = end - self.chunk_overlap
+        if current:
+            chunks.append("\n\n".join(current))
 
         logger.info(f"청킹 완료: {len(chunks)}개 청크 생성")
         return chunks
 
-    def load_and_chunk(self, file_path: str) -> list[str]:
-        """문서 로드 및 청킹"""
+    def _split_section(self, context: list[str], body: str) -> list[str]:
+        """
+        섹션 본문을 (상위 제목을 붙여도) 한도 안에 들어가는 조각으로 분리
+
+        섹션 제목은 이어지는 조각마다 다시 붙입니다.
+        """
+        prefix = "\n".join(context)
+        if self.fits(self._join(prefix, body)):
+            return [body]
+
+        lines = body.split("\n")
+        title = lines[0] if _HEADING.match(lines[0]) else ""
+        if title:
+            lines = lines[1:]
+            prefix = self._join(prefix, title)
+
+        # 줄 → 문장 단위 후보 (한 줄이 한도를 넘으면 문장으로 나눔)
+        units = []
+        for line in lines:
+            if not line.strip():
+                continue
+            if self.fits(self._join(prefix, line)):
+                units.append(line)
+            else:
+                units.extend(sentence for sentence in _SENTENCE_END.split(line) if sentence.strip())
+
+        pieces = []
+        current = ""
+        for unit in units:
+            candidate = f"{current}\n{unit}" if current else unit
+            if self.fits(self._join(prefix, self._join(title, candidate))):
+                current = candidate
+                continue
+
+            if current:
+                pieces.append(self._join(title, current))
+            if self.fits(self._join(prefix, self._join(title, unit))):
+                current = unit
+            else:
+                # 문장 하나도 한도를 넘으면 토큰 단위로 자름
+                pieces.extend(self._join(title, part) for part in self._split_tokens(self._join(prefix, title), unit))
+                current = ""
+
+        if current:
+            pieces.append(self._join(title, current))
+        return pieces
+
+    def _split_tokens(self, prefix: str, text: str) -> list[str]:
+        """
+        토큰 경계로 자르기 (chunk_overlap만큼 겹침)
+
+        토크나이저의 문자 오프셋으로 자르므로 한글 등 멀티바이트 문자가 깨지지 않습니다.
+        """
+        encoding = self.tokenizer(text, add_special_tokens=False, return_offsets_mapping=True, verbose=False)
+        offsets = encoding["offset_mapping"]
+        budget = max(1, self.chunk_size - self.count_tokens(prefix) - 1)
+
+        parts = []
+        start = 0
+        while start < len(offsets):
+            end = min(start + budget, len(offsets))
+            part = text[offsets[start][0]:offsets[end - 1][1]]
+
+            # 바이트 한도(Milvus) 또는 경계 토큰 재계산으로 넘치면 줄임
+            while end - start > 1 and not self.fits(self._join(prefix, part)):
+                end = start + max(1, (end - start) * 9 // 10)
+                part = text[offsets[start][0]:offsets[end - 1][1]]
+
+            parts.append(part.strip())
+            if end >= len(offsets):
+                break
+            start = max(start + 1, end - self.chunk_overlap)
+
+        return [part for part in parts if part]
+
+    @staticmethod
+    def _join(head: str, text: str) -> str:
+        """제목과 본문을 줄바꿈으로 연결 (빈 값 무시)"""
+        return f"{head}\n{text}" if head and text else head or text
+
+    def load_document(self, file_path: str) -> dict:
+        """
+        문서 로드 및 청킹 (청크 캐시 사용)
+
+        Returns:
+            {"path", "key", "chunks", "token_counts", "embeddings"(캐시된 임베딩 또는 None)}
+        """
         # 파일이 .md인지 확인
         if not file_path.endswith('.md'):
             raise ValueError("마크다운 파일(.md)만 지원합니다.")
@@ -68,7 +256,58 @@ class DocumentLoader:
         # 문서 로드
         content = self.load_markdown(file_path)
 
-        # 청킹
-        chunks = self.chunk_text(content)
+        key = self.cache.make_key(file_path, content, self.config) if self.cache.enabled else None
+        entry = self.cache.get(file_path, key) if key else None
+        if entry is None:
+            # 청킹
+            chunks = self.chunk_text(content)
+            token_counts = [self.count_tokens(chunk) for chunk in chunks]
+            entry = self.cache.put(file_path, key, chunks, token_counts)
+        else:
+            logger.info(f"청크 캐시 사용: {file_path} ({len(entry['chunks'])}개 청크)")
 
-        return chunks
+        entry["path"] = file_path
+        return entry
+
+    def load_and_chunk(self, file_path: str) -> list[str]:
+        """문서 로드 및 청킹"""
+        return self.load_document(file_path)["chunks"]
+
+    def cached_embeddings(self, documents: list[dict], with_sparse: bool = False) -> dict[str, tuple]:
+        """
+        캐시에 임베딩이 있는 문서들의 {청크 해시: (dense 임베딩, sparse 가중치 또는 None)}
+
+        Args:
+            with_sparse: sparse 가중치까지 캐시된 문서만 사용
+        """
+        vectors = {}
+        for document in documents:
+            if document["embeddings"] is None or (with_sparse and document["sparse"] is None):
+                continue
+            sparse = document["sparse"] or [None] * len(document["chunks"])
+            for chunk, vector, weights in zip(document["chunks"], document["embeddings"], sparse):
+                vectors[chunk_hash(chunk)] = (vector.tolist(), weights)
+        return vectors
+
+    def store_embeddings(self, documents: list[dict], vectors: dict[str, tuple]):
+        """
+        모든 청크의 임베딩을 알고 있는 문서를 캐시에 저장 (이미 캐시된 문서는 sparse가 새로 생긴 경우만)
+
+        Args:
+            documents: load_document 결과 목록
+            vectors: {청크 해시: (dense 임베딩, sparse 가중치 또는 None)}
+        """
+        for document in documents:
+            if not document["key"] or document["sparse"] is not None:
+                continue
+            hashes = [chunk_hash(chunk) for chunk in document["chunks"]]
+            if not hashes or not all(h in vectors for h in hashes):
+                continue
+
+            pairs = [vectors[h] for h in hashes]
+            sparse = [weights for _, weights in pairs]
+            if any(weights is None for weights in sparse):
+                if document["embeddings"] is not None:
+                    continue
+                sparse = None
+            self.cache.put_embeddings(document["path"], document, [dense for dense, _ in pairs], sparse)
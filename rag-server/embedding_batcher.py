@@ -0,0 +1,182 @@
+"""
+쿼리 임베딩 마이크로 배처 (Micro-batching)
+
+동시에 들어온 채팅 요청의 쿼리 임베딩을 몇 밀리초 동안(또는 최대 N개까지) 모아서
+BGE-M3 encode 한 번으로 처리하고, 결과를 기다리던 코루틴들에게 나눠줍니다.
+피크 시간대에 단건 forward pass가 반복되는 것을 줄여 초당 처리량을 높입니다.
+
+설정 (환경변수):
+- EMBED_BATCH_MAX_WAIT_MS: 첫 요청 이후 배치를 모으는 최대 대기 시간 (기본 5ms)
+- EMBED_BATCH_MAX_SIZE: 한 배치의 최대 쿼리 수 (기본 32)
+
+with_sparse가 켜져 있으면 같은 forward pass에서 sparse 가중치도 계산하여 hybrid 검색에 사용합니다.
+"""
+
+import os
+import time
+import asyncio
+import logging
+from typing import Optional, Dict, Any
+
+from thread_pool import run_blocking
+
+logger = logging.getLogger(__name__)
+
+# 배치 크기 히스토그램 구간 (상한값, 라벨)
+HISTOGRAM_BUCKETS = [
+    (1, "1"),
+    (2, "2"),
+    (4, "3-4"),
+    (8, "5-8"),
+    (16, "9-16"),
+    (32, "17-32"),
+    (64, "33-64"),
+]
+
+
+class EmbeddingBatcher:
+    """쿼리 임베딩 요청을 모아서 배치로 처리"""
+
+    def __init__(
+        self,
+        embeddings,
+        max_wait_ms: Optional[float] = None,
+        max_batch_size: Optional[int] = None,
+        with_sparse: bool = False
+    ):
+        """
+        Args:
+            embeddings: embed_queries(texts)를 제공하는 임베딩 모델 (BGE_M3_Embeddings)
+            max_wait_ms: 배치 수집 최대 대기 시간 (ms)
+            max_batch_size: 최대 배치 크기
+            with_sparse: sparse 가중치도 함께 계산 (embed_queries_hybrid 사용)
+        """
+        self.embeddings = embeddings
+        self.with_sparse = with_sparse
+        self.max_wait_ms = max_wait_ms if max_wait_ms is not None else float(os.getenv("EMBED_BATCH_MAX_WAIT_MS", "5"))
+        self.max_batch_size = max_batch_size if max_batch_size is not None else int(os.getenv("EMBED_BATCH_MAX_SIZE", "32"))
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+        # 통계
+        self.total_requests = 0
+        self.total_batches = 0
+        self.total_queue_wait_ms = 0.0
+        self.total_encode_ms = 0.0
+        self.batch_size_histogram: Dict[str, int] = {label: 0 for _, label in HISTOGRAM_BUCKETS}
+        self.batch_size_histogram[f"{HISTOGRAM_BUCKETS[-1][0] + 1}+"] = 0
+
+        logger.info(
+            f"✅ 임베딩 배처 초기화 (max_wait={self.max_wait_ms}ms, max_batch={self.max_batch_size}, "
+            f"sparse={self.with_sparse})"
+        )
+
+    async def embed_query(self, text: str) -> list[float]:
+        """
+        쿼리 임베딩 요청 (배치에 합류하여 결과를 기다림)
+
+        Args:
+            text: 쿼리 텍스트
+
+        Returns:
+            임베딩 벡터
+        """
+        dense, _ = await self.embed_query_hybrid(text)
+        return dense
+
+    async def embed_query_hybrid(self, text: str) -> tuple[list[float], Optional[dict[int, float]]]:
+        """
+        쿼리 (dense 임베딩, sparse 가중치) 요청
+
+        Returns:
+            (임베딩 벡터, sparse 가중치 또는 None(with_sparse가 꺼진 경우))
+        """
+        self._ensure_worker()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((text, future, time.perf_counter()))
+        return await future
+
+    def _ensure_worker(self):
+        """배치 처리 워커 태스크 시작 (현재 이벤트 루프에서 최초 1회)"""
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self):
+        """큐에서 요청을 모아 배치 임베딩을 수행하는 워커 루프"""
+        loop = asyncio.get_running_loop()
+        max_wait = self.max_wait_ms / 1000
+
+        while True:
+            batch = [await self._queue.get()]
+
+            # 첫 요청 이후 max_wait 동안 또는 max_batch_size까지 추가 요청 수집
+            deadline = loop.time() + max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            await self._process_batch(batch)
+
+    async def _process_batch(self, batch: list):
+        """배치 임베딩 실행 후 대기 중인 코루틴에 결과 전달"""
+        texts = [text for text, _, _ in batch]
+        started = time.perf_counter()
+
+        try:
+            if self.with_sparse:
+                pairs = await run_blocking(self.embeddings.embed_queries_hybrid, texts)
+            else:
+                pairs = [(vector, None) for vector in await run_blocking(self.embeddings.embed_queries, texts)]
+        except Exception as e:
+            logger.error(f"배치 임베딩 오류 (batch={len(batch)}): {str(e)}")
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        encode_ms = (time.perf_counter() - started) * 1000
+
+        for (_, future, enqueued_at), pair in zip(batch, pairs):
+            self.total_queue_wait_ms += (started - enqueued_at) * 1000
+            if not future.done():
+                future.set_result(pair)
+
+        self._record_batch(len(batch), encode_ms)
+
+    def _record_batch(self, size: int, encode_ms: float):
+        """배치 통계 기록"""
+        self.total_requests += size
+        self.total_batches += 1
+        self.total_encode_ms += encode_ms
+
+        for upper, label in HISTOGRAM_BUCKETS:
+            if size <= upper:
+                self.batch_size_histogram[label] += 1
+                break
+        else:
+            self.batch_size_histogram[f"{HISTOGRAM_BUCKETS[-1][0] + 1}+"] += 1
+
+        if size > 1:
+            logger.debug(f"📦 배치 임베딩: {size}개 ({encode_ms:.1f}ms)")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """배처 설정 및 통계 조회"""
+        return {
+            "max_wait_ms": self.max_wait_ms,
+            "max_batch_size": self.max_batch_size,
+            "with_sparse": self.with_sparse,
+            "total_requests": self.total_requests,
+            "total_batches": self.total_batches,
+            "avg_batch_size": round(self.total_requests / self.total_batches, 2) if self.total_batches else 0.0,
+            "avg_queue_wait_ms": round(self.total_queue_wait_ms / self.total_requests, 2) if self.total_requests else 0.0,
+            "avg_encode_ms": round(self.total_encode_ms / self.total_batches, 2) if self.total_batches else 0.0,
+            "queued": self._queue.qsize() if self._queue else 0,
+            "batch_size_histogram": dict(self.batch_size_histogram)
+        }
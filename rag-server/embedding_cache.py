@@ -0,0 +1,303 @@
+"""
+임베딩 캐시 (Embedding Cache)
+
+같은 텍스트의 BGE-M3 임베딩을 다시 계산하지 않도록 캐시합니다.
+"정보 없음" 섹션, 프랜차이즈 공통 메뉴, 리뷰 요약 제목처럼 여러 매장/재인덱싱에서
+반복되는 텍스트가 많아 인코딩 비용을 크게 줄일 수 있습니다.
+
+캐시 키: sha256(모델 이름, max_length, 텍스트)
+저장 계층:
+1. 메모리 LRU (float32)
+2. 디스크 SQLite (float16 BLOB, 프로세스 재시작/API 서버와 인덱싱 워커 간 공유)
+
+각 항목은 dense 임베딩과 (계산된 경우) sparse 어휘 가중치를 함께 저장합니다.
+sparse가 필요한 조회에서 dense만 있는 항목은 미스로 처리합니다.
+
+디스크에 기록된 모델 서명(모델 이름, max_length)이 현재와 다르면 디스크 캐시를 모두 비웁니다.
+
+설정 (환경변수):
+- EMBEDDING_CACHE_ENABLED: 캐시 사용 여부 (기본 true)
+- EMBEDDING_CACHE_MEMORY_ENTRIES: 메모리 LRU 최대 항목 수 (기본 10000)
+- EMBEDDING_CACHE_PATH: SQLite 파일 경로 (기본 /app/media/embedding_cache.sqlite3, 빈 값이면 디스크 계층 비활성화)
+- EMBEDDING_CACHE_PERSIST_QUERIES: 쿼리 임베딩도 디스크에 저장할지 (기본 false, 메모리에만 저장)
+"""
+
+import os
+import sqlite3
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# SQLite IN 절 하나에 넣을 최대 키 수
+_SQLITE_BATCH = 500
+
+
+def pack_sparse(weights: dict[int, float]) -> bytes:
+    """sparse 가중치 직렬화 (int32 토큰 ID 배열 + float16 가중치 배열)"""
+    indices = np.fromiter(weights.keys(), dtype=np.int32, count=len(weights))
+    values = np.fromiter(weights.values(), dtype=np.float16, count=len(weights))
+    return indices.tobytes() + values.tobytes()
+
+
+def unpack_sparse(blob: bytes) -> dict[int, float]:
+    """pack_sparse 역변환"""
+    count = len(blob) // 6
+    indices = np.frombuffer(blob[:count * 4], dtype=np.int32)
+    values = np.frombuffer(blob[count * 4:], dtype=np.float16)
+    return {int(index): float(value) for index, value in zip(indices, values)}
+
+
+class EmbeddingCache:
+    """메모리 LRU + SQLite 2계층 임베딩 캐시"""
+
+    def __init__(
+        self,
+        model_name: str,
+        max_length: int,
+        memory_entries: Optional[int] = None,
+        db_path: Optional[str] = None,
+        enabled: Optional[bool] = None,
+        persist_queries: Optional[bool] = None
+    ):
+        """
+        Args:
+            model_name: 임베딩 모델 이름 (키 및 모델 서명에 포함)
+            max_length: encode max_length (키 및 모델 서명에 포함)
+            memory_entries: 메모리 LRU 최대 항목 수
+            db_path: SQLite 파일 경로 (빈 문자열이면 디스크 계층 비활성화)
+            enabled: 캐시 사용 여부
+            persist_queries: 쿼리 임베딩도 디스크에 저장할지
+        """
+        self.model_name = model_name
+        self.max_length = max_length
+        self.signature = f"{model_name}:{max_length}"
+
+        self.enabled = enabled if enabled is not None else os.getenv("EMBEDDING_CACHE_ENABLED", "true").lower() == "true"
+        self.memory_entries = memory_entries or int(os.getenv("EMBEDDING_CACHE_MEMORY_ENTRIES", "10000"))
+        self.db_path = db_path if db_path is not None else os.getenv("EMBEDDING_CACHE_PATH", "/app/media/embedding_cache.sqlite3")
+        self.persist_queries = persist_queries if persist_queries is not None else os.getenv("EMBEDDING_CACHE_PERSIST_QUERIES", "false").lower() == "true"
+
+        # 키 -> (dense float32 배열, sparse 가중치 또는 None)
+        self._memory: OrderedDict[str, tuple] = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._disk_failed = False
+
+        # 통계
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def key(self, text: str) -> str:
+        """캐시 키 (모델 이름 + max_length + 텍스트 해시)"""
+        return hashlib.sha256(f"{self.model_name}\0{self.max_length}\0{text}".encode("utf-8")).hexdigest()
+
+    def get_many(self, texts: list[str], with_sparse: bool = False) -> list[Optional[tuple]]:
+        """
+        여러 텍스트의 캐시된 임베딩 조회 (메모리 → 디스크 순)
+
+        Args:
+            texts: 조회할 텍스트
+            with_sparse: sparse 가중치까지 있어야 히트로 처리
+
+        Returns:
+            texts 순서의 (dense 임베딩, sparse 가중치 또는 None) (없으면 None)
+        """
+        if not self.enabled:
+            return [None] * len(texts)
+
+        keys = [self.key(text) for text in texts]
+        from_memory: dict[str, tuple] = {}
+        from_disk: dict[str, tuple] = {}
+
+        def usable(entry) -> bool:
+            return entry is not None and (not with_sparse or entry[1] is not None)
+
+        with self._lock:
+            for key in keys:
+                entry = self._memory.get(key)
+                if usable(entry):
+                    self._memory.move_to_end(key)
+                    from_memory[key] = entry
+
+            disk_keys = [key for key in dict.fromkeys(keys) if key not in from_memory]
+            if disk_keys:
+                from_disk = {key: entry for key, entry in self._disk_get(disk_keys).items() if usable(entry)}
+                for key, entry in from_disk.items():
+                    self._remember(key, *entry)
+
+            results = []
+            for key in keys:
+                if key in from_memory:
+                    self.memory_hits += 1
+                    entry = from_memory[key]
+                elif key in from_disk:
+                    self.disk_hits += 1
+                    entry = from_disk[key]
+                else:
+                    self.misses += 1
+                    results.append(None)
+                    continue
+                results.append((entry[0].tolist(), entry[1]))
+            return results
+
+    def put_many(
+        self,
+        texts: list[str],
+        vectors: list[list[float]],
+        sparse: Optional[list[dict[int, float]]] = None,
+        persist: bool = True
+    ):
+        """
+        임베딩 저장
+
+        Args:
+            texts: 텍스트 목록
+            vectors: texts 순서의 dense 임베딩
+            sparse: texts 순서의 sparse 가중치 (없으면 dense만 저장)
+            persist: 디스크 계층에도 저장할지 (False면 메모리에만)
+        """
+        if not self.enabled or not texts:
+            return
+
+        rows = []
+        with self._lock:
+            for i, (text, vector) in enumerate(zip(texts, vectors)):
+                key = self.key(text)
+                array = np.asarray(vector, dtype=np.float32)
+                weights = sparse[i] if sparse is not None else None
+                self._remember(key, array, weights)
+                rows.append((
+                    key,
+                    array.astype(np.float16).tobytes(),
+                    pack_sparse(weights) if weights is not None else None
+                ))
+
+            if persist:
+                self._disk_put(rows)
+
+    def clear(self) -> dict:
+        """
+        캐시 전체 삭제 (모델 교체 등)
+
+        Returns:
+            삭제된 메모리/디스크 항목 수
+        """
+        with self._lock:
+            memory_removed = len(self._memory)
+            self._memory.clear()
+
+            disk_removed = 0
+            conn = self._connect()
+            if conn is not None:
+                disk_removed = conn.execute("DELETE FROM embeddings").rowcount
+                conn.commit()
+
+        logger.info(f"🧹 임베딩 캐시 삭제: 메모리 {memory_removed}개, 디스크 {disk_removed}개")
+        return {"memory_removed": memory_removed, "disk_removed": disk_removed}
+
+    def get_stats(self) -> dict:
+        """캐시 통계 (계층별 히트 수 및 히트율)"""
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        hits = self.memory_hits + self.disk_hits
+        return {
+            "enabled": self.enabled,
+            "model": self.signature,
+            "memory_entries": len(self._memory),
+            "memory_max_entries": self.memory_entries,
+            "disk_path": self.db_path or None,
+            "disk_available": self._conn is not None,
+            "persist_queries": self.persist_queries,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0
+        }
+
+    def _remember(self, key: str, vector: np.ndarray, sparse: Optional[dict[int, float]] = None):
+        """메모리 LRU에 저장 (lock 보유 상태에서 호출, sparse가 없으면 이미 저장된 sparse 유지)"""
+        if sparse is None and key in self._memory:
+            sparse = self._memory[key][1]
+        self._memory[key] = (vector.astype(np.float32, copy=False), sparse)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        """
+        SQLite 연결 (최초 사용 시 생성, lock 보유 상태에서 호출)
+
+        모델 서명이 다르면 이전 모델의 임베딩을 모두 삭제합니다.
+        """
+        if self._conn is not None or self._disk_failed or not self.db_path:
+            return self._conn
+
+        try:
+            os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL, sparse BLOB)")
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(embeddings)")}
+            if "sparse" not in columns:
+                conn.execute("ALTER TABLE embeddings ADD COLUMN sparse BLOB")
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT NOT NULL)")
+
+            row = conn.execute("SELECT value FROM meta WHERE name = 'signature'").fetchone()
+            if row and row[0] != self.signature:
+                removed = conn.execute("DELETE FROM embeddings").rowcount
+                logger.info(f"🔄 임베딩 모델 변경 ({row[0]} → {self.signature}): 디스크 캐시 {removed}개 삭제")
+            conn.execute("INSERT OR REPLACE INTO meta (name, value) VALUES ('signature', ?)", (self.signature,))
+            conn.commit()
+
+            self._conn = conn
+            logger.info(f"✅ 임베딩 디스크 캐시 연결: {self.db_path}")
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"⚠️ 임베딩 디스크 캐시 사용 불가 - 메모리 캐시만 사용: {str(e)}")
+            self._disk_failed = True
+
+        return self._conn
+
+    def _disk_get(self, keys: list[str]) -> dict[str, tuple]:
+        """디스크 계층 조회 (lock 보유 상태에서 호출)"""
+        conn = self._connect()
+        if conn is None:
+            return {}
+
+        found = {}
+        try:
+            for start in range(0, len(keys), _SQLITE_BATCH):
+                batch = keys[start:start + _SQLITE_BATCH]
+                placeholders = ",".join("?" * len(batch))
+                query = f"SELECT key, vector, sparse FROM embeddings WHERE key IN ({placeholders})"
+                for key, blob, sparse_blob in conn.execute(query, batch):
+                    found[key] = (
+                        np.frombuffer(blob, dtype=np.float16).astype(np.float32),
+                        unpack_sparse(sparse_blob) if sparse_blob is not None else None
+                    )
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ 임베딩 디스크 캐시 조회 실패: {str(e)}")
+        return found
+
+    def _disk_put(self, rows: list[tuple[str, bytes, Optional[bytes]]]):
+        """디스크 계층 저장 (lock 보유 상태에서 호출, 이미 저장된 sparse는 유지)"""
+        conn = self._connect()
+        if conn is None:
+            return
+
+        try:
+            conn.executemany("""
+                INSERT INTO embeddings (key, vector, sparse) VALUES (?, ?, ?)
+                ON CONFLICT(key) DO UPDATE SET
+                    vector = excluded.vector,
+                    sparse = COALESCE(excluded.sparse, embeddings.sparse)
+            """, rows)
+            conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ 임베딩 디스크 캐시 저장 실패: {str(e)}")
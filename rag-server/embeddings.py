@@ -1,34 +1,93 @@
 import logging
+from typing import Optional
 from FlagEmbedding import BGEM3FlagModel
 
+from embedding_cache import EmbeddingCache
+
 logger = logging.getLogger(__name__)
 
+MODEL_NAME = 'BAAI/bge-m3'
+MAX_LENGTH = 1024  # encode 시 최대 토큰 수 (초과분은 잘림, 청킹 시 이 한도 안으로 맞춤)
+
+
+def to_sparse_dict(lexical_weights) -> dict[int, float]:
+    """BGE-M3 lexical_weights({"토큰 ID": 가중치})를 Milvus sparse 벡터 형식({토큰 ID: 가중치})으로 변환"""
+    return {int(token_id): float(weight) for token_id, weight in lexical_weights.items() if weight > 0}
+
 
 class BGE_M3_Embeddings:
-    """BGE-M3 임베딩 모델"""
+    """
+    BGE-M3 임베딩 모델 (동일 텍스트는 EmbeddingCache에서 반환)
+
+    *_hybrid 메서드는 같은 forward pass에서 dense 임베딩과 sparse 어휘 가중치(lexical weights)를 함께 반환합니다.
+    """
 
     def __init__(self):
         logger.info("BGE-M3 모델 로딩 중...")
-        self.model = BGEM3FlagModel('BAAI/bge-m3', use_fp16=True)
+        self.model = BGEM3FlagModel(MODEL_NAME, use_fp16=True)
+        self.cache = EmbeddingCache(MODEL_NAME, MAX_LENGTH)
         logger.info("BGE-M3 모델 로딩 완료")
 
-    def embed_documents(self, texts: list[str]) -> list[list[float]]:
-        """문서 리스트를 임베딩"""
-        embeddings = self.model.encode(
-            texts,
-            batch_size=12,
-            max_length=1024
-        )['dense_vecs']
-        return embeddings.tolist()
+    def embed_documents(self, texts: list[str], batch_size: int = 12) -> list[list[float]]:
+        """문서 리스트를 임베딩 (batch_size: 모델 forward 한 번에 넣을 문서 수)"""
+        return [dense for dense, _ in self._embed_cached(texts, batch_size, persist=True, with_sparse=False)]
+
+    def embed_documents_hybrid(self, texts: list[str], batch_size: int = 12) -> tuple[list[list[float]], list[dict[int, float]]]:
+        """문서 리스트의 dense 임베딩 + sparse 가중치"""
+        pairs = self._embed_cached(texts, batch_size, persist=True, with_sparse=True)
+        return [dense for dense, _ in pairs], [sparse for _, sparse in pairs]
 
     def embed_query(self, text: str) -> list[float]:
         """쿼리 텍스트를 임베딩"""
-        embedding = self.model.encode(
-            [text],
-            batch_size=1,
-            max_length=1024
-        )['dense_vecs']
-        return embedding[0].tolist()
+        return self._embed_cached([text], 1, persist=self.cache.persist_queries, with_sparse=False)[0][0]
+
+    def embed_queries(self, texts: list[str]) -> list[list[float]]:
+        """여러 쿼리를 한 번의 배치로 임베딩"""
+        pairs = self._embed_cached(texts, len(texts), persist=self.cache.persist_queries, with_sparse=False)
+        return [dense for dense, _ in pairs]
+
+    def embed_queries_hybrid(self, texts: list[str]) -> list[tuple[list[float], dict[int, float]]]:
+        """여러 쿼리의 (dense 임베딩, sparse 가중치)를 한 번의 배치로 계산 (EmbeddingBatcher용)"""
+        return self._embed_cached(texts, len(texts), persist=self.cache.persist_queries, with_sparse=True)
+
+    def _embed_cached(self, texts: list[str], batch_size: int, persist: bool, with_sparse: bool) -> list[tuple]:
+        """
+        캐시에 없는 텍스트만 인코딩 (같은 호출 안의 중복 텍스트도 한 번만 인코딩)
+
+        Args:
+            texts: 임베딩할 텍스트
+            batch_size: 모델 forward 배치 크기 (캐시 미스 수보다 크면 줄임)
+            persist: 새 임베딩을 디스크 캐시에도 저장할지
+            with_sparse: sparse 가중치도 계산할지
+
+        Returns:
+            texts 순서의 (dense 임베딩, sparse 가중치 또는 None)
+        """
+        pairs = self.cache.get_many(texts, with_sparse=with_sparse)
+        missing = list(dict.fromkeys(text for text, pair in zip(texts, pairs) if pair is None))
+        if not missing:
+            return pairs
+
+        dense, sparse = self._encode(missing, min(batch_size, len(missing)), with_sparse)
+        self.cache.put_many(missing, dense, sparse, persist=persist)
+
+        by_text = {
+            text: (vector, sparse[i] if sparse is not None else None)
+            for i, (text, vector) in enumerate(zip(missing, dense))
+        }
+        return [pair if pair is not None else by_text[text] for text, pair in zip(texts, pairs)]
+
+    def _encode(self, texts: list[str], batch_size: int, with_sparse: bool) -> tuple[list[list[float]], Optional[list[dict[int, float]]]]:
+        """BGE-M3 인코딩 (dense 임베딩, sparse 가중치 또는 None)"""
+        output = self.model.encode(
+            texts,
+            batch_size=batch_size,
+            max_length=MAX_LENGTH,
+            return_dense=True,
+            return_sparse=with_sparse
+        )
+        sparse = [to_sparse_dict(weights) for weights in output['lexical_weights']] if with_sparse else None
+        return output['dense_vecs'].tolist(), sparse
 
     @property
     def dimension(self) -> int:
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+검색 방식 평가 (dense / sparse / hybrid)
+
+실제 매장 데이터로 질의 세트를 만들어 검색 방식별 recall@k와 검색 지연 시간(p50/p99)을 비교합니다.
+
+질의 세트:
+- 기본: DB의 menus 테이블에서 인덱싱된 매장(rag_documents)의 메뉴를 뽑아
+  "{메뉴명} 가격 얼마예요?" 같은 질의를 만들고, 상위 k개 중 메뉴명이 들어간 청크가 있으면 정답으로 봅니다.
+- --eval-file: {"store_id", "category", "query", "expected"} 형식의 JSONL (expected: 정답 청크에 들어 있어야 할 문자열)
+
+쿼리 임베딩(dense + sparse)은 한 번만 계산하고, 지연 시간은 Milvus 검색 구간만 측정합니다.
+컬렉션에 sparse_embedding 필드가 있어야 합니다 (없으면 migrate_vector_index.py로 재구축).
+
+실행 방법:
+    python evaluate_retrieval.py --stores 50 --menus-per-store 5
+    python evaluate_retrieval.py --eval-file eval_queries.jsonl --top-k 5
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import statistics
+
+import numpy as np
+from sqlalchemy import create_engine, text
+
+from embeddings import BGE_M3_Embeddings
+from vector_store import MilvusVectorStore
+
+MODES = ("dense", "sparse", "hybrid")
+
+# 메뉴 질의 템플릿 (고객이 실제로 묻는 형태)
+QUERY_TEMPLATES = [
+    "{menu} 가격 얼마예요?",
+    "{menu} 어떤 메뉴예요?",
+]
+
+
+def build_menu_queries(engine, stores: int, menus_per_store: int, category: str, rng: random.Random) -> list[dict]:
+    """인덱싱된 매장의 메뉴로 평가 질의 생성"""
+    with engine.connect() as conn:
+        rows = conn.execute(text("""
+            SELECT m.store_id, m.menu_name FROM menus m
+            WHERE m.menu_name IS NOT NULL AND m.menu_name <> ''
+              AND m.store_id IN (SELECT DISTINCT store_id FROM rag_documents WHERE category = :category)
+            ORDER BY m.store_id, m.id
+        """), {"category": category})
+        menus_by_store: dict[int, list[str]] = {}
+        for store_id, menu_name in rows:
+            menus_by_store.setdefault(store_id, []).append(menu_name.strip())
+
+    store_ids = sorted(menus_by_store)
+    rng.shuffle(store_ids)
+
+    queries = []
+    for store_id in store_ids[:stores]:
+        menus = list(dict.fromkeys(menus_by_store[store_id]))
+        for menu in rng.sample(menus, min(menus_per_store, len(menus))):
+            queries.append({
+                "store_id": store_id,
+                "category": category,
+                "query": rng.choice(QUERY_TEMPLATES).format(menu=menu),
+                "expected": menu
+            })
+    return queries
+
+
+def load_eval_file(path: str) -> list[dict]:
+    """JSONL 평가 질의 로드"""
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def search(store: MilvusVectorStore, mode: str, dense: list[float], sparse: dict[int, float],
+           store_id: int, category: str, top_k: int) -> list[dict]:
+    """검색 방식별 검색 (RAGPipeline.retrieve와 같은 분기)"""
+    if mode == "sparse":
+        return store.search_sparse(sparse, store_id, category, top_k=top_k)
+    if mode == "hybrid":
+        return store.hybrid_search(dense, sparse, store_id, category, top_k=top_k)
+    return store.search(dense, store_id, category, top_k=top_k)
+
+
+def evaluate(store: MilvusVectorStore, queries: list[dict], vectors: list[tuple], mode: str, top_k: int) -> dict:
+    """
+    한 가지 검색 방식 평가
+
+    Returns:
+        {"mode", "queries", "recall", "mrr", "p50_ms", "p99_ms", "mean_ms"}
+    """
+    # 워밍업 (컬렉션 로드/캐시)
+    for item, (dense, sparse) in list(zip(queries, vectors))[:5]:
+        search(store, mode, dense, sparse, item["store_id"], item["category"], top_k)
+
+    hits = 0
+    reciprocal_ranks = []
+    latencies = []
+    for item, (dense, sparse) in zip(queries, vectors):
+        started = time.perf_counter()
+        documents = search(store, mode, dense, sparse, item["store_id"], item["category"], top_k)
+        latencies.append((time.perf_counter() - started) * 1000)
+
+        rank = next((i for i, doc in enumerate(documents, 1) if item["expected"] in (doc["text"] or "")), None)
+        if rank is not None:
+            hits += 1
+        reciprocal_ranks.append(1.0 / rank if rank else 0.0)
+
+    return {
+        "mode": mode,
+        "queries": len(queries),
+        "recall": hits / len(queries),
+        "mrr": statistics.mean(reciprocal_ranks),
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p99_ms": float(np.percentile(latencies, 99)),
+        "mean_ms": statistics.mean(latencies)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="검색 방식별 recall@k / 지연 시간 비교 (dense, sparse, hybrid)")
+    parser.add_argument("--eval-file", help="평가 질의 JSONL (없으면 menus 테이블로 생성)")
+    parser.add_argument("--stores", type=int, default=50, help="질의를 만들 매장 수")
+    parser.add_argument("--menus-per-store", type=int, default=5, help="매장당 질의 수")
+    parser.add_argument("--category", default="customer", help="문서 카테고리")
+    parser.add_argument("--top-k", type=int, default=5, help="recall@k의 k")
+    parser.add_argument("--modes", default=",".join(MODES), help="비교할 검색 방식 (쉼표 구분)")
+    parser.add_argument("--seed", type=int, default=42, help="난수 시드")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    if args.eval_file:
+        queries = load_eval_file(args.eval_file)
+    else:
+        engine = create_engine(os.getenv("DATABASE_URL"))
+        queries = build_menu_queries(engine, args.stores, args.menus_per_store, args.category, random.Random(args.seed))
+    if not queries:
+        print("❌ 평가 질의가 없습니다 (인덱싱된 매장/메뉴 확인)")
+        sys.exit(1)
+
+    embeddings = BGE_M3_Embeddings()
+    store = MilvusVectorStore(dimension=embeddings.dimension)
+    if not store.has_sparse:
+        print("❌ 컬렉션에 sparse_embedding 필드가 없습니다 - migrate_vector_index.py로 재구축하세요")
+        sys.exit(1)
+
+    print(f"📊 질의 {len(queries)}개 임베딩 중...")
+    vectors = embeddings.embed_queries_hybrid([item["query"] for item in queries])
+
+    results = []
+    for mode in args.modes.split(","):
+        print(f"⏱️ {mode} 평가 중...")
+        results.append(evaluate(store, queries, vectors, mode, args.top_k))
+
+    print("=" * 80)
+    print(f"{'방식':<10}{'질의 수':>10}{f'recall@{args.top_k}':>12}{'MRR':>10}{'p50(ms)':>12}{'p99(ms)':>12}{'평균(ms)':>12}")
+    for result in results:
+        print(
+            f"{result['mode']:<10}{result['queries']:>10}{result['recall']:>12.3f}{result['mrr']:>10.3f}"
+            f"{result['p50_ms']:>12.2f}{result['p99_ms']:>12.2f}{result['mean_ms']:>12.2f}"
+        )
+    print("=" * 80)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"top_k": args.top_k, "results": results}, f, ensure_ascii=False, indent=2)
+        print(f"💾 결과 저장: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
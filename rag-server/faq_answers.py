@@ -0,0 +1,342 @@
+"""
+매장별 FAQ 사전 계산 답변 (FAQ Answers)
+
+주소, 전화번호처럼 자주 묻고 답이 정해진 질문은 문서 생성 시(DocumentGenerator) 매장 정보로
+4개 언어(ko/en/ja/zh) 답변을 미리 만들어 두고, 채팅에서 해당 의도로 분류되면
+임베딩 검색과 LLM 호출 없이 바로 반환합니다.
+
+저장 형식: {FAQ_ANSWERS_DIR}/store_{store_id}_faq.json
+    {"store_id": 1, "generated_at": "...", "answers": {"phone": {"ko": "...", "en": "...", ...}, ...}}
+파일 수정 시각이 바뀌면 다음 조회 때 다시 읽습니다 (문서 재생성 즉시 반영).
+
+영업시간은 스크래핑 데이터에 별도 필드가 없어 FAQ 대상이 아니며 RAG로 답변합니다.
+
+설정 (환경변수):
+- FAQ_ANSWERS_ENABLED: 사전 계산 답변 사용 여부 (기본 true)
+- FAQ_ANSWERS_DIR: 답변 파일 디렉토리 (기본 /app/media/documents)
+- FAQ_MIN_SIMILARITY / FAQ_MIN_MARGIN: 임베딩 의도 분류로 FAQ 의도를 확정할 최소 유사도/margin (기본 0.75 / 0.1)
+"""
+
+import os
+import re
+import json
+import logging
+import threading
+from datetime import datetime
+from typing import Optional, Dict, Any
+
+logger = logging.getLogger(__name__)
+
+LANGUAGES = ("ko", "en", "ja", "zh")
+
+# 의도 분류기 레이블 접두사 ("FAQ:phone" 등)
+FAQ_LABEL_PREFIX = "FAQ:"
+
+# 메뉴 목록/추천 답변에 넣을 최대 메뉴 수
+MAX_MENU_ITEMS = 3
+
+# FAQ 의도별 패턴 (규칙 라우터용)
+# 답이 정해진 짧은 질문만 확정하도록 메시지 전체와 일치해야 합니다 (끝의 문장부호/공백 제외).
+# "비건 메뉴 추천해줘", "영어 메뉴 있어요?"처럼 조건이 붙은 질문은 일치하지 않아 RAG로 답변합니다.
+FAQ_PATTERNS = {
+    "recommendation": (
+        r"(메뉴 ?추천(해 ?(줘|주세요))?|추천 ?메뉴(가|는)? ?(뭐(예요|에요|야)?|있어요|알려 ?(줘|주세요))?"
+        r"|뭐가 (제일 )?맛있어요|(제일 )?잘 ?나가는 메뉴(가|는)? ?(뭐(예요|에요|야)?)?"
+        r"|can you recommend a dish|what do you recommend|what('s| is) your (best|most popular|signature) dish"
+        r"|おすすめ(のメニュー)?(は(何ですか)?)?|(有什么)?推荐的菜|你们推荐什么菜?)"
+    ),
+    "menu": (
+        r"((가게 |매장 )?메뉴(는|가)? ?(뭐(뭐)? ?(있어요|있나요|예요|에요)|뭐가 있어요|종류 ?(알려 ?(줘|주세요)|뭐예요)|알려 ?(줘|주세요))"
+        r"|무슨 메뉴 ?(팔아요|있어요)|뭐 ?팔아요"
+        r"|what('s| is) on (the|your) menu|what do you (serve|sell)|(can i see|show me) the menu"
+        r"|メニュー(は何がありますか|を教えてください)|(你们)?有什么菜)"
+    ),
+    "directions": (
+        r"((오시는|가는) ?길(이)? ?(알려 ?(줘|주세요)|어떻게 (돼요|되나요))?"
+        r"|(가게|매장|식당|거기)?(에|까지)? ?어떻게 (찾아)?가(요|나요|야 (해요|하나요))"
+        r"|how (do|can) i get (there|to (the|your) (restaurant|store|shop))|directions( to (the|your) (restaurant|store|shop))?"
+        r"|(行き方|アクセス)(を教えてください|は)?|(去|到)?(你们|餐厅|店里)?怎么走)"
+    ),
+    "address": (
+        r"((가게|매장|식당) ?)?(주소|위치)(가|는|좀)? ?(어디(예요|에요|야|인가요)?|뭐(예요|에요|야)?|알려 ?(줘|주세요)|어떻게 (돼요|되나요))?"
+        r"|(가게|매장|식당)(가|는|이)? ?어디(에 있어요|예요|에요|야|있어요)"
+        r"|what('s| is) (your|the) address|where (is|are) (the|your) (restaurant|store|shop)|where are you located"
+        r"|(お店の)?住所(を教えてください|はどこですか|は)?"
+        r"|(你们的|店的|餐厅的?)?地址(是什么|在哪里?)?|(餐厅|你们店)在哪里?"
+    ),
+    "phone": (
+        r"((가게|매장|식당) ?)?(전화 ?번호|연락처)(가|는|좀)? ?(뭐(예요|에요|야)?|알려 ?(줘|주세요)|어떻게 (돼요|되나요))?"
+        r"|what('s| is) (your|the) (tele)?phone number|(tele)?phone number"
+        r"|電話番号(を教えてください|は)?|(你们的)?电话号码(是多少)?"
+    ),
+    "sns": (
+        r"(sns|인스타(그램)?) ?(계정|주소)?(이|은|는)? ?(있어요|있나요|뭐예요|알려 ?(줘|주세요))?"
+        r"|do you have (an )?instagram( account)?|what('s| is) your instagram( account)?"
+        r"|インスタ(グラム)?(はありますか)?|你们有(instagram|社交媒体)(账号)?吗"
+    ),
+}
+
+# 조건이 붙은 질문 (FAQ 의도처럼 보여도 사전 계산 답변으로는 답할 수 없음)
+FAQ_EXCLUDE_PATTERN = (
+    r"(비건|채식|vegan|vegetarian|ヴィーガン|ベジタリアン|素食|纯素"
+    r"|매운|맵지|spicy|辛い|辣"
+    r"|화장실|toilet|restroom|bathroom|トイレ|洗手间|厕所"
+    r"|충전|charge|充電|充电"
+    r"|영어|english|英語|英文|일본어|중국어"
+    r"|알레르기|allerg|アレルギー|过敏"
+    r"|블로그|blog|리뷰|review|이벤트|event|ブログ|博客"
+    r"|(is|are|do you have) .+ on (the|your) menu|메뉴에|菜单上|メニューに)"
+)
+
+# FAQ 의도별 예시 발화 (임베딩 의도 분류기 centroid)
+FAQ_EXAMPLES = {
+    "address": [
+        "가게 위치가 어디예요?", "주소 알려줘", "매장 주소가 뭐예요?",
+        "Where is the restaurant?", "What's your address?", "住所を教えてください", "地址在哪里？"
+    ],
+    "directions": [
+        "어떻게 찾아가요?", "오시는 길 알려줘", "역에서 어떻게 가요?",
+        "How do I get there?", "行き方を教えてください", "怎么走？"
+    ],
+    "phone": [
+        "전화번호 알려줘", "연락처가 어떻게 돼요?", "가게 번호 뭐예요?",
+        "What's your phone number?", "電話番号を教えてください", "电话号码是多少？"
+    ],
+    "sns": [
+        "인스타그램 계정 있어요?", "SNS 주소 알려줘", "Do you have Instagram?", "インスタはありますか？"
+    ],
+    "menu": [
+        "메뉴 뭐 있어요?", "무슨 메뉴 팔아요?", "메뉴 종류 알려줘",
+        "What's on the menu?", "メニューは何がありますか？", "有什么菜？"
+    ],
+    "recommendation": [
+        "메뉴 추천해줘", "뭐가 제일 맛있어요?", "추천 메뉴가 뭐예요?",
+        "Can you recommend a dish?", "おすすめのメニューは？", "有什么推荐的菜？"
+    ],
+}
+
+# 언어별 답변 템플릿
+TEMPLATES = {
+    "address": {
+        "ko": "주소는 {value}입니다.",
+        "en": "Our address is {value}.",
+        "ja": "住所は{value}です。",
+        "zh": "地址是{value}。"
+    },
+    "directions": {
+        "ko": "오시는 길: {value}",
+        "en": "Directions: {value}",
+        "ja": "アクセス: {value}",
+        "zh": "路线: {value}"
+    },
+    "phone": {
+        "ko": "전화번호는 {value}입니다.",
+        "en": "Our phone number is {value}.",
+        "ja": "電話番号は{value}です。",
+        "zh": "电话号码是{value}。"
+    },
+    "sns": {
+        "ko": "SNS: {value}",
+        "en": "Social media: {value}",
+        "ja": "SNS: {value}",
+        "zh": "社交媒体: {value}"
+    },
+    "menu": {
+        "ko": "대표 메뉴는 {value}입니다.",
+        "en": "Our menu includes {value}.",
+        "ja": "メニューは{value}などです。",
+        "zh": "菜单有{value}等。"
+    },
+    "recommendation": {
+        "ko": "추천 메뉴는 {value}입니다.",
+        "en": "We recommend {value}.",
+        "ja": "おすすめは{value}です。",
+        "zh": "推荐{value}。"
+    },
+}
+
+_COMPILED_PATTERNS = {intent: re.compile(pattern, re.IGNORECASE) for intent, pattern in FAQ_PATTERNS.items()}
+_EXCLUDE = re.compile(FAQ_EXCLUDE_PATTERN, re.IGNORECASE)
+_TRAILING = re.compile(r"[\s?？!！.。~]+$")
+_SPACES = re.compile(r"\s+")
+
+
+def is_faq_excluded(message: str) -> bool:
+    """조건이 붙어 사전 계산 답변으로 답할 수 없는 질문인지"""
+    return bool(_EXCLUDE.search(message))
+
+
+def match_faq_intent(message: str) -> Optional[str]:
+    """
+    메시지 전체가 FAQ 질문 형태인 경우의 FAQ 의도 (없으면 None)
+
+    끝의 문장부호와 연속 공백만 정리한 뒤 패턴 전체 일치로 판단합니다.
+    """
+    if is_faq_excluded(message):
+        return None
+    text = _SPACES.sub(" ", _TRAILING.sub("", message.strip()))
+    for intent, pattern in _COMPILED_PATTERNS.items():
+        if pattern.fullmatch(text):
+            return intent
+    return None
+
+
+def _present(value: Optional[str]) -> Optional[str]:
+    """비어 있거나 '정보 없음'이면 None"""
+    value = (value or "").strip()
+    return value if value and value != "정보 없음" else None
+
+
+def _menu_items(menus: list[dict]) -> str:
+    """메뉴 목록 문자열 ("김치찌개(9,000원), 된장찌개(8,000원)")"""
+    items = []
+    for menu in menus[:MAX_MENU_ITEMS]:
+        price = _present(menu.get("price"))
+        items.append(f"{menu['menu_name']}({price})" if price else menu["menu_name"])
+    return ", ".join(items)
+
+
+def build_faq_answers(store: dict, menus: list[dict]) -> Dict[str, Dict[str, str]]:
+    """
+    매장 정보로 FAQ 의도별 4개 언어 답변 생성
+
+    Args:
+        store: {"address", "directions", "phone", "sns"} (DocumentGenerator가 문서에 쓰는 값)
+        menus: [{"menu_name", "price", "recommendation"}] (메뉴 문서 순서)
+
+    Returns:
+        {의도: {언어: 답변}} (값이 없는 의도는 제외하여 RAG로 답변)
+    """
+    menus = [menu for menu in menus if _present(menu.get("menu_name"))]
+    values = {
+        "address": _present(store.get("address")),
+        "directions": _present(store.get("directions")),
+        "phone": _present(store.get("phone")),
+        "sns": _present(store.get("sns")),
+        "menu": _menu_items(menus) or None,
+        "recommendation": _menu_items([menu for menu in menus if _present(menu.get("recommendation"))]) or None,
+    }
+
+    return {
+        intent: {language: TEMPLATES[intent][language].format(value=value) for language in LANGUAGES}
+        for intent, value in values.items()
+        if value
+    }
+
+
+class FAQAnswerStore:
+    """매장별 FAQ 답변 파일 저장/조회 (메모리 캐시)"""
+
+    def __init__(self, answers_dir: Optional[str] = None, enabled: Optional[bool] = None):
+        """
+        Args:
+            answers_dir: 답변 파일 디렉토리
+            enabled: 사전 계산 답변 사용 여부
+        """
+        self.enabled = enabled if enabled is not None else os.getenv("FAQ_ANSWERS_ENABLED", "true").lower() == "true"
+        self.answers_dir = answers_dir or os.getenv("FAQ_ANSWERS_DIR", "/app/media/documents")
+
+        # store_id -> (파일 mtime, {의도: {언어: 답변}})
+        self._tables: Dict[int, tuple] = {}
+        self._lock = threading.Lock()
+
+        # 통계
+        self.hits = 0
+        self.misses = 0
+
+    def path(self, store_id: int) -> str:
+        """매장 FAQ 답변 파일 경로"""
+        return os.path.join(self.answers_dir, f"store_{store_id}_faq.json")
+
+    def save(self, store_id: int, answers: Dict[str, Dict[str, str]]) -> str:
+        """
+        매장 FAQ 답변 저장 (원자적 파일 교체)
+
+        Returns:
+            저장된 파일 경로
+        """
+        path = self.path(store_id)
+        data = {"store_id": store_id, "generated_at": datetime.now().isoformat(), "answers": answers}
+
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            self._tables.pop(store_id, None)
+        return path
+
+    def lookup(self, store_id: int, intent: Optional[str], language: str) -> Optional[str]:
+        """
+        FAQ 답변 조회
+
+        Args:
+            store_id: 매장 ID
+            intent: FAQ 의도 (None이면 미스)
+            language: 응답 언어 (ko, en, ja, zh)
+
+        Returns:
+            답변 또는 None (사전 계산된 답변 없음)
+        """
+        if not self.enabled or not intent:
+            return None
+
+        answers = self._load(store_id).get(intent, {})
+        answer = answers.get(language) or answers.get("ko")
+        if answer:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return answer
+
+    def _load(self, store_id: int) -> Dict[str, Dict[str, str]]:
+        """매장 답변 테이블 (파일이 바뀐 경우만 다시 읽음)"""
+        path = self.path(store_id)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return {}
+
+        cached = self._tables.get(store_id)
+        if cached and cached[0] == mtime:
+            return cached[1]
+
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                answers = json.load(f).get("answers", {})
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️ FAQ 답변 파일 로드 실패: {path} - {str(e)}")
+            return {}
+
+        with self._lock:
+            self._tables[store_id] = (mtime, answers)
+        return answers
+
+    def get_stats(self) -> Dict[str, Any]:
+        """조회 통계"""
+        total = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "loaded_stores": len(self._tables),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0
+        }
+
+
+# 전역 인스턴스
+_faq_store: Optional[FAQAnswerStore] = None
+
+
+def get_faq_store() -> FAQAnswerStore:
+    """
+    FAQ 답변 저장소 가져오기 (싱글톤)
+
+    Returns:
+        FAQAnswerStore 인스턴스
+    """
+    global _faq_store
+    if _faq_store is None:
+        _faq_store = FAQAnswerStore()
+    return _faq_store
@@ -0,0 +1,309 @@
+"""
+규칙 기반 고속 라우터 (Rule-Based Fast-Path Router)
+
+인사말, 언어 변경, 화면 이동, 매출 조회처럼 의도가 명확한 메시지를
+Kanana LLM 호출 없이 키워드/정규식 테이블만으로 즉시 라우팅합니다.
+판단이 애매한 메시지는 None을 반환하여 LLM 라우터로 넘깁니다.
+
+키워드 테이블은 툴 레지스트리의 파라미터 enum 값과 TOOL_KEYWORDS로부터
+초기화 시 한 번만 컴파일됩니다.
+"""
+
+import re
+import logging
+from typing import Dict, Any, Optional, List, Tuple
+
+from faq_answers import match_faq_intent
+
+logger = logging.getLogger(__name__)
+
+
+# 툴별 키워드 (휴리스틱 라우팅과 공유)
+TOOL_KEYWORDS = {
+    "order_menu": ["주문", "시켜", "먹고싶", "먹을게"],
+    "set_language": ["언어", "영어", "english", "일본어", "중국어", "speak", "language", "korean", "japanese", "chinese", "한국어", "말해"],
+    "navigate_to": ["화면", "페이지", "이동", "보여줘", "가기"],
+    "get_sales_data": ["매출", "판매", "수익"],
+    "get_order_statistics": ["통계", "순위", "인기"],
+    "analyze_trends": ["트렌드", "분석", "추세"]
+}
+
+# 매장 문서 검색이 필요한 키워드 (휴리스틱 라우팅과 공유)
+RAG_KEYWORDS = ["메뉴", "가격", "영업시간", "위치", "전화", "추천", "어디", "언제", "얼마"]
+
+# 파라미터 enum 값별 별칭 (메시지에서 값을 추출할 때 사용)
+ENUM_ALIASES = {
+    "language": {
+        "ko": ["korean", "korea", "한국어", "한국말", "한글", "韓国語", "韩语"],
+        "en": ["english", "영어", "英語", "英语"],
+        "ja": ["japanese", "japan", "일본어", "日本語", "日语"],
+        "zh": ["chinese", "china", "중국어", "中文", "中国語", "汉语"]
+    },
+    "destination": {
+        "menu": ["메뉴 화면", "메뉴판", "메뉴 페이지", "menu page", "menu screen"],
+        "order_history": ["주문 내역", "주문내역", "order history"],
+        "settings": ["설정", "settings"],
+        "store_info": ["매장 정보 화면", "매장정보 화면", "store info"],
+        "reviews": ["리뷰 화면", "리뷰 페이지", "후기 화면", "reviews"],
+        "home": ["홈 화면", "홈으로", "처음 화면", "home"]
+    }
+}
+
+# 의도별 확신 패턴
+_LANGUAGE_CHANGE_CUES = r"(speak|talk|switch|change|language|please|plz|in |바꿔|변경|말해|말하|로 해|으로 해|언어|해줘|해주세요|話して|说)"
+_NAVIGATION_CUES = r"(이동|가줘|가 줘|가자|가기|열어|띄워|보여줘|go to|open|show)"
+_GREETING_PATTERN = (
+    r"^(안녕|안녕하세요|안녕하십니까|반가워요?|반갑습니다|하이|헬로|"
+    r"고마워요?|감사합니다|감사해요|땡큐|수고하세요|잘 ?있어요?|"
+    r"hi|hello|hey|thanks|thank you|bye|good (morning|afternoon|evening)|"
+    r"こんにちは|ありがとう(ございます)?|你好|谢谢)"
+    r"[\s!.~?^ㅎㅋ]*$"
+)
+_STORE_INFO_PATTERN = (
+    r"(영업 ?시간|몇 ?시|오픈|마감|브레이크 ?타임|휴무|쉬는 ?날|주차|위치|주소|어디|찾아가|오시는 ?길|"
+    r"전화 ?번호|연락처|와이파이|wifi|sns|인스타|메뉴 ?추천|추천 ?메뉴|뭐가 맛있|가격|얼마|"
+    r"opening hours|business hours|parking|address|phone number|recommend)"
+)
+_ORDER_PATTERN = (
+    r"^(?P<menu>[가-힣A-Za-z][가-힣A-Za-z ]*?)\s*"
+    r"(?:(?P<quantity>\d+|한|두|세|네|다섯)\s*(?:개|그릇|인분|잔|접시)\s*)?"
+    r"(?P<verb>주문해 ?줘|주문해 ?주세요|주문할게요?|주문이요|시켜 ?줘|시킬게요?|주세요)[\s!.~]*$"
+)
+# 메뉴명으로 볼 수 없는 표현 ("추천 좀 해 주세요", "메뉴 뭐 있는지 알려 주세요" 등)
+_NOT_MENU_WORDS = ("좀", "추천", "메뉴", "뭐", "알려", "해", "다시")
+_KOREAN_NUMBERS = {"한": 1, "두": 2, "세": 3, "네": 4, "다섯": 5}
+
+# 매출/통계/트렌드 조회 확신 패턴 ("인기", "분석"처럼 고객 질문과 겹치는 키워드는 제외)
+_ANALYTICS_PATTERNS = [
+    ("get_sales_data", r"(매출|수익|판매액|sales|revenue)"),
+    ("get_order_statistics", r"(주문 ?통계|판매 ?순위|주문 ?순위|통계)"),
+    ("analyze_trends", r"(트렌드|추세|trend)"),
+]
+
+# 매출/통계 기간 추출
+_DATE_PATTERNS = [
+    (r"(어제|yesterday)", "yesterday"),
+    (r"(오늘|today)", "today"),
+]
+_SALES_PERIOD_PATTERNS = [
+    (r"(이번 ?주|주간|일주일|weekly|this week)", "weekly"),
+    (r"(이번 ?달|월간|한 ?달|monthly|this month)", "monthly"),
+]
+_STAT_PERIOD_PATTERNS = [
+    (r"(이번 ?주|주간|일주일|week)", "week"),
+    (r"(이번 ?달|월간|한 ?달|month)", "month"),
+]
+
+
+class RuleBasedRouter:
+    """결정적 규칙 기반 1단계 분류기"""
+
+    def __init__(self, tool_executor):
+        """
+        Args:
+            tool_executor: 툴 실행기 (툴 정보/파라미터 enum 조회용)
+        """
+        self.tool_executor = tool_executor
+
+        # 툴 키워드 정규식 컴파일
+        self._tool_patterns = {
+            tool_name: self._compile_alternation(keywords)
+            for tool_name, keywords in TOOL_KEYWORDS.items()
+            if self.tool_executor.get_tool_info(tool_name)
+        }
+
+        # 파라미터 enum 값 → 정규식 테이블 (툴 레지스트리 기반)
+        self._enum_patterns: Dict[Tuple[str, str], List[Tuple[re.Pattern, str]]] = {}
+        for tool in self.tool_executor.get_available_tools():
+            for param_name, param_info in tool["parameters"].items():
+                enum_values = param_info.get("enum")
+                if not enum_values:
+                    continue
+                table = []
+                for value in enum_values:
+                    aliases = ENUM_ALIASES.get(param_name, {}).get(value, [])
+                    table.append((self._compile_alternation(aliases + [value], word_boundary=True), value))
+                self._enum_patterns[(tool["name"], param_name)] = table
+
+        self._language_cue = re.compile(_LANGUAGE_CHANGE_CUES, re.IGNORECASE)
+        self._navigation_cue = re.compile(_NAVIGATION_CUES, re.IGNORECASE)
+        self._greeting = re.compile(_GREETING_PATTERN, re.IGNORECASE)
+        self._store_info = re.compile(_STORE_INFO_PATTERN, re.IGNORECASE)
+        self._order = re.compile(_ORDER_PATTERN)
+        self._analytics = [
+            (tool_name, re.compile(pattern, re.IGNORECASE))
+            for tool_name, pattern in _ANALYTICS_PATTERNS
+            if tool_name in self._tool_patterns
+        ]
+
+        logger.info(f"✅ 규칙 기반 라우터 초기화 완료 (툴 패턴 {len(self._tool_patterns)}개, enum 테이블 {len(self._enum_patterns)}개)")
+
+    def classify(self, user_message: str) -> Optional[Dict[str, Any]]:
+        """
+        메시지를 규칙으로 분류
+
+        Args:
+            user_message: 사용자 메시지
+
+        Returns:
+            라우팅 결정 (confidence 포함) 또는 None (규칙으로 판단 불가)
+        """
+        message = user_message.strip()
+        if not message:
+            return None
+
+        # 1. 인사/감사 (메시지 전체가 인사말인 경우만)
+        if self._greeting.match(message):
+            return self._simple_qa(message, 0.97, "인사말 규칙 매칭")
+
+        # 2. 언어 변경
+        language = self.extract_enum("set_language", "language", message)
+        if language and (self._language_cue.search(message) or len(message.split()) <= 2):
+            return self._tool_call("set_language", {"language": language}, 0.96, "언어 변경 규칙 매칭")
+
+        # 3. 화면 이동
+        destination = self.extract_enum("navigate_to", "destination", message)
+        if destination and self._navigation_cue.search(message):
+            return self._tool_call("navigate_to", {"destination": destination}, 0.92, "화면 이동 규칙 매칭")
+
+        # 4. 매출/통계/트렌드 조회
+        for tool_name, pattern in self._analytics:
+            if pattern.search(message):
+                params = self.extract_params(tool_name, message)
+                return self._tool_call(tool_name, params, 0.9, f"{tool_name} 키워드 규칙 매칭")
+
+        # 5. 메뉴 주문 (메뉴명을 확실히 추출할 수 있는 경우만)
+        if "order_menu" in self._tool_patterns:
+            params = self.extract_params("order_menu", message)
+            if params.get("menu"):
+                return self._tool_call("order_menu", params, 0.9, "메뉴 주문 규칙 매칭")
+
+        # 6. FAQ 질문 (메시지 전체가 FAQ 패턴과 일치하는 경우만 사전 계산 답변 대상)
+        if not self._matches_any_tool(message):
+            faq_intent = match_faq_intent(message)
+            if faq_intent:
+                return {
+                    "route": "RAG_QUERY",
+                    "query": message,
+                    "faq_intent": faq_intent,
+                    "confidence": 0.95,
+                    "reasoning": f"FAQ 규칙 매칭 ({faq_intent})"
+                }
+
+        # 7. 매장 정보 질문 (툴 키워드가 없는 경우만)
+        if self._store_info.search(message) and not self._matches_any_tool(message):
+            return {
+                "route": "RAG_QUERY",
+                "query": message,
+                "confidence": 0.9,
+                "reasoning": "매장 정보 키워드 규칙 매칭"
+            }
+
+        return None
+
+    def extract_enum(self, tool_name: str, param_name: str, message: str) -> Optional[str]:
+        """메시지에서 툴 파라미터 enum 값 추출 (별칭 포함)"""
+        for pattern, value in self._enum_patterns.get((tool_name, param_name), []):
+            if pattern.search(message):
+                return value
+        return None
+
+    def extract_params(self, tool_name: str, message: str) -> Dict[str, Any]:
+        """
+        메시지에서 툴 파라미터 추출
+
+        Args:
+            tool_name: 툴 이름
+            message: 사용자 메시지
+
+        Returns:
+            추출된 파라미터 (추출 실패한 파라미터는 생략)
+        """
+        params: Dict[str, Any] = {}
+
+        if tool_name == "order_menu":
+            match = self._order.match(message.strip())
+            if not match:
+                return params
+            menu = match.group("menu").strip()
+            quantity = match.group("quantity")
+            # "주세요"는 수량이 명시된 경우만 주문으로 판단
+            if match.group("verb") == "주세요" and not quantity:
+                return params
+            if menu and not any(word in menu.split() or menu.endswith(word) for word in _NOT_MENU_WORDS):
+                params["menu"] = menu
+                if quantity:
+                    params["quantity"] = int(quantity) if quantity.isdigit() else _KOREAN_NUMBERS[quantity]
+            return params
+
+        if tool_name == "get_sales_data":
+            date = self._first_match(_DATE_PATTERNS, message)
+            period = self._first_match(_SALES_PERIOD_PATTERNS, message)
+            if date:
+                params["date"] = date
+            if period:
+                params["period"] = period
+            return params
+
+        if tool_name in ("get_order_statistics", "analyze_trends"):
+            period = self._first_match(_STAT_PERIOD_PATTERNS, message)
+            if period:
+                params["period"] = period
+            return params
+
+        # enum 파라미터 추출 (set_language, navigate_to 등)
+        for (enum_tool, param_name) in self._enum_patterns:
+            if enum_tool == tool_name:
+                value = self.extract_enum(tool_name, param_name, message)
+                if value:
+                    params[param_name] = value
+        return params
+
+    def _matches_any_tool(self, message: str) -> bool:
+        """툴 키워드 포함 여부"""
+        return any(pattern.search(message) for pattern in self._tool_patterns.values())
+
+    def _tool_call(self, tool_name: str, params: Dict[str, Any], confidence: float, reasoning: str) -> Dict[str, Any]:
+        """TOOL_CALL 결정 생성"""
+        tool_info = self.tool_executor.get_tool_info(tool_name)
+        return {
+            "route": "TOOL_CALL",
+            "tool_name": tool_name,
+            "tool_params": params,
+            "tool_type": tool_info["tool_type"],
+            "confidence": confidence,
+            "reasoning": reasoning
+        }
+
+    @staticmethod
+    def _simple_qa(message: str, confidence: float, reasoning: str) -> Dict[str, Any]:
+        """SIMPLE_QA 결정 생성"""
+        return {
+            "route": "SIMPLE_QA",
+            "query": message,
+            "confidence": confidence,
+            "reasoning": reasoning
+        }
+
+    @staticmethod
+    def _first_match(patterns: List[Tuple[str, str]], message: str) -> Optional[str]:
+        """패턴 목록 중 처음 매칭되는 값 반환"""
+        for pattern, value in patterns:
+            if re.search(pattern, message, re.IGNORECASE):
+                return value
+        return None
+
+    @staticmethod
+    def _compile_alternation(keywords: List[str], word_boundary: bool = False) -> re.Pattern:
+        """
+        키워드 목록을 하나의 정규식으로 컴파일
+
+        영문 키워드는 단어 경계를 적용하여 "en"이 "often"에 매칭되는 것을 방지합니다.
+        """
+        parts = []
+        for keyword in sorted(set(keywords), key=len, reverse=True):
+            escaped = re.escape(keyword)
+            if word_boundary and keyword.isascii():
+                escaped = rf"\b{escaped}\b"
+            parts.append(escaped)
+        return re.compile("|".join(parts), re.IGNORECASE)
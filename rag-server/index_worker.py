@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+문서 인덱싱 워커
+document_indexing 큐의 인덱싱 작업(BGE-M3 인코딩 + Milvus 적재)을 처리하는 워커
+
+API 서버와 분리된 프로세스에서 인코딩하므로 인덱싱 중에도 채팅 응답 지연에 영향이 없습니다.
+작업마다 fork하면 모델을 매번 다시 로드하게 되므로 SimpleWorker(같은 프로세스에서 실행)를 사용하고,
+모델은 시작 시 한 번 로드합니다.
+
+실행 방법:
+    python index_worker.py
+"""
+
+import os
+import sys
+import logging
+from redis import Redis
+from rq import SimpleWorker, Queue, Connection
+
+from indexing_queue import INDEXING_QUEUE_NAME
+from tasks import get_document_indexer
+
+# 로깅 설정
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s [%(levelname)s] %(name)s: %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    """워커 시작"""
+    # Redis 연결 설정
+    redis_host = os.getenv("REDIS_HOST", "wafl-redis")
+    redis_port = int(os.getenv("REDIS_PORT", "6379"))
+    redis_db = int(os.getenv("REDIS_DB", "1"))
+
+    logger.info("=" * 80)
+    logger.info("🚀 문서 인덱싱 워커 시작")
+    logger.info(f"   Redis: {redis_host}:{redis_port}/{redis_db}")
+    logger.info("=" * 80)
+
+    # Redis 연결
+    try:
+        redis_conn = Redis(
+            host=redis_host,
+            port=redis_port,
+            db=redis_db,
+            decode_responses=False,
+            socket_connect_timeout=5,
+            socket_keepalive=True,
+            health_check_interval=30
+        )
+
+        # 연결 테스트
+        redis_conn.ping()
+        logger.info("✅ Redis 연결 성공")
+
+    except Exception as e:
+        logger.error(f"❌ Redis 연결 실패: {str(e)}")
+        sys.exit(1)
+
+    # 첫 작업 지연을 없애기 위해 임베딩 모델/Milvus 연결 미리 로드
+    logger.info("📦 임베딩 모델 로드 중...")
+    get_document_indexer()
+    logger.info("✅ 임베딩 모델 로드 완료")
+
+    # 워커 실행
+    with Connection(redis_conn):
+        queues = [Queue(INDEXING_QUEUE_NAME)]
+
+        logger.info("📋 큐 목록:")
+        for q in queues:
+            logger.info(f"   - {q.name} ({len(q)} 작업 대기중)")
+
+        worker = SimpleWorker(
+            queues,
+            connection=redis_conn,
+            name=f"index-worker-{os.getpid()}"
+        )
+
+        logger.info(f"👷 워커 시작: {worker.name}")
+        logger.info("⏳ 작업 대기 중...\n")
+
+        # 워커 실행 (무한 루프, SIGTERM/SIGINT로 종료)
+        worker.work(logging_level='INFO')
+
+
+if __name__ == '__main__':
+    try:
+        main()
+    except KeyboardInterrupt:
+        logger.info("\n\n⏹️  워커 종료 (Ctrl+C)")
+        sys.exit(0)
+    except Exception as e:
+        logger.error(f"\n\n❌ 워커 오류: {str(e)}")
+        sys.exit(1)
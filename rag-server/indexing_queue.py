@@ -0,0 +1,166 @@
+"""
+문서 인덱싱 작업 큐
+Redis Queue를 사용하여 BGE-M3 인코딩을 API 서버 밖(index_worker.py)에서 처리
+"""
+
+import os
+import logging
+from typing import Optional
+from redis import Redis
+from rq import Queue
+from rq.job import Job
+
+logger = logging.getLogger(__name__)
+
+INDEXING_QUEUE_NAME = "document_indexing"
+
+
+class IndexingQueue:
+    """Redis Queue 기반 문서 인덱싱 작업 큐"""
+
+    def __init__(self):
+        """Redis 연결 및 Queue 초기화"""
+        # Docker 환경에서는 서비스명 사용
+        redis_host = os.getenv("REDIS_HOST", "wafl-redis")
+        redis_port = int(os.getenv("REDIS_PORT", "6379"))
+        redis_db = int(os.getenv("REDIS_DB", "1"))
+
+        # 인덱싱 작업 타임아웃 (문서가 많은 매장도 처리할 수 있도록 넉넉하게)
+        self.job_timeout = int(os.getenv("INDEXING_JOB_TIMEOUT", "1800"))
+
+        try:
+            self.redis_conn = Redis(
+                host=redis_host,
+                port=redis_port,
+                db=redis_db,
+                decode_responses=False,  # RQ는 bytes 사용
+                socket_connect_timeout=5,
+                socket_keepalive=True,
+                health_check_interval=30
+            )
+
+            # 연결 테스트
+            self.redis_conn.ping()
+
+            # Queue 생성 (인덱싱 전용, 대화 저장 큐와 분리)
+            self.queue = Queue(
+                INDEXING_QUEUE_NAME,
+                connection=self.redis_conn,
+                default_timeout=self.job_timeout
+            )
+
+            logger.info(f"✅ IndexingQueue 초기화 완료 (Redis: {redis_host}:{redis_port})")
+
+        except Exception as e:
+            logger.error(f"❌ Redis 연결 실패: {str(e)}")
+            self.redis_conn = None
+            self.queue = None
+
+    def is_available(self) -> bool:
+        """큐 사용 가능 여부 확인"""
+        return self.queue is not None
+
+    def enqueue_indexing(self, store_id: int, category: str = "customer") -> Optional[str]:
+        """
+        문서 인덱싱 작업을 큐에 추가
+
+        같은 매장/카테고리의 작업이 아직 대기 중이면 새로 추가하지 않고 기존 작업 ID를 반환합니다.
+        (증분 인덱싱이라 대기 중인 작업 하나가 최신 문서를 모두 반영함)
+
+        Returns:
+            job_id: RQ Job ID (상태 조회용), 실패 시 None
+        """
+        if not self.is_available():
+            logger.warning("⚠️ Redis Queue 사용 불가 - 인덱싱 작업 추가 불가")
+            return None
+
+        pending_key = f"rag:indexing:pending:{store_id}:{category}"
+
+        try:
+            pending_id = self.redis_conn.get(pending_key)
+            if pending_id:
+                pending_id = pending_id.decode()
+                try:
+                    if Job.fetch(pending_id, connection=self.redis_conn).get_status() == "queued":
+                        logger.info(f"📎 대기 중인 인덱싱 작업 재사용: job_id={pending_id}, store_id={store_id}")
+                        return pending_id
+                except Exception:
+                    pass  # 만료된 작업이면 새로 추가
+
+            job = self.queue.enqueue(
+                'tasks.index_documents_task',
+                store_id=store_id,
+                category=category,
+                job_timeout=self.job_timeout,
+                result_ttl=86400,  # 결과 24시간 보관 (상태 조회용)
+                failure_ttl=86400  # 실패한 작업 24시간 보관
+            )
+            self.redis_conn.set(pending_key, job.id, ex=self.job_timeout)
+
+            logger.info(f"📤 인덱싱 작업 큐 추가: job_id={job.id}, store_id={store_id}, category={category}")
+            return job.id
+
+        except Exception as e:
+            logger.error(f"❌ 인덱싱 큐 추가 실패: {str(e)}")
+            return None
+
+    def get_job_status(self, job_id: str) -> Optional[dict]:
+        """
+        작업 상태 조회
+
+        Returns:
+            {
+                'status': 'queued|started|finished|failed',
+                'result': 인덱싱 결과 (완료 시),
+                'error': 에러 메시지 (실패 시)
+            }
+            작업이 없으면 None
+        """
+        if not self.is_available():
+            return None
+
+        try:
+            job = Job.fetch(job_id, connection=self.redis_conn)
+
+            return {
+                'job_id': job.id,
+                'status': job.get_status(),
+                'result': job.result if job.is_finished else None,
+                'error': str(job.exc_info) if job.is_failed else None,
+                'created_at': job.created_at.isoformat() if job.created_at else None,
+                'started_at': job.started_at.isoformat() if job.started_at else None,
+                'ended_at': job.ended_at.isoformat() if job.ended_at else None
+            }
+
+        except Exception as e:
+            logger.error(f"❌ 작업 상태 조회 실패: {str(e)}")
+            return None
+
+    def get_queue_info(self) -> dict:
+        """큐 상태 정보 조회"""
+        if not self.is_available():
+            return {'available': False}
+
+        try:
+            return {
+                'available': True,
+                'queued_jobs': len(self.queue),
+                'failed_jobs': len(self.queue.failed_job_registry),
+                'started_jobs': len(self.queue.started_job_registry),
+                'finished_jobs': len(self.queue.finished_job_registry)
+            }
+        except Exception as e:
+            logger.error(f"❌ 큐 정보 조회 실패: {str(e)}")
+            return {'available': False, 'error': str(e)}
+
+
+# 전역 싱글톤 인스턴스
+_queue_instance: Optional[IndexingQueue] = None
+
+
+def get_indexing_queue() -> IndexingQueue:
+    """전역 IndexingQueue 인스턴스 반환"""
+    global _queue_instance
+    if _queue_instance is None:
+        _queue_instance = IndexingQueue()
+    return _queue_instance
@@ -0,0 +1,176 @@
+"""
+임베딩 기반 의도 분류기 (Nearest-Centroid Intent Classifier)
+
+툴 레지스트리의 예시 발화(tools.py의 examples), FAQ 의도 예시(faq_answers.py)와 RAG/일반 대화 예시를
+서버 시작 시 BGE-M3로 한 번 임베딩하여 의도별 centroid를 만들어 두고,
+요청마다 쿼리 임베딩과 centroid 간 코사인 유사도(내적 1회)로 경로를 결정합니다.
+
+쿼리 임베딩은 RAG 검색에도 그대로 재사용되므로 요청당 임베딩은 한 번만 계산됩니다.
+1위/2위 유사도 차이(margin)가 작은 애매한 경우만 Kanana 라우터로 넘깁니다.
+
+설정 (환경변수):
+- INTENT_CLASSIFIER_ENABLED: 분류기 사용 여부 (기본 true)
+- INTENT_MIN_SIMILARITY: 1위 centroid 최소 유사도 (기본 0.6)
+- INTENT_MIN_MARGIN: 1위와 2위 유사도 최소 차이 (기본 0.05)
+"""
+
+import os
+import time
+import logging
+from typing import Optional, Dict, Any, List
+
+import numpy as np
+
+from thread_pool import run_blocking
+from faq_answers import FAQ_EXAMPLES, FAQ_LABEL_PREFIX
+
+logger = logging.getLogger(__name__)
+
+# 툴이 아닌 경로의 예시 발화 (툴 예시는 tools.py의 각 툴, FAQ 예시는 faq_answers.py에 정의)
+# FAQ 의도(위치, 전화번호, 메뉴 추천 등)와 겹치는 예시는 FAQ 레이블에만 두어 margin을 확보합니다.
+ROUTE_EXAMPLES = {
+    "RAG_QUERY": [
+        "영업시간 알려줘", "몇 시까지 영업해요?", "주차 가능한가요?", "김치찌개 얼마예요?",
+        "이 메뉴에 뭐가 들어가요?", "매운 음식 뭐 있어요?", "리뷰 평점이 어때요?",
+        "What time do you close?", "How much is the bulgogi?", "Is parking available?",
+        "営業時間を教えてください", "营业时间是几点？"
+    ],
+    "SIMPLE_QA": [
+        "안녕하세요", "안녕", "고마워요", "감사합니다", "반가워요", "잘 있어", "너는 누구야?",
+        "오늘 날씨 좋네요", "ㅎㅎ 재밌다", "Hello", "Hi there", "Thank you", "Who are you?",
+        "こんにちは", "ありがとう", "你好", "谢谢"
+    ]
+}
+
+TOOL_LABEL_PREFIX = "TOOL_CALL:"
+
+
+class EmbeddingIntentClassifier:
+    """예시 발화 centroid 기반 의도 분류기"""
+
+    def __init__(
+        self,
+        query_embedder,
+        tool_executor,
+        min_similarity: Optional[float] = None,
+        min_margin: Optional[float] = None,
+        enabled: Optional[bool] = None
+    ):
+        """
+        Args:
+            query_embedder: 쿼리 임베딩 배처 (EmbeddingBatcher, RAG 파이프라인과 공유)
+            tool_executor: 툴 실행기 (툴 예시 발화 조회용)
+            min_similarity: 1위 centroid 최소 유사도
+            min_margin: 1위와 2위 유사도 최소 차이
+            enabled: 분류기 사용 여부
+        """
+        self.query_embedder = query_embedder
+        self.tool_executor = tool_executor
+        self.enabled = enabled if enabled is not None else os.getenv("INTENT_CLASSIFIER_ENABLED", "true").lower() == "true"
+        self.min_similarity = min_similarity if min_similarity is not None else float(os.getenv("INTENT_MIN_SIMILARITY", "0.6"))
+        self.min_margin = min_margin if min_margin is not None else float(os.getenv("INTENT_MIN_MARGIN", "0.05"))
+
+        self.labels: List[str] = []
+        self._centroids: Optional[np.ndarray] = None
+
+    @property
+    def ready(self) -> bool:
+        """centroid 준비 완료 여부"""
+        return self.enabled and self._centroids is not None
+
+    def collect_examples(self) -> Dict[str, List[str]]:
+        """
+        의도 레이블별 예시 발화 수집
+
+        Returns:
+            {레이블: [예시 발화]} (툴은 "TOOL_CALL:툴이름", FAQ는 "FAQ:의도" 레이블)
+        """
+        examples = {}
+        for tool in self.tool_executor.get_available_tools():
+            if tool.get("examples"):
+                examples[TOOL_LABEL_PREFIX + tool["name"]] = list(tool["examples"])
+        examples.update({FAQ_LABEL_PREFIX + intent: list(texts) for intent, texts in FAQ_EXAMPLES.items()})
+        examples.update({label: list(texts) for label, texts in ROUTE_EXAMPLES.items()})
+        return examples
+
+    async def build(self):
+        """예시 발화를 임베딩하여 의도별 centroid 계산 (서버 시작 시 1회)"""
+        if not self.enabled:
+            logger.info("ℹ️ 임베딩 의도 분류기 비활성화")
+            return
+
+        started = time.perf_counter()
+        examples = self.collect_examples()
+        texts = [text for label_texts in examples.values() for text in label_texts]
+        vectors = await run_blocking(self.query_embedder.embeddings.embed_documents, texts)
+        self.set_centroids(examples, vectors)
+
+        logger.info(
+            f"✅ 임베딩 의도 분류기 준비 완료: {len(self.labels)}개 의도, {len(texts)}개 예시 "
+            f"({(time.perf_counter() - started) * 1000:.0f}ms)"
+        )
+
+    def set_centroids(self, examples: Dict[str, List[str]], vectors: List[List[float]]):
+        """
+        예시 임베딩으로 centroid 행렬 구성
+
+        Args:
+            examples: {레이블: [예시 발화]} (vectors와 같은 순서)
+            vectors: 예시 발화 임베딩 리스트
+        """
+        matrix = self._normalize_rows(np.asarray(vectors, dtype=np.float32))
+
+        labels = []
+        centroids = []
+        offset = 0
+        for label, texts in examples.items():
+            centroids.append(matrix[offset:offset + len(texts)].mean(axis=0))
+            labels.append(label)
+            offset += len(texts)
+
+        self.labels = labels
+        self._centroids = self._normalize_rows(np.stack(centroids))
+
+    async def embed(self, text: str) -> list[float]:
+        """쿼리 임베딩 (RAG 파이프라인과 같은 배처 사용)"""
+        return await self.query_embedder.embed_query(text)
+
+    def classify(self, query_embedding: list[float]) -> Optional[Dict[str, Any]]:
+        """
+        쿼리 임베딩을 가장 가까운 의도 centroid로 분류
+
+        Args:
+            query_embedding: 쿼리 임베딩
+
+        Returns:
+            {"label", "similarity", "margin", "confident", "scores"} 또는 None (분류기 미준비)
+            confident가 False면 LLM 라우터로 넘겨야 하는 애매한 경우입니다.
+        """
+        if not self.ready:
+            return None
+
+        query_vector = np.asarray(query_embedding, dtype=np.float32)
+        norm = np.linalg.norm(query_vector)
+        if norm > 0:
+            query_vector = query_vector / norm
+
+        similarities = self._centroids @ query_vector
+        order = np.argsort(similarities)[::-1]
+        best = float(similarities[order[0]])
+        second = float(similarities[order[1]]) if len(order) > 1 else -1.0
+        margin = best - second
+
+        return {
+            "label": self.labels[order[0]],
+            "similarity": round(best, 4),
+            "margin": round(margin, 4),
+            "confident": best >= self.min_similarity and margin >= self.min_margin,
+            "scores": {self.labels[i]: round(float(similarities[i]), 4) for i in order[:3]}
+        }
+
+    @staticmethod
+    def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+        """행 단위 L2 정규화"""
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
@@ -0,0 +1,227 @@
+"""
+비동기 LLM 클라이언트
+
+ollama.AsyncClient를 감싸서 이벤트 루프를 막지 않고 LLM을 호출합니다.
+동기 ollama.Client.generate는 응답이 올 때까지 uvicorn 이벤트 루프 전체를 멈추게 하므로
+async 엔드포인트에서는 반드시 이 모듈의 클라이언트를 사용해야 합니다.
+"""
+
+import os
+import logging
+from typing import Optional, Dict, Any, AsyncIterator
+import ollama
+
+logger = logging.getLogger(__name__)
+
+# 모델 설정
+MAIN_LLM_MODEL = "gemma3:27b-it-q4_K_M"
+ROUTER_LLM_MODEL = "huihui_ai/kanana-nano-abliterated:2.1b"
+
+# 응답 길이 제한 (태블릿 화면용)
+ANSWER_MAX_CHARS = 50
+
+# 응답이 잘렸을 때 덧붙이는 추가 설명 제안 문구
+MORE_MESSAGES = {
+    "ko": "\n\n더 자세히 설명해드릴까요?",
+    "en": "\n\nWould you like more details?",
+    "ja": "\n\nもっと詳しく説明しましょうか？",
+    "zh": "\n\n需要更详细的说明吗？"
+}
+
+
+class AsyncLLMClient:
+    """Ollama 비동기 클라이언트 래퍼"""
+
+    def __init__(self, host: str, model: str, timeout: Optional[float] = None):
+        """
+        Args:
+            host: Ollama 서버 URL
+            model: 사용할 모델 이름
+            timeout: 요청 타임아웃 (초, None이면 무제한)
+        """
+        self.host = host
+        self.model = model
+        self.client = ollama.AsyncClient(host=host, timeout=timeout)
+
+    async def generate(
+        self,
+        prompt: str,
+        options: Optional[Dict[str, Any]] = None,
+        usage: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """
+        프롬프트에 대한 전체 응답 생성 (비동기)
+
+        Args:
+            prompt: 프롬프트
+            options: Ollama 생성 옵션 (num_predict, temperature 등)
+            usage: 주어지면 토큰 사용량(read_usage 참고)을 채움
+
+        Returns:
+            앞뒤 공백이 제거된 응답 텍스트
+        """
+        response = await self.client.generate(
+            model=self.model,
+            prompt=prompt,
+            options=options
+        )
+        if usage is not None:
+            usage.update(read_usage(response))
+        return response['response'].strip()
+
+    async def stream(
+        self,
+        prompt: str,
+        options: Optional[Dict[str, Any]] = None,
+        usage: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[str]:
+        """
+        프롬프트에 대한 응답을 토큰 단위로 스트리밍 (비동기)
+
+        반복을 중단하고 제너레이터를 닫으면 HTTP 스트림도 닫히므로
+        Ollama 서버가 남은 토큰 생성을 중단합니다.
+
+        Args:
+            prompt: 프롬프트
+            options: Ollama 생성 옵션
+            usage: 주어지면 마지막 응답(done)의 토큰 사용량을 채움 (끝까지 생성된 경우만)
+
+        Yields:
+            생성된 토큰 텍스트
+        """
+        response = await self.client.generate(
+            model=self.model,
+            prompt=prompt,
+            options=options,
+            stream=True
+        )
+        try:
+            async for part in response:
+                token = part.get('response', '')
+                if token:
+                    yield token
+                if part.get('done'):
+                    if usage is not None:
+                        usage.update(read_usage(part))
+                    break
+        finally:
+            await response.aclose()
+
+
+def read_usage(response: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Ollama 응답의 토큰 사용량
+
+    Returns:
+        {"prompt_tokens": prompt_eval_count, "completion_tokens": eval_count, "prompt_eval_ms": prefill 시간}
+        (Ollama가 프롬프트 KV 캐시를 재사용하면 prompt_tokens가 실제보다 작게 보고될 수 있음)
+    """
+    prompt_eval_ns = response.get('prompt_eval_duration')
+    return {
+        "prompt_tokens": response.get('prompt_eval_count'),
+        "completion_tokens": response.get('eval_count'),
+        "prompt_eval_ms": round(prompt_eval_ns / 1e6, 2) if prompt_eval_ns else None
+    }
+
+
+def truncate_answer(answer: str, language: str = "ko", max_chars: int = ANSWER_MAX_CHARS) -> str:
+    """
+    응답 길이 제한 적용 (초과 시 자르고 추가 설명 제안 문구 추가)
+
+    Args:
+        answer: LLM 응답
+        language: 응답 언어 (ko, en, ja, zh)
+        max_chars: 최대 문자 수
+
+    Returns:
+        길이 제한이 적용된 응답
+    """
+    if len(answer) > max_chars:
+        answer = answer[:max_chars] + "..."
+        answer += MORE_MESSAGES.get(language, MORE_MESSAGES["ko"])
+    return answer
+
+
+async def limit_stream(
+    tokens: AsyncIterator[str],
+    language: str = "ko",
+    max_chars: int = ANSWER_MAX_CHARS
+) -> AsyncIterator[str]:
+    """
+    토큰 스트림에 길이 제한 적용
+
+    truncate_answer와 동일한 결과를 스트리밍으로 만들어냅니다.
+    제한을 넘는 순간 추가 설명 제안 문구를 보내고 원본 스트림을 닫아
+    서버에서 더 이상 토큰을 생성하지 않도록 합니다.
+
+    Args:
+        tokens: LLM 토큰 스트림
+        language: 응답 언어 (ko, en, ja, zh)
+        max_chars: 최대 문자 수
+
+    Yields:
+        클라이언트에 보낼 텍스트 조각
+    """
+    emitted = 0
+    started = False
+    try:
+        async for token in tokens:
+            # 응답 앞쪽 공백 제거 (truncate_answer의 strip과 동일하게)
+            if not started:
+                token = token.lstrip()
+                if not token:
+                    continue
+                started = True
+
+            remaining = max_chars - emitted
+            if len(token) > remaining:
+                if remaining > 0:
+                    yield token[:remaining]
+                yield "..." + MORE_MESSAGES.get(language, MORE_MESSAGES["ko"])
+                return
+
+            emitted += len(token)
+            yield token
+    finally:
+        await tokens.aclose()
+
+
+def _get_timeout() -> Optional[float]:
+    """LLM 요청 타임아웃 (환경변수 LLM_TIMEOUT_SECONDS, 기본 120초)"""
+    value = os.getenv("LLM_TIMEOUT_SECONDS", "120")
+    return float(value) if value else None
+
+
+# 전역 클라이언트 인스턴스
+_main_llm: Optional[AsyncLLMClient] = None
+_router_llm: Optional[AsyncLLMClient] = None
+
+
+def get_main_llm() -> AsyncLLMClient:
+    """
+    메인 LLM (Gemma3) 클라이언트 가져오기 (싱글톤)
+
+    Returns:
+        AsyncLLMClient 인스턴스
+    """
+    global _main_llm
+    if _main_llm is None:
+        main_url = os.getenv("OLLAMA_MAIN_URL", "http://112.148.37.41:1884")
+        _main_llm = AsyncLLMClient(host=main_url, model=MAIN_LLM_MODEL, timeout=_get_timeout())
+        logger.info(f"✅ 메인 LLM 클라이언트 초기화 완료: {main_url} ({MAIN_LLM_MODEL})")
+    return _main_llm
+
+
+def get_router_llm() -> AsyncLLMClient:
+    """
+    라우터 LLM (Kanana) 클라이언트 가져오기 (싱글톤)
+
+    Returns:
+        AsyncLLMClient 인스턴스
+    """
+    global _router_llm
+    if _router_llm is None:
+        router_url = os.getenv("OLLAMA_AGENT_URL", "http://112.148.37.41:1889")
+        _router_llm = AsyncLLMClient(host=router_url, model=ROUTER_LLM_MODEL, timeout=_get_timeout())
+        logger.info(f"✅ 라우터 LLM 클라이언트 초기화 완료: {router_url} ({ROUTER_LLM_MODEL})")
+    return _router_llm
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+채팅 엔드포인트 동시성 부하 테스트
+
+여러 태블릿이 동시에 /api/chat을 호출하는 상황을 재현하여
+요청들이 하나씩 직렬로 처리되지 않는지 확인합니다.
+
+측정 항목:
+- 전체 소요 시간 (wall time) vs 개별 응답 시간 합계
+  → 병렬도(sum / wall)가 1에 가까우면 이벤트 루프가 막혀 직렬 처리되고 있다는 의미
+- 채팅 요청 진행 중 /health 응답 시간
+  → 이벤트 루프가 막히면 헬스 체크도 LLM 응답이 끝날 때까지 대기함
+
+실행 방법:
+    python load_test.py --url http://localhost:58002 --store-id 1 --concurrency 8
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+
+import httpx
+
+DEFAULT_MESSAGES = [
+    "영업시간 알려줘",
+    "안녕하세요",
+    "메뉴 추천해줘",
+    "주차 돼요?",
+    "전화번호 알려줘",
+    "오늘 매출 알려줘",
+]
+
+
+async def _send_chat(client: httpx.AsyncClient, url: str, store_id: int, message: str) -> float:
+    """채팅 요청 1회 전송 후 응답 시간(초) 반환"""
+    started = time.perf_counter()
+    response = await client.post(
+        f"{url}/api/chat",
+        json={"message": message, "store_id": store_id, "category": "customer"}
+    )
+    response.raise_for_status()
+    return time.perf_counter() - started
+
+
+async def _probe_health(client: httpx.AsyncClient, url: str, stop: asyncio.Event) -> list[float]:
+    """채팅 요청이 진행되는 동안 /health 응답 시간 측정"""
+    latencies = []
+    while not stop.is_set():
+        started = time.perf_counter()
+        await client.get(f"{url}/health")
+        latencies.append(time.perf_counter() - started)
+        await asyncio.sleep(0.2)
+    return latencies
+
+
+async def run_load_test(url: str, store_id: int, concurrency: int, timeout: float) -> bool:
+    """
+    부하 테스트 실행
+
+    Returns:
+        동시 처리 확인 여부 (병렬도 > 1.5 이고 헬스 체크가 막히지 않으면 True)
+    """
+    messages = [DEFAULT_MESSAGES[i % len(DEFAULT_MESSAGES)] for i in range(concurrency)]
+
+    async with httpx.AsyncClient(timeout=timeout) as client:
+        # 워밍업 (모델 로딩 시간 제외)
+        await _send_chat(client, url, store_id, "안녕하세요")
+
+        stop = asyncio.Event()
+        probe = asyncio.create_task(_probe_health(client, url, stop))
+
+        wall_started = time.perf_counter()
+        latencies = await asyncio.gather(
+            *[_send_chat(client, url, store_id, message) for message in messages]
+        )
+        wall = time.perf_counter() - wall_started
+
+        stop.set()
+        health_latencies = await probe
+
+    total = sum(latencies)
+    parallelism = total / wall if wall > 0 else 0.0
+    health_max = max(health_latencies) if health_latencies else 0.0
+
+    print("=" * 80)
+    print(f"동시 요청 수: {concurrency}")
+    print(f"전체 소요 시간: {wall:.2f}s")
+    print(f"개별 응답 시간 합계: {total:.2f}s")
+    print(f"개별 응답 시간 p50/max: {statistics.median(latencies):.2f}s / {max(latencies):.2f}s")
+    print(f"병렬도 (합계 / 전체): {parallelism:.2f}")
+    print(f"/health 최대 응답 시간 (채팅 진행 중): {health_max * 1000:.0f}ms")
+    print("=" * 80)
+
+    concurrent = parallelism > 1.5 and health_max < 1.0
+    if concurrent:
+        print("✅ 채팅 요청이 동시에 처리되고 있습니다")
+    else:
+        print("❌ 채팅 요청이 직렬로 처리되고 있습니다 (이벤트 루프 블로킹 의심)")
+    return concurrent
+
+
+def main():
+    parser = argparse.ArgumentParser(description="RAG 서버 채팅 동시성 부하 테스트")
+    parser.add_argument("--url", default="http://localhost:58002", help="RAG 서버 URL")
+    parser.add_argument("--store-id", type=int, default=1, help="테스트 매장 ID")
+    parser.add_argument("--concurrency", type=int, default=8, help="동시 요청 수")
+    parser.add_argument("--timeout", type=float, default=300.0, help="요청 타임아웃 (초)")
+    args = parser.parse_args()
+
+    ok = asyncio.run(run_load_test(args.url, args.store_id, args.concurrency, args.timeout))
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
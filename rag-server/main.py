@@ -1,9 +1,10 @@
 from fastapi import FastAPI, Request, Form
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from pydantic import BaseModel
 import os
+import json
 import logging
 import time
 from typing import Optional
@@ -12,11 +13,15 @@ from agent import Agent  # 기존 Agent (백업용, 추후 제거 예정)
 from router import get_router
 from tool_executor import get_tool_executor
 from rag_pipeline import RAGPipeline
+from intent_classifier import EmbeddingIntentClassifier
+from request_context import RequestContext
 from document_generator import DocumentGenerator
+from faq_answers import get_faq_store
 from conversation_service import get_conversation_service
 from conversation_logger import get_conversation_logger
-import ollama
-import os
+from indexing_queue import get_indexing_queue
+from llm_client import get_main_llm, truncate_answer, limit_stream
+from thread_pool import run_blocking
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
@@ -31,13 +36,16 @@ templates = Jinja2Templates(directory="templates")
 agent = Agent()  # 기존 Agent (백업용)
 router = get_router()  # 지능형 라우터
 tool_executor = get_tool_executor()  # 툴 실행기
+faq_store = get_faq_store()  # 매장별 FAQ 사전 계산 답변
 rag_pipeline = RAGPipeline()
 doc_generator = DocumentGenerator()
 
-# 메인 LLM 클라이언트 (SIMPLE_QA 및 LLM-Interpreted 툴용)
-main_llm_url = os.getenv("OLLAMA_MAIN_URL", "http://112.148.37.41:1884")
-main_llm_client = ollama.Client(host=main_llm_url)
-main_llm_model = "gemma3:27b-it-q4_K_M"
+# 임베딩 의도 분류기 (RAG 파이프라인의 BGE-M3 모델 공유, centroid는 startup 시 계산)
+intent_classifier = EmbeddingIntentClassifier(rag_pipeline.query_embedder, tool_executor)
+router.attach_intent_classifier(intent_classifier)
+
+# 메인 LLM 비동기 클라이언트 (SIMPLE_QA 및 LLM-Interpreted 툴용)
+main_llm = get_main_llm()
 
 # 대화 저장 서비스 초기화
 try:
@@ -59,6 +67,24 @@ except Exception as e:
     logger.error(f"⚠️ 비동기 대화 로거 초기화 실패: {str(e)}")
     conversation_logger = None
 
+# 문서 인덱싱 큐 초기화 (인코딩은 index_worker.py에서 처리)
+try:
+    indexing_queue = get_indexing_queue()
+    if not indexing_queue.is_available():
+        logger.warning("⚠️ 인덱싱 큐 사용 불가 - 인라인 인덱싱으로 대체")
+except Exception as e:
+    logger.error(f"⚠️ 인덱싱 큐 초기화 실패: {str(e)}")
+    indexing_queue = None
+
+
+@app.on_event("startup")
+async def build_intent_centroids():
+    """임베딩 의도 분류기 centroid 계산 (실패 시 LLM 라우터만 사용)"""
+    try:
+        await intent_classifier.build()
+    except Exception as e:
+        logger.error(f"⚠️ 임베딩 의도 분류기 초기화 실패: {str(e)}")
+
 
 class ChatRequest(BaseModel):
     message: str
@@ -73,14 +99,39 @@ class DocumentIndexRequest(BaseModel):
     category: str = "customer"
 
 
-async def interpret_tool_result_with_llm(
+# 언어별 응답 지시
+LANGUAGE_INSTRUCTIONS = {
+    "ko": "한국어로 답변하세요.",
+    "en": "Answer in English.",
+    "ja": "日本語で答えてください。",
+    "zh": "用中文回答。"
+}
+
+
+# 언어별 오류 메시지
+TOOL_INTERPRETATION_ERROR_MESSAGES = {
+    "ko": "데이터 조회는 완료했지만, 설명 중 오류가 발생했습니다.",
+    "en": "Data retrieval completed, but an error occurred during explanation.",
+    "ja": "データ検索は完了しましたが、説明中にエラーが発生しました。",
+    "zh": "数据检索已完成，但在解释过程中发生了错误。"
+}
+
+SIMPLE_CHAT_ERROR_MESSAGES = {
+    "ko": "죄송합니다. 일시적인 오류가 발생했습니다.",
+    "en": "Sorry, a temporary error has occurred.",
+    "ja": "申し訳ありません。一時的なエラーが発生しました。",
+    "zh": "抱歉，发生了临时错误。"
+}
+
+
+def build_tool_interpretation_prompt(
     user_message: str,
     tool_name: str,
     tool_result: dict,
     language: str = "ko"
 ) -> str:
     """
-    LLM-Interpreted 툴 결과를 Gemma3로 자연어 해석
+    LLM-Interpreted 툴 결과 해석용 프롬프트 생성
 
     Args:
         user_message: 사용자 메시지
@@ -89,22 +140,12 @@ async def interpret_tool_result_with_llm(
         language: 응답 언어 (ko, en, ja, zh)
 
     Returns:
-        자연어 응답
+        프롬프트 문자열
     """
-    try:
-        # 툴 결과를 문자열로 변환
-        import json
-        result_str = json.dumps(tool_result, ensure_ascii=False, indent=2)
-
-        # 언어별 지시
-        language_instructions = {
-            "ko": "한국어로 답변하세요.",
-            "en": "Answer in English.",
-            "ja": "日本語で答えてください。",
-            "zh": "用中文回答。"
-        }
+    # 툴 결과를 문자열로 변환
+    result_str = json.dumps(tool_result, ensure_ascii=False, indent=2)
 
-        prompt = f"""You are a friendly store assistant.
+    return f"""You are a friendly store assistant.
 The system has retrieved the following data. Please respond naturally to the customer based on this data.
 
 Customer question: {user_message}
@@ -119,40 +160,67 @@ Response rules:
 4. Format numbers for readability (e.g., 1500000 → 1.5M or 150만원)
 5. Mention trends or insights briefly if any
 
-**IMPORTANT: {language_instructions.get(language, language_instructions["ko"])}**
+**IMPORTANT: {LANGUAGE_INSTRUCTIONS.get(language, LANGUAGE_INSTRUCTIONS["ko"])}**
 
 Answer:"""
 
-        response = main_llm_client.generate(
-            model=main_llm_model,
-            prompt=prompt
-        )
 
-        answer = response['response'].strip()
+def build_simple_chat_prompt(user_message: str, language: str = "ko") -> str:
+    """
+    일반 대화(SIMPLE_QA)용 프롬프트 생성
 
-        # 50자 제한 체크
-        more_messages = {
-            "ko": "\n\n더 자세히 설명해드릴까요?",
-            "en": "\n\nWould you like more details?",
-            "ja": "\n\nもっと詳しく説明しましょうか？",
-            "zh": "\n\n需要更详细的说明吗？"
-        }
+    Args:
+        user_message: 사용자 메시지
+        language: 응답 언어 (ko, en, ja, zh)
+
+    Returns:
+        프롬프트 문자열
+    """
+    return f"""You are a friendly store assistant.
+
+Response rules:
+1. Keep your answer concise, within 50 characters
+2. Deliver only the key points the customer wants
+3. Be kind but get to the point
+4. Skip unnecessary explanations
+5. **Important**: Never make up information you don't know
+6. If uncertain, say "I'm not sure. Please ask a staff member for assistance"
 
-        if len(answer) > 50:
-            answer = answer[:50] + "..."
-            answer += more_messages.get(language, more_messages["ko"])
+**IMPORTANT: {LANGUAGE_INSTRUCTIONS.get(language, LANGUAGE_INSTRUCTIONS["ko"])}**
 
-        return answer
+User: {user_message}
+Assistant:"""
+
+
+async def interpret_tool_result_with_llm(
+    user_message: str,
+    tool_name: str,
+    tool_result: dict,
+    language: str = "ko"
+) -> str:
+    """
+    LLM-Interpreted 툴 결과를 Gemma3로 자연어 해석
+
+    Args:
+        user_message: 사용자 메시지
+        tool_name: 실행된 툴 이름
+        tool_result: 툴 실행 결과
+        language: 응답 언어 (ko, en, ja, zh)
+
+    Returns:
+        자연어 응답
+    """
+    try:
+        prompt = build_tool_interpretation_prompt(user_message, tool_name, tool_result, language)
+
+        answer = await main_llm.generate(prompt)
+
+        # 50자 제한 체크
+        return truncate_answer(answer, language)
 
     except Exception as e:
         logger.error(f"LLM 해석 오류: {str(e)}")
-        error_messages = {
-            "ko": "데이터 조회는 완료했지만, 설명 중 오류가 발생했습니다.",
-            "en": "Data retrieval completed, but an error occurred during explanation.",
-            "ja": "データ検索は完了しましたが、説明中にエラーが発生しました。",
-            "zh": "数据检索已完成，但在解释过程中发生了错误。"
-        }
-        return error_messages.get(language, error_messages["ko"])
+        return TOOL_INTERPRETATION_ERROR_MESSAGES.get(language, TOOL_INTERPRETATION_ERROR_MESSAGES["ko"])
 
 
 async def simple_chat_with_llm(user_message: str, language: str = "ko") -> str:
@@ -167,59 +235,90 @@ async def simple_chat_with_llm(user_message: str, language: str = "ko") -> str:
         LLM 응답
     """
     try:
-        # 언어별 지시
-        language_instructions = {
-            "ko": "한국어로 답변하세요.",
-            "en": "Answer in English.",
-            "ja": "日本語で答えてください。",
-            "zh": "用中文回答。"
-        }
+        prompt = build_simple_chat_prompt(user_message, language)
 
-        prompt = f"""You are a friendly store assistant.
+        answer = await main_llm.generate(prompt)
 
-Response rules:
-1. Keep your answer concise, within 50 characters
-2. Deliver only the key points the customer wants
-3. Be kind but get to the point
-4. Skip unnecessary explanations
-5. **Important**: Never make up information you don't know
-6. If uncertain, say "I'm not sure. Please ask a staff member for assistance"
+        # 50자 제한 체크
+        return truncate_answer(answer, language)
 
-**IMPORTANT: {language_instructions.get(language, language_instructions["ko"])}**
+    except Exception as e:
+        logger.error(f"일반 대화 오류: {str(e)}")
+        return SIMPLE_CHAT_ERROR_MESSAGES.get(language, SIMPLE_CHAT_ERROR_MESSAGES["ko"])
 
-User: {user_message}
-Assistant:"""
 
-        response = main_llm_client.generate(
-            model=main_llm_model,
-            prompt=prompt
-        )
+async def create_conversation_if_needed(request: ChatRequest, http_request: Request) -> Optional[str]:
+    """
+    대화 세션 UUID 확보 (요청에 없으면 새 세션 생성)
 
-        answer = response['response'].strip()
+    Returns:
+        대화 세션 UUID (생성 실패 시 None)
+    """
+    conversation_uuid = request.conversation_uuid
 
-        # 50자 제한 체크
-        more_messages = {
-            "ko": "\n\n더 자세히 설명해드릴까요?",
-            "en": "\n\nWould you like more details?",
-            "ja": "\n\nもっと詳しく説明しましょうか？",
-            "zh": "\n\n需要更详细的说明吗？"
-        }
+    if conversation_service and not conversation_uuid:
+        try:
+            # 클라이언트 정보 추출
+            client_ip = http_request.client.host if http_request.client else None
+            user_agent = http_request.headers.get("user-agent")
+
+            # 새 대화 세션 생성 (동기 DB 호출은 스레드 풀에서 실행)
+            conversation_uuid = await run_blocking(
+                conversation_service.create_conversation,
+                store_id=request.store_id,
+                category=request.category,
+                client_ip=client_ip,
+                user_agent=user_agent
+            )
+            logger.info(f"🔐 대화 세션 생성: {conversation_uuid}")
+        except Exception as e:
+            logger.error(f"⚠️ 대화 세션 생성 실패: {str(e)}")
 
-        if len(answer) > 50:
-            answer = answer[:50] + "..."
-            answer += more_messages.get(language, more_messages["ko"])
+    return conversation_uuid
 
-        return answer
 
-    except Exception as e:
-        logger.error(f"일반 대화 오류: {str(e)}")
-        error_messages = {
-            "ko": "죄송합니다. 일시적인 오류가 발생했습니다.",
-            "en": "Sorry, a temporary error has occurred.",
-            "ja": "申し訳ありません。一時的なエラーが発生しました。",
-            "zh": "抱歉，发生了临时错误。"
-        }
-        return error_messages.get(language, error_messages["ko"])
+def save_conversation_message(
+    conversation_uuid: Optional[str],
+    user_message: str,
+    bot_response: str,
+    used_rag: bool,
+    response_time_ms: int,
+    rag_doc_count: Optional[int] = None,
+    rag_max_score: Optional[float] = None
+):
+    """대화 저장 (비동기 큐 전용 - 실패 시 저장 안함)"""
+    if conversation_logger and conversation_logger.is_available() and conversation_uuid:
+        try:
+            # 메시지를 큐에 추가만 하고 즉시 반환 (~1ms)
+            job_id = conversation_logger.enqueue_message_save(
+                conversation_uuid=conversation_uuid,
+                user_message=user_message,
+                bot_response=bot_response,
+                used_rag=used_rag,
+                response_time_ms=response_time_ms,
+                rag_doc_count=rag_doc_count,
+                rag_max_score=rag_max_score
+            )
+            if job_id:
+                logger.info(f"📤 대화 저장 작업 큐 추가: job_id={job_id}")
+            else:
+                logger.warning("⚠️ 대화 저장 큐 추가 실패 - 저장 스킵")
+        except Exception as e:
+            logger.error(f"⚠️ 대화 저장 실패 - 저장 스킵: {str(e)}")
+    else:
+        if conversation_uuid:
+            logger.warning("⚠️ 비동기 로거 사용 불가 - 대화 저장 스킵")
+
+
+def get_rag_metadata(rag_debug: dict) -> tuple[Optional[int], Optional[float]]:
+    """RAG 디버그 정보에서 (검색 문서 수, 최고 유사도) 추출"""
+    rag_doc_count = None
+    rag_max_score = None
+    if "retrieved_documents" in rag_debug:
+        rag_doc_count = len(rag_debug["retrieved_documents"])
+        if rag_doc_count > 0:
+            rag_max_score = rag_debug["retrieved_documents"][0].get("score")
+    return rag_doc_count, rag_max_score
 
 
 @app.get("/", response_class=HTMLResponse)
@@ -232,33 +331,22 @@ async def root(request: Request):
 async def chat(request: ChatRequest, http_request: Request):
     """채팅 엔드포인트 (대화 저장 포함)"""
     start_time = time.time()
-    conversation_uuid = request.conversation_uuid
 
     try:
         logger.info("🚀 " + "="*76)
         logger.info(f"🚀 새로운 채팅 요청: store_id={request.store_id}, message={request.message}")
         logger.info("🚀 " + "="*76)
 
+        # 요청 컨텍스트 (쿼리 임베딩 등 요청당 1회 계산, 단계별 시간 기록)
+        context = RequestContext(request.message, rag_pipeline.query_embedder)
+
         # 대화 세션 생성 또는 기존 세션 사용
-        if conversation_service and not conversation_uuid:
-            try:
-                # 클라이언트 정보 추출
-                client_ip = http_request.client.host if http_request.client else None
-                user_agent = http_request.headers.get("user-agent")
-
-                # 새 대화 세션 생성
-                conversation_uuid = conversation_service.create_conversation(
-                    store_id=request.store_id,
-                    category=request.category,
-                    client_ip=client_ip,
-                    user_agent=user_agent
-                )
-                logger.info(f"🔐 대화 세션 생성: {conversation_uuid}")
-            except Exception as e:
-                logger.error(f"⚠️ 대화 세션 생성 실패: {str(e)}")
+        with context.span("conversation"):
+            conversation_uuid = await create_conversation_if_needed(request, http_request)
 
         # 라우터로 경로 결정
-        route_decision = await router.route(request.message)
+        with context.span("route"):
+            route_decision = await router.route(request.message, context)
 
         debug_info = {
             "router": route_decision,
@@ -281,7 +369,8 @@ async def chat(request: ChatRequest, http_request: Request):
             logger.info(f"🔧 툴 호출: {tool_name} ({tool_type})")
 
             # 툴 실행
-            tool_result = await tool_executor.execute_tool(tool_name, tool_params)
+            with context.span("tool"):
+                tool_result = await tool_executor.execute_tool(tool_name, tool_params)
             debug_info["tool_result"] = tool_result
             used_tool = tool_name
 
@@ -301,64 +390,64 @@ async def chat(request: ChatRequest, http_request: Request):
             else:
                 # LLM-Interpreted 툴 - Gemma3로 해석
                 logger.info(f"🤖 LLM 해석 시작 (툴 결과 해석)")
-                response = await interpret_tool_result_with_llm(
-                    user_message=request.message,
-                    tool_name=tool_name,
-                    tool_result=tool_result["result"],
-                    language=changed_language if changed_language else request.language
-                )
+                with context.span("llm"):
+                    response = await interpret_tool_result_with_llm(
+                        user_message=request.message,
+                        tool_name=tool_name,
+                        tool_result=tool_result["result"],
+                        language=changed_language if changed_language else request.language
+                    )
                 debug_info["llm_interpretation"] = response
 
         elif route_decision["route"] == "RAG_QUERY":
-            # RAG 파이프라인 실행
-            logger.info(f"📚 RAG 쿼리 실행")
-            used_rag = True
-
-            response, rag_debug = await rag_pipeline.query(
-                query=route_decision["query"],
-                store_id=request.store_id,
-                category=request.category,
-                language=request.language
-            )
-            debug_info["rag"] = rag_debug
-
-            # RAG 메타데이터 추출
-            if "retrieved_documents" in rag_debug:
-                rag_doc_count = len(rag_debug["retrieved_documents"])
-                if rag_doc_count > 0:
-                    rag_max_score = rag_debug["retrieved_documents"][0].get("score")
+            # FAQ 사전 계산 답변 조회 (규칙/임베딩 분류가 확정한 FAQ 의도만, 히트 시 검색/LLM 없이 즉시 응답)
+            faq_intent = route_decision.get("faq_intent") if route_decision.get("stage") in ("rule", "embedding") else None
+            with context.span("faq"):
+                faq_answer = faq_store.lookup(request.store_id, faq_intent, request.language)
+
+            if faq_answer is not None:
+                logger.info(f"⚡ FAQ 사전 계산 답변 사용: {faq_intent}")
+                response = faq_answer
+                debug_info["faq"] = {"intent": faq_intent}
+            else:
+                # RAG 파이프라인 실행
+                logger.info(f"📚 RAG 쿼리 실행")
+                used_rag = True
+
+                with context.span("rag"):
+                    response, rag_debug = await rag_pipeline.query(
+                        query=route_decision["query"],
+                        store_id=request.store_id,
+                        category=request.category,
+                        language=request.language,
+                        context=context
+                    )
+                debug_info["rag"] = rag_debug
+
+                # RAG 메타데이터 추출
+                rag_doc_count, rag_max_score = get_rag_metadata(rag_debug)
 
         else:  # SIMPLE_QA
             # 일반 대화 - Gemma3 직접 응답
             logger.info(f"💬 일반 대화 처리")
-            response = await simple_chat_with_llm(route_decision["query"], language=request.language)
+            with context.span("llm"):
+                response = await simple_chat_with_llm(route_decision["query"], language=request.language)
             debug_info["simple_chat"] = response
 
         # 응답 시간 계산
         response_time_ms = int((time.time() - start_time) * 1000)
+        debug_info["request"] = context.to_debug()
 
         # 대화 저장 (비동기 전용 - 실패 시 저장 안함)
-        if conversation_logger and conversation_logger.is_available() and conversation_uuid:
-            try:
-                # 메시지를 큐에 추가만 하고 즉시 반환 (~1ms)
-                job_id = conversation_logger.enqueue_message_save(
-                    conversation_uuid=conversation_uuid,
-                    user_message=request.message,
-                    bot_response=response,
-                    used_rag=needs_rag,
-                    response_time_ms=response_time_ms,
-                    rag_doc_count=rag_doc_count,
-                    rag_max_score=rag_max_score
-                )
-                if job_id:
-                    logger.info(f"📤 대화 저장 작업 큐 추가: job_id={job_id}")
-                else:
-                    logger.warning("⚠️ 대화 저장 큐 추가 실패 - 저장 스킵")
-            except Exception as e:
-                logger.error(f"⚠️ 대화 저장 실패 - 저장 스킵: {str(e)}")
-        else:
-            if conversation_uuid:
-                logger.warning("⚠️ 비동기 로거 사용 불가 - 대화 저장 스킵")
+        save_conversation_message(
+            conversation_uuid=conversation_uuid,
+            user_message=request.message,
+            bot_response=response,
+            used_rag=used_rag,
+            response_time_ms=response_time_ms,
+            rag_doc_count=rag_doc_count,
+            rag_max_score=rag_max_score
+        )
 
         logger.info("✅ " + "="*76)
         logger.info(f"✅ 채팅 완료: 응답 길이 = {len(response)} 문자, 응답 시간 = {response_time_ms}ms")
@@ -393,14 +482,215 @@ async def chat(request: ChatRequest, http_request: Request):
         )
 
 
+def format_sse(event: str, data: dict) -> str:
+    """Server-Sent Events 메시지 포맷팅"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@app.post("/api/chat/stream")
+async def chat_stream(request: ChatRequest, http_request: Request):
+    """
+    스트리밍 채팅 엔드포인트 (Server-Sent Events)
+
+    메인 LLM이 생성하는 토큰을 도착하는 즉시 전송하고,
+    50자 제한에 도달하면 추가 설명 제안 문구를 보낸 뒤 서버 측 생성을 중단합니다.
+
+    이벤트:
+        token: {"text": "..."} - 응답 텍스트 조각
+        done: 최종 메타데이터 (/api/chat 응답과 동일한 필드, response 포함)
+        error: {"error": "..."} - 처리 중 오류
+    """
+    start_time = time.time()
+
+    logger.info("🚀 " + "="*76)
+    logger.info(f"🚀 새로운 스트리밍 채팅 요청: store_id={request.store_id}, message={request.message}")
+    logger.info("🚀 " + "="*76)
+
+    # 요청 컨텍스트 (쿼리 임베딩 등 요청당 1회 계산, 단계별 시간 기록)
+    context = RequestContext(request.message, rag_pipeline.query_embedder)
+
+    # 대화 세션 생성 또는 기존 세션 사용
+    with context.span("conversation"):
+        conversation_uuid = await create_conversation_if_needed(request, http_request)
+
+    async def event_stream():
+        response = ""
+        try:
+            # 라우터로 경로 결정
+            with context.span("route"):
+                route_decision = await router.route(request.message, context)
+
+            debug_info = {
+                "router": route_decision,
+                "route": route_decision["route"]
+            }
+
+            rag_doc_count = None
+            rag_max_score = None
+            used_rag = False
+            used_tool = None
+            changed_language = None  # 툴로 변경된 언어
+            language = request.language
+            prompt = None  # 스트리밍할 LLM 프롬프트 (없으면 즉시 응답)
+
+            # 경로별 처리 (LLM 호출 전 단계까지)
+            if route_decision["route"] == "TOOL_CALL":
+                tool_name = route_decision["tool_name"]
+                tool_params = route_decision.get("tool_params", {})
+                tool_type = route_decision["tool_type"]
+
+                logger.info(f"🔧 툴 호출: {tool_name} ({tool_type})")
+
+                with context.span("tool"):
+                    tool_result = await tool_executor.execute_tool(tool_name, tool_params)
+                debug_info["tool_result"] = tool_result
+                used_tool = tool_name
+
+                # set_language 툴인 경우 변경된 언어 추출
+                if tool_name == "set_language" and tool_result.get("success"):
+                    changed_language = tool_result.get("result", {}).get("language")
+                    language = changed_language or language
+                    logger.info(f"🌐 언어 변경 감지: {changed_language}")
+
+                if not tool_result["success"]:
+                    response = f"죄송합니다. {tool_result.get('error', '알 수 없는 오류')}"
+                    logger.error(f"❌ 툴 실행 실패: {tool_result.get('error')}")
+                elif tool_type == "Self-Contained":
+                    response = tool_result["result"].get("message", tool_result["notification"])
+                    logger.info(f"✅ Self-Contained 툴 완료: {response}")
+                else:
+                    prompt = build_tool_interpretation_prompt(
+                        user_message=request.message,
+                        tool_name=tool_name,
+                        tool_result=tool_result["result"],
+                        language=language
+                    )
+
+            elif route_decision["route"] == "RAG_QUERY":
+                # FAQ 사전 계산 답변 조회 (규칙/임베딩 분류가 확정한 FAQ 의도만, 히트 시 검색/LLM 없이 즉시 응답)
+                faq_intent = route_decision.get("faq_intent") if route_decision.get("stage") in ("rule", "embedding") else None
+                with context.span("faq"):
+                    faq_answer = faq_store.lookup(request.store_id, faq_intent, language)
+
+                if faq_answer is not None:
+                    logger.info(f"⚡ FAQ 사전 계산 답변 사용 (스트리밍): {faq_intent}")
+                    response = faq_answer
+                    debug_info["faq"] = {"intent": faq_intent}
+                else:
+                    logger.info(f"📚 RAG 쿼리 실행 (스트리밍)")
+                    used_rag = True
+
+                    # 답변 캐시 조회 (히트 시 LLM 없이 즉시 응답)
+                    rag_query = route_decision["query"]
+                    with context.span("rag_cache_lookup"):
+                        cached_answer, rag_debug, query_embedding, sparse_embedding = await rag_pipeline.lookup_cached_answer(
+                            rag_query, request.store_id, request.category, language, context
+                        )
+
+                    if cached_answer is not None:
+                        response = cached_answer
+                    else:
+                        with context.span("retrieval"):
+                            prompt, direct_answer, rag_debug = await rag_pipeline.prepare_prompt(
+                                query=rag_query,
+                                store_id=request.store_id,
+                                category=request.category,
+                                language=language,
+                                query_embedding=query_embedding,
+                                context=context,
+                                sparse_embedding=sparse_embedding
+                            )
+                        if prompt is None:
+                            response = direct_answer
+
+                    debug_info["rag"] = rag_debug
+                    rag_doc_count, rag_max_score = get_rag_metadata(rag_debug)
+
+            else:  # SIMPLE_QA
+                logger.info(f"💬 일반 대화 처리 (스트리밍)")
+                prompt = build_simple_chat_prompt(route_decision["query"], language)
+
+            if prompt is None:
+                # LLM 없이 즉시 응답 가능한 경우 한 번에 전송
+                yield format_sse("token", {"text": response})
+            else:
+                # 메인 LLM 토큰 스트리밍 (50자 제한 도달 시 생성 중단)
+                first_token_ms = None
+                llm_usage = {}  # 50자 제한으로 생성을 중단하면 Ollama가 사용량을 보내지 않음
+                with context.span("llm"):
+                    async for piece in limit_stream(main_llm.stream(prompt, usage=llm_usage), language):
+                        if first_token_ms is None:
+                            first_token_ms = int((time.time() - start_time) * 1000)
+                        response += piece
+                        yield format_sse("token", {"text": piece})
+                debug_info["first_token_ms"] = first_token_ms
+                debug_info["llm_response"] = response
+                if llm_usage:
+                    debug_info["llm_usage"] = llm_usage
+
+                # 스트리밍으로 생성한 RAG 답변도 캐시에 저장
+                if route_decision["route"] == "RAG_QUERY":
+                    rag_debug["llm_response"] = response
+                    rag_pipeline.cache_answer(
+                        rag_query, request.store_id, request.category, language,
+                        query_embedding, response, rag_debug, context
+                    )
+
+            # 응답 시간 계산
+            response_time_ms = int((time.time() - start_time) * 1000)
+            debug_info["request"] = context.to_debug()
+
+            # 대화 저장 (비동기 전용 - 실패 시 저장 안함)
+            save_conversation_message(
+                conversation_uuid=conversation_uuid,
+                user_message=request.message,
+                bot_response=response,
+                used_rag=used_rag,
+                response_time_ms=response_time_ms,
+                rag_doc_count=rag_doc_count,
+                rag_max_score=rag_max_score
+            )
+
+            logger.info(f"✅ 스트리밍 채팅 완료: 응답 길이 = {len(response)} 문자, 응답 시간 = {response_time_ms}ms")
+
+            # 최종 메타데이터 이벤트
+            done_data = {
+                "response": response,
+                "route": route_decision["route"],
+                "used_rag": used_rag,
+                "used_tool": used_tool,
+                "conversation_uuid": conversation_uuid,
+                "response_time_ms": response_time_ms,
+                "language": changed_language or request.language,
+                "debug": debug_info
+            }
+            if changed_language:
+                done_data["language_changed"] = True
+
+            yield format_sse("done", done_data)
+
+        except Exception as e:
+            logger.error(f"스트리밍 채팅 오류: {str(e)}")
+            yield format_sse("error", {"error": str(e)})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"  # nginx 버퍼링 비활성화
+        }
+    )
+
+
 @app.post("/api/generate-documents")
 async def generate_documents(request: DocumentIndexRequest):
     """매장 문서 자동 생성 및 등록 엔드포인트"""
     try:
         logger.info(f"문서 생성 요청: store_id={request.store_id}")
 
-        # 문서 자동 생성
-        result = doc_generator.generate_all_documents(request.store_id)
+        # 문서 자동 생성 (DB 조회 및 파일 쓰기는 스레드 풀에서 실행)
+        result = await run_blocking(doc_generator.generate_all_documents, request.store_id)
 
         return JSONResponse({
             "status": "success",
@@ -418,11 +708,30 @@ async def generate_documents(request: DocumentIndexRequest):
 
 @app.post("/api/index-documents")
 async def index_documents(request: DocumentIndexRequest):
-    """문서 인덱싱 엔드포인트"""
+    """
+    문서 인덱싱 엔드포인트
+
+    인덱싱 작업을 큐에 넣고 job_id를 즉시 반환합니다.
+    진행 상태는 GET /api/index-documents/{job_id}로 조회합니다.
+    Redis 큐를 사용할 수 없으면 기존처럼 인라인으로 인덱싱합니다.
+    """
     try:
         logger.info(f"문서 인덱싱 요청: store_id={request.store_id}, category={request.category}")
 
-        # 문서 인덱싱
+        job_id = None
+        if indexing_queue and indexing_queue.is_available():
+            job_id = await run_blocking(indexing_queue.enqueue_indexing, request.store_id, request.category)
+
+        if job_id:
+            return JSONResponse({
+                "status": "queued",
+                "job_id": job_id,
+                "store_id": request.store_id,
+                "category": request.category
+            }, status_code=202)
+
+        # 큐 사용 불가 → 인라인 인덱싱 (fallback)
+        logger.warning("⚠️ 인덱싱 큐 사용 불가 - API 서버에서 직접 인덱싱")
         result = await rag_pipeline.index_documents(
             store_id=request.store_id,
             category=request.category
@@ -438,6 +747,24 @@ async def index_documents(request: DocumentIndexRequest):
         )
 
 
+@app.get("/api/index-documents/{job_id}")
+async def get_index_job_status(job_id: str):
+    """
+    인덱싱 작업 상태 조회
+
+    Returns:
+        status(queued/started/finished/failed), 완료 시 result(인덱싱 결과), 실패 시 error
+    """
+    if not indexing_queue or not indexing_queue.is_available():
+        return JSONResponse({"error": "인덱싱 큐 사용 불가"}, status_code=503)
+
+    status = await run_blocking(indexing_queue.get_job_status, job_id)
+    if status is None:
+        return JSONResponse({"error": f"작업을 찾을 수 없습니다: {job_id}"}, status_code=404)
+
+    return JSONResponse(status)
+
+
 @app.get("/api/stores")
 async def get_stores():
     """매장 목록 조회"""
@@ -445,13 +772,16 @@ async def get_stores():
         from sqlalchemy import create_engine, text
         import os
 
-        db_url = os.getenv("DATABASE_URL")
-        engine = create_engine(db_url)
+        def _fetch_stores():
+            db_url = os.getenv("DATABASE_URL")
+            engine = create_engine(db_url)
+
+            with engine.connect() as conn:
+                query = text("SELECT id, store_name FROM stores ORDER BY id")
+                result = conn.execute(query)
+                return [{"id": row[0], "name": row[1]} for row in result]
 
-        with engine.connect() as conn:
-            query = text("SELECT id, store_name FROM stores ORDER BY id")
-            result = conn.execute(query)
-            stores = [{"id": row[0], "name": row[1]} for row in result]
+        stores = await run_blocking(_fetch_stores)
 
         return {"stores": stores}
 
@@ -526,6 +856,108 @@ async def get_logging_queue_status():
         )
 
 
+@app.get("/api/embeddings/batcher/stats")
+async def get_embedding_batcher_stats():
+    """
+    쿼리 임베딩 배처 통계 조회
+
+    Returns:
+        배치 설정, 평균 배치 크기, 대기/인코딩 시간, 배치 크기 히스토그램
+    """
+    return JSONResponse(rag_pipeline.query_embedder.get_stats())
+
+
+@app.get("/api/rerank/stats")
+async def get_rerank_stats():
+    """
+    검색 결과 재순위화 통계 조회
+
+    Returns:
+        재순위화 설정, 적용/부하 건너뜀/시간 초과 횟수, 평균 소요 시간
+    """
+    return JSONResponse(rag_pipeline.reranker.get_stats())
+
+
+@app.get("/api/faq-answers/stats")
+async def get_faq_answer_stats():
+    """
+    FAQ 사전 계산 답변 통계 조회
+
+    Returns:
+        사용 여부, 로드된 매장 수, 히트/미스 횟수
+    """
+    return JSONResponse(faq_store.get_stats())
+
+
+@app.get("/api/embeddings/cache/stats")
+async def get_embedding_cache_stats():
+    """
+    임베딩 캐시 통계 조회
+
+    Returns:
+        메모리/디스크 계층별 히트 수, 미스 수, 히트율
+    """
+    return JSONResponse(rag_pipeline.embeddings.cache.get_stats())
+
+
+@app.post("/api/embeddings/cache/clear")
+async def clear_embedding_cache():
+    """
+    임베딩 캐시 전체 삭제 (임베딩 모델 교체 시)
+
+    Returns:
+        삭제된 메모리/디스크 항목 수
+    """
+    return JSONResponse(await run_blocking(rag_pipeline.embeddings.cache.clear))
+
+
+@app.get("/api/answer-cache/stats")
+async def get_answer_cache_stats():
+    """
+    시맨틱 답변 캐시 통계 조회
+
+    Returns:
+        캐시 설정, 항목 수, 정확/시맨틱 히트 및 미스 카운터
+    """
+    return JSONResponse(rag_pipeline.answer_cache.get_stats())
+
+
+@app.post("/api/answer-cache/invalidate")
+async def invalidate_answer_cache(request: DocumentIndexRequest):
+    """
+    매장 답변 캐시 무효화 (인덱싱 워커가 벡터 변경 후 호출)
+
+    Returns:
+        삭제된 캐시 항목 수
+    """
+    removed = rag_pipeline.answer_cache.invalidate_store(request.store_id, request.category)
+    return JSONResponse({"status": "success", "removed": removed})
+
+
+@app.get("/api/indexing-queue/status")
+async def get_indexing_queue_status():
+    """
+    문서 인덱싱 큐 상태 조회
+
+    Returns:
+        큐 상태 정보 (대기중, 처리중, 완료, 실패 작업 수)
+    """
+    if not indexing_queue:
+        return JSONResponse({"available": False})
+    return JSONResponse(await run_blocking(indexing_queue.get_queue_info))
+
+
+@app.get("/api/router/stats")
+async def get_router_stats():
+    """
+    라우터 단계별 통계 조회
+
+    Returns:
+        규칙/LLM/휴리스틱/fallback 단계별 처리 건수 및 평균 소요 시간
+    """
+    return JSONResponse(router.get_stats())
+
+
 # =====================================================================
 # 대화 관리 API
 # =====================================================================
@@ -546,7 +978,8 @@ async def get_conversation(conversation_uuid: str, decrypt: bool = False):
                 status_code=503
             )
 
-        messages = conversation_service.get_conversation_messages(
+        messages = await run_blocking(
+            conversation_service.get_conversation_messages,
             conversation_uuid=conversation_uuid,
             decrypt=decrypt
         )
@@ -575,7 +1008,7 @@ async def end_conversation_session(conversation_uuid: str):
                 status_code=503
             )
 
-        conversation_service.end_conversation(conversation_uuid)
+        await run_blocking(conversation_service.end_conversation, conversation_uuid)
 
         return JSONResponse({
             "status": "success",
@@ -607,7 +1040,8 @@ async def get_conversation_statistics(store_id: int, days: int = 30):
                 status_code=503
             )
 
-        stats = conversation_service.get_store_statistics(
+        stats = await run_blocking(
+            conversation_service.get_store_statistics,
             store_id=store_id,
             days=days
         )
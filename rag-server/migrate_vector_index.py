@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+벡터 인덱스 마이그레이션
+
+기존 컬렉션(IVF_FLAT, 파티션 없음)을 현재 설정(get_index_config: 기본 HNSW +
+store_id partition key)과 현재 스키마(chunk_hash, sparse_embedding 포함)로 재구축합니다.
+dense 임베딩은 다시 계산하지 않고 그대로 복사합니다.
+기존 컬렉션에 sparse_embedding 필드가 없으면 텍스트로 BGE-M3 sparse 가중치를 계산해 채웁니다
+(이 경우 모델을 로드하므로 GPU/CPU 자원이 필요합니다).
+
+진행 순서:
+1. 새 설정으로 임시 컬렉션({name}_migrating) 생성
+2. 기존 컬렉션의 모든 엔티티를 배치로 복사 (query_iterator)
+3. count(*) 쿼리로 두 컬렉션의 개수 검증 후 기존 컬렉션을 {name}_backup_{시각}으로, 임시 컬렉션을 {name}으로 이름 변경
+4. --drop-backup 지정 시 백업 컬렉션 삭제
+
+이름 변경 후에는 RAG 서버/워커를 재시작해야 새 컬렉션을 로드합니다.
+
+실행 방법:
+    python migrate_vector_index.py --collection wafl_documents
+    python migrate_vector_index.py --dry-run
+"""
+
+import argparse
+import logging
+import sys
+import time
+
+from pymilvus import Collection, utility
+
+from vector_store import MilvusVectorStore, get_index_config, chunk_hash, EMPTY_SPARSE
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# 새 스키마의 필드 순서 (id는 auto_id)
+COPY_FIELDS = ["store_id", "category", "text", "chunk_hash", "embedding", "sparse_embedding"]
+
+
+def count_entities(collection: Collection) -> int:
+    """
+    삭제된 엔티티를 제외한 실제 엔티티 수
+
+    num_entities는 압축 전 삭제분을 포함하고 flush되지 않은 데이터는 빠뜨리므로
+    count(*) 쿼리를 Strong 일관성으로 실행합니다 (컬렉션이 로드되어 있어야 함).
+    """
+    rows = collection.query(expr="", output_fields=["count(*)"], consistency_level="Strong")
+    return int(rows[0]["count(*)"])
+
+
+def copy_entities(source: Collection, target: Collection, batch_size: int) -> int:
+    """
+    source의 모든 엔티티를 target으로 복사
+
+    이전 스키마에 chunk_hash 필드가 없으면 텍스트로 계산하여 채웁니다.
+    target에만 sparse_embedding 필드가 있으면 BGE-M3로 sparse 가중치를 계산하여 채웁니다.
+
+    Returns:
+        복사된 엔티티 수
+    """
+    source_fields = {field.name for field in source.schema.fields}
+    target_fields = {field.name for field in target.schema.fields}
+    write_fields = [field for field in COPY_FIELDS if field in target_fields]
+    read_fields = [field for field in write_fields if field in source_fields]
+
+    embeddings = None
+    if "sparse_embedding" in target_fields and "sparse_embedding" not in source_fields:
+        from embeddings import BGE_M3_Embeddings
+        logger.info("📦 sparse 가중치 계산을 위해 BGE-M3 모델 로드 중...")
+        embeddings = BGE_M3_Embeddings()
+
+    iterator = source.query_iterator(batch_size=batch_size, expr="id >= 0", output_fields=read_fields)
+    copied = 0
+    try:
+        while True:
+            rows = iterator.next()
+            if not rows:
+                break
+            if "chunk_hash" not in source_fields:
+                for row in rows:
+                    row["chunk_hash"] = chunk_hash(row["text"])
+            if embeddings is not None:
+                _, sparse = embeddings.embed_documents_hybrid([row["text"] for row in rows])
+                for row, weights in zip(rows, sparse):
+                    row["sparse_embedding"] = weights or EMPTY_SPARSE
+            target.insert([[row[field] for row in rows] for field in write_fields])
+            copied += len(rows)
+            logger.info(f"  복사 진행: {copied}개")
+    finally:
+        iterator.close()
+
+    target.flush()
+    return copied
+
+
+def migrate(collection_name: str, dimension: int, batch_size: int, dry_run: bool, drop_backup: bool) -> bool:
+    """
+    컬렉션 마이그레이션 실행
+
+    Returns:
+        성공 여부
+    """
+    config = get_index_config()
+    store = MilvusVectorStore(collection_name=collection_name, dimension=dimension, index_config=config)
+
+    current = store.describe_index()
+    source_count = count_entities(store.collection)
+    logger.info(f"📦 현재 컬렉션: {collection_name} ({source_count}개, 인덱스={current})")
+    logger.info(f"🎯 목표 설정: {store.index_params()} (partition_key={config['partition_key']}, "
+                f"num_partitions={config['num_partitions']})")
+
+    if dry_run:
+        logger.info("ℹ️ dry-run: 변경 없이 종료")
+        return True
+
+    temp_name = f"{collection_name}_migrating"
+    if utility.has_collection(temp_name):
+        logger.info(f"🗑️ 이전 임시 컬렉션 삭제: {temp_name}")
+        utility.drop_collection(temp_name)
+
+    started = time.perf_counter()
+    target = store.create_collection(temp_name)
+    copied = copy_entities(store.collection, target, batch_size)
+
+    # 교체 직전에 두 컬렉션을 다시 세어 비교 (복사 중 원본에 추가/삭제가 있었으면 중단)
+    target.flush()
+    source_count = count_entities(store.collection)
+    target_count = count_entities(target)
+    if target_count != source_count:
+        logger.error(f"❌ 개수 불일치: 원본 {source_count}개, 복사 {target_count}개 - 기존 컬렉션 유지")
+        return False
+
+    backup_name = f"{collection_name}_backup_{time.strftime('%Y%m%d%H%M%S')}"
+    store.collection.release()
+    utility.rename_collection(collection_name, backup_name)
+    utility.rename_collection(temp_name, collection_name)
+    logger.info(f"🔁 컬렉션 교체 완료: {collection_name} (백업: {backup_name})")
+
+    if drop_backup:
+        utility.drop_collection(backup_name)
+        logger.info(f"🗑️ 백업 컬렉션 삭제: {backup_name}")
+
+    logger.info(f"✅ 마이그레이션 완료: {copied}개 복사 ({time.perf_counter() - started:.1f}s)")
+    logger.info("ℹ️ RAG 서버와 워커를 재시작하여 새 컬렉션을 로드하세요")
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Milvus 벡터 인덱스 마이그레이션 (IVF_FLAT → HNSW + partition key + sparse 필드)")
+    parser.add_argument("--collection", default="wafl_documents", help="마이그레이션할 컬렉션")
+    parser.add_argument("--dimension", type=int, default=1024, help="임베딩 차원")
+    parser.add_argument("--batch-size", type=int, default=1000, help="복사 배치 크기")
+    parser.add_argument("--dry-run", action="store_true", help="현재/목표 설정만 출력")
+    parser.add_argument("--drop-backup", action="store_true", help="교체 후 기존 컬렉션 삭제")
+    args = parser.parse_args()
+
+    ok = migrate(args.collection, args.dimension, args.batch_size, args.dry_run, args.drop_backup)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
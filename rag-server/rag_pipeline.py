@@ -1,14 +1,23 @@
 import os
 import logging
-import ollama
-from sqlalchemy import create_engine, text
+from typing import Optional
+from sqlalchemy import create_engine
 
 from embeddings import BGE_M3_Embeddings
+from embedding_batcher import EmbeddingBatcher
+from answer_cache import SemanticAnswerCache
 from vector_store import MilvusVectorStore
-from document_loader import DocumentLoader
+from reranker import Reranker
+from context_budgeter import ContextBudgeter
+from document_indexer import DocumentIndexer, has_changes
+from llm_client import get_main_llm, truncate_answer
+from thread_pool import run_blocking
+from request_context import timed
 
 logger = logging.getLogger(__name__)
 
+RETRIEVAL_MODES = ("dense", "sparse", "hybrid")
+
 
 class RAGPipeline:
     """RAG 파이프라인: 문서 인덱싱 및 검색"""
@@ -17,20 +26,48 @@ class RAGPipeline:
         # 컴포넌트 초기화
         self.embeddings = BGE_M3_Embeddings()
         self.vector_store = MilvusVectorStore(dimension=self.embeddings.dimension)
-        self.document_loader = DocumentLoader(chunk_size=1000, chunk_overlap=200)
 
-        # Ollama 클라이언트 (메인 LLM)
-        main_url = os.getenv("OLLAMA_MAIN_URL", "http://112.148.37.41:1884")
-        self.llm_client = ollama.Client(host=main_url)
-        self.llm_model = "gemma3:27b-it-q4_K_M"
+        # 검색 방식 (dense / sparse / hybrid), sparse 필드가 없는 컬렉션은 dense만 가능
+        self.retrieval_mode = os.getenv("RETRIEVAL_MODE", "hybrid").lower()
+        if self.retrieval_mode not in RETRIEVAL_MODES:
+            logger.warning(f"⚠️ 알 수 없는 RETRIEVAL_MODE={self.retrieval_mode} - hybrid 사용")
+            self.retrieval_mode = "hybrid"
+        if self.retrieval_mode != "dense" and not self.vector_store.has_sparse:
+            logger.warning(f"⚠️ 컬렉션에 sparse 필드가 없어 {self.retrieval_mode} 대신 dense 검색 사용")
+            self.retrieval_mode = "dense"
+        # sparse 가중치가 이 값 이상인 문서가 있으면 dense 유사도가 낮아도 관련 문서로 판단
+        self.sparse_min_score = float(os.getenv("SPARSE_MIN_SCORE", "0.1"))
+        logger.info(f"🔎 검색 방식: {self.retrieval_mode}")
+
+        # 동시 쿼리 임베딩 배치 처리
+        self.query_embedder = EmbeddingBatcher(self.embeddings, with_sparse=self.retrieval_mode != "dense")
+        # 검색 후보 재순위화 + 토큰 예산 (RERANK_ENABLED)
+        self.reranker = Reranker()
+        # 청크 중복 제거 + 관련 섹션 추출 + 경로별 토큰 예산
+        self.context_budgeter = ContextBudgeter()
+        self.answer_cache = SemanticAnswerCache()  # 반복 질문 답변 캐시
+
+        # Ollama 비동기 클라이언트 (메인 LLM)
+        self.llm = get_main_llm()
+        self.llm_model = self.llm.model
 
         # 데이터베이스 연결
         db_url = os.getenv("DATABASE_URL")
         self.engine = create_engine(db_url)
 
+        # 문서 인덱서 (임베딩 모델/벡터 스토어/DB 연결 공유)
+        self.indexer = DocumentIndexer(
+            embeddings=self.embeddings,
+            vector_store=self.vector_store,
+            engine=self.engine
+        )
+
     async def index_documents(self, store_id: int, category: str = "customer") -> dict:
         """
-        특정 매장의 문서들을 인덱싱
+        특정 매장의 문서들을 증분 인덱싱 (API 서버 인라인 실행)
+
+        평소에는 인덱싱 워커(index_worker.py)가 처리하며,
+        Redis 큐를 사용할 수 없을 때만 이 경로로 API 서버에서 직접 실행합니다.
 
         Args:
             store_id: 매장 ID
@@ -39,128 +76,121 @@ class RAGPipeline:
         Returns:
             인덱싱 결과
         """
-        try:
-            # 데이터베이스에서 문서 경로 조회
-            with self.engine.connect() as conn:
-                query = text("""
-                    SELECT doc_path FROM rag_documents
-                    WHERE store_id = :store_id AND category = :category
-                """)
-                result = conn.execute(query, {"store_id": store_id, "category": category})
-                doc_paths = [row[0] for row in result]
-
-            if not doc_paths:
-                return {
-                    "status": "error",
-                    "message": f"매장 {store_id}의 {category} 문서가 없습니다."
-                }
-
-            # 기존 벡터 삭제
-            self.vector_store.delete_by_store(store_id, category)
-
-            # 문서 로드 및 청킹
-            all_chunks = []
-            for doc_path in doc_paths:
-                chunks = self.document_loader.load_and_chunk(doc_path)
-                all_chunks.extend(chunks)
-
-            if not all_chunks:
-                return {
-                    "status": "error",
-                    "message": "청킹된 문서가 없습니다."
-                }
-
-            # 임베딩 생성
-            embeddings = self.embeddings.embed_documents(all_chunks)
-
-            # 벡터 스토어에 삽입
-            self.vector_store.insert(
-                texts=all_chunks,
-                embeddings=embeddings,
-                store_id=store_id,
-                category=category
-            )
-
-            return {
-                "status": "success",
-                "indexed_documents": len(doc_paths),
-                "indexed_chunks": len(all_chunks),
-                "store_id": store_id,
-                "category": category
-            }
-
-        except Exception as e:
-            logger.error(f"인덱싱 오류: {str(e)}")
-            return {
-                "status": "error",
-                "message": str(e)
-            }
-
-    async def query(self, query: str, store_id: int, category: str = "customer", language: str = "ko") -> tuple[str, dict]:
+        result = await run_blocking(self.indexer.index, store_id, category)
+
+        # 변경이 있으면 답변 캐시 무효화
+        if has_changes(result):
+            self.answer_cache.invalidate_store(store_id, category)
+
+        return result
+
+    async def prepare_prompt(
+        self,
+        query: str,
+        store_id: int,
+        category: str = "customer",
+        language: str = "ko",
+        query_embedding: Optional[list[float]] = None,
+        context=None,
+        route: str = "RAG_QUERY",
+        sparse_embedding: Optional[dict[int, float]] = None
+    ) -> tuple[Optional[str], Optional[str], dict]:
         """
-        RAG 쿼리 실행
+        문서 검색 후 LLM 프롬프트 생성 (LLM 호출 전 단계)
+
+        일반 응답(query)과 스트리밍 응답(/api/chat/stream)이 공통으로 사용합니다.
 
         Args:
             query: 사용자 질문
             store_id: 매장 ID
             category: 문서 카테고리
             language: 응답 언어 (ko, en, ja, zh)
+            query_embedding: 이미 계산된 쿼리 임베딩 (없으면 새로 계산)
+            context: 요청 컨텍스트 (RequestContext, sparse 가중치 재사용)
+            route: 라우팅 경로 (컨텍스트 토큰 예산 선택)
+            sparse_embedding: 이미 계산된 sparse 가중치 (답변 캐시 조회에서 함께 계산됨)
 
         Returns:
-            tuple[str, dict]: (LLM 응답, 디버그 정보)
+            tuple: (프롬프트, 즉시 응답, 디버그 정보)
+                관련 문서가 없으면 프롬프트는 None이고 즉시 응답에 안내 메시지가 담깁니다.
         """
-        try:
-            logger.info("="*80)
-            logger.info("🔍 [RAG] 문서 검색 시작")
-            logger.info("="*80)
-
-            # 쿼리 임베딩
-            query_embedding = self.embeddings.embed_query(query)
-            logger.info(f"📊 쿼리 임베딩 완료 (차원: {len(query_embedding)})")
-
-            # 유사 문서 검색 (상위 5개)
-            documents = self.vector_store.search(
-                query_embedding=query_embedding,
-                store_id=store_id,
-                category=category,
-                top_k=5
-            )
-
-            # 언어별 에러 메시지
-            no_info_messages = {
-                "ko": "제가 잘 모르겠어요. 죄송하지만 직원에게 문의해주세요.",
-                "en": "I'm not sure. Please ask a staff member for assistance.",
-                "ja": "よくわかりません。申し訳ありませんが、スタッフにお問い合わせください。",
-                "zh": "我不太清楚。抱歉，请向工作人员咨询。"
+        logger.info("="*80)
+        logger.info("🔍 [RAG] 문서 검색 시작")
+        logger.info("="*80)
+
+        # 쿼리 임베딩 (동시 요청과 함께 배치 처리, 답변 캐시 조회에서 계산했으면 재사용)
+        if self.retrieval_mode != "dense":
+            if query_embedding is None or sparse_embedding is None:
+                embedding, sparse_embedding = await self.embed_query_hybrid(query, context)
+                query_embedding = query_embedding or embedding
+        elif query_embedding is None:
+            query_embedding = await self.query_embedder.embed_query(query)
+        logger.info(f"📊 쿼리 임베딩 완료 (차원: {len(query_embedding)}, sparse 토큰: {len(sparse_embedding or {})})")
+
+        # 유사 문서 검색 (재순위화 사용 시 후보를 더 많이 가져옴)
+        documents = await run_blocking(
+            self.retrieve, query_embedding, sparse_embedding, store_id, category, self.reranker.fetch_k
+        )
+
+        # 언어별 에러 메시지
+        no_info_messages = {
+            "ko": "제가 잘 모르겠어요. 죄송하지만 직원에게 문의해주세요.",
+            "en": "I'm not sure. Please ask a staff member for assistance.",
+            "ja": "よくわかりません。申し訳ありませんが、スタッフにお問い合わせください。",
+            "zh": "我不太清楚。抱歉，请向工作人员咨询。"
+        }
+        no_info_message = no_info_messages.get(language, no_info_messages["ko"])
+
+        if not documents:
+            logger.warning("⚠️ 검색된 문서가 없습니다")
+            return None, no_info_message, {"error": "No documents found"}
+
+        logger.info(f"📚 검색된 문서: {len(documents)}개")
+        for i, doc in enumerate(documents, 1):
+            logger.info(f"  [{i}] 유사도: {doc['score']:.4f} (sparse: {doc.get('sparse_score') or 0.0:.4f})")
+            logger.info(f"      내용 미리보기: {doc['text'][:100]}...")
+
+        # 유사도가 너무 낮으면 관련 정보 없음으로 처리 (dense 유사도 또는 어휘 일치 중 하나는 충분해야 함)
+        max_score = max(doc.get("dense_score") or 0.0 for doc in documents)
+        max_sparse_score = max(doc.get("sparse_score") or 0.0 for doc in documents)
+        if max_score < 0.3 and max_sparse_score < self.sparse_min_score:
+            logger.warning(f"⚠️ 최고 유사도가 너무 낮습니다: {max_score:.4f} (sparse: {max_sparse_score:.4f})")
+            return None, no_info_message, {
+                "error": "Low relevance score",
+                "max_score": max_score,
+                "max_sparse_score": max_sparse_score
             }
 
-            if not documents:
-                logger.warning("⚠️ 검색된 문서가 없습니다")
-                return no_info_messages.get(language, no_info_messages["ko"]), {"error": "No documents found"}
-
-            logger.info(f"📚 검색된 문서: {len(documents)}개")
-            for i, doc in enumerate(documents, 1):
-                logger.info(f"  [{i}] 유사도: {doc['score']:.4f}")
-                logger.info(f"      내용 미리보기: {doc['text'][:100]}...")
-
-            # 유사도가 너무 낮으면 관련 정보 없음으로 처리
-            if documents[0]['score'] < 0.3:
-                logger.warning(f"⚠️ 최고 유사도가 너무 낮습니다: {documents[0]['score']:.4f}")
-                return no_info_messages.get(language, no_info_messages["ko"]), {"error": "Low relevance score", "max_score": documents[0]['score']}
-
-            # 컨텍스트 생성
-            context = "\n\n".join([doc["text"] for doc in documents])
-
-            # 언어별 지시
-            language_instructions = {
-                "ko": "한국어로 답변하세요.",
-                "en": "Answer in English.",
-                "ja": "日本語で答えてください。",
-                "zh": "用中文回答。"
-            }
-
-            # 프롬프트 템플릿
-            prompt = f"""You are a friendly store assistant.
+        # 재순위화 후 토큰 예산 안의 청크만 사용 (부하/시간 초과 시 검색 순서 유지)
+        with timed(context, "rerank"):
+            documents, rerank_info = await self.reranker.rerank(query, documents)
+        logger.info(
+            f"🎯 재순위화 {rerank_info['status']}: {rerank_info['candidates']}개 → {rerank_info['selected']}개 "
+            f"({rerank_info['context_tokens']} 토큰, {rerank_info['rerank_ms']}ms)"
+        )
+
+        # 컨텍스트 생성 (중복 줄 제거, 질문 관련 섹션만 경로별 토큰 예산까지)
+        budget = self.context_budgeter.budget_for(route, category)
+        with timed(context, "context_budget"):
+            context_text, budget_info = await run_blocking(
+                self.context_budgeter.build, query, documents, budget, sparse_embedding
+            )
+        logger.info(
+            f"✂️ 컨텍스트 예산 적용: {budget_info['input_tokens']} → {budget_info['context_tokens']} 토큰 "
+            f"(예산 {budget}, 섹션 {budget_info['selected_sections']}/{budget_info['sections']}, "
+            f"중복 줄 {budget_info['duplicate_lines']}개)"
+        )
+
+        # 언어별 지시
+        language_instructions = {
+            "ko": "한국어로 답변하세요.",
+            "en": "Answer in English.",
+            "ja": "日本語で答えてください。",
+            "zh": "用中文回答。"
+        }
+
+        # 프롬프트 템플릿
+        prompt = f"""You are a friendly store assistant.
 Answer the customer's question based on the store documents below.
 
 Response rules:
@@ -174,54 +204,180 @@ Response rules:
 **IMPORTANT: {language_instructions.get(language, language_instructions["ko"])}**
 
 Store documents:
-{context}
+{context_text}
 
 Customer question: {query}
 
 Assistant answer:"""
 
-            logger.info("="*80)
-            logger.info("🤖 [LLM] 응답 생성")
-            logger.info("="*80)
-            logger.info(f"📝 최종 프롬프트 (길이: {len(prompt)} 문자):")
-            logger.info(f"\n{prompt}\n")
+        logger.info(f"📝 최종 프롬프트 (길이: {len(prompt)} 문자):")
+        logger.info(f"\n{prompt}\n")
+
+        debug_info = {
+            "retrieved_documents": [
+                {
+                    "score": doc["score"],
+                    "sparse_score": doc.get("sparse_score"),
+                    "rrf_score": doc.get("rrf_score"),
+                    "rerank_score": doc.get("rerank_score"),
+                    "text_preview": doc["text"][:200]
+                }
+                for doc in documents
+            ],
+            "retrieval_mode": self.retrieval_mode,
+            "rerank": rerank_info,
+            "context_budget": budget_info,
+            "prompt_tokens_estimate": self.context_budgeter.count_tokens(prompt),
+            "context_length": len(context_text),
+            "final_prompt": prompt,
+            "llm_model": self.llm_model
+        }
+
+        return prompt, None, debug_info
+
+    def retrieve(
+        self,
+        query_embedding: list[float],
+        sparse_embedding: Optional[dict[int, float]],
+        store_id: int,
+        category: str,
+        top_k: int = 5
+    ) -> list[dict]:
+        """검색 방식(retrieval_mode)에 따른 문서 검색 (blocking)"""
+        if self.retrieval_mode == "sparse":
+            return self.vector_store.search_sparse(sparse_embedding, store_id, category, top_k=top_k)
+        if self.retrieval_mode == "hybrid":
+            return self.vector_store.hybrid_search(query_embedding, sparse_embedding, store_id, category, top_k=top_k)
+        return self.vector_store.search(query_embedding, store_id, category, top_k=top_k)
+
+    async def embed_query_hybrid(self, query: str, context=None) -> tuple[list[float], Optional[dict[int, float]]]:
+        """쿼리 (dense 임베딩, sparse 가중치) (요청 컨텍스트에 같은 메시지가 있으면 재사용)"""
+        if context is not None and context.matches(query):
+            return await context.get_embedding(), await context.get_sparse_embedding()
+        return await self.query_embedder.embed_query_hybrid(query)
+
+    async def embed_query(self, query: str, context=None) -> list[float]:
+        """
+        쿼리 임베딩 (요청 컨텍스트에 같은 메시지의 임베딩이 있으면 재사용)
 
-            # LLM 응답 생성
-            response = self.llm_client.generate(
-                model=self.llm_model,
-                prompt=prompt
-            )
+        Args:
+            query: 검색 질의
+            context: 요청 컨텍스트 (RequestContext)
+        """
+        if context is not None and context.matches(query):
+            return await context.get_embedding()
+        return await self.query_embedder.embed_query(query)
+
+    async def lookup_cached_answer(
+        self,
+        query: str,
+        store_id: int,
+        category: str = "customer",
+        language: str = "ko",
+        context=None
+    ) -> tuple[Optional[str], Optional[dict], Optional[list[float]], Optional[dict[int, float]]]:
+        """
+        답변 캐시 조회 (정규화 텍스트 일치 → 임베딩 유사도 순)
 
-            answer = response['response'].strip()
+        context가 주어지면 (요청 컨텍스트) 정규화된 메시지와 라우터에서 계산한 임베딩을 재사용합니다.
+        검색에 sparse 가중치가 필요하면 같은 배치에서 함께 계산해 prepare_prompt가 다시 임베딩하지 않도록 합니다.
 
-            # 50자 제한 체크 및 추가 설명 제안
-            more_messages = {
-                "ko": "\n\n더 자세히 설명해드릴까요?",
-                "en": "\n\nWould you like more details?",
-                "ja": "\n\nもっと詳しく説明しましょうか？",
-                "zh": "\n\n需要更详细的说明吗？"
-            }
+        Returns:
+            tuple: (캐시된 답변, 디버그 정보, 쿼리 임베딩, sparse 가중치)
+                미스인 경우 답변/디버그 정보는 None이며, 계산된 임베딩/sparse 가중치를 재사용할 수 있습니다.
+        """
+        normalized = context.normalized_message if context is not None and context.matches(query) else None
+        cached = self.answer_cache.lookup_exact(store_id, category, language, query, normalized)
+        if cached:
+            return cached[0], cached[1], None, None
+
+        sparse_embedding = None
+        if self.retrieval_mode != "dense":
+            query_embedding, sparse_embedding = await self.embed_query_hybrid(query, context)
+        else:
+            query_embedding = await self.embed_query(query, context)
+        cached = self.answer_cache.lookup_similar(store_id, category, language, query_embedding)
+        if cached:
+            return cached[0], cached[1], query_embedding, sparse_embedding
+
+        return None, None, query_embedding, sparse_embedding
+
+    def cache_answer(
+        self,
+        query: str,
+        store_id: int,
+        category: str,
+        language: str,
+        query_embedding: Optional[list[float]],
+        answer: str,
+        debug_info: dict,
+        context=None
+    ):
+        """LLM이 생성한 RAG 답변을 캐시에 저장 (context: 요청 컨텍스트, 정규화된 메시지 재사용)"""
+        normalized = context.normalized_message if context is not None and context.matches(query) else None
+        self.answer_cache.put(store_id, category, language, query, query_embedding, answer, debug_info, normalized)
+
+    async def query(
+        self,
+        query: str,
+        store_id: int,
+        category: str = "customer",
+        language: str = "ko",
+        context=None
+    ) -> tuple[str, dict]:
+        """
+        RAG 쿼리 실행
 
-            if len(answer) > 50:
-                answer = answer[:50] + "..."
-                answer += more_messages.get(language, more_messages["ko"])
+        Args:
+            query: 사용자 질문
+            store_id: 매장 ID
+            category: 문서 카테고리
+            language: 응답 언어 (ko, en, ja, zh)
+            context: 요청 컨텍스트 (RequestContext, 라우터 임베딩 재사용 및 단계별 시간 기록)
+
+        Returns:
+            tuple[str, dict]: (LLM 응답, 디버그 정보)
+        """
+        try:
+            # 답변 캐시 조회
+            with timed(context, "rag_cache_lookup"):
+                cached_answer, cached_debug, query_embedding, sparse_embedding = await self.lookup_cached_answer(
+                    query, store_id, category, language, context
+                )
+            if cached_answer is not None:
+                return cached_answer, cached_debug
+
+            with timed(context, "retrieval"):
+                prompt, direct_answer, debug_info = await self.prepare_prompt(
+                    query=query,
+                    store_id=store_id,
+                    category=category,
+                    language=language,
+                    query_embedding=query_embedding,
+                    context=context,
+                    sparse_embedding=sparse_embedding
+                )
+
+            if prompt is None:
+                return direct_answer, debug_info
+
+            logger.info("="*80)
+            logger.info("🤖 [LLM] 응답 생성")
+            logger.info("="*80)
+
+            # LLM 응답 생성 (비동기) 및 50자 제한 적용
+            llm_usage = {}
+            with timed(context, "llm"):
+                answer = truncate_answer(await self.llm.generate(prompt, usage=llm_usage), language)
 
             logger.info(f"💬 LLM 응답:\n{answer}")
             logger.info("="*80)
 
-            debug_info = {
-                "retrieved_documents": [
-                    {
-                        "score": doc["score"],
-                        "text_preview": doc["text"][:200]
-                    }
-                    for doc in documents
-                ],
-                "context_length": len(context),
-                "final_prompt": prompt,
-                "llm_model": self.llm_model,
-                "llm_response": answer
-            }
+            debug_info["llm_response"] = answer
+            debug_info["llm_usage"] = llm_usage
+
+            # 답변 캐시 저장
+            self.cache_answer(query, store_id, category, language, query_embedding, answer, debug_info, context)
 
             return answer, debug_info
 
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+전체 매장 일괄 재인덱싱
+
+rag_documents 테이블의 모든 (store_id, category)를 한 번에 재인덱싱합니다.
+임베딩 모델이나 청킹 방식을 바꾼 뒤 전체 매장에 반영할 때 사용합니다.
+
+처리 구조:
+1. 로더 스레드 풀(--concurrency)이 매장별로 문서 청킹 + 기존 청크 해시 조회
+2. 여러 매장의 새 청크를 모아 큰 배치(--embed-batch)로 BGE-M3 인코딩
+   (컬렉션에 sparse 필드가 있으면 sparse 가중치도 같은 forward pass에서 계산)
+   (청크 캐시에 임베딩이 있는 청크는 인코딩 생략)
+3. BulkVectorWriter로 적재하고, 매장 행이 insert된 뒤 오래된 청크 삭제 + 변경된 매장의 RAG 서버 답변 캐시 무효화
+4. 완료한 매장은 상태 파일에 기록 → 중단 후 --resume으로 이어서 실행
+
+기본은 증분 모드(바뀐 청크만 임베딩)이며, --full은 모든 청크를 다시 적재합니다.
+(--full이어도 바뀌지 않은 문서는 청크 캐시의 임베딩을 재사용하며, 모델을 바꾸면 캐시 키가 달라져 새로 인코딩됩니다.)
+
+실행 방법:
+    python reindex_all.py --concurrency 4 --embed-batch 256
+    python reindex_all.py --full
+    python reindex_all.py --resume
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime
+
+from sqlalchemy import create_engine, text
+
+from embeddings import BGE_M3_Embeddings
+from vector_store import MilvusVectorStore, plan_chunk_update
+from document_loader import DocumentLoader
+from bulk_writer import BulkVectorWriter
+from tasks import invalidate_answer_cache
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_STATE_FILE = "/app/media/reindex_state.json"
+
+
+class ReindexState:
+    """재인덱싱 진행 상태 (완료한 매장 목록을 파일에 저장)"""
+
+    def __init__(self, path: str, resume: bool, full: bool):
+        self.path = path
+        self._lock = threading.Lock()
+        self.completed: set[str] = set()
+        self.data = {"full": full, "started_at": datetime.now().isoformat(), "completed": []}
+
+        if resume and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self.data = json.load(f)
+            self.completed = set(self.data.get("completed", []))
+            if self.data.get("full") != full:
+                logger.warning(f"⚠️ 이전 실행과 모드가 다릅니다 (이전 full={self.data.get('full')}, 현재 full={full})")
+            logger.info(f"↩️ 이어서 실행: 완료된 매장 {len(self.completed)}개 건너뜀")
+
+    @staticmethod
+    def key(store_id: int, category: str) -> str:
+        return f"{store_id}:{category}"
+
+    def is_done(self, store_id: int, category: str) -> bool:
+        return self.key(store_id, category) in self.completed
+
+    def mark_done(self, store_id: int, category: str):
+        """매장 완료 기록 (원자적 파일 교체)"""
+        with self._lock:
+            self.completed.add(self.key(store_id, category))
+            self.data["completed"] = sorted(self.completed)
+            self.data["updated_at"] = datetime.now().isoformat()
+
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+
+
+class FleetReindexer:
+    """전체 매장 재인덱싱 파이프라인"""
+
+    def __init__(self, concurrency: int, embed_batch: int, encode_batch_size: int, full: bool, state: ReindexState):
+        self.concurrency = concurrency
+        self.embed_batch = embed_batch
+        self.encode_batch_size = encode_batch_size
+        self.full = full
+        self.state = state
+
+        self.embeddings = BGE_M3_Embeddings()
+        self.vector_store = MilvusVectorStore(dimension=self.embeddings.dimension)
+        self.document_loader = DocumentLoader()
+        self.engine = create_engine(os.getenv("DATABASE_URL"))
+
+        # 통계
+        self.stores_done = 0
+        self.stores_failed = 0
+        self.embedded_chunks = 0
+        self.cached_chunks = 0
+        self.deleted_chunks = 0
+
+    def list_targets(self) -> dict[tuple[int, str], list[str]]:
+        """rag_documents에서 (store_id, category)별 문서 경로 조회"""
+        with self.engine.connect() as conn:
+            rows = conn.execute(text("""
+                SELECT store_id, category, doc_path FROM rag_documents
+                ORDER BY store_id, category
+            """))
+            targets: dict[tuple[int, str], list[str]] = {}
+            for store_id, category, doc_path in rows:
+                targets.setdefault((store_id, category), []).append(doc_path)
+        return targets
+
+    def prepare_store(self, store_id: int, category: str, doc_paths: list[str]) -> dict:
+        """매장 하나의 청킹 및 증분 계획 (로더 스레드에서 실행)"""
+        documents = [self.document_loader.load_document(doc_path) for doc_path in doc_paths]
+        chunks = [chunk for document in documents for chunk in document["chunks"]]
+
+        existing = self.vector_store.get_chunk_hashes(store_id, category)
+        chunks_by_hash, new_hashes, stale_ids = plan_chunk_update(chunks, existing, full=self.full)
+
+        # 청크 캐시에 임베딩이 있는 청크는 다시 인코딩하지 않음
+        cached = self.document_loader.cached_embeddings(documents, with_sparse=self.vector_store.has_sparse)
+        return {
+            "store_id": store_id,
+            "category": category,
+            "documents": documents,
+            "texts": [chunks_by_hash[h] for h in new_hashes],
+            "hashes": new_hashes,
+            "vectors": {h: cached[h] for h in new_hashes if h in cached},
+            "stale_ids": stale_ids
+        }
+
+    def run(self) -> bool:
+        """
+        재인덱싱 실행
+
+        Returns:
+            모든 매장 성공 여부
+        """
+        targets = self.list_targets()
+        pending_targets = [
+            (store_id, category, paths) for (store_id, category), paths in targets.items()
+            if not self.state.is_done(store_id, category)
+        ]
+        total = len(pending_targets)
+        logger.info(f"🚀 재인덱싱 시작: 대상 {total}개 (전체 {len(targets)}개, full={self.full})")
+
+        self._started = time.perf_counter()
+        self._total = total
+        batch: list[dict] = []
+        batch_chunks = 0
+
+        with BulkVectorWriter(self.vector_store) as writer, \
+                ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="reindex-loader") as pool:
+            # 준비된 매장이 메모리에 너무 많이 쌓이지 않도록 동시 제출 수 제한
+            queue = iter(pending_targets)
+            in_flight: dict = {}
+            max_in_flight = self.concurrency * 4
+
+            while True:
+                for store_id, category, paths in queue:
+                    in_flight[pool.submit(self.prepare_store, store_id, category, paths)] = (store_id, category)
+                    if len(in_flight) >= max_in_flight:
+                        break
+                if not in_flight:
+                    break
+
+                finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    store_id, category = in_flight.pop(future)
+                    try:
+                        plan = future.result()
+                    except Exception as e:
+                        self.stores_failed += 1
+                        logger.error(f"❌ 매장 준비 실패: store_id={store_id}, category={category} - {str(e)}")
+                        continue
+
+                    if not plan["texts"]:
+                        # 새 청크가 없으면 오래된 청크만 삭제하고 완료
+                        self._complete(plan)
+                        continue
+
+                    batch.append(plan)
+                    batch_chunks += len(plan["texts"])
+                    if batch_chunks >= self.embed_batch:
+                        self._embed_and_write(batch, writer)
+                        batch, batch_chunks = [], 0
+
+            if batch:
+                self._embed_and_write(batch, writer)
+
+        self._log_progress(final=True)
+        return self.stores_failed == 0
+
+    def _embed_and_write(self, batch: list[dict], writer: BulkVectorWriter):
+        """여러 매장의 새 청크 중 캐시에 없는 것만 한 번에 인코딩 후 writer에 추가"""
+        pending = [
+            (plan, h, text) for plan in batch
+            for h, text in zip(plan["hashes"], plan["texts"])
+            if h not in plan["vectors"]
+        ]
+        with_sparse = self.vector_store.has_sparse
+        if pending:
+            texts = [text for _, _, text in pending]
+            if with_sparse:
+                dense, sparse = self.embeddings.embed_documents_hybrid(texts, batch_size=self.encode_batch_size)
+            else:
+                dense = self.embeddings.embed_documents(texts, batch_size=self.encode_batch_size)
+                sparse = [None] * len(dense)
+            for (plan, h, _), vector, weights in zip(pending, dense, sparse):
+                plan["vectors"][h] = (vector, weights)
+        self.embedded_chunks += len(pending)
+        self.cached_chunks += sum(len(plan["hashes"]) for plan in batch) - len(pending)
+
+        for plan in batch:
+            self.document_loader.store_embeddings(plan["documents"], plan["vectors"])
+            writer.add(
+                plan["texts"],
+                [plan["vectors"][h][0] for h in plan["hashes"]],
+                plan["store_id"],
+                plan["category"],
+                chunk_hashes=plan["hashes"],
+                sparse_embeddings=[plan["vectors"][h][1] for h in plan["hashes"]] if with_sparse else None,
+                after_insert=lambda plan=plan: self._complete(plan)
+            )
+            # 적재 후에는 문서/벡터가 필요 없으므로 메모리 해제
+            plan["documents"] = plan["vectors"] = None
+
+    def _complete(self, plan: dict):
+        """새 청크 insert 이후 오래된 청크 삭제, 답변 캐시 무효화 및 완료 기록"""
+        self.vector_store.delete_by_ids(plan["stale_ids"])
+        self.deleted_chunks += len(plan["stale_ids"])
+        if plan["texts"] or plan["stale_ids"]:
+            # 인덱싱 워커와 같은 API로 RAG 서버의 이전 답변 캐시 제거 (실패하면 TTL 만료 대기)
+            invalidate_answer_cache(plan["store_id"], plan["category"])
+        self.state.mark_done(plan["store_id"], plan["category"])
+        self.stores_done += 1
+        self._log_progress()
+
+    def _log_progress(self, final: bool = False):
+        """진행률 출력 (처리량 및 예상 남은 시간)"""
+        done = self.stores_done + self.stores_failed
+        if not final and done % 10 and done != self._total:
+            return
+
+        elapsed = time.perf_counter() - self._started
+        rate = self.embedded_chunks / elapsed if elapsed > 0 else 0.0
+        eta = (elapsed / done) * (self._total - done) if done else 0.0
+        prefix = "✅ 재인덱싱 완료" if final else "📈 진행"
+        logger.info(
+            f"{prefix}: {done}/{self._total} 매장 (실패 {self.stores_failed}), "
+            f"임베딩 {self.embedded_chunks}개 ({rate:.1f} chunks/s), 캐시 재사용 {self.cached_chunks}개, 삭제 {self.deleted_chunks}개, "
+            f"경과 {elapsed:.0f}s" + ("" if final else f", 남은 시간 약 {eta:.0f}s")
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="전체 매장 일괄 재인덱싱")
+    parser.add_argument("--concurrency", type=int, default=4, help="문서 청킹/조회 동시 실행 수")
+    parser.add_argument("--embed-batch", type=int, default=256, help="한 번에 인코딩할 청크 수 (여러 매장 합산)")
+    parser.add_argument("--encode-batch-size", type=int, default=32, help="BGE-M3 forward 배치 크기")
+    parser.add_argument("--full", action="store_true", help="변경 여부와 관계없이 모든 청크 재적재")
+    parser.add_argument("--resume", action="store_true", help="상태 파일의 완료 매장 건너뛰기")
+    parser.add_argument("--state-file", default=DEFAULT_STATE_FILE, help="진행 상태 파일 경로")
+    args = parser.parse_args()
+
+    state = ReindexState(args.state_file, resume=args.resume, full=args.full)
+    reindexer = FleetReindexer(
+        concurrency=args.concurrency,
+        embed_batch=args.embed_batch,
+        encode_batch_size=args.encode_batch_size,
+        full=args.full,
+        state=state
+    )
+    ok = reindexer.run()
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+요청 컨텍스트 (Request Context)
+
+/api/chat 요청 하나를 처리하는 동안 라우터 → 툴/RAG/일반 대화 단계를 따라 전달되며,
+비용이 드는 중간 결과를 요청당 한 번만 계산하도록 메모이즈합니다.
+
+- 정규화된 메시지 (답변 캐시 조회/저장 키)
+- 쿼리 임베딩 및 sparse 가중치 (의도 분류, 답변 캐시 조회, RAG 검색이 공유)
+- 단계별 소요 시간 (debug["request"]["timings_ms"]로 반환)
+
+단계 시간은 중첩될 수 있습니다 (예: "embedding"은 "route" 또는 "rag_cache_lookup" 안에서 측정됨).
+"""
+
+import time
+import logging
+from contextlib import contextmanager, nullcontext
+from typing import Optional, Dict, Any
+
+from answer_cache import normalize_query
+
+logger = logging.getLogger(__name__)
+
+class RequestContext:
+    """요청 단위 메모이즈 컨텍스트"""
+
+    def __init__(self, message: str, query_embedder=None):
+        """
+        Args:
+            message: 사용자 메시지
+            query_embedder: 쿼리 임베딩 배처 (EmbeddingBatcher)
+        """
+        self.message = message
+        self.query_embedder = query_embedder
+        self.timings: Dict[str, float] = {}
+
+        self._normalized_message: Optional[str] = None
+        self._embedding: Optional[list[float]] = None
+        self._sparse_embedding: Optional[dict[int, float]] = None
+        self._started = time.perf_counter()
+
+    @property
+    def normalized_message(self) -> str:
+        """정규화된 메시지 (최초 접근 시 1회 계산)"""
+        if self._normalized_message is None:
+            self._normalized_message = normalize_query(self.message)
+        return self._normalized_message
+
+    @property
+    def has_embedding(self) -> bool:
+        """쿼리 임베딩 계산 여부"""
+        return self._embedding is not None
+
+    async def get_embedding(self) -> list[float]:
+        """메시지 쿼리 임베딩 (최초 호출 시 1회 계산, 이후 재사용)"""
+        if self._embedding is None:
+            with self.span("embedding"):
+                # sparse 가중치도 같은 배치에서 계산되므로 함께 보관
+                self._embedding, self._sparse_embedding = await self.query_embedder.embed_query_hybrid(self.message)
+        return self._embedding
+
+    async def get_sparse_embedding(self) -> Optional[dict[int, float]]:
+        """메시지 sparse 가중치 (배처의 with_sparse가 꺼져 있으면 None)"""
+        await self.get_embedding()
+        return self._sparse_embedding
+
+    def matches(self, query: str) -> bool:
+        """질의가 이 요청의 원본 메시지와 같은지 (임베딩 재사용 가능 여부)"""
+        return query == self.message
+
+    @contextmanager
+    def span(self, name: str):
+        """
+        단계 소요 시간 측정 (같은 이름이 여러 번 측정되면 누적)
+
+        사용 예:
+            with context.span("route"):
+                decision = await router.route(message, context)
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self.timings[name] = round(self.timings.get(name, 0.0) + elapsed_ms, 2)
+
+    def to_debug(self) -> Dict[str, Any]:
+        """디버그 정보 (단계별 소요 시간 및 메모이즈된 값 요약)"""
+        return {
+            "normalized_message": self.normalized_message,
+            "embedded": self.has_embedding,
+            "timings_ms": dict(self.timings),
+            "total_ms": round((time.perf_counter() - self._started) * 1000, 2)
+        }
+
+
+def timed(context: Optional[RequestContext], name: str):
+    """컨텍스트가 있으면 단계 시간 측정, 없으면 아무것도 하지 않는 컨텍스트 매니저"""
+    return context.span(name) if context is not None else nullcontext()
@@ -0,0 +1,212 @@
+"""
+검색 결과 재순위화 (Reranker)
+
+벡터 검색 후보(기본 20개)를 cross-encoder로 질문과 함께 다시 점수 매겨,
+관련도가 높은 청크만 토큰 예산 안에서 골라 프롬프트에 넣습니다.
+프롬프트가 짧아져 LLM 첫 토큰이 빨라지고, 관련 없는 청크로 인한 잘못된 답변이 줄어듭니다.
+
+GPU는 임베딩/LLM이 쓰므로 기본적으로 CPU에서 배치로 실행하며, 지연 예산이 있습니다.
+- 이미 실행 중인 재순위화가 RERANK_MAX_PENDING개 이상이면 (부하 상황) 바로 건너뜀
+- RERANK_TIMEOUT_MS 안에 끝나지 않으면 검색 순서 그대로 사용
+건너뛴 경우에도 토큰 예산은 적용합니다.
+
+설정 (환경변수):
+- RERANK_ENABLED: 재순위화 사용 여부 (기본 false)
+- RERANK_MODEL: cross-encoder 모델 (기본 BAAI/bge-reranker-v2-m3)
+- RERANK_DEVICE: 실행 장치 (기본 cpu)
+- RERANK_BATCH_SIZE: cross-encoder 배치 크기 (기본 16)
+- RERANK_CANDIDATES: 재순위화할 검색 후보 수 (기본 20)
+- RERANK_TOP_K: 프롬프트에 넣을 최대 청크 수 (기본 5)
+- RERANK_TOKEN_BUDGET: 프롬프트에 넣을 청크 토큰 합계 한도 (기본 1500)
+- RERANK_MIN_SCORE: 이 점수(0~1) 미만 청크 제외, 최상위 1개는 항상 유지 (기본 0.05)
+- RERANK_TIMEOUT_MS: 재순위화 최대 대기 시간 (기본 300ms)
+- RERANK_MAX_PENDING: 동시에 실행할 수 있는 재순위화 수 (기본 2)
+"""
+
+import os
+import time
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any
+
+from document_loader import get_tokenizer
+
+logger = logging.getLogger(__name__)
+
+
+class Reranker:
+    """cross-encoder 재순위화 + 토큰 예산 기반 청크 선택"""
+
+    def __init__(
+        self,
+        enabled: Optional[bool] = None,
+        model_name: Optional[str] = None,
+        candidates: Optional[int] = None,
+        top_k: Optional[int] = None,
+        token_budget: Optional[int] = None,
+        timeout_ms: Optional[float] = None,
+        tokenizer=None
+    ):
+        """
+        Args:
+            enabled: 재순위화 사용 여부
+            model_name: cross-encoder 모델
+            candidates: 재순위화할 검색 후보 수
+            top_k: 최대 선택 청크 수
+            token_budget: 선택 청크 토큰 합계 한도
+            timeout_ms: 재순위화 최대 대기 시간 (ms)
+            tokenizer: 토큰 계산용 토크나이저 (None이면 임베딩 모델 토크나이저)
+        """
+        self.enabled = enabled if enabled is not None else os.getenv("RERANK_ENABLED", "false").lower() == "true"
+        self.model_name = model_name or os.getenv("RERANK_MODEL", "BAAI/bge-reranker-v2-m3")
+        self.device = os.getenv("RERANK_DEVICE", "cpu")
+        self.batch_size = int(os.getenv("RERANK_BATCH_SIZE", "16"))
+        self.candidates = candidates or int(os.getenv("RERANK_CANDIDATES", "20"))
+        self.top_k = top_k or int(os.getenv("RERANK_TOP_K", "5"))
+        self.token_budget = token_budget or int(os.getenv("RERANK_TOKEN_BUDGET", "1500"))
+        self.min_score = float(os.getenv("RERANK_MIN_SCORE", "0.05"))
+        self.timeout_ms = timeout_ms if timeout_ms is not None else float(os.getenv("RERANK_TIMEOUT_MS", "300"))
+        self.max_pending = int(os.getenv("RERANK_MAX_PENDING", "2"))
+        self.tokenizer = tokenizer or get_tokenizer()
+
+        self.model = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending = 0
+        self._lock = threading.Lock()
+
+        # 통계
+        self.applied = 0
+        self.skipped_load = 0
+        self.timeouts = 0
+        self.errors = 0
+        self.total_rerank_ms = 0.0
+
+        if self.enabled:
+            from sentence_transformers import CrossEncoder
+            logger.info(f"재순위화 모델 로딩 중... ({self.model_name}, device={self.device})")
+            self.model = CrossEncoder(self.model_name, max_length=512, device=self.device)
+            # 시간 초과된 작업이 쌓여도 다른 블로킹 작업(임베딩/검색)을 막지 않도록 전용 스레드 사용
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="rag-rerank")
+            logger.info(
+                f"✅ 재순위화 활성화 (후보 {self.candidates}개 → 최대 {self.top_k}개, "
+                f"토큰 예산 {self.token_budget}, 제한 {self.timeout_ms}ms)"
+            )
+
+    @property
+    def fetch_k(self) -> int:
+        """벡터 검색에서 가져올 후보 수"""
+        return self.candidates if self.enabled else self.top_k
+
+    async def rerank(self, query: str, documents: list[dict]) -> tuple[list[dict], dict]:
+        """
+        후보 재순위화 후 토큰 예산 안에서 선택
+
+        Args:
+            query: 검색 질의
+            documents: 벡터 검색 결과 (검색 점수 순)
+
+        Returns:
+            tuple: (선택된 문서, 재순위화 정보 {"status", "rerank_ms", "candidates", "selected", "context_tokens"})
+                status: applied | disabled | skipped_load | timeout | error
+        """
+        status = "disabled"
+        rerank_ms = 0.0
+        ranked = documents
+
+        if self.enabled and len(documents) > 1:
+            if self._pending >= self.max_pending:
+                status = "skipped_load"
+                self.skipped_load += 1
+            else:
+                started = time.perf_counter()
+                future = self._executor.submit(self.score, query, [doc["text"] for doc in documents])
+                # 시간 초과 후에도 스레드에서 계속 실행되므로 실제로 끝날 때 pending 감소
+                with self._lock:
+                    self._pending += 1
+                future.add_done_callback(self._on_done)
+                try:
+                    scores = await asyncio.wait_for(asyncio.wrap_future(future), timeout=self.timeout_ms / 1000)
+                    ranked = sorted(
+                        ({**doc, "rerank_score": score} for doc, score in zip(documents, scores)),
+                        key=lambda doc: doc["rerank_score"],
+                        reverse=True
+                    )
+                    status = "applied"
+                    self.applied += 1
+                except asyncio.TimeoutError:
+                    status = "timeout"
+                    self.timeouts += 1
+                    logger.warning(f"⏱️ 재순위화 시간 초과 ({self.timeout_ms}ms) - 검색 순서 사용")
+                except Exception as e:
+                    status = "error"
+                    self.errors += 1
+                    logger.error(f"재순위화 오류: {str(e)}")
+                finally:
+                    rerank_ms = (time.perf_counter() - started) * 1000
+                    self.total_rerank_ms += rerank_ms
+
+        selected, context_tokens = self.select(ranked)
+        return selected, {
+            "status": status,
+            "rerank_ms": round(rerank_ms, 2),
+            "candidates": len(documents),
+            "selected": len(selected),
+            "context_tokens": context_tokens
+        }
+
+    def _on_done(self, future):
+        """재순위화 작업 종료 (시간 초과로 버려진 작업 포함)"""
+        with self._lock:
+            self._pending -= 1
+
+    def score(self, query: str, texts: list[str]) -> list[float]:
+        """질문-청크 쌍 관련도 점수 (0~1, blocking)"""
+        scores = self.model.predict([(query, text) for text in texts], batch_size=self.batch_size)
+        return [float(score) for score in scores]
+
+    def select(self, documents: list[dict]) -> tuple[list[dict], int]:
+        """
+        순서대로 top_k개까지, 토큰 합계가 예산을 넘지 않는 청크 선택
+
+        최상위 청크는 예산을 넘더라도 항상 포함하고, rerank_score가 min_score 미만인 청크는 제외합니다.
+
+        Returns:
+            tuple: (선택된 문서, 선택된 청크 토큰 합계)
+        """
+        selected = []
+        total_tokens = 0
+        for document in documents:
+            if len(selected) >= self.top_k:
+                break
+            if selected and document.get("rerank_score", 1.0) < self.min_score:
+                continue
+
+            tokens = len(self.tokenizer(document["text"], add_special_tokens=False, verbose=False)["input_ids"])
+            if selected and total_tokens + tokens > self.token_budget:
+                continue
+            selected.append(document)
+            total_tokens += tokens
+
+        return selected, total_tokens
+
+    def get_stats(self) -> Dict[str, Any]:
+        """재순위화 설정 및 통계"""
+        attempts = self.applied + self.timeouts + self.errors
+        return {
+            "enabled": self.enabled,
+            "model": self.model_name if self.enabled else None,
+            "device": self.device,
+            "candidates": self.candidates,
+            "top_k": self.top_k,
+            "token_budget": self.token_budget,
+            "timeout_ms": self.timeout_ms,
+            "max_pending": self.max_pending,
+            "pending": self._pending,
+            "applied": self.applied,
+            "skipped_load": self.skipped_load,
+            "timeouts": self.timeouts,
+            "errors": self.errors,
+            "avg_rerank_ms": round(self.total_rerank_ms / attempts, 2) if attempts else 0.0
+        }
@@ -2,6 +2,8 @@
 지능형 라우터 (Intelligent Router)
 
 Kanana 모델을 사용하여 사용자 질문을 분석하고 최적의 처리 경로를 결정합니다.
+의도가 명확한 메시지는 규칙 기반 고속 라우터(fast_router)가 LLM 호출 없이 먼저 처리하고,
+그 다음 임베딩 의도 분류기(intent_classifier)가 처리하며, 애매한 경우만 Kanana를 호출합니다.
 
 라우팅 결과:
 - TOOL_CALL: 툴 호출이 필요한 경우
@@ -13,10 +15,13 @@ import os
 import json
 import logging
 import re
+import time
 from typing import Dict, Any, Optional
-import ollama
 
 from tool_executor import get_tool_executor
+from llm_client import get_router_llm
+from fast_router import RuleBasedRouter, TOOL_KEYWORDS, RAG_KEYWORDS
+from faq_answers import FAQ_LABEL_PREFIX, is_faq_excluded
 
 logger = logging.getLogger(__name__)
 
@@ -26,22 +31,45 @@ class IntelligentRouter:
 
     def __init__(self):
         """라우터 초기화"""
-        # Kanana 모델 초기화
-        self.router_url = os.getenv("OLLAMA_AGENT_URL", "http://112.148.37.41:1889")
-        self.router_client = ollama.Client(host=self.router_url)
-        self.router_model = "huihui_ai/kanana-nano-abliterated:2.1b"
+        # Kanana 모델 초기화 (비동기 클라이언트)
+        self.router_llm = get_router_llm()
+        self.router_model = self.router_llm.model
 
         # 툴 실행기 (툴 정보 조회용)
         self.tool_executor = get_tool_executor()
 
+        # 1단계 규칙 기반 분류기 (이 confidence 이상이면 LLM 생략)
+        self.rule_router = RuleBasedRouter(self.tool_executor)
+        self.rule_confidence_threshold = float(os.getenv("FAST_ROUTER_CONFIDENCE", "0.9"))
+
+        # 2단계 임베딩 의도 분류기 (attach_intent_classifier로 연결)
+        self.intent_classifier = None
+        # FAQ 의도는 사전 계산 답변을 그대로 반환하므로 더 높은 기준으로만 확정
+        self.faq_min_similarity = float(os.getenv("FAQ_MIN_SIMILARITY", "0.75"))
+        self.faq_min_margin = float(os.getenv("FAQ_MIN_MARGIN", "0.1"))
+
+        # 단계별 처리 통계
+        self.stage_counts = {"rule": 0, "embedding": 0, "llm": 0, "heuristic": 0, "fallback": 0}
+        self.stage_time_ms = {"rule": 0.0, "embedding": 0.0, "llm": 0.0, "heuristic": 0.0, "fallback": 0.0}
+
         logger.info("✅ 지능형 라우터 초기화 완료")
 
-    async def route(self, user_message: str) -> Dict[str, Any]:
+    def attach_intent_classifier(self, intent_classifier):
+        """
+        임베딩 의도 분류기 연결
+
+        Args:
+            intent_classifier: EmbeddingIntentClassifier (RAG 파이프라인과 임베딩 모델 공유)
+        """
+        self.intent_classifier = intent_classifier
+
+    async def route(self, user_message: str, context=None) -> Dict[str, Any]:
         """
         사용자 메시지를 분석하여 최적의 경로 결정
 
         Args:
             user_message: 사용자 메시지
+            context: 요청 컨텍스트 (RequestContext, 쿼리 임베딩을 RAG 단계와 공유)
 
         Returns:
             라우팅 결정 딕셔너리:
@@ -51,45 +79,172 @@ class IntelligentRouter:
                 "tool_params": dict (TOOL_CALL인 경우),
                 "tool_type": str (TOOL_CALL인 경우),
                 "query": str (RAG_QUERY/SIMPLE_QA인 경우),
+                "faq_intent": str (사전 계산 답변이 있을 수 있는 FAQ 의도, 규칙/임베딩 단계의 RAG_QUERY인 경우만),
                 "confidence": float (0-1),
-                "reasoning": str
+                "reasoning": str,
+                "stage": "rule" | "embedding" | "llm" | "heuristic" | "fallback"
             }
         """
+        started = time.perf_counter()
+
         try:
             logger.info("="*80)
             logger.info("🧭 [라우터] 경로 결정 시작")
             logger.info("="*80)
             logger.info(f"📝 사용자 메시지: {user_message}")
 
-            # 프롬프트 생성
+            # 1단계: 규칙 기반 고속 분류 (LLM 호출 없음)
+            rule_decision = self.rule_router.classify(user_message)
+            if rule_decision and rule_decision["confidence"] >= self.rule_confidence_threshold:
+                rule_decision["stage"] = "rule"
+                self._log_decision(rule_decision)
+                return self._record_stage(rule_decision, started)
+
+            # 2단계: 임베딩 의도 분류 (centroid 내적 1회)
+            if self.intent_classifier and self.intent_classifier.ready:
+                if context is not None:
+                    query_embedding = await context.get_embedding()
+                else:
+                    query_embedding = await self.intent_classifier.embed(user_message)
+                intent_decision = self._route_by_intent(user_message, query_embedding)
+                if intent_decision:
+                    self._log_decision(intent_decision)
+                    return self._record_stage(intent_decision, started)
+
+            # 3단계: Kanana LLM 라우팅
             prompt = self._create_routing_prompt(user_message)
 
             logger.info(f"📋 라우터 프롬프트 생성 완료 (길이: {len(prompt)} 문자)")
 
-            # Kanana 모델 호출
-            response = self.router_client.generate(
-                model=self.router_model,
-                prompt=prompt
-            )
-
-            raw_response = response['response'].strip()
+            # Kanana 모델 호출 (이벤트 루프를 막지 않도록 비동기 호출)
+            raw_response = await self.router_llm.generate(prompt)
             logger.info(f"💬 라우터 응답:\n{raw_response}")
 
-            # JSON 파싱
+            # JSON 파싱 (실패 시 휴리스틱)
             routing_decision = self._parse_routing_response(raw_response, user_message)
+            routing_decision.setdefault("stage", "llm")
 
-            logger.info(f"✅ 라우팅 결정: {routing_decision['route']}")
-            if routing_decision['route'] == 'TOOL_CALL':
-                logger.info(f"   🔧 툴: {routing_decision.get('tool_name')} ({routing_decision.get('tool_type')})")
-                logger.info(f"   📦 파라미터: {routing_decision.get('tool_params')}")
-            logger.info("="*80)
-
-            return routing_decision
+            self._log_decision(routing_decision)
+            return self._record_stage(routing_decision, started)
 
         except Exception as e:
             logger.error(f"❌ 라우팅 오류: {str(e)}", exc_info=True)
             # 오류 시 SIMPLE_QA로 fallback
-            return self._create_fallback_decision(user_message, str(e))
+            return self._record_stage(self._create_fallback_decision(user_message, str(e)), started)
+
+    def _route_by_intent(self, user_message: str, query_embedding: list[float]) -> Optional[Dict[str, Any]]:
+        """
+        임베딩 의도 분류 결과를 라우팅 결정으로 변환
+
+        Args:
+            user_message: 사용자 메시지
+            query_embedding: 쿼리 임베딩
+
+        Returns:
+            라우팅 결정 또는 None (margin이 작거나 필수 파라미터를 추출하지 못한 경우 → LLM)
+        """
+        intent = self.intent_classifier.classify(query_embedding)
+        if intent is None:
+            return None
+
+        logger.info(
+            f"🧲 임베딩 의도 분류: {intent['label']} "
+            f"(유사도={intent['similarity']}, margin={intent['margin']})"
+        )
+        if not intent["confident"]:
+            return None
+
+        reasoning = f"임베딩 의도 분류 (유사도 {intent['similarity']}, margin {intent['margin']})"
+        label = intent["label"]
+
+        if label.startswith(FAQ_LABEL_PREFIX):
+            # FAQ 의도는 RAG 경로로 보내되, 확신이 높고 조건이 붙지 않은 질문만
+            # 사전 계산된 답변으로 검색/LLM 없이 응답
+            decision = {
+                "route": "RAG_QUERY",
+                "query": user_message,
+                "confidence": intent["similarity"],
+                "reasoning": reasoning,
+                "stage": "embedding",
+                "intent_scores": intent["scores"]
+            }
+            if (
+                intent["similarity"] >= self.faq_min_similarity
+                and intent["margin"] >= self.faq_min_margin
+                and not is_faq_excluded(user_message)
+            ):
+                decision["faq_intent"] = label[len(FAQ_LABEL_PREFIX):]
+            return decision
+
+        if label in ("RAG_QUERY", "SIMPLE_QA"):
+            return {
+                "route": label,
+                "query": user_message,
+                "confidence": intent["similarity"],
+                "reasoning": reasoning,
+                "stage": "embedding",
+                "intent_scores": intent["scores"]
+            }
+
+        tool_name = label.split(":", 1)[1]
+        tool_info = self.tool_executor.get_tool_info(tool_name)
+        if not tool_info:
+            return None
+
+        # 필수 파라미터와 enum 파라미터는 메시지에서 추출된 경우만 확정 (추측하지 않음)
+        tool_params = self.rule_router.extract_params(tool_name, user_message)
+        for param_name, param_info in tool_info["parameters"].items():
+            if param_name not in tool_params and (param_info.get("required") or param_info.get("enum")):
+                logger.info(f"   ↪ 파라미터 '{param_name}' 추출 실패 → LLM 라우터로 전달")
+                return None
+
+        return {
+            "route": "TOOL_CALL",
+            "tool_name": tool_name,
+            "tool_params": tool_params,
+            "tool_type": tool_info["tool_type"],
+            "confidence": intent["similarity"],
+            "reasoning": reasoning,
+            "stage": "embedding",
+            "intent_scores": intent["scores"]
+        }
+
+    def _log_decision(self, routing_decision: Dict[str, Any]):
+        """라우팅 결정 로그 출력"""
+        logger.info(f"✅ 라우팅 결정: {routing_decision['route']} (단계: {routing_decision.get('stage')})")
+        if routing_decision['route'] == 'TOOL_CALL':
+            logger.info(f"   🔧 툴: {routing_decision.get('tool_name')} ({routing_decision.get('tool_type')})")
+            logger.info(f"   📦 파라미터: {routing_decision.get('tool_params')}")
+        logger.info("="*80)
+
+    def _record_stage(self, routing_decision: Dict[str, Any], started: float) -> Dict[str, Any]:
+        """결정을 내린 단계별 처리 건수 및 소요 시간 기록"""
+        stage = routing_decision.get("stage", "llm")
+        self.stage_counts[stage] = self.stage_counts.get(stage, 0) + 1
+        self.stage_time_ms[stage] = self.stage_time_ms.get(stage, 0.0) + (time.perf_counter() - started) * 1000
+        return routing_decision
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        단계별 라우팅 통계 조회
+
+        Returns:
+            단계별 처리 건수, 평균 소요 시간, 절약된 LLM 호출 수
+        """
+        total = sum(self.stage_counts.values())
+        saved = self.stage_counts.get("rule", 0) + self.stage_counts.get("embedding", 0)
+        return {
+            "total": total,
+            "rule_confidence_threshold": self.rule_confidence_threshold,
+            "stage_counts": dict(self.stage_counts),
+            "stage_avg_ms": {
+                stage: round(self.stage_time_ms[stage] / count, 3) if count else 0.0
+                for stage, count in self.stage_counts.items()
+            },
+            "intent_classifier_ready": bool(self.intent_classifier and self.intent_classifier.ready),
+            "llm_calls_saved": saved,
+            "llm_calls_saved_rate": round(saved / total, 4) if total else 0.0
+        }
 
     def _create_routing_prompt(self, user_message: str) -> str:
         """
@@ -300,16 +455,7 @@ SIMPLE_QA인 경우:
         message_lower = user_message.lower()
 
         # 1. 툴 호출 키워드 체크
-        tool_keywords = {
-            "order_menu": ["주문", "시켜", "먹고싶", "먹을게"],
-            "set_language": ["언어", "영어", "english", "일본어", "중국어", "speak", "language", "korean", "japanese", "chinese", "한국어", "말해"],
-            "navigate_to": ["화면", "페이지", "이동", "보여줘", "가기"],
-            "get_sales_data": ["매출", "판매", "수익"],
-            "get_order_statistics": ["통계", "순위", "인기"],
-            "analyze_trends": ["트렌드", "분석", "추세"]
-        }
-
-        for tool_name, keywords in tool_keywords.items():
+        for tool_name, keywords in TOOL_KEYWORDS.items():
             if any(keyword in message_lower for keyword in keywords):
                 tool_info = self.tool_executor.get_tool_info(tool_name)
                 if tool_info:
@@ -319,16 +465,9 @@ SIMPLE_QA인 경우:
                     tool_params = {}
                     if tool_name == "set_language":
                         # 언어 키워드 추출
-                        lang_map = {
-                            "english": "en", "영어": "en",
-                            "korean": "ko", "한국어": "ko",
-                            "japanese": "ja", "일본어": "ja",
-                            "chinese": "zh", "중국어": "zh"
-                        }
-                        for lang_keyword, lang_code in lang_map.items():
-                            if lang_keyword in message_lower:
-                                tool_params = {"language": lang_code}
-                                break
+                        language = self.rule_router.extract_enum("set_language", "language", user_message)
+                        if language:
+                            tool_params = {"language": language}
 
                         # 파라미터를 찾지 못한 경우 기본값 사용
                         if not tool_params:
@@ -340,18 +479,19 @@ SIMPLE_QA인 경우:
                         "tool_params": tool_params,
                         "tool_type": tool_info["tool_type"],
                         "confidence": 0.6,
-                        "reasoning": "휴리스틱 기반 매칭"
+                        "reasoning": "휴리스틱 기반 매칭",
+                        "stage": "heuristic"
                     }
 
         # 2. RAG 키워드 체크
-        rag_keywords = ["메뉴", "가격", "영업시간", "위치", "전화", "추천", "어디", "언제", "얼마"]
-        if any(keyword in message_lower for keyword in rag_keywords):
+        if any(keyword in message_lower for keyword in RAG_KEYWORDS):
             logger.info("✅ 휴리스틱 매칭: RAG_QUERY")
             return {
                 "route": "RAG_QUERY",
                 "query": user_message,
                 "confidence": 0.65,
-                "reasoning": "휴리스틱 기반 매칭 (매장 정보 키워드)"
+                "reasoning": "휴리스틱 기반 매칭 (매장 정보 키워드)",
+                "stage": "heuristic"
             }
 
         # 3. 기본값: SIMPLE_QA
@@ -360,7 +500,8 @@ SIMPLE_QA인 경우:
             "route": "SIMPLE_QA",
             "query": user_message,
             "confidence": 0.5,
-            "reasoning": "휴리스틱 기반 기본값"
+            "reasoning": "휴리스틱 기반 기본값",
+            "stage": "heuristic"
         }
 
     def _create_fallback_decision(
@@ -383,7 +524,8 @@ SIMPLE_QA인 경우:
             "route": "SIMPLE_QA",
             "query": user_message,
             "confidence": 0.3,
-            "reasoning": f"에러 발생으로 인한 fallback: {error_msg}"
+            "reasoning": f"에러 발생으로 인한 fallback: {error_msg}",
+            "stage": "fallback"
         }
 
 
@@ -1,14 +1,28 @@
 """
 Redis Queue Worker Tasks
-백그라운드에서 실행되는 대화 저장 작업들
+백그라운드에서 실행되는 대화 저장 / 문서 인덱싱 작업들
 """
 
+import os
 import logging
 from typing import Optional
+import httpx
 from conversation_service import get_conversation_service
 
 logger = logging.getLogger(__name__)
 
+# 인덱싱 워커 프로세스 안에서 한 번만 로드하는 인덱서 (BGE-M3 모델 포함)
+_document_indexer = None
+
+
+def get_document_indexer():
+    """워커 전역 DocumentIndexer 반환 (최초 호출 시 모델 로드)"""
+    global _document_indexer
+    if _document_indexer is None:
+        from document_indexer import DocumentIndexer
+        _document_indexer = DocumentIndexer()
+    return _document_indexer
+
 
 def create_conversation_task(
     store_id: int,
@@ -148,6 +162,56 @@ def cleanup_old_conversations_task(days: int = 90) -> dict:
         raise
 
 
+def index_documents_task(store_id: int, category: str = "customer") -> dict:
+    """
+    문서 인덱싱 작업 (백그라운드)
+
+    index_worker.py가 실행하며, 벡터가 바뀌면 RAG 서버에 답변 캐시 무효화를 요청합니다.
+    (답변 캐시는 API 서버 메모리에 있으므로 워커에서 직접 비울 수 없음)
+
+    Args:
+        store_id: 매장 ID
+        category: 문서 카테고리
+
+    Returns:
+        인덱싱 결과 (indexed_chunks, embedded_chunks, deleted_chunks 등)
+
+    Raises:
+        RuntimeError: 인덱싱 실패 시 (작업이 failed 상태로 기록됨)
+    """
+    from document_indexer import has_changes
+
+    logger.info(f"🔄 [Worker] 문서 인덱싱 시작: store_id={store_id}, category={category}")
+
+    result = get_document_indexer().index(store_id, category)
+    if result.get("status") != "success":
+        logger.error(f"❌ [Worker] 문서 인덱싱 실패: {result.get('message')}")
+        raise RuntimeError(result.get("message", "인덱싱 실패"))
+
+    if has_changes(result):
+        invalidate_answer_cache(store_id, category)
+
+    logger.info(
+        f"✅ [Worker] 문서 인덱싱 완료: store_id={store_id} "
+        f"(청크 {result['indexed_chunks']}개, 임베딩 {result['embedded_chunks']}개, 삭제 {result['deleted_chunks']}개)"
+    )
+    return result
+
+
+def invalidate_answer_cache(store_id: int, category: str):
+    """RAG 서버의 매장 답변 캐시 무효화 요청 (실패해도 캐시 TTL로 만료됨)"""
+    rag_server_url = os.getenv("RAG_SERVER_URL", "http://wafl-rag-server:8002")
+    try:
+        response = httpx.post(
+            f"{rag_server_url}/api/answer-cache/invalidate",
+            json={"store_id": store_id, "category": category},
+            timeout=5
+        )
+        response.raise_for_status()
+    except Exception as e:
+        logger.warning(f"⚠️ [Worker] 답변 캐시 무효화 요청 실패 (TTL 만료 대기): {str(e)}")
+
+
 if __name__ == "__main__":
     # 로컬 테스트
     print("=" * 80)
@@ -0,0 +1,104 @@
+import pytest
+
+import answer_cache
+from answer_cache import SemanticAnswerCache
+
+
+class Clock:
+    """answer_cache 모듈의 time.time 대체"""
+
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(answer_cache.time, "time", clock.time)
+    return clock
+
+
+@pytest.fixture
+def cache(clock):
+    return SemanticAnswerCache(similarity_threshold=0.95, ttl_seconds=60, max_entries=3, enabled=True)
+
+
+def put(cache, store_id, query, embedding, answer, category="customer"):
+    cache.put(store_id, category, "ko", query, embedding, answer, {"sources": []})
+
+
+def test_exact_lookup_normalizes_query(cache):
+    put(cache, 1, "영업시간 알려줘", [1.0, 0.0], "10시부터 22시까지 영업합니다.")
+
+    answer, debug_info = cache.lookup_exact(1, "customer", "ko", "  영업시간   알려줘?? ")
+    assert answer == "10시부터 22시까지 영업합니다."
+    assert debug_info["cache"]["hit"] == "exact"
+    # 매장/카테고리/언어가 다르면 미스
+    assert cache.lookup_exact(2, "customer", "ko", "영업시간 알려줘") is None
+    assert cache.lookup_exact(1, "owner", "ko", "영업시간 알려줘") is None
+    assert cache.lookup_exact(1, "customer", "en", "영업시간 알려줘") is None
+
+
+def test_similar_lookup_threshold(cache):
+    put(cache, 1, "주차 돼요?", [1.0, 0.0], "매장 앞 2대 주차 가능합니다.")
+
+    answer, debug_info = cache.lookup_similar(1, "customer", "ko", [0.99, 0.05])
+    assert answer == "매장 앞 2대 주차 가능합니다."
+    assert debug_info["cache"]["hit"] == "semantic"
+    assert cache.lookup_similar(1, "customer", "ko", [0.6, 0.8]) is None
+
+
+def test_ttl_expiry(cache, clock):
+    put(cache, 1, "영업시간 알려줘", [1.0, 0.0], "10시부터 22시까지 영업합니다.")
+
+    clock.now += 60
+    assert cache.lookup_exact(1, "customer", "ko", "영업시간 알려줘") is not None
+
+    clock.now += 1
+    assert cache.lookup_similar(1, "customer", "ko", [1.0, 0.0]) is None
+    assert cache.lookup_exact(1, "customer", "ko", "영업시간 알려줘") is None
+    assert cache.get_stats()["entries"] == 0
+
+
+def test_lru_eviction(cache):
+    for i in range(3):
+        put(cache, 1, f"질문 {i}", None, f"답변 {i}")
+    # 가장 오래된 "질문 0"을 최근 사용으로 갱신 → 다음 저장 시 "질문 1"이 제거됨
+    cache.lookup_exact(1, "customer", "ko", "질문 0")
+    put(cache, 1, "질문 3", None, "답변 3")
+
+    assert cache.lookup_exact(1, "customer", "ko", "질문 1") is None
+    assert [cache.lookup_exact(1, "customer", "ko", f"질문 {i}")[0] for i in (0, 2, 3)] == ["답변 0", "답변 2", "답변 3"]
+    assert cache.get_stats()["evictions"] == 1
+
+
+def test_invalidate_store(cache):
+    put(cache, 1, "영업시간 알려줘", [1.0, 0.0], "고객 답변")
+    put(cache, 1, "영업시간 알려줘", [1.0, 0.0], "점주 답변", category="owner")
+    put(cache, 2, "영업시간 알려줘", [1.0, 0.0], "다른 매장 답변")
+
+    assert cache.invalidate_store(1, "customer") == 1
+    assert cache.lookup_similar(1, "customer", "ko", [1.0, 0.0]) is None
+    assert cache.lookup_exact(1, "owner", "ko", "영업시간 알려줘")[0] == "점주 답변"
+
+    assert cache.invalidate_store(1) == 1
+    assert cache.lookup_exact(2, "customer", "ko", "영업시간 알려줘")[0] == "다른 매장 답변"
+    assert cache.invalidate_store(1) == 0
+
+
+def test_stats_count_exact_misses_separately(cache):
+    put(cache, 1, "주차 돼요?", [1.0, 0.0], "주차 가능합니다.")
+
+    # 완전 일치 미스 후 유사도 히트: 최종 미스 아님
+    assert cache.lookup_exact(1, "customer", "ko", "주차 되나요") is None
+    assert cache.lookup_similar(1, "customer", "ko", [1.0, 0.01]) is not None
+    # 두 단계 모두 미스
+    assert cache.lookup_exact(1, "customer", "ko", "메뉴 추천") is None
+    assert cache.lookup_similar(1, "customer", "ko", [0.0, 1.0]) is None
+
+    stats = cache.get_stats()
+    assert (stats["exact_hits"], stats["exact_misses"], stats["semantic_hits"], stats["misses"]) == (0, 2, 1, 1)
+    assert stats["hit_rate"] == 0.5
@@ -0,0 +1,73 @@
+import pytest
+
+pytest.importorskip("pymilvus")
+
+from bulk_writer import BulkVectorWriter
+
+
+class RecordingStore:
+    """insert/flush 호출 기록용 벡터 스토어"""
+
+    def __init__(self, has_sparse=False):
+        self.has_sparse = has_sparse
+        self.inserted = []
+        self.sparse = []
+        self.flushes = 0
+
+    def insert_rows(self, store_ids, categories, texts, chunk_hashes, embeddings, sparse_embeddings):
+        self.inserted.extend(texts)
+        self.sparse.extend(sparse_embeddings)
+
+    def flush(self):
+        self.flushes += 1
+
+
+def make_writer(store, batch_rows=2):
+    return BulkVectorWriter(store, batch_rows=batch_rows, flush_every_rows=0, flush_interval_seconds=0)
+
+
+def test_callback_runs_after_rows_are_inserted():
+    store = RecordingStore()
+    calls = []
+    writer = make_writer(store, batch_rows=3)
+
+    writer.add(["a", "b"], [[0.1], [0.2]], 1, "customer", after_insert=lambda: calls.append(list(store.inserted)))
+    assert calls == []
+
+    writer.flush()
+    assert calls == [["a", "b"]]
+
+
+def test_callback_runs_for_add_without_rows():
+    # 재인덱싱 결과 새 청크가 없어도 오래된 청크 삭제 콜백은 실행되어야 함
+    store = RecordingStore()
+    calls = []
+    with make_writer(store) as writer:
+        writer.add([], [], 1, "customer", after_insert=lambda: calls.append("delete_stale"))
+
+    assert calls == ["delete_stale"]
+    assert store.inserted == []
+    assert store.flushes == 0
+
+
+def test_sparse_weights_required_for_sparse_collection():
+    store = RecordingStore(has_sparse=True)
+    writer = make_writer(store)
+
+    with pytest.raises(ValueError):
+        writer.add(["a"], [[0.1]], 1, "customer")
+    with pytest.raises(ValueError):
+        writer.add(["a", "b"], [[0.1], [0.2]], 1, "customer", sparse_embeddings=[{1: 0.5}])
+
+    # 검증 실패한 행은 버퍼에 남지 않음
+    writer.add(["c"], [[0.3]], 1, "customer", sparse_embeddings=[{3: 0.7}])
+    writer.flush()
+    assert store.inserted == ["c"]
+    assert store.sparse == [{3: 0.7}]
+
+
+def test_column_lengths_must_match():
+    writer = make_writer(RecordingStore())
+
+    with pytest.raises(ValueError):
+        writer.add(["a", "b"], [[0.1]], 1, "customer")
@@ -0,0 +1,50 @@
+import re
+
+import pytest
+
+pytest.importorskip("FlagEmbedding")
+pytest.importorskip("pymilvus")
+
+from context_budgeter import ContextBudgeter
+
+
+class WordTokenizer:
+    """단어 단위 토크나이저 (임베딩 모델 없이 토큰 수/가중치 계산용)"""
+
+    def __init__(self):
+        self.vocab = {}
+
+    def __call__(self, text, add_special_tokens=False, verbose=False):
+        ids = [self.vocab.setdefault(word, len(self.vocab)) for word in re.findall(r"\w+", text)]
+        return {"input_ids": ids}
+
+
+MENU_CHUNK = """## 메뉴
+### 김치찌개
+**가격**: 9,000원
+**포장**: 가능
+### 된장찌개
+**가격**: 9,000원
+**포장**: 가능"""
+
+
+@pytest.fixture
+def budgeter():
+    return ContextBudgeter(default_budget=600, budgets={}, section_max_tokens=160, tokenizer=WordTokenizer())
+
+
+def test_sections_sharing_lines_are_kept(budgeter):
+    context, info = budgeter.build("된장찌개 가격", [{"text": MENU_CHUNK}], 600)
+
+    assert "### 김치찌개" in context
+    assert "### 된장찌개" in context
+    assert context.count("**가격**: 9,000원") == 2
+    assert info["duplicate_lines"] == 0
+
+
+def test_overlap_between_chunks_is_dropped(budgeter):
+    overlap = "## 메뉴\n### 된장찌개\n**가격**: 9,000원\n**포장**: 가능"
+    context, info = budgeter.build("된장찌개 가격", [{"text": MENU_CHUNK}, {"text": overlap}], 600)
+
+    assert context.count("**가격**: 9,000원") == 2
+    assert info["duplicate_lines"] == 2
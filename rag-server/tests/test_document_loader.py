@@ -0,0 +1,114 @@
+import re
+
+import pytest
+
+pytest.importorskip("FlagEmbedding")
+pytest.importorskip("pymilvus")
+
+from chunk_cache import ChunkCache
+from document_loader import DocumentLoader, split_sections
+
+
+class WhitespaceTokenizer:
+    """공백 단위 토크나이저 (특수 토큰 2개, 문자 오프셋 제공)"""
+
+    def __call__(self, text, add_special_tokens=True, return_offsets_mapping=False, verbose=False):
+        offsets = [match.span() for match in re.finditer(r"\S+", text)]
+        input_ids = list(range(len(offsets) + (2 if add_special_tokens else 0)))
+        encoding = {"input_ids": input_ids}
+        if return_offsets_mapping:
+            encoding["offset_mapping"] = offsets
+        return encoding
+
+
+def make_loader(chunk_size=20):
+    return DocumentLoader(chunk_size=chunk_size, chunk_overlap=4, tokenizer=WhitespaceTokenizer(), cache=ChunkCache(enabled=False))
+
+
+@pytest.fixture
+def loader():
+    return make_loader()
+
+
+def leading_lines(chunk, count):
+    """청크 앞부분의 (빈 줄 제외) 줄 목록"""
+    return [line for line in chunk.split("\n") if line][:count]
+
+
+def test_split_sections_heading_path():
+    text = "# 매장\n소개\n## 메뉴\n---\n### 김치찌개\n9,000원\n### 된장찌개\n8,000원\n## 리뷰\n맛있어요"
+
+    assert split_sections(text) == [
+        ([], "# 매장\n소개"),
+        (["# 매장"], "## 메뉴"),
+        (["# 매장", "## 메뉴"], "### 김치찌개\n9,000원"),
+        (["# 매장", "## 메뉴"], "### 된장찌개\n8,000원"),
+        (["# 매장"], "## 리뷰\n맛있어요"),
+    ]
+
+
+def test_chunks_carry_heading_context(loader):
+    menus = "\n".join(f"### 메뉴{i}\n가격 {i},000원 맛있는 메뉴 설명" for i in range(6))
+    chunks = loader.chunk_text(f"# 테스트 식당\n## 메뉴\n{menus}")
+
+    assert len(chunks) > 1
+    for chunk in chunks:
+        assert leading_lines(chunk, 2) == ["# 테스트 식당", "## 메뉴"]
+        assert loader.count_tokens(chunk) <= loader.chunk_size
+    # 메뉴 항목은 나뉘지 않고 순서대로 한 번씩 들어감
+    joined = "\n".join(chunks)
+    assert [joined.count(f"### 메뉴{i}\n가격 {i},000원") for i in range(6)] == [1] * 6
+
+
+def test_oversized_section_split_under_limit(loader):
+    body = "\n".join(f"리뷰 {i}번 국물이 진하고 맛있어요" for i in range(10))
+    chunks = loader.chunk_text(f"# 테스트 식당\n## 리뷰\n{body}")
+
+    assert len(chunks) > 1
+    for chunk in chunks:
+        assert loader.count_tokens(chunk) <= loader.chunk_size
+        # 섹션 제목을 이어지는 조각마다 다시 붙임
+        assert leading_lines(chunk, 2) == ["# 테스트 식당", "## 리뷰"]
+    assert sum(chunk.count("국물이 진하고") for chunk in chunks) == 10
+
+
+def test_long_line_split_on_tokens_with_overlap(loader):
+    words = [f"단어{i}" for i in range(40)]
+    pieces = loader._split_section(["# 매장"], "## 소개\n" + " ".join(words))
+
+    assert len(pieces) > 1
+    for piece in pieces:
+        assert piece.startswith("## 소개\n")
+        assert loader.count_tokens("# 매장\n" + piece) <= loader.chunk_size
+    parts = [piece.split("\n", 1)[1].split() for piece in pieces]
+    # 모든 토큰이 순서대로 포함되고 이웃 조각은 chunk_overlap만큼 겹침
+    assert parts[0][0] == words[0] and parts[-1][-1] == words[-1]
+    for previous, current in zip(parts, parts[1:]):
+        assert previous[-loader.chunk_overlap:] == current[:loader.chunk_overlap]
+
+
+def test_split_tokens_budget_includes_prefix(loader):
+    parts = loader._split_tokens("# 매장\n## 소개", " ".join(f"단어{i}" for i in range(30)))
+
+    for part in parts:
+        assert loader.count_tokens(f"# 매장\n## 소개\n{part}") <= loader.chunk_size
+
+
+@pytest.mark.parametrize("text, chunks", [
+    ("", []),
+    ("\n\n---\n", []),
+    ("# 테스트 식당", ["# 테스트 식당"]),
+])
+def test_empty_or_heading_only_document(loader, text, chunks):
+    assert loader.chunk_text(text) == chunks
+
+
+def test_table_and_list_kept_intact():
+    loader = make_loader(chunk_size=40)
+    table = "| 메뉴 | 가격 |\n| --- | --- |\n| 김치찌개 | 9,000 |\n| 된장찌개 | 8,000 |"
+    items = "- 주차 가능\n- 포장 가능\n- 단체석 있음"
+    chunks = loader.chunk_text(f"# 테스트 식당\n## 가격표\n{table}\n## 편의시설\n{items}\n## 소개\n{'설명 ' * 30}")
+
+    assert len(chunks) > 1
+    assert any(table in chunk for chunk in chunks)
+    assert any(items in chunk for chunk in chunks)
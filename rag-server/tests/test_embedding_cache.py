@@ -0,0 +1,27 @@
+import pytest
+
+from embedding_cache import EmbeddingCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return EmbeddingCache("BAAI/bge-m3", 8192, memory_entries=10, db_path=str(tmp_path / "embeddings.db"), enabled=True)
+
+
+def test_dense_put_keeps_sparse_weights(cache):
+    cache.put_many(["메뉴 추천"], [[0.1, 0.2]], sparse=[{7: 0.5}])
+    cache.put_many(["메뉴 추천"], [[0.3, 0.4]])
+
+    vector, weights = cache.get_many(["메뉴 추천"], with_sparse=True)[0]
+    assert vector == pytest.approx([0.3, 0.4])
+    assert weights == pytest.approx({7: 0.5})
+
+
+def test_dense_put_keeps_sparse_weights_on_disk(cache, tmp_path):
+    cache.put_many(["메뉴 추천"], [[0.1, 0.2]], sparse=[{7: 0.5}])
+    cache.put_many(["메뉴 추천"], [[0.3, 0.4]])
+
+    reopened = EmbeddingCache("BAAI/bge-m3", 8192, memory_entries=10, db_path=str(tmp_path / "embeddings.db"), enabled=True)
+    vector, weights = reopened.get_many(["메뉴 추천"], with_sparse=True)[0]
+    assert vector == pytest.approx([0.3, 0.4], abs=1e-3)
+    assert weights == pytest.approx({7: 0.5}, abs=1e-3)
@@ -0,0 +1,56 @@
+import pytest
+
+from faq_answers import match_faq_intent, is_faq_excluded
+
+
+@pytest.mark.parametrize("message, intent", [
+    ("주소 알려줘", "address"),
+    ("가게 위치가 어디예요?", "address"),
+    ("Where is the restaurant?", "address"),
+    ("住所を教えてください", "address"),
+    ("地址在哪里？", "address"),
+    ("오시는 길 알려줘", "directions"),
+    ("How do I get there?", "directions"),
+    ("怎么走？", "directions"),
+    ("전화번호 알려줘", "phone"),
+    ("연락처가 어떻게 돼요?", "phone"),
+    ("What's your phone number?", "phone"),
+    ("电话号码是多少？", "phone"),
+    ("인스타그램 계정 있어요?", "sns"),
+    ("Do you have Instagram?", "sns"),
+    ("메뉴 뭐 있어요?", "menu"),
+    ("What's on the menu?", "menu"),
+    ("有什么菜？", "menu"),
+    ("메뉴 추천해줘", "recommendation"),
+    ("뭐가 제일 맛있어요?", "recommendation"),
+    ("おすすめのメニューは？", "recommendation"),
+])
+def test_match_faq_intent(message, intent):
+    assert match_faq_intent(message) == intent
+
+
+@pytest.mark.parametrize("message", [
+    # 다른 장소/대상의 위치, 전화 관련 질문
+    "화장실 어디에 있어요?",
+    "洗手间在哪？",
+    "Can I charge my phone here?",
+    # 조건이 붙은 추천/메뉴 질문
+    "비건 메뉴 추천해줘",
+    "매운 메뉴 추천해줘",
+    "영어 메뉴 있어요?",
+    "菜单上有素食吗？",
+    "Is bulgogi on the menu?",
+    "김치찌개 메뉴에 있어요?",
+    # SNS 키워드가 들어간 다른 질문
+    "블로그 리뷰 이벤트 있어요?",
+    # FAQ 패턴이 메시지 일부에만 있는 경우
+    "주소 알려주고 주차도 돼요?",
+    "주차 가능한가요?",
+])
+def test_qualified_asks_are_not_faq(message):
+    assert match_faq_intent(message) is None
+
+
+def test_is_faq_excluded():
+    assert is_faq_excluded("vegan options?")
+    assert not is_faq_excluded("전화번호 알려줘")
@@ -0,0 +1,102 @@
+import pytest
+
+pytest.importorskip("pymilvus")
+
+from vector_store import chunk_hash, plan_chunk_update, reciprocal_rank_fusion
+
+MENU = "## 김치찌개\n가격: 9,000원\n*최종 업데이트: 2024-10-01 12:00:00*"
+REVIEW = "## 리뷰\n국물이 진하고 맛있어요"
+
+
+def stored(*chunks):
+    """저장된 청크 해시 {해시: [엔티티 id]} (id는 1부터)"""
+    existing = {}
+    for entity_id, chunk in enumerate(chunks, 1):
+        existing.setdefault(chunk_hash(chunk), []).append(entity_id)
+    return existing
+
+
+def test_chunk_hash_ignores_updated_at():
+    assert chunk_hash(MENU) == chunk_hash(MENU.replace("2024-10-01 12:00:00", "2024-10-02 09:30:15"))
+    assert chunk_hash(MENU) != chunk_hash(MENU.replace("9,000원", "9,500원"))
+
+
+def test_unchanged_document_is_noop():
+    chunks_by_hash, new_hashes, stale_ids = plan_chunk_update([MENU, REVIEW], stored(MENU, REVIEW))
+
+    assert list(chunks_by_hash.values()) == [MENU, REVIEW]
+    assert new_hashes == []
+    assert stale_ids == []
+
+
+def test_timestamp_only_change_is_noop():
+    regenerated = MENU.replace("2024-10-01 12:00:00", "2024-10-02 09:30:15")
+
+    _, new_hashes, stale_ids = plan_chunk_update([regenerated, REVIEW], stored(MENU, REVIEW))
+
+    assert new_hashes == []
+    assert stale_ids == []
+
+
+def test_edited_chunk_replaced():
+    edited = MENU.replace("9,000원", "9,500원")
+
+    chunks_by_hash, new_hashes, stale_ids = plan_chunk_update([edited, REVIEW], stored(MENU, REVIEW))
+
+    assert [chunks_by_hash[h] for h in new_hashes] == [edited]
+    assert stale_ids == [1]
+
+
+def test_duplicate_chunks_kept_once():
+    # 새 청크 중복은 한 번만 임베딩하고, 중복 저장된 청크는 하나만 남김
+    chunks_by_hash, new_hashes, stale_ids = plan_chunk_update([REVIEW, MENU, REVIEW], stored(MENU, MENU))
+
+    assert list(chunks_by_hash.values()) == [REVIEW, MENU]
+    assert [chunks_by_hash[h] for h in new_hashes] == [REVIEW]
+    assert stale_ids == [2]
+
+
+def test_full_update_replaces_all():
+    chunks_by_hash, new_hashes, stale_ids = plan_chunk_update([MENU, REVIEW], stored(MENU, REVIEW), full=True)
+
+    assert new_hashes == list(chunks_by_hash)
+    assert stale_ids == [1, 2]
+
+
+def dense(entity_id, score):
+    return {"id": entity_id, "text": f"청크 {entity_id}", "dense_score": score, "sparse_score": None}
+
+
+def sparse(entity_id, score):
+    return {"id": entity_id, "text": f"청크 {entity_id}", "dense_score": None, "sparse_score": score}
+
+
+def test_rrf_fuses_dense_and_sparse():
+    fused = reciprocal_rank_fusion([
+        [dense(1, 0.9), dense(2, 0.8), dense(3, 0.7)],
+        [sparse(3, 0.4), sparse(2, 0.3), sparse(4, 0.2)],
+    ], top_k=10, k=60)
+
+    # 양쪽에 나온 문서가 한쪽 1위보다 위 (점수 스케일이 아닌 순위로 합산)
+    assert [document["id"] for document in fused] == [3, 2, 1, 4]
+    assert fused[0]["rrf_score"] == pytest.approx(1 / 63 + 1 / 61)
+    assert fused[1]["rrf_score"] == pytest.approx(1 / 62 + 1 / 62)
+    assert fused[2]["rrf_score"] == pytest.approx(1 / 61)
+
+
+def test_rrf_dedups_by_id_and_keeps_both_scores():
+    fused = reciprocal_rank_fusion([[dense(7, 0.9)], [sparse(7, 0.5)]], top_k=10)
+
+    assert len(fused) == 1
+    assert fused[0]["dense_score"] == 0.9
+    assert fused[0]["sparse_score"] == 0.5
+
+
+def test_rrf_top_k_cut():
+    fused = reciprocal_rank_fusion([
+        [dense(i, 1 - i / 10) for i in range(5)],
+        [sparse(i, 1 - i / 10) for i in range(5, 10)],
+    ], top_k=3)
+
+    assert [document["id"] for document in fused] == [0, 5, 1]
+    assert reciprocal_rank_fusion([], top_k=3) == []
@@ -0,0 +1,54 @@
+"""
+블로킹 작업용 스레드 풀
+
+BGE-M3 임베딩, Milvus 검색/삽입, 동기 DB 호출처럼 이벤트 루프를 막는 작업을
+크기가 제한된 스레드 풀에서 실행합니다.
+풀 크기를 제한하여 동시 요청이 몰려도 GPU/CPU와 Milvus 연결이 과부하되지 않도록 합니다.
+"""
+
+import os
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+# 전역 스레드 풀 인스턴스
+_global_pool: Optional[ThreadPoolExecutor] = None
+
+
+def get_thread_pool() -> ThreadPoolExecutor:
+    """
+    전역 블로킹 작업 스레드 풀 가져오기 (싱글톤)
+
+    풀 크기는 환경변수 BLOCKING_POOL_SIZE로 조정합니다 (기본 4).
+
+    Returns:
+        ThreadPoolExecutor 인스턴스
+    """
+    global _global_pool
+    if _global_pool is None:
+        max_workers = int(os.getenv("BLOCKING_POOL_SIZE", "4"))
+        _global_pool = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="rag-blocking"
+        )
+        logger.info(f"✅ 블로킹 작업 스레드 풀 초기화 완료 (workers={max_workers})")
+    return _global_pool
+
+
+async def run_blocking(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """
+    블로킹 함수를 스레드 풀에서 실행하고 결과를 기다림
+
+    Args:
+        func: 실행할 동기 함수
+        *args, **kwargs: 함수 인자
+
+    Returns:
+        함수 반환값
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_thread_pool(), partial(func, *args, **kwargs))
@@ -7,7 +7,7 @@
 
 import logging
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
@@ -20,6 +20,7 @@ class BaseTool(ABC):
     description: str = ""
     tool_type: str = ""  # "Self-Contained" or "LLM-Interpreted"
     parameters: Dict[str, Any] = {}
+    examples: List[str] = []  # 의도 분류기 centroid 계산용 예시 발화
 
     @abstractmethod
     def execute(self, **kwargs) -> Dict[str, Any]:
@@ -74,6 +75,11 @@ class SetLanguageTool(BaseTool):
             "enum": ["ko", "en", "ja", "zh"]
         }
     }
+    examples = [
+        "언어를 영어로 바꿔줘", "한국어로 말해줘", "일본어로 변경해 주세요", "중국어로 해줘",
+        "plz speak english", "Can you speak English?", "Change the language to Korean",
+        "日本語で話してください", "请说中文"
+    ]
 
     def execute(self, language: str = "en", **kwargs) -> Dict[str, Any]:
         """
@@ -149,6 +155,10 @@ class OrderMenuTool(BaseTool):
             "required": False
         }
     }
+    examples = [
+        "김치찌개 주문해줘", "된장찌개 2개 주세요", "비빔밥 하나 시킬게요", "불고기 3인분 주문할게",
+        "I'd like to order bibimbap", "Two kimchi stews, please", "ビビンバを注文します", "我要点一份拌饭"
+    ]
 
     def execute(self, menu: str, quantity: int = 1, options: Optional[str] = None, **kwargs) -> Dict[str, Any]:
         """
@@ -196,6 +206,10 @@ class NavigateToTool(BaseTool):
             "enum": ["menu", "order_history", "settings", "store_info", "reviews", "home"]
         }
     }
+    examples = [
+        "메뉴 화면으로 가줘", "주문 내역 보여줘", "설정 화면 열어줘", "리뷰 화면으로 이동",
+        "홈으로 가자", "Go to the menu page", "Show my order history", "ホーム画面に戻って", "打开设置"
+    ]
 
     def execute(self, destination: str, **kwargs) -> Dict[str, Any]:
         """
@@ -247,6 +261,10 @@ class ApplyFilterTool(BaseTool):
             "required": True
         }
     }
+    examples = [
+        "안 매운 메뉴만 보여줘", "만원 이하 메뉴만 골라줘", "찌개류만 필터링해줘", "인기순으로 정렬해줘",
+        "Show only vegetarian dishes", "Filter menus under 10,000 won", "辛くないメニューだけ見せて"
+    ]
 
     def execute(self, filter_type: str, filter_value: str, **kwargs) -> Dict[str, Any]:
         """
@@ -303,6 +321,10 @@ class GetSalesDataTool(BaseTool):
             "default": "daily"
         }
     }
+    examples = [
+        "오늘 매출 알려줘", "어제 매출 얼마야?", "이번 달 매출 보여줘", "지난주 매출 조회해줘",
+        "What were today's sales?", "Show this month's revenue", "今日の売上を教えて", "今天的销售额是多少"
+    ]
 
     def execute(self, date: str = "today", period: str = "daily", **kwargs) -> Dict[str, Any]:
         """
@@ -356,6 +378,11 @@ class GetOrderStatisticsTool(BaseTool):
             "default": "menu_ranking"
         }
     }
+    examples = [
+        "오늘 주문 통계 보여줘", "이번 주 메뉴별 주문 순위 알려줘", "시간대별 주문 분포 보여줘",
+        "주문 건수 통계 알려줘", "Show order statistics for this week", "What are the top ordered menus today?",
+        "今月の注文統計を見せて"
+    ]
 
     def execute(self, period: str = "today", stat_type: str = "menu_ranking", **kwargs) -> Dict[str, Any]:
         """
@@ -414,6 +441,10 @@ class AnalyzeTrendsTool(BaseTool):
             "default": "week"
         }
     }
+    examples = [
+        "매출 트렌드 분석해줘", "이번 달 매출 추이 어때?", "메뉴 판매 추세 분석해줘", "분기별 트렌드 알려줘",
+        "Analyze the sales trend", "How are orders trending this month?", "売上の傾向を分析して"
+    ]
 
     def execute(self, analysis_type: str = "sales", period: str = "week", **kwargs) -> Dict[str, Any]:
         """
@@ -552,7 +583,8 @@ class ToolRegistry:
             "name": tool.name,
             "description": tool.description,
             "tool_type": tool.tool_type,
-            "parameters": tool.parameters
+            "parameters": tool.parameters,
+            "examples": tool.examples
         }
 
     def get_all_tools_info(self) -> list:
@@ -1,4 +1,6 @@
 import os
+import re
+import hashlib
 import logging
 from pymilvus import (
     connections,
@@ -11,13 +13,133 @@ from pymilvus import (
 
 logger = logging.getLogger(__name__)
 
+# 문서 재생성 때마다 바뀌는 타임스탬프 (청크 해시 계산 시 제외)
+_UPDATED_AT = re.compile(r"최종 업데이트: \d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}")
+
+# 매장/카테고리당 조회할 최대 청크 수 (Milvus query limit 상한)
+MAX_QUERY_LIMIT = 16384
+
+# 빈 sparse 벡터 대체값 (Milvus는 값이 없는 sparse 행을 거부함, 검색 점수에 영향 없는 크기)
+EMPTY_SPARSE = {0: 1e-6}
+
+# text 필드 최대 길이 (Milvus VARCHAR max_length는 UTF-8 바이트 기준 → 한글 1자 = 3바이트)
+MAX_TEXT_LENGTH = 4096
+
+
+def chunk_hash(text: str) -> str:
+    """
+    청크 내용 해시 (SHA-256)
+
+    문서 생성 시각("최종 업데이트: ...")만 다른 청크는 같은 해시가 되도록
+    타임스탬프를 제외하고 계산합니다.
+    """
+    normalized = _UPDATED_AT.sub("최종 업데이트:", text)
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def plan_chunk_update(chunks: list[str], existing: dict[str, list[int]],
+                      full: bool = False) -> tuple[dict[str, str], list[str], list[int]]:
+    """
+    증분 재인덱싱 계획 계산
+
+    Args:
+        chunks: 새로 만든 청크 리스트
+        existing: 저장된 청크 해시 {해시: [엔티티 id]} (get_chunk_hashes 결과)
+        full: True면 기존 청크를 모두 교체 (모델/청킹 변경 시)
+
+    Returns:
+        (해시별 청크 {해시: 텍스트}, 새로 임베딩할 해시 리스트, 삭제할 엔티티 id 리스트)
+    """
+    # 중복 청크는 하나만 유지
+    chunks_by_hash: dict[str, str] = {}
+    for chunk in chunks:
+        chunks_by_hash.setdefault(chunk_hash(chunk), chunk)
+
+    if full:
+        stale_ids = [entity_id for ids in existing.values() for entity_id in ids]
+        return chunks_by_hash, list(chunks_by_hash), stale_ids
+
+    new_hashes = [h for h in chunks_by_hash if h not in existing]
+    stale_ids = []
+    for h, ids in existing.items():
+        if h in chunks_by_hash:
+            stale_ids.extend(ids[1:])  # 같은 청크가 여러 번 저장된 경우 하나만 유지
+        else:
+            stale_ids.extend(ids)
+    return chunks_by_hash, new_hashes, stale_ids
+
+
+def reciprocal_rank_fusion(result_lists: list[list[dict]], top_k: int, k: int = 60) -> list[dict]:
+    """
+    Reciprocal Rank Fusion (RRF)
+
+    각 결과 목록에서 순위 r인 문서에 1 / (k + r)을 더해 합산 점수 순으로 정렬합니다.
+    점수 스케일이 다른 dense(코사인)와 sparse(어휘 가중치 내적) 결과를 순위만으로 합칠 수 있습니다.
+
+    Args:
+        result_lists: 검색 결과 목록들 (각 문서는 "id" 포함)
+        top_k: 반환할 문서 수
+        k: RRF 상수 (클수록 하위 순위 문서의 영향이 커짐)
+
+    Returns:
+        rrf_score 기준 상위 top_k 문서
+    """
+    fused: dict[int, dict] = {}
+    for results in result_lists:
+        for rank, document in enumerate(results, 1):
+            entry = fused.setdefault(document["id"], {**document, "rrf_score": 0.0})
+            entry["rrf_score"] += 1.0 / (k + rank)
+            for field in ("dense_score", "sparse_score"):
+                if document.get(field) is not None:
+                    entry[field] = document[field]
+
+    ranked = sorted(fused.values(), key=lambda document: document["rrf_score"], reverse=True)
+    return ranked[:top_k]
+
+
+def get_index_config() -> dict:
+    """
+    벡터 인덱스 설정 (환경변수)
+
+    - VECTOR_INDEX_TYPE: HNSW (기본) 또는 IVF_FLAT
+    - HNSW_M / HNSW_EF_CONSTRUCTION / HNSW_EF: HNSW 빌드/검색 파라미터 (기본 16 / 200 / 64)
+    - IVF_NLIST / IVF_NPROBE: IVF_FLAT 빌드/검색 파라미터 (기본 128 / 10)
+    - MILVUS_PARTITION_KEY: store_id를 partition key로 사용 (기본 true)
+    - MILVUS_NUM_PARTITIONS: partition key 해시 파티션 수 (기본 64)
+    - MILVUS_SPARSE_ENABLED: BGE-M3 sparse 벡터 필드 사용 (기본 true, Milvus 2.4 이상)
+    - SPARSE_DROP_RATIO_BUILD / SPARSE_DROP_RATIO_SEARCH: 작은 sparse 가중치 제외 비율 (기본 0.2 / 0.2)
+    - HYBRID_RRF_K: hybrid 검색 RRF 상수 (기본 60)
+    """
+    return {
+        "index_type": os.getenv("VECTOR_INDEX_TYPE", "HNSW").upper(),
+        "hnsw_m": int(os.getenv("HNSW_M", "16")),
+        "hnsw_ef_construction": int(os.getenv("HNSW_EF_CONSTRUCTION", "200")),
+        "hnsw_ef": int(os.getenv("HNSW_EF", "64")),
+        "ivf_nlist": int(os.getenv("IVF_NLIST", "128")),
+        "ivf_nprobe": int(os.getenv("IVF_NPROBE", "10")),
+        "partition_key": os.getenv("MILVUS_PARTITION_KEY", "true").lower() == "true",
+        "num_partitions": int(os.getenv("MILVUS_NUM_PARTITIONS", "64")),
+        "sparse": os.getenv("MILVUS_SPARSE_ENABLED", "true").lower() == "true",
+        "sparse_drop_ratio_build": float(os.getenv("SPARSE_DROP_RATIO_BUILD", "0.2")),
+        "sparse_drop_ratio_search": float(os.getenv("SPARSE_DROP_RATIO_SEARCH", "0.2")),
+        "rrf_k": int(os.getenv("HYBRID_RRF_K", "60"))
+    }
+
 
 class MilvusVectorStore:
     """Milvus 벡터 스토어"""
 
-    def __init__(self, collection_name: str = "wafl_documents", dimension: int = 1024):
+    def __init__(self, collection_name: str = "wafl_documents", dimension: int = 1024,
+                 index_config: dict = None):
+        """
+        Args:
+            collection_name: 컬렉션 이름
+            dimension: 임베딩 차원
+            index_config: 인덱스 설정 (None이면 환경변수 기반 get_index_config())
+        """
         self.collection_name = collection_name
         self.dimension = dimension
+        self.index_config = index_config or get_index_config()
         self.collection = None
 
         # Milvus 연결
@@ -48,81 +170,185 @@ class MilvusVectorStore:
             self.collection = Collection(self.collection_name)
             self.collection.load()
             logger.info(f"기존 컬렉션 로드: {self.collection_name}")
+
+            if not self.has_chunk_hash:
+                logger.warning(
+                    "⚠️ 컬렉션에 chunk_hash 필드가 없어 증분 재인덱싱을 사용할 수 없습니다. "
+                    "migrate_vector_index.py로 재구축하세요"
+                )
+
+            if self.index_config.get("sparse") and not self.has_sparse:
+                logger.warning(
+                    "⚠️ 컬렉션에 sparse_embedding 필드가 없어 dense 검색만 사용합니다. "
+                    "migrate_vector_index.py로 재구축하세요"
+                )
+
+            current = self.describe_index()
+            if current.get("index_type") != self.index_config["index_type"]:
+                logger.warning(
+                    f"⚠️ 컬렉션 인덱스({current.get('index_type')})가 설정({self.index_config['index_type']})과 다릅니다. "
+                    f"migrate_vector_index.py로 재구축하세요"
+                )
             return
 
-        # 스키마 정의
+        self.collection = self.create_collection(self.collection_name)
+        logger.info(f"새 컬렉션 생성: {self.collection_name} ({self.index_config['index_type']})")
+
+    def build_schema(self) -> CollectionSchema:
+        """컬렉션 스키마 (partition key 설정 시 store_id 기준 파티셔닝)"""
         fields = [
             FieldSchema(name="id", dtype=DataType.INT64, is_primary=True, auto_id=True),
-            FieldSchema(name="store_id", dtype=DataType.INT64),
+            FieldSchema(name="store_id", dtype=DataType.INT64,
+                        is_partition_key=self.index_config["partition_key"]),
             FieldSchema(name="category", dtype=DataType.VARCHAR, max_length=50),
-            FieldSchema(name="text", dtype=DataType.VARCHAR, max_length=4096),
+            FieldSchema(name="text", dtype=DataType.VARCHAR, max_length=MAX_TEXT_LENGTH),
+            FieldSchema(name="chunk_hash", dtype=DataType.VARCHAR, max_length=64),
             FieldSchema(name="embedding", dtype=DataType.FLOAT_VECTOR, dim=self.dimension)
         ]
+        if self.index_config.get("sparse"):
+            # BGE-M3 lexical weights (토큰 ID -> 가중치), 메뉴명/가격 같은 정확한 어휘 매칭용
+            fields.append(FieldSchema(name="sparse_embedding", dtype=DataType.SPARSE_FLOAT_VECTOR))
+        return CollectionSchema(fields=fields, description="WAFL 문서 벡터 스토어")
 
-        schema = CollectionSchema(fields=fields, description="WAFL 문서 벡터 스토어")
-
-        # 컬렉션 생성
-        self.collection = Collection(name=self.collection_name, schema=schema)
-
-        # 인덱스 생성
-        index_params = {
+    def index_params(self) -> dict:
+        """임베딩 인덱스 빌드 파라미터"""
+        if self.index_config["index_type"] == "HNSW":
+            params = {"M": self.index_config["hnsw_m"], "efConstruction": self.index_config["hnsw_ef_construction"]}
+        else:
+            params = {"nlist": self.index_config["ivf_nlist"]}
+        return {
             "metric_type": "IP",  # Inner Product (코사인 유사도)
-            "index_type": "IVF_FLAT",
-            "params": {"nlist": 128}
+            "index_type": self.index_config["index_type"],
+            "params": params
         }
-        self.collection.create_index(field_name="embedding", index_params=index_params)
-        self.collection.load()
 
-        logger.info(f"새 컬렉션 생성: {self.collection_name}")
+    def create_collection(self, name: str) -> Collection:
+        """
+        설정된 스키마/인덱스로 컬렉션 생성 후 로드
+
+        Args:
+            name: 생성할 컬렉션 이름 (마이그레이션 시 임시 이름 사용)
+        """
+        kwargs = {}
+        if self.index_config["partition_key"]:
+            kwargs["num_partitions"] = self.index_config["num_partitions"]
+
+        collection = Collection(name=name, schema=self.build_schema(), **kwargs)
+        collection.create_index(field_name="embedding", index_params=self.index_params())
+        if self.index_config.get("sparse"):
+            collection.create_index(field_name="sparse_embedding", index_params={
+                "metric_type": "IP",
+                "index_type": "SPARSE_INVERTED_INDEX",
+                "params": {"drop_ratio_build": self.index_config["sparse_drop_ratio_build"]}
+            })
+        collection.load()
+        return collection
+
+    @property
+    def has_chunk_hash(self) -> bool:
+        """컬렉션 스키마에 chunk_hash 필드가 있는지 (이전 스키마 호환)"""
+        return any(field.name == "chunk_hash" for field in self.collection.schema.fields)
+
+    @property
+    def has_sparse(self) -> bool:
+        """컬렉션 스키마에 sparse_embedding 필드가 있는지 (이전 스키마 호환)"""
+        return any(field.name == "sparse_embedding" for field in self.collection.schema.fields)
+
+    def describe_index(self) -> dict:
+        """현재 컬렉션의 임베딩 인덱스 정보 (index_type, params 등)"""
+        for index in self.collection.indexes:
+            if index.field_name == "embedding":
+                return dict(index.params)
+        return {}
 
     def insert(self, texts: list[str], embeddings: list[list[float]],
-               store_id: int, category: str):
-        """문서 삽입"""
-        try:
-            data = [
-                [store_id] * len(texts),  # store_id
-                [category] * len(texts),  # category
-                texts,                    # text
-                embeddings                # embedding
-            ]
+               store_id: int, category: str, chunk_hashes: list[str] = None,
+               sparse_embeddings: list[dict[int, float]] = None):
+        """
+        문서 삽입
 
-            self.collection.insert(data)
-            self.collection.flush()
+        삽입 후 flush하지 않습니다. 삽입된 데이터는 flush 없이도 검색되며,
+        세그먼트 봉인(flush)은 Milvus의 자동 flush 또는 flush() 호출 시 일어납니다.
+        여러 매장을 연속으로 적재할 때는 BulkVectorWriter(bulk_writer.py)를 사용하세요.
 
+        Args:
+            chunk_hashes: 청크 내용 해시 (None이면 텍스트로 계산)
+            sparse_embeddings: 청크 sparse 가중치 (컬렉션에 sparse 필드가 있으면 필수)
+        """
+        try:
+            self.insert_rows(
+                store_ids=[store_id] * len(texts),
+                categories=[category] * len(texts),
+                texts=texts,
+                chunk_hashes=chunk_hashes or [chunk_hash(text) for text in texts],
+                embeddings=embeddings,
+                sparse_embeddings=sparse_embeddings
+            )
             logger.info(f"문서 삽입 완료: {len(texts)}개 (store_id={store_id}, category={category})")
 
         except Exception as e:
             logger.error(f"문서 삽입 오류: {str(e)}")
             raise
 
+    def insert_rows(self, store_ids: list[int], categories: list[str], texts: list[str],
+                    chunk_hashes: list[str], embeddings: list[list[float]],
+                    sparse_embeddings: list[dict[int, float]] = None):
+        """
+        컬럼 단위 행 삽입 (여러 매장의 행을 한 번에 삽입할 때 사용)
+
+        Args:
+            store_ids / categories / texts / chunk_hashes / embeddings / sparse_embeddings: 같은 길이의 컬럼 리스트
+        """
+        data = [store_ids, categories, texts]
+        if self.has_chunk_hash:
+            data.append(chunk_hashes)
+        data.append(embeddings)
+        if self.has_sparse:
+            if sparse_embeddings is None:
+                raise ValueError("컬렉션에 sparse_embedding 필드가 있어 sparse 가중치가 필요합니다")
+            data.append([weights or EMPTY_SPARSE for weights in sparse_embeddings])
+        self.collection.insert(data)
+
+    def flush(self):
+        """버퍼된 삽입 데이터를 세그먼트로 봉인"""
+        self.collection.flush()
+
+    def get_chunk_hashes(self, store_id: int, category: str) -> dict[str, list[int]]:
+        """
+        매장/카테고리에 저장된 청크 해시 조회
+
+        Returns:
+            {청크 해시: [엔티티 id]} (chunk_hash 필드가 없는 이전 스키마는 {"": [모든 id]})
+        """
+        output_fields = ["id", "chunk_hash"] if self.has_chunk_hash else ["id"]
+        rows = self.collection.query(
+            expr=self._filter_expr(store_id, category),
+            output_fields=output_fields,
+            limit=MAX_QUERY_LIMIT
+        )
+
+        hashes: dict[str, list[int]] = {}
+        for row in rows:
+            hashes.setdefault(row.get("chunk_hash", ""), []).append(row["id"])
+        return hashes
+
+    # Milvus 한 번의 search 요청에 넣을 최대 쿼리 수 (nq)
+    MAX_SEARCH_BATCH = 1024
+
     def search(self, query_embedding: list[float], store_id: int,
                category: str, top_k: int = 5) -> list[dict]:
         """유사 문서 검색"""
         try:
-            search_params = {"metric_type": "IP", "params": {"nprobe": 10}}
-
-            # 검색 필터: store_id와 category 일치
-            expr = f"store_id == {store_id} && category == '{category}'"
-
             results = self.collection.search(
                 data=[query_embedding],
                 anns_field="embedding",
-                param=search_params,
+                param=self._search_params(top_k),
                 limit=top_k,
-                expr=expr,
+                expr=self._filter_expr(store_id, category),
                 output_fields=["text", "store_id", "category"]
             )
 
-            # 결과 포맷팅
-            documents = []
-            for hits in results:
-                for hit in hits:
-                    documents.append({
-                        "text": hit.entity.get("text"),
-                        "score": hit.score,
-                        "store_id": hit.entity.get("store_id"),
-                        "category": hit.entity.get("category")
-                    })
+            documents = self._format_hits(results[0])
 
             logger.info(f"검색 완료: {len(documents)}개 문서 (store_id={store_id}, category={category})")
             return documents
@@ -131,11 +357,139 @@ class MilvusVectorStore:
             logger.error(f"검색 오류: {str(e)}")
             return []
 
+    def search_sparse(self, sparse_embedding: dict[int, float], store_id: int,
+                      category: str, top_k: int = 5) -> list[dict]:
+        """sparse(어휘 가중치) 검색 (sparse 필드가 없으면 빈 리스트)"""
+        if not self.has_sparse or not sparse_embedding:
+            return []
+        try:
+            results = self.collection.search(
+                data=[sparse_embedding],
+                anns_field="sparse_embedding",
+                param={"metric_type": "IP", "params": {"drop_ratio_search": self.index_config["sparse_drop_ratio_search"]}},
+                limit=top_k,
+                expr=self._filter_expr(store_id, category),
+                output_fields=["text", "store_id", "category"]
+            )
+            return self._format_hits(results[0], score_field="sparse_score")
+
+        except Exception as e:
+            logger.error(f"sparse 검색 오류: {str(e)}")
+            return []
+
+    def hybrid_search(self, query_embedding: list[float], sparse_embedding: dict[int, float],
+                      store_id: int, category: str, top_k: int = 5, candidates: int = None) -> list[dict]:
+        """
+        dense + sparse hybrid 검색 (Reciprocal Rank Fusion)
+
+        두 검색에서 각각 candidates개를 가져와 RRF로 합칩니다.
+        결과 문서의 "score"는 dense 유사도(dense 결과에 없으면 0.0)로 유지하여
+        기존 유사도 임계값 판단과 호환되며, "sparse_score", "rrf_score"가 추가됩니다.
+
+        Args:
+            candidates: 검색기별 후보 수 (기본 max(top_k * 4, 20))
+        """
+        candidates = candidates or max(top_k * 4, 20)
+        dense = self.search(query_embedding, store_id, category, top_k=candidates)
+        sparse = self.search_sparse(sparse_embedding, store_id, category, top_k=candidates)
+        if not sparse:
+            return dense[:top_k]
+
+        fused = reciprocal_rank_fusion([dense, sparse], top_k, k=self.index_config.get("rrf_k", 60))
+        for document in fused:
+            document["score"] = document.get("dense_score") or 0.0
+        return fused
+
+    def search_many(self, requests: list[tuple]) -> list[list[dict]]:
+        """
+        여러 쿼리 일괄 검색
+
+        같은 필터 조건(store_id, category)을 가진 요청끼리 묶어
+        그룹당 한 번의 Milvus search로 처리합니다.
+
+        Args:
+            requests: (query_embedding, store_id, category, top_k) 튜플 리스트
+
+        Returns:
+            요청 순서와 같은 순서의 검색 결과 리스트 (실패한 그룹의 요청은 빈 리스트)
+        """
+        results: list[list[dict]] = [[] for _ in requests]
+
+        # 필터 조건별 그룹화: (store_id, category) -> 요청 인덱스 리스트
+        groups: dict[tuple, list[int]] = {}
+        for index, (_, store_id, category, _) in enumerate(requests):
+            groups.setdefault((store_id, category), []).append(index)
+
+        for (store_id, category), indices in groups.items():
+            expr = self._filter_expr(store_id, category)
+
+            for offset in range(0, len(indices), self.MAX_SEARCH_BATCH):
+                batch = indices[offset:offset + self.MAX_SEARCH_BATCH]
+                # 그룹 내 최대 top_k로 한 번에 검색한 뒤 요청별로 잘라냄
+                limit = max(requests[i][3] for i in batch)
+
+                try:
+                    hits_per_query = self.collection.search(
+                        data=[requests[i][0] for i in batch],
+                        anns_field="embedding",
+                        param=self._search_params(limit),
+                        limit=limit,
+                        expr=expr,
+                        output_fields=["text", "store_id", "category"]
+                    )
+                except Exception as e:
+                    logger.error(f"일괄 검색 오류 (store_id={store_id}, category={category}): {str(e)}")
+                    continue
+
+                for i, hits in zip(batch, hits_per_query):
+                    results[i] = self._format_hits(hits)[:requests[i][3]]
+
+        logger.info(f"일괄 검색 완료: {len(requests)}개 쿼리, {len(groups)}개 그룹")
+        return results
+
+    def _search_params(self, top_k: int = 0) -> dict:
+        """검색 파라미터 (HNSW의 ef는 top_k 이상이어야 함)"""
+        if self.index_config["index_type"] == "HNSW":
+            params = {"ef": max(self.index_config["hnsw_ef"], top_k)}
+        else:
+            params = {"nprobe": self.index_config["ivf_nprobe"]}
+        return {"metric_type": "IP", "params": params}
+
+    @staticmethod
+    def _filter_expr(store_id: int, category: str) -> str:
+        """검색 필터: store_id와 category 일치 (partition key 사용 시 해당 파티션만 검색)"""
+        return f"store_id == {int(store_id)} && category == '{category}'"
+
+    @staticmethod
+    def _format_hits(hits, score_field: str = "dense_score") -> list[dict]:
+        """검색 결과 포맷팅 (score와 함께 검색기별 점수 필드 기록)"""
+        return [
+            {
+                "id": hit.id,
+                "text": hit.entity.get("text"),
+                "score": hit.score,
+                score_field: hit.score,
+                "store_id": hit.entity.get("store_id"),
+                "category": hit.entity.get("category")
+            }
+            for hit in hits
+        ]
+
+    def delete_by_ids(self, ids: list[int]):
+        """엔티티 id로 문서 삭제"""
+        if not ids:
+            return
+        try:
+            self.collection.delete(f"id in {[int(entity_id) for entity_id in ids]}")
+            logger.info(f"문서 삭제 완료: {len(ids)}개")
+        except Exception as e:
+            logger.error(f"문서 삭제 오류: {str(e)}")
+            raise
+
     def delete_by_store(self, store_id: int, category: str):
         """특정 매장의 문서 삭제"""
         try:
-            expr = f"store_id == {store_id} && category == '{category}'"
-            self.collection.delete(expr)
+            self.collection.delete(self._filter_expr(store_id, category))
             logger.info(f"문서 삭제 완료: store_id={store_id}, category={category}")
         except Exception as e:
             logger.error(f"문서 삭제 오류: {str(e)}")
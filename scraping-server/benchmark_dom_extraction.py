@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+목록 페이지 추출 방식 비교 (항목별 WebDriver 호출 vs execute_script 일괄 추출)
+
+같은 페이지에서 기존 항목별 수집 코드와 utils.dom_extractor의 일괄 추출을 번갈아 실행해
+추출 시간을 비교하고, 두 결과가 같은지 확인합니다 (다르면 종료 코드 1).
+저장된 페이지(--fixture)로 실행하면 선택자/파서 회귀 확인용으로 쓸 수 있습니다.
+
+실행 방법:
+    # 저장된 페이지 (브라우저에서 "다른 이름으로 저장"한 HTML)
+    python benchmark_dom_extraction.py --page review --fixture tests/fixtures/review_visitor.html
+    # 실제 매장 페이지 (더보기를 끝까지 누른 뒤 비교)
+    python benchmark_dom_extraction.py --page review --store-id 1234567890 --load-more 50
+"""
+
+import os
+import sys
+import time
+import argparse
+import statistics
+
+from selenium.webdriver.common.by import By
+
+from utils.selenium_driver import SeleniumDriver
+from utils.dom_extractor import (
+    MENU_ITEM, REVIEW_ITEM, MORE_BUTTON,
+    extract_menus, extract_reviews, parse_revisit_count
+)
+
+PAGES = {
+    "menu": ("menu/list", MENU_ITEM),
+    "review": ("review/visitor", REVIEW_ITEM),
+}
+
+
+def extract_menus_per_element(driver):
+    """기존 메뉴 수집 루프 (항목마다 find_elements/.text/get_attribute)"""
+    menus = []
+    for li in driver.find_elements(By.CSS_SELECTOR, MENU_ITEM):
+        menu = {"name": "", "desc": "", "price": "", "image": None, "recommendation": ""}
+
+        name_elements = li.find_elements(By.CSS_SELECTOR, "span.lPzHi")
+        if name_elements:
+            menu["name"] = name_elements[0].text.strip()
+
+        desc_elements = li.find_elements(By.CSS_SELECTOR, "div.kPogF")
+        if desc_elements:
+            menu["desc"] = desc_elements[0].text.strip()
+
+        rec_elements = li.find_elements(By.CSS_SELECTOR, "span.QM_zp span")
+        if rec_elements:
+            menu["recommendation"] = rec_elements[0].text.strip()
+
+        price_em_elements = li.find_elements(By.CSS_SELECTOR, "div.GXS1X em")
+        if price_em_elements:
+            menu["price"] = price_em_elements[0].text.strip()
+        else:
+            price_div_elements = li.find_elements(By.CSS_SELECTOR, "div.GXS1X")
+            if price_div_elements:
+                menu["price"] = price_div_elements[0].text.strip()
+
+        img_elements = li.find_elements(By.CSS_SELECTOR, "img")
+        if img_elements:
+            menu["image"] = img_elements[0].get_attribute('src') or None
+
+        if menu["name"] or menu["desc"] or menu["price"]:
+            menus.append(menu)
+    return menus
+
+
+def extract_reviews_per_element(driver):
+    """기존 리뷰 수집 루프 (항목마다 find_element/.text)"""
+    reviews = []
+    for r in driver.find_elements(By.CSS_SELECTOR, REVIEW_ITEM):
+        try:
+            content = r.find_element(By.CSS_SELECTOR, 'div.pui__vn15t2').text.strip()
+            date = r.find_element(By.CSS_SELECTOR, 'span.pui__gfuUIT > time').text.strip()
+        except Exception:
+            continue
+
+        revisit_elements = r.find_elements(By.CSS_SELECTOR, 'span.pui__gfuUIT')
+        revisit_text = revisit_elements[1].text.strip() if len(revisit_elements) > 1 else ''
+        reviews.append({"content": content, "date": date, "revisit": parse_revisit_count(revisit_text)})
+    return reviews
+
+
+EXTRACTORS = {
+    "menu": {"per_element": extract_menus_per_element, "bulk": extract_menus},
+    "review": {"per_element": extract_reviews_per_element, "bulk": extract_reviews},
+}
+
+
+def load_more(driver, item_selector, max_clicks):
+    """더보기를 max_clicks번까지 눌러 항목을 늘림"""
+    for _ in range(max_clicks):
+        buttons = driver.find_elements(By.CSS_SELECTOR, MORE_BUTTON)
+        if not buttons:
+            break
+        count = len(driver.find_elements(By.CSS_SELECTOR, item_selector))
+        driver.execute_script("arguments[0].click();", buttons[0])
+        deadline = time.time() + 5
+        while time.time() < deadline and len(driver.find_elements(By.CSS_SELECTOR, item_selector)) <= count:
+            time.sleep(0.1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="목록 페이지 추출 방식 비교 (항목별 WebDriver 호출 vs 일괄 추출)")
+    parser.add_argument("--page", choices=sorted(PAGES), required=True, help="페이지 종류")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--fixture", help="저장된 페이지 HTML 파일")
+    source.add_argument("--store-id", help="네이버 플레이스 ID (실제 페이지)")
+    parser.add_argument("--load-more", type=int, default=0, help="실제 페이지에서 누를 더보기 횟수")
+    parser.add_argument("--repeat", type=int, default=5, help="방식별 반복 횟수")
+    args = parser.parse_args()
+
+    path, item_selector = PAGES[args.page]
+    if args.fixture:
+        url = f"file://{os.path.abspath(args.fixture)}"
+    else:
+        url = f"https://m.place.naver.com/restaurant/{args.store_id}/{path}"
+
+    with SeleniumDriver(headless=True) as driver:
+        driver.get(url)
+        deadline = time.time() + 10
+        while time.time() < deadline and not driver.find_elements(By.CSS_SELECTOR, item_selector):
+            time.sleep(0.1)
+        if args.store_id and args.load_more:
+            load_more(driver, item_selector, args.load_more)
+
+        items = len(driver.find_elements(By.CSS_SELECTOR, item_selector))
+        print(f"📄 {url} - 항목 {items}개")
+
+        timings = {mode: [] for mode in EXTRACTORS[args.page]}
+        results = {}
+        for _ in range(args.repeat):
+            for mode, extract in EXTRACTORS[args.page].items():
+                started = time.perf_counter()
+                results[mode] = extract(driver)
+                timings[mode].append((time.perf_counter() - started) * 1000)
+
+    print("=" * 60)
+    print(f"{'방식':<14}{'추출 수':>8}{'p50(ms)':>12}{'최소(ms)':>12}{'최대(ms)':>12}")
+    for mode, values in timings.items():
+        print(f"{mode:<14}{len(results[mode]):>8}{statistics.median(values):>12.1f}{min(values):>12.1f}{max(values):>12.1f}")
+    print("=" * 60)
+
+    speedup = statistics.median(timings["per_element"]) / max(statistics.median(timings["bulk"]), 1e-6)
+    print(f"⚡ 일괄 추출 {speedup:.1f}배 빠름")
+
+    if results["per_element"] != results["bulk"]:
+        mismatches = [i for i, (a, b) in enumerate(zip(results["per_element"], results["bulk"])) if a != b]
+        print(f"❌ 추출 결과 불일치: 항목 수 {len(results['per_element'])} vs {len(results['bulk'])}, 다른 항목 {mismatches[:10]}")
+        sys.exit(1)
+    print("✅ 두 방식의 추출 결과 일치")
+
+
+if __name__ == "__main__":
+    main()
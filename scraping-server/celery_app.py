@@ -24,10 +24,17 @@ celery.conf.update(
     # 태스크 라우팅 - 모든 작업을 기본 큐로
     task_routes={
         'tasks.scraping_tasks.scrape_store_data': {'queue': 'celery'},
+        'tasks.scraping_tasks.scrape_store_info_task': {'queue': 'celery'},
+        'tasks.scraping_tasks.scrape_menu_info_task': {'queue': 'celery'},
+        'tasks.scraping_tasks.scrape_review_info_task': {'queue': 'celery'},
+        'tasks.scraping_tasks.finalize_scraping': {'queue': 'celery'},
         'tasks.scraping_tasks.generate_review_summary': {'queue': 'celery'},
     },
 
     # 워커 설정
+    # 수집은 대부분 네트워크/브라우저 대기이므로 SCRAPING_WORKER_POOL=threads로 한 워커가 여러 매장을
+    # 동시에 처리할 수 있음 (스레드마다 브라우저 풀에서 별도 브라우저 사용, 도메인별 요청 간격 제한 적용)
+    worker_pool=os.getenv("SCRAPING_WORKER_POOL", "prefork"),
     worker_prefetch_multiplier=1,
     task_acks_late=True,
     worker_disable_rate_limits=False,
@@ -1,13 +1,15 @@
-from celery import current_task
+from celery import current_task, chord, group
+from celery.exceptions import Ignore, Retry
+from celery.signals import worker_process_shutdown, worker_shutdown
 from celery_app import celery
 from sqlalchemy.orm import sessionmaker
 from database import engine, Store, Menu, Review, ScrapingTask
-from utils.selenium_driver import SeleniumDriver
+from utils.browser_pool import get_browser_pool
+from utils.selenium_driver import LOAD_MORE_TIMEOUT
 from utils.image_downloader import ImageDownloader
+from utils.naver_place_client import get_place_client
+from utils.dom_extractor import MENU_ITEM, REVIEW_ITEM, MORE_BUTTON, extract_menus, extract_reviews
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-import time
 import logging
 import traceback
 import os
@@ -19,6 +21,29 @@ logger = logging.getLogger(__name__)
 # 데이터베이스 세션
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# 수집 방식: http (페이지 JSON 파싱, 실패 시 Selenium) | selenium
+SCRAPE_BACKEND = os.getenv("SCRAPE_BACKEND", "http").lower()
+place_client = get_place_client()
+
+# 브라우저 풀 (워커 프로세스별, BROWSER_POOL_ENABLED=false면 태스크마다 새 브라우저)
+browser_pool = get_browser_pool()
+
+# 매장 정보/메뉴/리뷰 단계를 별도 서브태스크로 동시에 실행 (기본 false: 한 태스크에서 브라우저 하나로 순서대로)
+# 단계마다 브라우저 세션을 따로 쓰므로 브라우저 풀을 사용할 때만 적용 (풀 없이는 매장당 Chrome을 최대 3번 새로 띄움)
+PARALLEL_PHASES = os.getenv("SCRAPE_PARALLEL_PHASES", "false").lower() == "true"
+if PARALLEL_PHASES and not browser_pool.enabled:
+    logger.warning("SCRAPE_PARALLEL_PHASES는 BROWSER_POOL_ENABLED=true일 때만 적용됩니다 - 순차 수집 사용")
+    PARALLEL_PHASES = False
+
+# 병렬 단계 수 (진행률 계산용)
+PHASE_COUNT = 3
+
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def close_browser_pool(**kwargs):
+    """워커(프로세스) 종료 시 보관 중인 브라우저 종료 (threads 풀은 worker_shutdown만 발생)"""
+    browser_pool.close()
+
 @celery.task(bind=True, max_retries=3)
 def scrape_store_data(self, store_id):
     """
@@ -46,66 +71,63 @@ def scrape_store_data(self, store_id):
         store.scraping_status = 'in_progress'
         db.commit()
 
-        # 스크래핑 태스크 기록
-        scraping_task = ScrapingTask(
-            store_id=store_id,
-            task_id=task_id,
-            status='started'
-        )
-        db.add(scraping_task)
+        # 스크래핑 태스크 기록 (재시도는 같은 태스크 ID로 실행되므로 기존 기록 재사용)
+        scraping_task = db.query(ScrapingTask).filter(ScrapingTask.task_id == task_id).first()
+        if scraping_task:
+            scraping_task.status = 'started'
+            scraping_task.error_message = None
+        else:
+            scraping_task = ScrapingTask(
+                store_id=store_id,
+                task_id=task_id,
+                status='started'
+            )
+            db.add(scraping_task)
         db.commit()
 
         # 스크래핑 진행상황 업데이트
         self.update_state(state='PROGRESS', meta={'progress': 10, 'status': '매장 기본 정보 수집 시작'})
 
-        # 매장 기본 정보 스크래핑
-        store_info = scrape_store_info(store.store_id, db, store_id)
-        self.update_state(state='PROGRESS', meta={'progress': 30, 'status': '메뉴 정보 수집 시작'})
-
-        # 메뉴 정보 스크래핑
-        menu_info = scrape_menu_info(store.store_id, db, store_id)
-        self.update_state(state='PROGRESS', meta={'progress': 60, 'status': '리뷰 정보 수집 시작'})
-
-        # 리뷰 정보 스크래핑
-        review_info = scrape_review_info(store.store_id, db, store_id)
-        self.update_state(state='PROGRESS', meta={'progress': 90, 'status': '데이터 저장 중'})
+        if PARALLEL_PHASES:
+            # 세 단계를 서로 다른 워커에서 동시에 실행하고, 모두 끝나면 finalize_scraping이 결과를 합침
+            # (replace: 최종 결과가 이 태스크 ID로 저장되어 상태 조회 API가 그대로 동작)
+            reset_phase_progress(task_id)
+            phases = group(
+                scrape_store_info_task.s(store_id, store.store_id, task_id),
+                scrape_menu_info_task.s(store_id, store.store_id, task_id),
+                scrape_review_info_task.s(store_id, store.store_id, task_id)
+            )
+            logger.info(f"매장 {store_id} 스크래핑 단계 병렬 실행")
+            raise self.replace(chord(phases, finalize_scraping.s(store_id, task_id, self.request.retries)))
 
-        # 스크래핑 결과를 매장 정보에 업데이트
-        if store_info:
-            for key, value in store_info.items():
-                if hasattr(store, key):
-                    setattr(store, key, value)
+        # 세 단계가 브라우저 하나를 함께 사용 (풀 사용 시 이전 태스크의 브라우저 재사용)
+        # 브라우저는 Selenium 수집이 필요할 때만 시작됨
+        with browser_pool.session() as browser:
+            # 매장 기본 정보 스크래핑
+            store_info = scrape_store_info(browser, store.store_id, db, store_id)
+            self.update_state(state='PROGRESS', meta={'progress': 30, 'status': '메뉴 정보 수집 시작'})
 
-        # 매장 정보 비교 및 상태 설정
-        is_match = compare_store_info(store)
-        store.scraping_status = 'completed' if is_match else 'mismatch'
+            # 메뉴 정보 스크래핑
+            menu_info = scrape_menu_info(browser, store.store_id, db, store_id)
+            self.update_state(state='PROGRESS', meta={'progress': 60, 'status': '리뷰 정보 수집 시작'})
 
-        db.commit()
+            # 리뷰 정보 스크래핑
+            review_info = scrape_review_info(browser, store.store_id, db, store_id)
 
-        # 태스크 완료 기록
-        scraping_task.status = 'success'
-        scraping_task.result = f"매장 정보: {len(store_info) if store_info else 0}개, 메뉴: {menu_info['count'] if menu_info else 0}개, 리뷰: {review_info['count'] if review_info else 0}개"
-        db.commit()
+            # 실제 대기 시간 (고정 sleep 대신 조건 대기)
+            waits = browser.wait_stats()
+        self.update_state(state='PROGRESS', meta={'progress': 90, 'status': '데이터 저장 중'})
 
-        # 리뷰 요약 태스크 시작
-        if review_info and review_info['count'] > 0:
-            generate_review_summary.delay(store_id)
+        return finish_scraping(db, store, scraping_task, store_info, menu_info, review_info, waits)
 
-        result = {
-            'store_id': store_id,
-            'status': 'completed',
-            'store_info': store_info,
-            'menu_count': menu_info['count'] if menu_info else 0,
-            'review_count': review_info['count'] if review_info else 0,
-            'is_match': is_match
-        }
-
-        logger.info(f"매장 {store_id} 스크래핑 완료: {result}")
-        return result
+    except Ignore:
+        # 단계 서브태스크로 대체됨 (오류 아님)
+        raise
 
     except Exception as e:
         logger.error(f"매장 {store_id} 스크래핑 오류: {e}")
         logger.error(traceback.format_exc())
+        db.rollback()
 
         # 오류 상태 업데이트
         if 'store' in locals():
@@ -128,260 +150,429 @@ def scrape_store_data(self, store_id):
     finally:
         db.close()
 
-def scrape_store_info(naver_store_id, db, store_id):
-    """매장 기본 정보 스크래핑"""
+def finish_scraping(db, store, scraping_task, store_info, menu_info, review_info, waits):
+    """
+    단계별 수집 결과를 매장 정보에 반영하고 태스크 완료 기록
+
+    Returns:
+        dict: 스크래핑 결과
+    """
+    store_id = store.id
+    logger.info(f"매장 {store_id} 페이지 대기 시간: {waits}")
+
+    # 스크래핑 결과를 매장 정보에 업데이트
+    if store_info:
+        for key, value in store_info.items():
+            if hasattr(store, key):
+                setattr(store, key, value)
+
+    # 매장 정보 비교 및 상태 설정
+    is_match = compare_store_info(store)
+    store.scraping_status = 'completed' if is_match else 'mismatch'
+
+    db.commit()
+
+    # 태스크 완료 기록
+    if scraping_task:
+        scraping_task.status = 'success'
+        scraping_task.result = f"매장 정보: {len(store_info) if store_info else 0}개, 메뉴: {menu_info['count'] if menu_info else 0}개, 리뷰: {review_info['count'] if review_info else 0}개"
+        db.commit()
+
+    # 리뷰 요약 태스크 시작
+    if review_info and review_info['count'] > 0:
+        generate_review_summary.delay(store_id)
+
+    result = {
+        'store_id': store_id,
+        'status': 'completed',
+        'store_info': store_info,
+        'menu_count': menu_info['count'] if menu_info else 0,
+        'review_count': review_info['count'] if review_info else 0,
+        'is_match': is_match,
+        'waits': waits
+    }
+
+    logger.info(f"매장 {store_id} 스크래핑 완료: {result}")
+    return result
+
+def phase_progress_key(task_id):
+    """병렬 단계 완료 수 카운터 키"""
+    return f"scrape:phases:{task_id}"
+
+def reset_phase_progress(task_id):
+    """병렬 단계 완료 수 초기화 (재시도 시 이전 시도의 완료 수 제거)"""
     try:
-        with SeleniumDriver(headless=True) as driver:
-            # 매장 기본 정보 페이지
-            store_page = f'https://m.place.naver.com/restaurant/{naver_store_id}/home'
-            driver.get(store_page)
-            time.sleep(3)
-
-            store_info = {}
-
-            # CSS 선택자 정의
-            selectors = {
-                'scraped_store_name': 'span.GHAhO',
-                'scraped_category': 'span.lnJFt',
-                'scraped_description': 'div.XtBbS',
-                'scraped_store_address': 'span.LDgIH',
-                'scraped_directions': 'span.zPfVt',
-                'scraped_phone': 'span.xlx7Q',
-                'scraped_sns': 'div.jO09N a',
-                'scraped_etc_info': 'div.xPvPE'
-            }
-
-            # 기본 정보 수집
-            for field, selector in selectors.items():
-                try:
-                    elements = driver.find_elements(By.CSS_SELECTOR, selector)
-                    if elements:
-                        if field == 'scraped_sns':
-                            store_info[field] = elements[0].get_attribute('href')
-                        else:
-                            store_info[field] = elements[0].text.strip()
-                except Exception as e:
-                    logger.warning(f"{field} 수집 실패: {e}")
-                    store_info[field] = None
-
-            # 전화번호 팝업 처리
-            if not store_info.get('scraped_phone'):
-                try:
-                    phone_button = driver.find_elements(By.CSS_SELECTOR, 'a.BfF3H')
-                    if phone_button:
-                        driver.execute_script("arguments[0].click();", phone_button[0])
-                        time.sleep(1)
-                        phone_elements = driver.find_elements(By.CSS_SELECTOR, 'div.J7eF_ em')
-                        if phone_elements:
-                            store_info['scraped_phone'] = phone_elements[0].text.strip()
-                except Exception as e:
-                    logger.warning(f"전화번호 팝업 처리 실패: {e}")
-
-            # 추가 정보 페이지
-            info_page = f'https://m.place.naver.com/restaurant/{naver_store_id}/information'
-            driver.get(info_page)
-            time.sleep(3)
-
-            # 매장 소개
-            try:
-                intro_elements = driver.find_elements(By.CSS_SELECTOR, 'div.T8RFa')
-                if intro_elements:
-                    store_info['scraped_intro'] = intro_elements[0].text.strip()
-            except Exception as e:
-                logger.warning(f"매장 소개 수집 실패: {e}")
+        celery.backend.client.delete(phase_progress_key(task_id))
+    except Exception as e:
+        logger.warning(f"단계 진행률 초기화 실패: {e}")
 
-            # 편의시설 및 서비스
-            try:
-                services = []
-                service_elements = driver.find_elements(By.CSS_SELECTOR, 'li.c7TR6')
-                for li in service_elements:
-                    try:
-                        service = li.find_element(By.CSS_SELECTOR, 'div.owG4q').text.strip()
-                        extra_elements = li.find_elements(By.CSS_SELECTOR, 'span.place_blind')
-                        if extra_elements:
-                            extra = extra_elements[0].text.strip()
-                            service_name = f'{service} ({extra})'
-                        else:
-                            service_name = service
-
-                        if service_name:
-                            services.append(service_name)
-                    except:
-                        continue
-
-                store_info['scraped_services'] = ", ".join(services) if services else None
-            except Exception as e:
-                logger.warning(f"편의시설 수집 실패: {e}")
+def report_phase_done(task_id, phase_name):
+    """병렬 단계 하나가 끝날 때마다 원래 태스크의 진행률 갱신 (끝난 단계 수 기준 10% → 85%)"""
+    try:
+        client = celery.backend.client
+        done = client.incr(phase_progress_key(task_id))
+        client.expire(phase_progress_key(task_id), 3600)
+        celery.backend.store_result(
+            task_id,
+            {'progress': 10 + 75 * done // PHASE_COUNT, 'status': f'{phase_name} 수집 완료 ({done}/{PHASE_COUNT})'},
+            'PROGRESS'
+        )
+    except Exception as e:
+        logger.warning(f"단계 진행률 갱신 실패: {e}")
 
-            return store_info
+def run_phase(phase, store_id, naver_store_id, task_id):
+    """
+    수집 단계 하나를 자체 DB 세션/브라우저로 실행 (병렬 단계 서브태스크용)
 
+    단계 하나의 실패로 chord가 다른 단계 결과 없이 끝나지 않도록 오류는 결과에 담아 반환하고,
+    finalize_scraping이 오류로 기록한 뒤 재시도합니다.
+
+    Returns:
+        dict: {"result": 단계 결과, "waits": 대기 통계, "error": 오류 메시지 (실패 시)}
+    """
+    db = SessionLocal()
+    try:
+        with browser_pool.session() as browser:
+            result = phase(browser, naver_store_id, db, store_id)
+            return {'result': result, 'waits': browser.wait_stats()}
     except Exception as e:
-        logger.error(f"매장 정보 스크래핑 실패: {e}")
-        return None
+        logger.error(f"매장 {store_id} {phase.__name__} 실패: {e}")
+        db.rollback()
+        return {'result': None, 'waits': {}, 'error': f"{phase.__name__}: {e}"}
+    finally:
+        db.close()
+        report_phase_done(task_id, phase.__name__)
+
+@celery.task
+def scrape_store_info_task(store_id, naver_store_id, task_id):
+    """매장 기본 정보 수집 단계"""
+    return run_phase(scrape_store_info, store_id, naver_store_id, task_id)
+
+@celery.task
+def scrape_menu_info_task(store_id, naver_store_id, task_id):
+    """메뉴 수집 단계"""
+    return run_phase(scrape_menu_info, store_id, naver_store_id, task_id)
+
+@celery.task
+def scrape_review_info_task(store_id, naver_store_id, task_id):
+    """리뷰 수집 단계"""
+    return run_phase(scrape_review_info, store_id, naver_store_id, task_id)
 
-def scrape_menu_info(naver_store_id, db, store_id):
-    """메뉴 정보 스크래핑"""
+@celery.task(bind=True)
+def finalize_scraping(self, results, store_id, task_id, retries=0):
+    """
+    병렬 수집 단계 결과 합치기 (chord 콜백)
+
+    실패한 단계가 있으면 매장을 오류로 기록하고, 재시도 횟수가 남아 있으면
+    scrape_store_data를 같은 태스크 ID로 다시 실행합니다 (순차 수집의 self.retry와 같은 간격).
+
+    Args:
+        results (list): [매장 정보, 메뉴, 리뷰] 단계 결과 (group 순서)
+        store_id (int): 매장 ID
+        task_id (str): 원래 scrape_store_data 태스크 ID (ScrapingTask 기록, 이 태스크의 ID와 같음)
+        retries (int): 원래 태스크의 재시도 횟수
+    """
+    db = SessionLocal()
     try:
-        with SeleniumDriver(headless=True) as driver:
-            menu_page = f'https://m.place.naver.com/restaurant/{naver_store_id}/menu/list'
-            driver.get(menu_page)
-            time.sleep(3)
+        store = db.query(Store).filter(Store.id == store_id).first()
+        scraping_task = db.query(ScrapingTask).filter(ScrapingTask.task_id == task_id).first()
 
-            # 기존 메뉴 삭제
-            db.query(Menu).filter(Menu.store_id == store_id).delete()
-            db.commit()
+        errors = [phase['error'] for phase in results if phase.get('error')]
+        if errors:
+            raise RuntimeError(f"수집 단계 실패 - {'; '.join(errors)}")
 
-            # 더보기 버튼 클릭
-            while True:
-                try:
-                    more_button = WebDriverWait(driver, 10).until(
-                        EC.element_to_be_clickable((By.CSS_SELECTOR, 'a.fvwqf'))
-                    )
-                    driver.execute_script("arguments[0].click();", more_button)
-                    time.sleep(2)
-                except:
-                    break
+        self.update_state(state='PROGRESS', meta={'progress': 90, 'status': '데이터 저장 중'})
 
-            # 메뉴 수집
-            menus = driver.find_elements(By.CSS_SELECTOR, 'li.E2jtL')
-            image_downloader = ImageDownloader()
-            menu_count = 0
+        store_info, menu_info, review_info = (phase['result'] for phase in results)
+        waits = {}
+        for phase in results:
+            waits.update(phase['waits'])
 
-            for li in menus:
-                try:
-                    menu_name = ""
-                    menu_desc = ""
-                    menu_price = ""
-                    menu_recommendation = ""
-                    image_file_path = None
-                    image_url = None
-
-                    # 메뉴명
-                    name_elements = li.find_elements(By.CSS_SELECTOR, "span.lPzHi")
-                    if name_elements:
-                        menu_name = name_elements[0].text.strip()
-
-                    # 메뉴 설명
-                    desc_elements = li.find_elements(By.CSS_SELECTOR, "div.kPogF")
-                    if desc_elements:
-                        menu_desc = desc_elements[0].text.strip()
-
-                    # 추천 여부
-                    rec_elements = li.find_elements(By.CSS_SELECTOR, "span.QM_zp span")
-                    if rec_elements:
-                        menu_recommendation = rec_elements[0].text.strip()
-
-                    # 가격
-                    price_em_elements = li.find_elements(By.CSS_SELECTOR, "div.GXS1X em")
-                    if price_em_elements:
-                        menu_price = price_em_elements[0].text.strip()
-                    else:
-                        price_div_elements = li.find_elements(By.CSS_SELECTOR, "div.GXS1X")
-                        if price_div_elements:
-                            menu_price = price_div_elements[0].text.strip()
-
-                    # 이미지
-                    img_elements = li.find_elements(By.CSS_SELECTOR, "img")
-                    if img_elements:
-                        image_url = img_elements[0].get_attribute('src')
-                        if image_url and image_url.startswith('http'):
-                            image_file_path = image_downloader.download_and_save_image(
-                                image_url, store_id, menu_count + 1
-                            )
-
-                    # 메뉴 정보가 있을 경우에만 저장
-                    if menu_name or menu_desc or menu_price:
-                        menu = Menu(
-                            store_id=store_id,
-                            menu_name=menu_name,
-                            price=menu_price,
-                            description=menu_desc,
-                            recommendation=menu_recommendation,
-                            image_file_path=image_file_path,
-                            image_url=image_url
-                        )
-                        db.add(menu)
-                        menu_count += 1
-
-                except Exception as e:
-                    logger.warning(f"메뉴 항목 처리 실패: {e}")
-                    continue
+        return finish_scraping(db, store, scraping_task, store_info, menu_info, review_info, waits)
 
+    except Exception as e:
+        logger.error(f"매장 {store_id} 스크래핑 오류: {e}")
+        logger.error(traceback.format_exc())
+        db.rollback()
+
+        if 'store' in locals() and store:
+            store.scraping_status = 'error'
+            store.scraping_error_message = str(e)
             db.commit()
-            logger.info(f"메뉴 {menu_count}개 수집 완료")
-            return {'count': menu_count}
 
-    except Exception as e:
-        logger.error(f"메뉴 정보 스크래핑 실패: {e}")
-        return {'count': 0}
+        if 'scraping_task' in locals() and scraping_task:
+            scraping_task.status = 'failure'
+            scraping_task.error_message = str(e)
+            db.commit()
+
+        # 재시도 로직 (수집 단계부터 다시 실행)
+        if retries < scrape_store_data.max_retries:
+            countdown = 60 * (retries + 1)
+            logger.info(f"매장 {store_id} 스크래핑 재시도 ({retries + 1}/{scrape_store_data.max_retries})")
+            scrape_store_data.apply_async((store_id,), task_id=task_id, countdown=countdown, retries=retries + 1)
+            raise Retry(exc=e, when=countdown)
 
-def scrape_review_info(naver_store_id, db, store_id, max_iterations=50):
-    """리뷰 정보 스크래핑"""
+        raise
+
+    finally:
+        db.close()
+
+def click_load_more(browser, name, item_selector):
+    """
+    더보기 버튼 클릭 후 항목이 추가될 때까지 대기
+
+    버튼이 없으면 네트워크가 유휴 상태가 될 때까지만 기다려 마지막 페이지인지 확인합니다.
+
+    Returns:
+        bool: 항목이 추가되었는지 (버튼이 없거나 시간 초과면 False)
+    """
     try:
-        with SeleniumDriver(headless=True) as driver:
-            review_page = f'https://m.place.naver.com/restaurant/{naver_store_id}/review/visitor'
-            driver.get(review_page)
-            time.sleep(3)
+        if browser.wait_for_page(f'{name}_button', MORE_BUTTON, LOAD_MORE_TIMEOUT) != 'element':
+            return False
+
+        driver = browser.driver
+        more_buttons = driver.find_elements(By.CSS_SELECTOR, MORE_BUTTON)
+        if not more_buttons:
+            return False
+        count = len(driver.find_elements(By.CSS_SELECTOR, item_selector))
+        driver.execute_script("arguments[0].click();", more_buttons[0])
+        return bool(browser.wait_for_count_increase(name, item_selector, count))
+    except Exception as e:
+        logger.warning(f"더보기 처리 실패: {e}")
+        return False
 
-            # 기존 리뷰 삭제
-            db.query(Review).filter(Review.store_id == store_id).delete()
-            db.commit()
+def save_menus(db, store_id, menus):
+    """
+    수집한 메뉴로 매장 메뉴 교체 (이미지 다운로드 포함)
+
+    Args:
+        menus: [{"name", "desc", "price", "image", "recommendation"}]
+    """
+    db.query(Menu).filter(Menu.store_id == store_id).delete()
 
-            # 더보기 버튼 클릭
-            count = 0
-            while True:
-                if max_iterations > 0 and count >= max_iterations:
-                    break
+    image_downloader = ImageDownloader()
+    menu_count = 0
+    for item in menus:
+        image_url = item.get('image')
+        image_file_path = None
+        if image_url and image_url.startswith('http'):
+            image_file_path = image_downloader.download_and_save_image(image_url, store_id, menu_count + 1)
 
-                try:
-                    more_button = WebDriverWait(driver, 10).until(
-                        EC.element_to_be_clickable((By.CSS_SELECTOR, 'a.fvwqf'))
+        db.add(Menu(
+            store_id=store_id,
+            menu_name=item['name'],
+            price=item['price'],
+            description=item['desc'],
+            recommendation=item['recommendation'],
+            image_file_path=image_file_path,
+            image_url=image_url
+        ))
+        menu_count += 1
+
+    db.commit()
+    return {'count': menu_count}
+
+def save_reviews(db, store_id, reviews):
+    """
+    수집한 리뷰로 매장 리뷰 교체
+
+    Args:
+        reviews: [{"content", "date", "revisit"}]
+    """
+    db.query(Review).filter(Review.store_id == store_id).delete()
+    for item in reviews:
+        db.add(Review(
+            store_id=store_id,
+            content=item['content'],
+            review_date=item['date'],
+            revisit_count=item['revisit']
+        ))
+    db.commit()
+    return {'count': len(reviews)}
+
+def scrape_store_info(browser, naver_store_id, db, store_id):
+    """매장 기본 정보 스크래핑 (HTTP 수집 실패 시 Selenium)"""
+    if SCRAPE_BACKEND == 'http':
+        try:
+            store_info = place_client.fetch_store_info(naver_store_id)
+            logger.info("매장 정보 HTTP 수집 완료")
+            return store_info
+        except Exception as e:
+            logger.warning(f"매장 정보 HTTP 수집 실패, Selenium으로 대체: {e}")
+
+    try:
+        driver = browser.ensure_alive()
+        # 매장 기본 정보 페이지
+        store_page = f'https://m.place.naver.com/restaurant/{naver_store_id}/home'
+        browser.open(store_page)
+        browser.wait_for_page('store_home', 'span.GHAhO')
+
+        store_info = {}
+
+        # CSS 선택자 정의
+        selectors = {
+            'scraped_store_name': 'span.GHAhO',
+            'scraped_category': 'span.lnJFt',
+            'scraped_description': 'div.XtBbS',
+            'scraped_store_address': 'span.LDgIH',
+            'scraped_directions': 'span.zPfVt',
+            'scraped_phone': 'span.xlx7Q',
+            'scraped_sns': 'div.jO09N a',
+            'scraped_etc_info': 'div.xPvPE'
+        }
+
+        # 기본 정보 수집
+        for field, selector in selectors.items():
+            try:
+                elements = driver.find_elements(By.CSS_SELECTOR, selector)
+                if elements:
+                    if field == 'scraped_sns':
+                        store_info[field] = elements[0].get_attribute('href')
+                    else:
+                        store_info[field] = elements[0].text.strip()
+            except Exception as e:
+                logger.warning(f"{field} 수집 실패: {e}")
+                store_info[field] = None
+
+        # 전화번호 팝업 처리
+        if not store_info.get('scraped_phone'):
+            try:
+                phone_button = driver.find_elements(By.CSS_SELECTOR, 'a.BfF3H')
+                if phone_button:
+                    driver.execute_script("arguments[0].click();", phone_button[0])
+                    phone_elements = browser.wait_until(
+                        'phone_popup',
+                        lambda d: d.find_elements(By.CSS_SELECTOR, 'div.J7eF_ em'),
+                        LOAD_MORE_TIMEOUT
                     )
-                    driver.execute_script("arguments[0].click();", more_button)
-                    count += 1
-                    time.sleep(2)
-                except:
-                    break
+                    if phone_elements:
+                        store_info['scraped_phone'] = phone_elements[0].text.strip()
+            except Exception as e:
+                logger.warning(f"전화번호 팝업 처리 실패: {e}")
 
-            # 리뷰 수집
-            reviews = driver.find_elements(By.CSS_SELECTOR, 'li.place_apply_pui.EjjAW')
-            review_count = 0
+        # 추가 정보 페이지
+        info_page = f'https://m.place.naver.com/restaurant/{naver_store_id}/information'
+        browser.open(info_page)
+        browser.wait_for_page('store_information', 'div.T8RFa, li.c7TR6')
 
-            for r in reviews:
+        # 매장 소개
+        try:
+            intro_elements = driver.find_elements(By.CSS_SELECTOR, 'div.T8RFa')
+            if intro_elements:
+                store_info['scraped_intro'] = intro_elements[0].text.strip()
+        except Exception as e:
+            logger.warning(f"매장 소개 수집 실패: {e}")
+
+        # 편의시설 및 서비스
+        try:
+            services = []
+            service_elements = driver.find_elements(By.CSS_SELECTOR, 'li.c7TR6')
+            for li in service_elements:
                 try:
-                    content = r.find_element(By.CSS_SELECTOR, 'div.pui__vn15t2').text.strip()
-                    date = r.find_element(By.CSS_SELECTOR, 'span.pui__gfuUIT > time').text.strip()
-
-                    revisit_elements = r.find_elements(By.CSS_SELECTOR, 'span.pui__gfuUIT')
-                    revisit_text = revisit_elements[1].text.strip() if len(revisit_elements) > 1 else ''
-
-                    revisit_count = 0
-                    if "번째 방문" in revisit_text:
-                        try:
-                            revisit_count = int(revisit_text.replace('번째 방문', '').strip())
-                        except ValueError:
-                            revisit_count = 0
-
-                    review = Review(
-                        store_id=store_id,
-                        content=content,
-                        review_date=date,
-                        revisit_count=revisit_count
-                    )
-                    db.add(review)
-                    review_count += 1
+                    service = li.find_element(By.CSS_SELECTOR, 'div.owG4q').text.strip()
+                    extra_elements = li.find_elements(By.CSS_SELECTOR, 'span.place_blind')
+                    if extra_elements:
+                        extra = extra_elements[0].text.strip()
+                        service_name = f'{service} ({extra})'
+                    else:
+                        service_name = service
 
-                except Exception as e:
-                    logger.warning(f"리뷰 항목 처리 실패: {e}")
+                    if service_name:
+                        services.append(service_name)
+                except:
                     continue
 
-            db.commit()
-            logger.info(f"리뷰 {review_count}개 수집 완료")
-            return {'count': review_count}
+            store_info['scraped_services'] = ", ".join(services) if services else None
+        except Exception as e:
+            logger.warning(f"편의시설 수집 실패: {e}")
+
+        return store_info
+
+    except Exception as e:
+        logger.error(f"매장 정보 스크래핑 실패: {e}")
+        raise
+
+def scrape_menu_info(browser, naver_store_id, db, store_id):
+    """메뉴 정보 스크래핑 (HTTP 수집 실패 또는 결과 없음 시 Selenium)"""
+    if SCRAPE_BACKEND == 'http':
+        try:
+            menus = place_client.fetch_menus(naver_store_id)
+            if menus:
+                menu_info = save_menus(db, store_id, menus)
+                logger.info(f"메뉴 {menu_info['count']}개 HTTP 수집 완료")
+                return menu_info
+            logger.warning("HTTP 수집 메뉴 없음, Selenium으로 확인")
+        except Exception as e:
+            db.rollback()
+            logger.warning(f"메뉴 HTTP 수집 실패, Selenium으로 대체: {e}")
+
+    try:
+        driver = browser.ensure_alive()
+        menu_page = f'https://m.place.naver.com/restaurant/{naver_store_id}/menu/list'
+        browser.open(menu_page)
+        page_state = browser.wait_for_page('menu_list', MENU_ITEM)
+
+        # 더보기 버튼 클릭
+        while click_load_more(browser, 'menu_more', MENU_ITEM):
+            pass
+
+        # 메뉴 수집 (페이지 전체를 스크립트 한 번으로 추출)
+        menus = extract_menus(driver, MENU_ITEM)
+        if not menus and page_state != 'element':
+            # 메뉴 요소를 확인하지 못한 빈 결과는 느린 로딩일 수 있으므로 기존 메뉴를 지우지 않음
+            logger.warning(f"메뉴 목록 로딩 미확인 (대기 결과: {page_state}), 기존 메뉴 유지")
+            return {'count': 0}
+        menu_info = save_menus(db, store_id, menus)
+        logger.info(f"메뉴 {menu_info['count']}개 수집 완료")
+        return menu_info
+
+    except Exception as e:
+        logger.error(f"메뉴 정보 스크래핑 실패: {e}")
+        raise
+
+def scrape_review_info(browser, naver_store_id, db, store_id, max_iterations=50):
+    """리뷰 정보 스크래핑 (HTTP 수집 실패 또는 결과 없음 시 Selenium)"""
+    if SCRAPE_BACKEND == 'http':
+        try:
+            reviews = place_client.fetch_reviews(naver_store_id)
+            if reviews:
+                review_info = save_reviews(db, store_id, reviews)
+                logger.info(f"리뷰 {review_info['count']}개 HTTP 수집 완료")
+                return review_info
+            logger.warning("HTTP 수집 리뷰 없음, Selenium으로 확인")
+        except Exception as e:
+            db.rollback()
+            logger.warning(f"리뷰 HTTP 수집 실패, Selenium으로 대체: {e}")
+
+    try:
+        driver = browser.ensure_alive()
+        review_page = f'https://m.place.naver.com/restaurant/{naver_store_id}/review/visitor'
+        browser.open(review_page)
+        page_state = browser.wait_for_page('review_list', REVIEW_ITEM)
+
+        # 더보기 버튼 클릭
+        count = 0
+        while True:
+            if max_iterations > 0 and count >= max_iterations:
+                break
+
+            if not click_load_more(browser, 'review_more', REVIEW_ITEM):
+                break
+            count += 1
+
+        # 리뷰 수집 (페이지 전체를 스크립트 한 번으로 추출)
+        reviews = extract_reviews(driver, REVIEW_ITEM)
+        if not reviews and page_state != 'element':
+            # 리뷰 요소를 확인하지 못한 빈 결과는 느린 로딩일 수 있으므로 기존 리뷰를 지우지 않음
+            logger.warning(f"리뷰 목록 로딩 미확인 (대기 결과: {page_state}), 기존 리뷰 유지")
+            return {'count': 0}
+        review_info = save_reviews(db, store_id, reviews)
+        logger.info(f"리뷰 {review_info['count']}개 수집 완료")
+        return review_info
 
     except Exception as e:
         logger.error(f"리뷰 정보 스크래핑 실패: {e}")
-        return {'count': 0}
+        raise
 
 def normalize_address(address):
     """주소 정규화 - 광역시/특별시 등을 통일"""
@@ -472,15 +663,22 @@ def generate_review_summary(self, store_id):
             logger.error(f"문서 생성 API 호출 실패: {e}")
 
         # RAG 인덱싱 (customer 카테고리)
+        # RAG 서버는 작업을 큐에 넣고 job_id를 바로 반환하므로 인코딩 완료를 기다리지 않음
+        # (진행 상태: GET {rag_server_url}/api/index-documents/{job_id})
+        index_job_id = None
         try:
-            logger.info(f"매장 {store_id}의 RAG 인덱싱 시작")
+            logger.info(f"매장 {store_id}의 RAG 인덱싱 요청")
             index_response = requests.post(
                 f"{rag_server_url}/api/index-documents",
                 json={"store_id": store_id, "category": "customer"},
-                timeout=60
+                timeout=60  # 큐 사용 불가 시 인라인 인덱싱 대비
             )
 
-            if index_response.status_code == 200:
+            if index_response.status_code == 202:
+                index_job_id = index_response.json().get("job_id")
+                logger.info(f"매장 {store_id}의 RAG 인덱싱 작업 등록: job_id={index_job_id}")
+            elif index_response.status_code == 200:
+                # RAG 서버 큐 사용 불가 시 인라인 인덱싱 결과
                 logger.info(f"매장 {store_id}의 RAG 인덱싱 완료: {index_response.json()}")
             else:
                 logger.error(f"RAG 인덱싱 실패: {index_response.status_code} - {index_response.text}")
@@ -490,7 +688,8 @@ def generate_review_summary(self, store_id):
         return {
             'status': 'completed',
             'store_id': store_id,
-            'summary_length': len(summary)
+            'summary_length': len(summary),
+            'index_job_id': index_job_id
         }
 
     except Exception as e:
@@ -0,0 +1,82 @@
+from pathlib import Path
+
+import pytest
+
+from utils.dom_extractor import parse_menu_items, parse_review_items, parse_revisit_count
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+MENUS = [
+    {"name": "김치찌개", "desc": "돼지고기 김치찌개", "price": "9,000",
+     "image": "https://ldb-phinf.pstatic.net/menu/kimchi.jpg", "recommendation": "대표"},
+    {"name": "된장찌개", "desc": "", "price": "9,000", "image": None, "recommendation": ""},
+    {"name": "공기밥", "desc": "", "price": "변동", "image": None, "recommendation": ""},
+]
+
+REVIEWS = [
+    {"content": "국물이 진하고 맛있어요", "date": "10.1.화", "revisit": 2},
+    {"content": "맛있어요", "date": "9.19.목", "revisit": 0},
+]
+
+
+@pytest.mark.parametrize("text, count", [
+    ("2번째 방문", 2),
+    ("12 번째 방문", 12),
+    ("1번째 방문 · 예약 후 이용", 1),
+    ("인증 수단 영수증", 0),
+    ("", 0),
+    (None, 0),
+])
+def test_parse_revisit_count(text, count):
+    assert parse_revisit_count(text) == count
+
+
+def test_parse_menu_items():
+    items = [
+        {"name": "김치찌개", "desc": "돼지고기 김치찌개", "price": "9,000",
+         "image": "https://ldb-phinf.pstatic.net/menu/kimchi.jpg", "recommendation": "대표"},
+        {"name": "된장찌개", "desc": "", "price": "9,000", "image": "", "recommendation": None},
+        {"name": "공기밥", "price": "변동"},
+        {"name": "", "desc": "", "price": "", "image": "https://ldb-phinf.pstatic.net/menu/empty.jpg"},
+    ]
+    assert parse_menu_items(items) == MENUS
+
+
+def test_parse_review_items():
+    items = [
+        {"content": "국물이 진하고 맛있어요", "date": "10.1.화", "revisit_text": "2번째 방문"},
+        {"content": "맛있어요", "date": "9.19.목", "revisit_text": ""},
+        {"content": "사진만 올린 리뷰", "date": None, "revisit_text": ""},
+        {"content": None, "date": "9.1.일", "revisit_text": "3번째 방문"},
+    ]
+    assert parse_review_items(items) == REVIEWS
+
+
+@pytest.fixture(scope="module")
+def driver():
+    pytest.importorskip("selenium")
+    pytest.importorskip("webdriver_manager")
+    pytest.importorskip("redis")
+    from utils.selenium_driver import SeleniumDriver
+
+    browser = SeleniumDriver(headless=True)
+    try:
+        browser.start_driver()
+    except Exception as e:
+        pytest.skip(f"Chrome을 시작할 수 없음: {e}")
+    yield browser.driver
+    browser.quit_driver()
+
+
+def test_extract_menus(driver):
+    from utils.dom_extractor import extract_menus
+
+    driver.get((FIXTURES / "menu_list.html").as_uri())
+    assert extract_menus(driver) == MENUS
+
+
+def test_extract_reviews(driver):
+    from utils.dom_extractor import extract_reviews
+
+    driver.get((FIXTURES / "review_visitor.html").as_uri())
+    assert extract_reviews(driver) == REVIEWS
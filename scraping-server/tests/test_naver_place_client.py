@@ -0,0 +1,191 @@
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("requests")
+pytest.importorskip("redis")
+
+import requests
+
+from utils.naver_place_client import (
+    NaverPlaceClient, NaverPlaceParseError,
+    extract_apollo_state, parse_store_info, parse_information, parse_menus, parse_reviews, review_total
+)
+
+FIXTURES = Path(__file__).parent / "fixtures"
+PLACE_ID = "1234567890"
+
+
+def load_state(name):
+    return extract_apollo_state((FIXTURES / name).read_text(encoding="utf-8"))
+
+
+def test_extract_apollo_state():
+    state = load_state("place_home.html")
+
+    assert state["PlaceDetailBase:1234567890"]["name"] == "테스트 식당"
+    assert "ROOT_QUERY" in state
+
+
+@pytest.mark.parametrize("html", [
+    "<html><body>로그인이 필요합니다</body></html>",
+    "<script>window.__APOLLO_STATE__ = {\"Menu:1\": </script>",
+    "<script>window.__APOLLO_STATE__ = [1, 2];</script>",
+])
+def test_extract_apollo_state_parse_error(html):
+    with pytest.raises(NaverPlaceParseError):
+        extract_apollo_state(html)
+
+
+def test_parse_store_info():
+    assert parse_store_info(load_state("place_home.html"), PLACE_ID) == {
+        "scraped_store_name": "테스트 식당",
+        "scraped_category": "한식",
+        "scraped_description": "얼큰한 김치찌개 맛집",
+        "scraped_store_address": "서울 서초구 강남대로8길 49 1층",
+        "scraped_directions": "강남역 1번 출구에서 도보 5분",
+        "scraped_phone": "0507-1234-5678",
+        "scraped_sns": "https://www.instagram.com/test_restaurant",
+    }
+
+
+def test_parse_store_info_keeps_etc_info():
+    # Apollo 상태에 없는 기타 정보는 키를 넣지 않아 Selenium으로 수집한 값이 유지됨
+    assert "scraped_etc_info" not in parse_store_info(load_state("place_home.html"), PLACE_ID)
+
+
+def test_parse_store_info_without_place():
+    with pytest.raises(NaverPlaceParseError):
+        parse_store_info(load_state("place_menu.html"), PLACE_ID)
+
+
+def test_parse_information():
+    assert parse_information(load_state("place_information.html"), PLACE_ID) == {
+        "scraped_intro": "매일 아침 끓이는 육수로 만든 찌개 전문점입니다.",
+        "scraped_services": "단체 이용 가능, 포장, 무선 인터넷",
+    }
+
+
+def test_parse_menus():
+    assert parse_menus(load_state("place_menu.html")) == [
+        {"name": "김치찌개", "desc": "돼지고기 김치찌개", "price": "9,000",
+         "image": "https://ldb-phinf.pstatic.net/menu/kimchi.jpg", "recommendation": "대표"},
+        {"name": "된장찌개", "desc": "", "price": "9,000", "image": None, "recommendation": ""},
+        {"name": "공기밥", "desc": "", "price": "변동", "image": None, "recommendation": ""},
+    ]
+
+
+def test_parse_reviews():
+    assert parse_reviews(load_state("place_review.html")) == [
+        {"content": "국물이 진하고 맛있어요", "date": "10.1.화", "revisit": 2},
+        {"content": "맛있어요", "date": "9.19.목", "revisit": 1},
+    ]
+
+
+def test_review_total():
+    assert review_total(load_state("place_review.html")) == 6
+    assert review_total(load_state("place_menu.html")) is None
+
+
+class FakeResponse:
+    def __init__(self, text="", data=None):
+        self.text = text
+        self.data = data
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.data
+
+
+class FakeSession:
+    """저장된 페이지 HTML과 GraphQL 추가 페이지 응답 (요청 기록, 실패할 페이지 지정 가능)"""
+
+    PAGES = {"home": "place_home.html", "information": "place_information.html", "review/visitor": "place_review.html"}
+
+    def __init__(self, pages=None, failing=()):
+        self.pages = pages or {}
+        self.failing = failing
+        self.requests = []
+
+    def get(self, url, timeout=None):
+        page = url.split("/1234567890/", 1)[1]
+        if page in self.failing:
+            raise requests.RequestException(f"{page} 요청 실패")
+        return FakeResponse(text=(FIXTURES / self.PAGES[page]).read_text(encoding="utf-8"))
+
+    def post(self, url, json=None, headers=None, timeout=None):
+        review_input = json[0]["variables"]["input"]
+        self.requests.append((review_input["page"], review_input["size"]))
+        if review_input["page"] in self.failing:
+            raise requests.RequestException("GraphQL 요청 실패")
+        items = self.pages.get(review_input["page"], [])
+        return FakeResponse(data=[{"data": {"visitorReviews": {"items": items, "total": 6}}}])
+
+
+class NoWait:
+    def wait(self, url):
+        return 0.0
+
+
+def review(review_id, body):
+    return {"id": review_id, "body": body, "created": "2024-09-01", "visited": "8.31.토", "visitCount": 1}
+
+
+def make_client(session):
+    client = NaverPlaceClient(review_pages=10)
+    client.session = session
+    client.rate_limiter = NoWait()
+    return client
+
+
+def test_fetch_reviews_pages_on_first_page_size():
+    session = FakeSession({
+        # 첫 페이지 이후 새 리뷰가 생겨 한 칸씩 밀린 경우 (r3 중복)
+        2: [review("r3", ""), review("r4", "맛있어요"), review("r5", "친절해요")],
+        3: [review("r6", "재방문 의사 있어요")],
+    })
+
+    reviews = make_client(session).fetch_reviews(PLACE_ID)
+
+    # 첫 페이지(3개)와 같은 크기로 이어서 요청하고, 짧은 페이지에서 멈춤
+    assert session.requests == [(2, 3), (3, 3)]
+    # 본문이 같아도 ID가 다르면 모두 유지
+    assert [item["content"] for item in reviews] == [
+        "국물이 진하고 맛있어요", "맛있어요", "맛있어요", "친절해요", "재방문 의사 있어요"
+    ]
+
+
+def test_fetch_reviews_stops_at_total():
+    session = FakeSession({
+        2: [review("r4", "맛있어요"), review("r5", "친절해요"), review("r6", "재방문 의사 있어요")],
+        3: [review("r7", "전체 리뷰 수 이후")],
+    })
+
+    reviews = make_client(session).fetch_reviews(PLACE_ID)
+
+    # 전체 6개를 받으면 더 요청하지 않음
+    assert session.requests == [(2, 3)]
+    assert len(reviews) == 5
+
+
+def test_fetch_reviews_paging_failure_raises():
+    # 전체 리뷰 수에 도달하기 전 추가 페이지 실패 → Selenium으로 대체되도록 예외
+    session = FakeSession({2: [review("r4", "맛있어요"), review("r5", "친절해요"), review("r6", "좋아요")]}, failing=(2,))
+
+    with pytest.raises(NaverPlaceParseError):
+        make_client(session).fetch_reviews(PLACE_ID)
+
+
+def test_fetch_store_info():
+    store_info = make_client(FakeSession()).fetch_store_info(PLACE_ID)
+
+    assert store_info["scraped_store_name"] == "테스트 식당"
+    assert store_info["scraped_intro"] == "매일 아침 끓이는 육수로 만든 찌개 전문점입니다."
+
+
+def test_fetch_store_info_information_failure_raises():
+    # 소개 페이지 실패 시 기본 정보만 반환하면 이전 소개/편의시설이 남으므로 예외 (Selenium으로 대체)
+    with pytest.raises(requests.RequestException):
+        make_client(FakeSession(failing=("information",))).fetch_store_info(PLACE_ID)
@@ -0,0 +1,126 @@
+from contextlib import contextmanager
+from utils.selenium_driver import SeleniumDriver
+import os
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class BrowserPool:
+    """
+    워커 프로세스별 Chrome 브라우저 풀
+
+    스크래핑이 끝난 브라우저를 닫지 않고 보관했다가 다음 태스크에서 재사용합니다.
+    (headless Chrome 기동이 매장 하나 스크래핑 시간의 큰 부분을 차지함)
+    - 새 브라우저는 실제로 필요할 때(ensure_alive) 시작 (HTTP 수집이 성공하면 Chrome을 띄우지 않음)
+    - 꺼낼 때 헬스 체크 후 응답 없는 브라우저는 버림
+    - BROWSER_MAX_PAGES 페이지 이상 연 브라우저는 메모리 누수 방지를 위해 새로 띄움
+    - 반납 시 쿠키를 지우고 빈 페이지로 이동
+
+    설정 (환경변수):
+    - BROWSER_POOL_ENABLED: 브라우저 풀 사용 여부 (기본 false, 사용하지 않으면 태스크마다 새 브라우저)
+    - BROWSER_POOL_SIZE: 프로세스당 보관할 최대 브라우저 수 (기본 1)
+    - BROWSER_MAX_PAGES: 브라우저 하나로 열 최대 페이지 수 (기본 50)
+    """
+
+    def __init__(self, enabled=None, size=None, max_pages=None, headless=True):
+        self.enabled = enabled if enabled is not None else os.getenv("BROWSER_POOL_ENABLED", "false").lower() == "true"
+        self.size = size or int(os.getenv("BROWSER_POOL_SIZE", "1"))
+        self.max_pages = max_pages or int(os.getenv("BROWSER_MAX_PAGES", "50"))
+        self.headless = headless
+
+        self._idle = []
+        self._lock = threading.Lock()
+
+        # 통계
+        self.created = 0
+        self.reused = 0
+        self.recycled = 0
+
+    def acquire(self):
+        """브라우저 꺼내기 (없거나 응답 없으면 아직 시작하지 않은 새 브라우저)"""
+        while True:
+            with self._lock:
+                browser = self._idle.pop() if self._idle else None
+            if browser is None:
+                break
+            if browser.is_alive():
+                self.reused += 1
+                return browser
+            logger.warning("풀의 Chrome WebDriver 응답 없음 - 폐기")
+            browser.quit_driver()
+
+        self.created += 1
+        return SeleniumDriver(headless=self.headless)
+
+    def release(self, browser):
+        """브라우저 반납 (풀이 꺼져 있거나, 가득 찼거나, 재활용 대상이면 종료)"""
+        if browser.driver is None:
+            return
+        if not self.enabled or browser.pages >= self.max_pages or not browser.is_alive():
+            if browser.pages >= self.max_pages:
+                self.recycled += 1
+                logger.info(f"Chrome WebDriver 재활용: {browser.pages}페이지 사용")
+            browser.quit_driver()
+            return
+
+        try:
+            browser.driver.delete_all_cookies()
+            browser.driver.get("about:blank")
+        except Exception as e:
+            logger.warning(f"Chrome WebDriver 초기화 실패 - 폐기: {e}")
+            browser.quit_driver()
+            return
+
+        with self._lock:
+            if len(self._idle) < self.size:
+                self._idle.append(browser)
+                return
+        browser.quit_driver()
+
+    @contextmanager
+    def session(self):
+        """스크래핑 작업 하나가 쓸 브라우저 세션"""
+        browser = self.acquire()
+        browser.reset_waits()
+        try:
+            yield browser
+        finally:
+            self.release(browser)
+
+    def close(self):
+        """보관 중인 브라우저 모두 종료 (워커 프로세스 종료 시)"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for browser in idle:
+            browser.quit_driver()
+
+    def get_stats(self):
+        """풀 설정 및 통계"""
+        return {
+            "enabled": self.enabled,
+            "size": self.size,
+            "max_pages": self.max_pages,
+            "idle": len(self._idle),
+            "created": self.created,
+            "reused": self.reused,
+            "recycled": self.recycled
+        }
+
+
+# 전역 인스턴스 (prefork 워커에서는 자식 프로세스마다 따로 생성됨)
+_browser_pool = None
+
+
+def get_browser_pool():
+    """
+    브라우저 풀 가져오기 (싱글톤)
+
+    Returns:
+        BrowserPool 인스턴스
+    """
+    global _browser_pool
+    if _browser_pool is None:
+        _browser_pool = BrowserPool()
+    return _browser_pool
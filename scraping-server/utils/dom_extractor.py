@@ -0,0 +1,103 @@
+"""
+목록 페이지 일괄 추출 (DOM Extractor)
+
+메뉴/리뷰 항목마다 find_elements, .text, get_attribute를 부르면 호출마다 WebDriver 왕복이 생겨
+더보기를 끝까지 누른 리뷰 페이지에서는 수천 번이 됩니다.
+브라우저 안에서 DOM을 한 번에 훑는 스크립트를 execute_script 한 번으로 실행해 항목 전체를 JSON 배열로 받습니다.
+
+선택자와 결과는 기존 항목별 수집 코드와 같습니다 (.text 대신 같은 렌더링 텍스트인 innerText 사용).
+비교 및 저장된 페이지 확인: benchmark_dom_extraction.py
+"""
+
+import re
+
+# 목록 항목/더보기 버튼 선택자
+MENU_ITEM = 'li.E2jtL'
+REVIEW_ITEM = 'li.place_apply_pui.EjjAW'
+MORE_BUTTON = 'a.fvwqf'
+
+# arguments[0]: 항목 선택자 → [{name, desc, price, image, recommendation}]
+MENU_SCRIPT = """
+const text = (root, selector) => {
+  const element = root.querySelector(selector);
+  return element ? element.innerText.trim() : '';
+};
+return Array.from(document.querySelectorAll(arguments[0])).map(li => {
+  const priceEm = li.querySelector('div.GXS1X em');
+  const image = li.querySelector('img');
+  return {
+    name: text(li, 'span.lPzHi'),
+    desc: text(li, 'div.kPogF'),
+    price: priceEm ? priceEm.innerText.trim() : text(li, 'div.GXS1X'),
+    image: image ? image.src : null,
+    recommendation: text(li, 'span.QM_zp span')
+  };
+});
+"""
+
+# arguments[0]: 항목 선택자 → [{content, date, revisit_text}] (본문/날짜가 없으면 null)
+REVIEW_SCRIPT = """
+return Array.from(document.querySelectorAll(arguments[0])).map(li => {
+  const content = li.querySelector('div.pui__vn15t2');
+  const date = li.querySelector('span.pui__gfuUIT > time');
+  const details = li.querySelectorAll('span.pui__gfuUIT');
+  return {
+    content: content ? content.innerText.trim() : null,
+    date: date ? date.innerText.trim() : null,
+    revisit_text: details.length > 1 ? details[1].innerText.trim() : ''
+  };
+});
+"""
+
+_REVISIT = re.compile(r"(\d+)\s*번째 방문")
+
+
+def parse_revisit_count(text):
+    """"2번째 방문" → 2 (없으면 0)"""
+    match = _REVISIT.search(text or "")
+    return int(match.group(1)) if match else 0
+
+
+def parse_menu_items(items):
+    """
+    추출한 메뉴 항목 정리 (이름/설명/가격이 모두 없는 항목 제외)
+
+    Returns:
+        list[dict]: [{"name", "desc", "price", "image", "recommendation"}]
+    """
+    menus = []
+    for item in items:
+        menu = {
+            "name": item.get("name") or "",
+            "desc": item.get("desc") or "",
+            "price": item.get("price") or "",
+            "image": item.get("image") or None,
+            "recommendation": item.get("recommendation") or ""
+        }
+        if menu["name"] or menu["desc"] or menu["price"]:
+            menus.append(menu)
+    return menus
+
+
+def parse_review_items(items):
+    """
+    추출한 리뷰 항목 정리 (본문이나 날짜가 없는 항목 제외)
+
+    Returns:
+        list[dict]: [{"content", "date", "revisit"}]
+    """
+    return [
+        {"content": item["content"], "date": item["date"], "revisit": parse_revisit_count(item.get("revisit_text"))}
+        for item in items
+        if item.get("content") is not None and item.get("date") is not None
+    ]
+
+
+def extract_menus(driver, item_selector=MENU_ITEM):
+    """현재 페이지의 메뉴 전체 (WebDriver 호출 1회)"""
+    return parse_menu_items(driver.execute_script(MENU_SCRIPT, item_selector) or [])
+
+
+def extract_reviews(driver, item_selector=REVIEW_ITEM):
+    """현재 페이지의 리뷰 전체 (WebDriver 호출 1회)"""
+    return parse_review_items(driver.execute_script(REVIEW_SCRIPT, item_selector) or [])
@@ -0,0 +1,354 @@
+"""
+네이버 플레이스 HTTP/JSON 수집기
+
+m.place.naver.com 페이지는 화면에 그리는 데이터를 HTML 안의 Apollo 상태(window.__APOLLO_STATE__)로
+함께 내려줍니다. 브라우저 없이 페이지 HTML만 받아 이 JSON에서 매장 정보/메뉴/리뷰를 꺼내므로
+매장 하나가 Chrome 세션 대신 HTTP 요청 몇 번으로 끝납니다.
+
+Apollo 상태의 필드명은 네이버가 예고 없이 바꿀 수 있으므로, 필요한 데이터를 찾지 못하면
+NaverPlaceParseError를 발생시키고 호출 측(scraping_tasks)이 Selenium 수집으로 대체합니다.
+
+설정 (환경변수):
+- SCRAPE_HTTP_TIMEOUT: 요청 타임아웃 (기본 10초)
+- SCRAPE_REVIEW_PAGES: 첫 페이지 이후 GraphQL로 더 가져올 리뷰 페이지 수 (기본 10, 0이면 첫 페이지만)
+
+저장된 페이지로 파서 확인:
+    python -m utils.naver_place_client menu saved_menu_page.html
+"""
+
+import os
+import re
+import sys
+import json
+import logging
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from utils.rate_limiter import get_rate_limiter
+
+logger = logging.getLogger(__name__)
+
+PLACE_URL = "https://m.place.naver.com/restaurant/{place_id}/{page}"
+GRAPHQL_URL = "https://api.place.naver.com/graphql"
+
+# Selenium 드라이버와 같은 모바일 페이지를 받도록 브라우저 헤더 사용
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/98.0.4758.102 Safari/537.36",
+    "Accept-Language": "ko-KR,ko;q=0.9",
+    "Referer": "https://m.place.naver.com/"
+}
+
+_APOLLO_STATE = re.compile(r"window\.__APOLLO_STATE__\s*=\s*")
+
+# 방문자 리뷰 추가 페이지 조회 (m.place 리뷰 탭의 "더보기"와 같은 요청)
+VISITOR_REVIEWS_QUERY = """
+query getVisitorReviews($input: VisitorReviewsInput) {
+  visitorReviews(input: $input) {
+    items { id body created visited visitCount }
+    total
+  }
+}
+"""
+
+
+class NaverPlaceParseError(ValueError):
+    """페이지에서 필요한 JSON 데이터를 찾지 못함 (Selenium 수집으로 대체)"""
+
+
+def extract_apollo_state(html):
+    """
+    HTML에서 Apollo 상태 JSON 추출
+
+    Returns:
+        dict: {"타입:ID": 객체, "ROOT_QUERY": ...}
+    """
+    match = _APOLLO_STATE.search(html)
+    if not match:
+        raise NaverPlaceParseError("__APOLLO_STATE__를 찾을 수 없습니다")
+    try:
+        state, _ = json.JSONDecoder().raw_decode(html, match.end())
+    except ValueError as e:
+        raise NaverPlaceParseError(f"__APOLLO_STATE__ 파싱 실패: {e}")
+    if not isinstance(state, dict):
+        raise NaverPlaceParseError("__APOLLO_STATE__ 형식이 올바르지 않습니다")
+    return state
+
+
+def objects_of_type(state, typename):
+    """Apollo 상태에서 __typename이 같은 객체 목록 (문서 순서)"""
+    return [value for value in state.values() if isinstance(value, dict) and value.get("__typename") == typename]
+
+
+def resolve(state, value):
+    """{"__ref": "타입:ID"} 참조를 실제 객체로"""
+    if isinstance(value, dict) and "__ref" in value:
+        return state.get(value["__ref"], {})
+    return value
+
+
+def _text(value):
+    """문자열 정리 (비어 있으면 None)"""
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+
+def format_price(price):
+    """Apollo 가격("9000")을 화면 표기("9,000")로 (숫자가 아니면 그대로)"""
+    price = _text(price)
+    if price and price.isdigit():
+        return f"{int(price):,}"
+    return price or ""
+
+
+def parse_store_info(state, place_id):
+    """
+    매장 기본 정보 파싱 (home 페이지)
+
+    Returns:
+        dict: Store 모델의 scraped_* 필드 (Selenium 수집과 같은 키, scraped_etc_info 제외)
+    """
+    base = state.get(f"PlaceDetailBase:{place_id}") or next(iter(objects_of_type(state, "PlaceDetailBase")), None)
+    if not base or not _text(base.get("name")):
+        raise NaverPlaceParseError("PlaceDetailBase를 찾을 수 없습니다")
+
+    # Apollo 상태에 대응 필드가 있는 키는 값이 없어도 None으로 채워 이전 수집 값이 남지 않도록 함
+    # 기타 정보(scraped_etc_info, 화면 하단 div.xPvPE)는 대응 필드가 없어 키를 넣지 않음 (Selenium 수집 값 유지)
+    micro_reviews = base.get("microReviews") or []
+    store_info = {
+        "scraped_store_name": _text(base.get("name")),
+        "scraped_category": _text(base.get("category")),
+        # 화면의 매장명 아래 한 줄 소개
+        "scraped_description": (_text(micro_reviews[0]) if micro_reviews else None) or _text(base.get("description")),
+        "scraped_store_address": _text(base.get("roadAddress")) or _text(base.get("address")),
+        "scraped_directions": _text(base.get("road")),
+        "scraped_phone": _text(base.get("phone")) or _text(base.get("virtualPhone")),
+    }
+
+    # 홈페이지/SNS (첫 번째 링크)
+    homepages = resolve(state, base.get("homepages")) or {}
+    links = [resolve(state, link) for link in (homepages.get("etc") or [])]
+    repr_link = resolve(state, homepages.get("repr"))
+    if repr_link:
+        links.insert(0, repr_link)
+    store_info["scraped_sns"] = next((_text(link.get("url")) for link in links if link and link.get("url")), None)
+
+    return store_info
+
+
+def parse_information(state, place_id):
+    """
+    매장 소개/편의시설 파싱 (information 페이지)
+
+    Returns:
+        dict: {"scraped_intro", "scraped_services"} (없으면 None)
+    """
+    base = state.get(f"PlaceDetailBase:{place_id}") or next(iter(objects_of_type(state, "PlaceDetailBase")), {})
+    description = _text(base.get("description"))
+
+    conveniences = base.get("conveniences")
+    for key, value in state.get("ROOT_QUERY", {}).items():
+        if not key.startswith("placeDetail"):
+            continue
+        detail = resolve(state, value) or {}
+        description = description or _text(detail.get("description"))
+        conveniences = conveniences or detail.get("conveniences")
+
+    services = ", ".join(str(item).strip() for item in conveniences or [] if str(item).strip())
+    return {"scraped_intro": description, "scraped_services": services or None}
+
+
+def parse_menus(state):
+    """
+    메뉴 파싱 (menu/list 페이지)
+
+    Returns:
+        list[dict]: [{"name", "desc", "price", "image", "recommendation"}] (화면 순서)
+    """
+    menus = []
+    for menu in objects_of_type(state, "Menu"):
+        images = menu.get("images") or []
+        menus.append({
+            "name": _text(menu.get("name")) or "",
+            "desc": _text(menu.get("description")) or "",
+            "price": format_price(menu.get("price")),
+            "image": _text(images[0]) if images else None,
+            # 화면의 "대표" 배지와 같은 값
+            "recommendation": "대표" if menu.get("recommend") else ""
+        })
+    return [menu for menu in menus if menu["name"] or menu["desc"] or menu["price"]]
+
+
+def parse_review(review):
+    """방문자 리뷰 객체 → {"content", "date", "revisit"}"""
+    return {
+        "content": _text(review.get("body")) or "",
+        "date": _text(review.get("visited")) or _text(review.get("created")) or "",
+        "revisit": int(review.get("visitCount") or 0)
+    }
+
+
+def parse_reviews(state):
+    """
+    방문자 리뷰 파싱 (review/visitor 페이지의 첫 페이지)
+
+    Returns:
+        list[dict]: [{"content", "date", "revisit"}]
+    """
+    return [parse_review(review) for review in objects_of_type(state, "VisitorReview") if _text(review.get("body"))]
+
+
+def review_total(state):
+    """첫 페이지 Apollo 상태의 전체 방문자 리뷰 수 (없으면 None)"""
+    for key, value in state.get("ROOT_QUERY", {}).items():
+        if key.startswith("visitorReviews"):
+            total = (resolve(state, value) or {}).get("total")
+            if isinstance(total, int):
+                return total
+    return None
+
+
+def review_key(review):
+    """리뷰 중복 판단 키 (리뷰 ID, 없으면 본문+작성일)"""
+    return review.get("id") or (review.get("body"), review.get("created"))
+
+
+class NaverPlaceClient:
+    """네이버 플레이스 페이지 HTTP 수집 (연결 재사용)"""
+
+    def __init__(self, timeout=None, review_pages=None):
+        self.timeout = timeout or float(os.getenv("SCRAPE_HTTP_TIMEOUT", "10"))
+        self.review_pages = review_pages if review_pages is not None else int(os.getenv("SCRAPE_REVIEW_PAGES", "10"))
+
+        # 같은 호스트에 연결을 유지해 매장마다 TLS 연결을 새로 맺지 않음
+        self.session = requests.Session()
+        self.session.headers.update(HEADERS)
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=8,
+            max_retries=Retry(total=2, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504])
+        )
+        self.session.mount("https://", adapter)
+        self.rate_limiter = get_rate_limiter()
+
+    def fetch_state(self, place_id, page):
+        """페이지 HTML을 받아 Apollo 상태 추출"""
+        url = PLACE_URL.format(place_id=place_id, page=page)
+        self.rate_limiter.wait(url)
+        response = self.session.get(url, timeout=self.timeout)
+        response.raise_for_status()
+        return extract_apollo_state(response.text)
+
+    def fetch_store_info(self, place_id):
+        """
+        매장 기본 정보 + 소개/편의시설
+
+        소개 페이지 수집이 실패하면 예외를 그대로 전달해 호출 측이 Selenium으로 대체합니다
+        (기본 정보만 반환하면 이전 수집의 소개/편의시설 값이 그대로 남음).
+        """
+        store_info = parse_store_info(self.fetch_state(place_id, "home"), place_id)
+        store_info.update(parse_information(self.fetch_state(place_id, "information"), place_id))
+        return store_info
+
+    def fetch_menus(self, place_id):
+        """메뉴 목록 (메뉴 페이지에 전체 메뉴가 포함됨)"""
+        return parse_menus(self.fetch_state(place_id, "menu/list"))
+
+    def fetch_reviews(self, place_id):
+        """
+        방문자 리뷰 (첫 페이지 + GraphQL 추가 페이지)
+
+        추가 페이지는 페이지에 포함된 첫 페이지와 같은 크기로 요청해 page 번호가 첫 페이지에 이어지도록 하고,
+        리뷰 ID로 중복을 제거합니다 (본문이 같은 서로 다른 리뷰는 모두 유지).
+        전체 리뷰 수(또는 SCRAPE_REVIEW_PAGES 한도)에 도달하기 전에 추가 페이지 요청이 실패하면
+        첫 페이지만 저장하지 않도록 NaverPlaceParseError를 발생시킵니다 (호출 측이 Selenium으로 대체).
+        """
+        state = self.fetch_state(place_id, "review/visitor")
+        items = objects_of_type(state, "VisitorReview")
+        page_size = len(items)
+        total = review_total(state)
+        seen = {review_key(item) for item in items}
+
+        for page in range(2, self.review_pages + 2) if page_size else ():
+            if total is not None and len(items) >= total:
+                break
+            try:
+                page_items = self._fetch_review_page(place_id, page, page_size)
+            except (requests.RequestException, ValueError, KeyError, TypeError) as e:
+                raise NaverPlaceParseError(
+                    f"리뷰 추가 페이지 수집 실패 (page={page}, {len(items)}/{total if total is not None else '?'}개): {e}"
+                )
+
+            new_items = [item for item in page_items if review_key(item) not in seen]
+            seen.update(review_key(item) for item in new_items)
+            items.extend(new_items)
+            if not new_items or len(page_items) < page_size:
+                break
+
+        return [parse_review(item) for item in items if _text(item.get("body"))]
+
+    def _fetch_review_page(self, place_id, page, size):
+        """GraphQL 방문자 리뷰 한 페이지 (size: 페이지당 리뷰 수)"""
+        payload = [{
+            "operationName": "getVisitorReviews",
+            "query": VISITOR_REVIEWS_QUERY,
+            "variables": {
+                "input": {
+                    "businessId": str(place_id),
+                    "businessType": "restaurant",
+                    "item": "0",
+                    "page": page,
+                    "size": size,
+                    "includeContent": True
+                }
+            }
+        }]
+        self.rate_limiter.wait(GRAPHQL_URL)
+        response = self.session.post(
+            GRAPHQL_URL,
+            json=payload,
+            headers={"Referer": PLACE_URL.format(place_id=place_id, page="review/visitor")},
+            timeout=self.timeout
+        )
+        response.raise_for_status()
+        return response.json()[0]["data"]["visitorReviews"]["items"] or []
+
+
+# 전역 인스턴스
+_place_client = None
+
+
+def get_place_client():
+    """
+    네이버 플레이스 HTTP 수집기 가져오기 (싱글톤)
+
+    Returns:
+        NaverPlaceClient 인스턴스
+    """
+    global _place_client
+    if _place_client is None:
+        _place_client = NaverPlaceClient()
+    return _place_client
+
+
+PARSERS = {
+    "home": lambda state, place_id: parse_store_info(state, place_id),
+    "information": lambda state, place_id: parse_information(state, place_id),
+    "menu": lambda state, place_id: parse_menus(state),
+    "review": lambda state, place_id: parse_reviews(state),
+}
+
+
+if __name__ == "__main__":
+    # 저장된 페이지 HTML로 파서 확인: python -m utils.naver_place_client <home|information|menu|review> <파일> [place_id]
+    if len(sys.argv) < 3 or sys.argv[1] not in PARSERS:
+        print(f"사용법: python -m utils.naver_place_client <{'|'.join(PARSERS)}> <HTML 파일> [place_id]")
+        sys.exit(1)
+
+    with open(sys.argv[2], "r", encoding="utf-8") as f:
+        apollo_state = extract_apollo_state(f.read())
+    result = PARSERS[sys.argv[1]](apollo_state, sys.argv[3] if len(sys.argv) > 3 else "")
+    print(json.dumps(result, ensure_ascii=False, indent=2))
@@ -0,0 +1,131 @@
+from urllib.parse import urlparse
+import os
+import time
+import threading
+import logging
+
+import redis
+
+logger = logging.getLogger(__name__)
+
+# 도메인별 다음 요청 가능 시각 예약 (Redis 서버 시각 기준, ms)
+_RESERVE_SCRIPT = """
+local now_parts = redis.call('TIME')
+local now = now_parts[1] * 1000 + math.floor(now_parts[2] / 1000)
+local interval = tonumber(ARGV[1])
+local next_slot = tonumber(redis.call('GET', KEYS[1]) or '0')
+local slot = math.max(now, next_slot)
+redis.call('SET', KEYS[1], slot + interval, 'PX', slot + interval - now + 1000)
+return slot - now
+"""
+
+
+def parse_intervals(value):
+    """"도메인=ms,도메인=ms" 형식의 도메인별 최소 요청 간격 파싱"""
+    intervals = {}
+    for item in value.split(","):
+        if "=" not in item:
+            continue
+        domain, interval = item.split("=", 1)
+        try:
+            intervals[domain.strip()] = int(interval)
+        except ValueError:
+            logger.warning(f"잘못된 요청 간격 설정 무시: {item}")
+    return intervals
+
+
+class DomainRateLimiter:
+    """
+    도메인별 요청 간격 제한
+
+    여러 워커/스레드가 동시에 같은 사이트를 요청해 차단되지 않도록, 도메인마다 요청 사이에
+    최소 간격을 둡니다. 다음 요청 시각을 Redis에 예약하므로 모든 워커 프로세스에 함께 적용되며,
+    Redis를 쓸 수 없으면 프로세스 안에서만 제한합니다.
+
+    설정 (환경변수):
+    - SCRAPE_RATE_LIMIT_MS: 도메인별 최소 요청 간격 기본값 (기본 500ms, 0이면 제한 없음)
+    - SCRAPE_RATE_LIMITS: 도메인별 간격 "도메인=ms,도메인=ms" (기본값보다 우선)
+    """
+
+    def __init__(self, default_interval_ms=None, intervals=None, redis_url=None):
+        self.default_interval_ms = default_interval_ms if default_interval_ms is not None else int(os.getenv("SCRAPE_RATE_LIMIT_MS", "500"))
+        self.intervals = intervals if intervals is not None else parse_intervals(os.getenv("SCRAPE_RATE_LIMITS", ""))
+
+        self._local_slots = {}
+        self._lock = threading.Lock()
+
+        # 통계
+        self.requests = 0
+        self.total_wait_ms = 0.0
+
+        try:
+            self.redis = redis.Redis.from_url(redis_url or os.getenv("REDIS_URL", "redis://localhost:56379/0"))
+            self._reserve = self.redis.register_script(_RESERVE_SCRIPT)
+        except Exception as e:
+            logger.warning(f"Redis 연결 실패, 프로세스 내 요청 간격 제한 사용: {e}")
+            self.redis = None
+
+    def interval_for(self, domain):
+        """도메인의 최소 요청 간격 (ms)"""
+        return self.intervals.get(domain, self.default_interval_ms)
+
+    def wait(self, url):
+        """
+        URL 도메인의 차례가 올 때까지 대기
+
+        Returns:
+            float: 실제 대기 시간 (ms)
+        """
+        domain = urlparse(url).netloc
+        interval = self.interval_for(domain)
+        if interval <= 0:
+            return 0.0
+
+        delay_ms = self._reserve_slot(domain, interval)
+        if delay_ms > 0:
+            time.sleep(delay_ms / 1000)
+
+        self.requests += 1
+        self.total_wait_ms += delay_ms
+        return delay_ms
+
+    def _reserve_slot(self, domain, interval):
+        """다음 요청 시각 예약 후 그때까지 남은 시간 (ms)"""
+        if self.redis is not None:
+            try:
+                return float(self._reserve(keys=[f"scrape:rate:{domain}"], args=[interval]))
+            except Exception as e:
+                logger.warning(f"Redis 요청 간격 예약 실패, 프로세스 내 제한 사용: {e}")
+
+        with self._lock:
+            now = time.monotonic() * 1000
+            slot = max(now, self._local_slots.get(domain, 0.0))
+            self._local_slots[domain] = slot + interval
+        return slot - now
+
+    def get_stats(self):
+        """요청 간격 제한 설정 및 통계"""
+        return {
+            "default_interval_ms": self.default_interval_ms,
+            "intervals": self.intervals,
+            "shared": self.redis is not None,
+            "requests": self.requests,
+            "avg_wait_ms": round(self.total_wait_ms / self.requests, 1) if self.requests else 0.0
+        }
+
+
+# 전역 인스턴스
+_rate_limiter = None
+
+
+def get_rate_limiter():
+    """
+    도메인별 요청 간격 제한기 가져오기 (싱글톤)
+
+    Returns:
+        DomainRateLimiter 인스턴스
+    """
+    global _rate_limiter
+    if _rate_limiter is None:
+        _rate_limiter = DomainRateLimiter()
+    return _rate_limiter
@@ -5,15 +5,74 @@ from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.by import By
+from selenium.common.exceptions import TimeoutException
+from functools import lru_cache
+from utils.rate_limiter import get_rate_limiter
 import os
+import time
 import logging
 
 logger = logging.getLogger(__name__)
 
+# 대기 설정 (고정 sleep 대신 조건 충족 시 바로 진행, 아래 값은 상한)
+PAGE_TIMEOUT = float(os.getenv("SCRAPE_PAGE_TIMEOUT", "10"))  # 페이지 내용 렌더링 대기 (초)
+LOAD_MORE_TIMEOUT = float(os.getenv("SCRAPE_LOAD_MORE_TIMEOUT", "5"))  # 더보기 클릭 후 항목 추가 대기 (초)
+NETWORK_IDLE_MS = float(os.getenv("SCRAPE_NETWORK_IDLE_MS", "500"))  # 이 시간 동안 새 요청이 없으면 네트워크 유휴
+
+# 문서 로드 상태와 마지막 리소스 응답 이후 경과 시간 (ms)
+_NETWORK_STATE_SCRIPT = """
+performance.setResourceTimingBufferSize(5000);
+const entries = performance.getEntriesByType('resource');
+const last = entries.reduce((latest, entry) => Math.max(latest, entry.responseEnd), 0);
+return [document.readyState, performance.now() - last];
+"""
+
+
+@lru_cache(maxsize=None)
+def resolve_chromedriver_path():
+    """
+    ChromeDriver 경로 확인 (프로세스당 한 번만 실행)
+
+    ChromeDriverManager().install()은 버전 확인/다운로드를 하므로 브라우저를 띄울 때마다 부르지 않습니다.
+
+    Returns:
+        str: ChromeDriver 경로 또는 None (Selenium 기본 탐색 사용)
+    """
+    # 시스템에 설치된 ChromeDriver를 먼저 확인
+    system_chromedriver = '/usr/local/bin/chromedriver'
+    if os.path.exists(system_chromedriver):
+        logger.info(f"시스템 ChromeDriver 사용: {system_chromedriver}")
+        return system_chromedriver
+
+    # 시스템에 없으면 ChromeDriverManager 사용
+    try:
+        driver_path = ChromeDriverManager().install()
+        # ChromeDriverManager가 잘못된 파일을 반환하는 경우 수정
+        if 'THIRD_PARTY_NOTICES' in driver_path or not driver_path.endswith('chromedriver'):
+            driver_dir = os.path.dirname(driver_path)
+            chromedriver_path = os.path.join(driver_dir, 'chromedriver')
+            if os.path.exists(chromedriver_path):
+                driver_path = chromedriver_path
+                # 실행 권한 확인 및 부여
+                if not os.access(driver_path, os.X_OK):
+                    os.chmod(driver_path, 0o755)
+                    logger.info(f"ChromeDriver 실행 권한 부여: {driver_path}")
+
+        logger.info(f"ChromeDriver 경로: {driver_path}")
+        return driver_path
+    except Exception as e:
+        logger.warning(f"ChromeDriverManager 실패, 기본 chromedriver 사용: {e}")
+        return None
+
+
 class SeleniumDriver:
     def __init__(self, headless=True):
         self.driver = None
         self.headless = headless
+        # 이 브라우저로 연 페이지 수 (브라우저 풀 재활용 기준)
+        self.pages = 0
+        # 대기 기록 [{"name", "ms", "result"}] (작업마다 reset_waits로 초기화)
+        self.waits = []
 
     def __enter__(self):
         self.start_driver()
@@ -44,33 +103,7 @@ class SeleniumDriver:
             if os.path.exists('/usr/bin/google-chrome'):
                 options.binary_location = '/usr/bin/google-chrome'
 
-            # ChromeDriver 서비스 설정
-            # 시스템에 설치된 ChromeDriver를 먼저 확인
-            system_chromedriver = '/usr/local/bin/chromedriver'
-            if os.path.exists(system_chromedriver):
-                logger.info(f"시스템 ChromeDriver 사용: {system_chromedriver}")
-                service = Service(system_chromedriver)
-            else:
-                # 시스템에 없으면 ChromeDriverManager 사용
-                try:
-                    driver_path = ChromeDriverManager().install()
-                    # ChromeDriverManager가 잘못된 파일을 반환하는 경우 수정
-                    if 'THIRD_PARTY_NOTICES' in driver_path or not driver_path.endswith('chromedriver'):
-                        driver_dir = os.path.dirname(driver_path)
-                        chromedriver_path = os.path.join(driver_dir, 'chromedriver')
-                        if os.path.exists(chromedriver_path):
-                            driver_path = chromedriver_path
-                            # 실행 권한 확인 및 부여
-                            if not os.access(driver_path, os.X_OK):
-                                os.chmod(driver_path, 0o755)
-                                logger.info(f"ChromeDriver 실행 권한 부여: {driver_path}")
-
-                    logger.info(f"ChromeDriver 경로: {driver_path}")
-                    service = Service(driver_path)
-                except Exception as e:
-                    logger.warning(f"ChromeDriverManager 실패, 기본 chromedriver 사용: {e}")
-                    service = Service()
-
+            service = Service(resolve_chromedriver_path())
             self.driver = webdriver.Chrome(service=service, options=options)
 
             # 자동화 감지 우회
@@ -91,6 +124,113 @@ class SeleniumDriver:
                 logger.info("Chrome WebDriver 종료 완료")
             except Exception as e:
                 logger.error(f"Chrome WebDriver 종료 중 오류: {e}")
+            finally:
+                self.driver = None
+
+    def open(self, url):
+        """페이지 이동 (도메인별 요청 간격 적용, 연 페이지 수 기록)"""
+        get_rate_limiter().wait(url)
+        self.driver.get(url)
+        self.pages += 1
+
+    def is_alive(self):
+        """브라우저가 응답하는지 확인 (헬스 체크)"""
+        if not self.driver:
+            return False
+        try:
+            self.driver.execute_script("return 1")
+            return True
+        except Exception:
+            return False
+
+    def ensure_alive(self):
+        """브라우저를 시작하지 않았거나 죽었으면 (다시) 시작 (한 단계 실패가 다음 단계로 번지지 않도록)"""
+        if self.driver is None:
+            self.start_driver()
+        elif not self.is_alive():
+            logger.warning("Chrome WebDriver 응답 없음 - 재시작")
+            self.quit_driver()
+            self.pages = 0
+            self.start_driver()
+        return self.driver
+
+    def wait_until(self, name, condition, timeout):
+        """
+        조건이 참이 될 때까지 대기하고 실제 대기 시간 기록
+
+        Args:
+            name: 대기 이름 (통계 집계 단위)
+            condition: driver를 받아 충족 시 참 값을 반환하는 함수
+            timeout: 최대 대기 시간 (초)
+
+        Returns:
+            조건 함수의 반환값 또는 None (시간 초과)
+        """
+        started = time.perf_counter()
+        try:
+            result = WebDriverWait(self.driver, timeout, poll_frequency=0.1).until(condition)
+        except TimeoutException:
+            result = None
+        self.waits.append({
+            "name": name,
+            "ms": round((time.perf_counter() - started) * 1000, 1),
+            "result": result if isinstance(result, str) else ("ok" if result else "timeout")
+        })
+        return result
+
+    def network_idle(self, driver=None):
+        """문서 로드가 끝났고 NETWORK_IDLE_MS 동안 완료된 리소스 요청이 없는지"""
+        ready_state, idle_ms = (driver or self.driver).execute_script(_NETWORK_STATE_SCRIPT)
+        return ready_state == "complete" and idle_ms >= NETWORK_IDLE_MS
+
+    def wait_for_page(self, name, selector, timeout=None):
+        """
+        페이지 내용 렌더링 대기
+
+        selector 요소가 나타나면 바로 진행하고, 요소가 없는 매장(정보 미등록 등)은
+        네트워크가 유휴 상태가 되면 더 기다리지 않습니다.
+
+        Returns:
+            "element" | "network_idle" | None (시간 초과)
+        """
+        def ready(driver):
+            if driver.find_elements(By.CSS_SELECTOR, selector):
+                return "element"
+            return "network_idle" if self.network_idle(driver) else False
+
+        return self.wait_until(name, ready, timeout or PAGE_TIMEOUT)
+
+    def wait_for_count_increase(self, name, selector, previous_count, timeout=None):
+        """selector 요소 수가 previous_count보다 많아질 때까지 대기 (더보기 클릭 결과)"""
+        def increased(driver):
+            return len(driver.find_elements(By.CSS_SELECTOR, selector)) > previous_count
+
+        return self.wait_until(name, increased, timeout or LOAD_MORE_TIMEOUT)
+
+    def wait_for_network_idle(self, name, timeout=None):
+        """네트워크 유휴 상태까지 대기 (더보기 버튼 갱신 등 후속 렌더링)"""
+        return self.wait_until(name, self.network_idle, timeout or LOAD_MORE_TIMEOUT)
+
+    def reset_waits(self):
+        """대기 기록 초기화"""
+        self.waits = []
+
+    def wait_stats(self):
+        """
+        대기 이름별 통계
+
+        Returns:
+            {이름: {"count", "total_ms", "max_ms", "timeouts"}}
+        """
+        stats = {}
+        for wait in self.waits:
+            entry = stats.setdefault(wait["name"], {"count": 0, "total_ms": 0.0, "max_ms": 0.0, "timeouts": 0})
+            entry["count"] += 1
+            entry["total_ms"] = round(entry["total_ms"] + wait["ms"], 1)
+            entry["max_ms"] = max(entry["max_ms"], wait["ms"])
+            if wait["result"] == "timeout":
+                entry["timeouts"] += 1
+        return stats
 
     def wait_for_element(self, by, value, timeout=10):
         """요소가 나타날 때까지 대기"""